@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class AuthenticationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.authentication'
+    
+    def ready(self):
+        # Invalidar la caché de usuarios autenticados del proceso
+        from django.db.models.signals import post_delete, post_save
+        from .authentication import usuario_modificado
+        from .models import User
+        
+        post_save.connect(usuario_modificado, sender=User)
+        post_delete.connect(usuario_modificado, sender=User)
@@ -0,0 +1,128 @@
+"""
+Autenticación JWT con caché de usuarios por proceso
+
+JWTAuthentication consulta la tabla de usuarios en cada petición para
+obtener el usuario del token. CachedJWTAuthentication guarda el usuario
+AUTH_USER_CACHE_SECONDS segundos en memoria del proceso (worker de
+gunicorn), así la mayoría de las peticiones no hacen consultas de
+autenticación:
+- las escrituras del propio proceso invalidan la entrada al instante
+  (señales post_save/post_delete de User: rol, is_active, contraseña...)
+- las de otros procesos se ven al vencer la entrada, o antes si llega un
+  token emitido después de cargarla con otro rol (claim role, ver tokens.py)
+Con AUTH_USER_CACHE_SECONDS=0 se comporta como JWTAuthentication.
+"""
+import copy
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from django.conf import settings
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from .tokens import ROLE_CLAIM
+
+
+class UserCache:
+    """Usuarios autenticados del proceso por id, con vencimiento"""
+
+    def __init__(self):
+        # user_id -> (vence (monotonic), cargado (epoch), usuario)
+        self._usuarios: Dict[object, Tuple[float, float, object]] = {}
+        self._generacion = 0
+        self._lock = threading.Lock()
+
+    def get(self, user_id, emitido: Optional[float] = None, role: Optional[str] = None):
+        """
+        Copia del usuario en caché, o None si no está o venció
+
+        Si el token se emitió después de cargar la entrada y trae otro rol,
+        la entrada se descarta: el token sabe algo más reciente.
+        """
+        with self._lock:
+            entrada = self._usuarios.get(user_id)
+        if entrada is None:
+            return None
+        vence, cargado, usuario = entrada
+        if time.monotonic() >= vence:
+            return None
+        if role is not None and role != usuario.role and emitido is not None and emitido >= int(cargado):
+            return None
+        # Copia por petición: las vistas pueden modificar request.user
+        return copy.copy(usuario)
+
+    def generacion(self) -> int:
+        """Marca para set(): descarta cargas que se cruzaron con una invalidación"""
+        return self._generacion
+
+    def set(self, usuario, generacion: int) -> None:
+        """Guardar el usuario recién leído de la base de datos"""
+        ttl = settings.AUTH_USER_CACHE_SECONDS
+        if ttl <= 0:
+            return
+        with self._lock:
+            if generacion != self._generacion:
+                return
+            if usuario.pk not in self._usuarios and len(self._usuarios) >= settings.AUTH_USER_CACHE_SIZE:
+                self._purgar()
+            self._usuarios[usuario.pk] = (time.monotonic() + ttl, time.time(), copy.copy(usuario))
+
+    def invalidate(self, user_id=None) -> None:
+        """Descartar un usuario, o todos si no se indica"""
+        with self._lock:
+            self._generacion += 1
+            if user_id is None:
+                self._usuarios.clear()
+            else:
+                self._usuarios.pop(user_id, None)
+
+    def __len__(self) -> int:
+        return len(self._usuarios)
+
+    def _purgar(self) -> None:
+        """Liberar espacio: primero las vencidas, si no la más antigua"""
+        ahora = time.monotonic()
+        for user_id in [k for k, (vence, _, _) in self._usuarios.items() if vence <= ahora]:
+            del self._usuarios[user_id]
+        if len(self._usuarios) >= settings.AUTH_USER_CACHE_SIZE:
+            del self._usuarios[next(iter(self._usuarios))]
+
+
+# Caché compartida por todas las peticiones del proceso
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication que resuelve el usuario desde user_cache"""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('El token no identifica al usuario')
+
+        usuario = user_cache.get(
+            user_id, emitido=validated_token.get('iat'), role=validated_token.get(ROLE_CLAIM)
+        )
+        if usuario is None:
+            generacion = user_cache.generacion()
+            # Consulta, usuario activo y revocación por contraseña como simplejwt
+            usuario = super().get_user(validated_token)
+            user_cache.set(usuario, generacion)
+        elif api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(usuario.password):
+            raise AuthenticationFailed('La contraseña del usuario cambió', code='password_changed')
+        return usuario
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    """Esquema de seguridad OpenAPI (Bearer JWT) para CachedJWTAuthentication"""
+    target_class = 'apps.authentication.authentication.CachedJWTAuthentication'
+
+
+def usuario_modificado(sender, instance, **kwargs) -> None:
+    """Receptor de post_save/post_delete de User"""
+    user_cache.invalidate(instance.pk)
@@ -1,5 +1,6 @@
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
+from django.db.models.functions import Lower
 
 User = get_user_model()
 
@@ -7,18 +8,42 @@ User = get_user_model()
 class EmailBackend(ModelBackend):
     """
     Authentication backend que permite login con email
+
+    - El email no distingue mayúsculas (índice funcional LOWER(email))
+    - Un email inexistente cuesta lo mismo que una contraseña incorrecta:
+      se calcula un hash igual, para no revelar qué cuentas existen
+    - check_password re-hashea la contraseña si se guardó con otro
+      algoritmo o costo (PASSWORD_HASHERS)
+    - También atiende username=... (login del admin), así que no hace
+      falta ModelBackend detrás, que repetiría el hash en cada fallo
     """
     def authenticate(self, request, email=None, password=None, **kwargs):
-        try:
-            user = User.objects.get(email=email)
-            if user.check_password(password):
-                return user
-        except User.DoesNotExist:
+        if email is None:
+            email = kwargs.get(User.USERNAME_FIELD, kwargs.get('username'))
+        if email is None or password is None:
             return None
+
+        user = self._get_by_email(email)
+        if user is None:
+            # Mismo costo que verificar una contraseña
+            User().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
         return None
-    
+
     def get_user(self, user_id):
         try:
             return User.objects.get(pk=user_id)
         except User.DoesNotExist:
             return None
+
+    @staticmethod
+    def _get_by_email(email):
+        """Usuario por email sin distinguir mayúsculas; si hay varios, el exacto"""
+        candidatos = list(
+            User.objects.alias(email_lower=Lower('email')).filter(email_lower=email.lower())
+        )
+        if len(candidatos) > 1:
+            candidatos = [user for user in candidatos if user.email == email]
+        return candidatos[0] if len(candidatos) == 1 else None
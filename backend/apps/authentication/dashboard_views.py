@@ -3,6 +3,8 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Count, Sum, Avg
 from drf_spectacular.utils import extend_schema
+from nexus_domain.interfaces import IInventarioRepository
+from apps.core.container import container
 from apps.empresas.models import Empresa
 from apps.productos.models import Producto, PrecioMoneda
 from apps.inventario.models import Inventario
@@ -25,7 +27,10 @@ class DashboardStatsView(APIView):
         # Estadísticas básicas
         total_empresas = Empresa.objects.count()
         total_productos = Producto.objects.count()
-        total_inventario = Inventario.objects.aggregate(total=Sum('cantidad'))['total'] or 0
+        
+        # Snapshot columnar del inventario (una sola consulta con precios)
+        snapshot = container.resolve(IInventarioRepository).load_snapshot()
+        total_inventario = snapshot.total_cantidad()
 
         # Empresas recientes
         empresas_recientes = Empresa.objects.order_by('-created_at')[:5].values(
@@ -51,12 +56,7 @@ class DashboardStatsView(APIView):
         ).order_by('-total_cantidad')[:5]
 
         # Valor total estimado (precios en COP)
-        valor_total = 0
-        inventarios = Inventario.objects.select_related('producto').prefetch_related('producto__precios')
-        for inv in inventarios:
-            precio_cop = inv.producto.precios.filter(moneda='COP').first()
-            if precio_cop:
-                valor_total += float(precio_cop.precio) * inv.cantidad
+        valor_total = snapshot.valuation('COP')
 
         # Distribución de productos por empresa
         productos_por_empresa = Producto.objects.values(
@@ -103,6 +103,7 @@ class DashboardStatsView(APIView):
                 'total_inventario': total_inventario,
                 'valor_total_cop': round(valor_total, 2)
             },
+            'distribucion_stock': snapshot.stock_status_counts(),
             'empresas_recientes': list(empresas_recientes),
             'productos_top': list(productos_top),
             'inventario_por_empresa': list(inventario_por_empresa),
@@ -0,0 +1,42 @@
+"""
+Hashers de contraseñas con costo configurable
+
+Los de Django fijan el costo en atributos de clase; estos lo leen de
+settings (ARGON2_*, BCRYPT_ROUNDS, PBKDF2_ITERATIONS). must_update() compara
+el hash guardado con el costo vigente, así que al cambiarlo las contraseñas
+se re-hashean en el siguiente login.
+"""
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Argon2id (requiere argon2-cffi)"""
+
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
+
+
+class BCryptSHA256PasswordHasher(hashers.BCryptSHA256PasswordHasher):
+    """bcrypt sobre SHA-256 de la contraseña (requiere bcrypt)"""
+
+    @property
+    def rounds(self):
+        return settings.BCRYPT_ROUNDS
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 (sin dependencias)"""
+
+    @property
+    def iterations(self):
+        return settings.PBKDF2_ITERATIONS
@@ -0,0 +1,253 @@
+"""
+Tests para el módulo de Autenticación
+"""
+from unittest import mock
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.empresas.models import Empresa
+from apps.inventario.models import Inventario
+from apps.productos.models import Producto
+from .authentication import user_cache
+from .throttling import login_buckets
+from .tokens import UserRefreshToken
+
+User = get_user_model()
+
+
+class DashboardStatsTest(APITestCase):
+    """Tests para las estadísticas del dashboard"""
+    
+    def setUp(self):
+        user = User.objects.create_user(
+            username='externo',
+            email='externo@example.com',
+            password='externo123',
+            role='EXTERNO'
+        )
+        self.client.force_authenticate(user=user)
+        
+        for nit, cantidades in (('900123456', [10, 5]), ('800987654', [1])):
+            empresa = Empresa.objects.create(
+                nit=nit,
+                nombre=f'Empresa {nit}',
+                direccion='Calle 123 #45-67',
+                telefono='3001234567'
+            )
+            for i, cantidad in enumerate(cantidades):
+                producto = Producto.objects.create(
+                    codigo=f'{nit}-{i}', nombre=f'Producto {i}', empresa=empresa
+                )
+                Inventario.objects.create(empresa=empresa, producto=producto, cantidad=cantidad)
+    
+    def test_stats(self):
+        """Test: Totales e inventario agregado por empresa"""
+        response = self.client.get(reverse('dashboard-stats'))
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['resumen']['total_empresas'], 2)
+        self.assertEqual(response.data['resumen']['total_inventario'], 16)
+        self.assertEqual(
+            [(e['empresa__nit'], e['total_productos'], e['total_cantidad'])
+             for e in response.data['inventario_por_empresa']],
+            [('900123456', 2, 15), ('800987654', 1, 1)]
+        )
+
+
+class CachedJWTAuthenticationTest(APITestCase):
+    """Tests para la autenticación JWT con caché de usuarios"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='admin123',
+            role='ADMIN'
+        )
+        user_cache.invalidate()
+        self.addCleanup(user_cache.invalidate)
+    
+    def _autenticar(self, user=None):
+        token = UserRefreshToken.for_user(user or self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    
+    def test_login_incluye_rol(self):
+        """Test: Los tokens del login llevan los claims de rol"""
+        response = self.client.post(
+            reverse('login'), {'email': 'admin@example.com', 'password': 'admin123'}
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        token = AccessToken(response.data['tokens']['access'])
+        self.assertEqual(token['role'], 'ADMIN')
+        self.assertTrue(token['is_admin'])
+    
+    def test_sin_consultas_con_cache(self):
+        """Test: Con el usuario en caché la petición no consulta la base de datos"""
+        self._autenticar()
+        self.client.get(reverse('profile'))
+        
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('profile'))
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['email'], 'admin@example.com')
+    
+    @override_settings(AUTH_USER_CACHE_SECONDS=0)
+    def test_cache_desactivada(self):
+        """Test: Con AUTH_USER_CACHE_SECONDS=0 cada petición consulta el usuario"""
+        self._autenticar()
+        self.client.get(reverse('profile'))
+        
+        with self.assertNumQueries(1):
+            self.client.get(reverse('profile'))
+    
+    def test_cambio_de_rol_invalida(self):
+        """Test: Guardar el usuario descarta su entrada de la caché"""
+        self._autenticar()
+        self.client.get(reverse('profile'))
+        
+        self.user.role = 'EXTERNO'
+        self.user.save()
+        response = self.client.get(reverse('profile'))
+        
+        self.assertEqual(response.data['role'], 'EXTERNO')
+    
+    def test_usuario_desactivado(self):
+        """Test: Un usuario desactivado deja de autenticarse"""
+        self._autenticar()
+        self.client.get(reverse('profile'))
+        
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(reverse('profile'))
+        
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+    
+    def test_token_posterior_con_otro_rol(self):
+        """Test: Un token emitido después con otro rol recarga el usuario"""
+        self._autenticar()
+        self.client.get(reverse('profile'))
+        
+        # Cambio hecho por otro proceso: sin señales en este
+        User.objects.filter(pk=self.user.pk).update(role='EXTERNO')
+        self._autenticar(User.objects.get(pk=self.user.pk))
+        response = self.client.get(reverse('profile'))
+        
+        self.assertEqual(response.data['role'], 'EXTERNO')
+
+
+class LoginTest(APITestCase):
+    """Tests para el login con email"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='externo',
+            email='externo@example.com',
+            password='externo123',
+            role='EXTERNO'
+        )
+        login_buckets.clear()
+        self.addCleanup(login_buckets.clear)
+    
+    def _login(self, email='externo@example.com', password='externo123'):
+        return self.client.post(reverse('login'), {'email': email, 'password': password})
+    
+    def test_email_sin_distinguir_mayusculas(self):
+        """Test: El login acepta el email con otras mayúsculas"""
+        response = self._login(email='Externo@Example.com')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['user']['email'], 'externo@example.com')
+    
+    def test_rehash_al_iniciar_sesion(self):
+        """Test: Una contraseña con otro algoritmo se re-hashea en el login"""
+        User.objects.filter(pk=self.user.pk).update(
+            password=make_password('externo123', hasher='pbkdf2_sha256')
+        )
+        
+        response = self._login()
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('argon2'))
+    
+    def test_email_inexistente_calcula_hash(self):
+        """Test: Un email inexistente cuesta un hash, como una contraseña incorrecta"""
+        with mock.patch.object(User, 'set_password', autospec=True) as set_password:
+            response = self._login(email='nadie@example.com')
+        
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        set_password.assert_called_once()
+    
+    def test_usuario_inactivo(self):
+        """Test: Un usuario desactivado no obtiene tokens"""
+        self.user.is_active = False
+        self.user.save()
+        
+        response = self._login()
+        
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+    
+    @override_settings(LOGIN_RATE_BURST=2, LOGIN_RATE_PER_MINUTE=1)
+    def test_limite_por_ip(self):
+        """Test: Superada la ráfaga de intentos la IP recibe 429"""
+        self._login(password='incorrecta')
+        self._login(password='incorrecta')
+        
+        response = self._login()
+        
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+    
+    @override_settings(LOGIN_RATE_BURST=2, LOGIN_RATE_PER_MINUTE=1)
+    def test_x_forwarded_for_no_cambia_de_bucket(self):
+        """Test: Sin proxies configurados X-Forwarded-For no evita el límite"""
+        for i in range(2):
+            self.client.post(
+                reverse('login'), {'email': 'externo@example.com', 'password': 'incorrecta'},
+                HTTP_X_FORWARDED_FOR=f'10.0.0.{i}'
+            )
+        
+        response = self.client.post(
+            reverse('login'), {'email': 'externo@example.com', 'password': 'externo123'},
+            HTTP_X_FORWARDED_FOR='10.0.0.99'
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+    
+    @override_settings(LOGIN_RATE_BURST=1, LOGIN_RATE_PER_MINUTE=1)
+    def test_x_forwarded_for_con_proxy_de_confianza(self):
+        """Test: Con NUM_PROXIES=1 la IP es la que agregó el proxy, no las del cliente"""
+        with self.settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}):
+            primero = self.client.post(
+                reverse('login'), {'email': 'externo@example.com', 'password': 'externo123'},
+                HTTP_X_FORWARDED_FOR='1.1.1.1, 10.0.0.1'
+            )
+            falsificado = self.client.post(
+                reverse('login'), {'email': 'externo@example.com', 'password': 'externo123'},
+                HTTP_X_FORWARDED_FOR='2.2.2.2, 10.0.0.1'
+            )
+            otro_cliente = self.client.post(
+                reverse('login'), {'email': 'externo@example.com', 'password': 'externo123'},
+                HTTP_X_FORWARDED_FOR='10.0.0.2'
+            )
+        
+        self.assertEqual(primero.status_code, status.HTTP_200_OK)
+        self.assertEqual(falsificado.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(otro_cliente.status_code, status.HTTP_200_OK)
+    
+    def test_buckets_acotados(self):
+        """Test: Superado MAX_CLAVES se descarta el bucket usado hace más tiempo"""
+        with mock.patch.object(login_buckets, 'MAX_CLAVES', 3):
+            for ip in ('1.1.1.1', '2.2.2.2', '3.3.3.3', '1.1.1.1', '4.4.4.4'):
+                login_buckets.consume(ip, 1, 0)
+            
+            self.assertEqual(len(login_buckets), 3)
+            # 1.1.1.1 se usó de nuevo: sigue sin tokens; 2.2.2.2 se descartó
+            self.assertGreater(login_buckets.consume('1.1.1.1', 1, 0), 0)
+            self.assertEqual(login_buckets.consume('2.2.2.2', 1, 0), 0)
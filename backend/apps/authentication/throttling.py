@@ -0,0 +1,79 @@
+"""
+Límite de intentos de login por IP
+
+Token bucket en memoria del proceso: cada IP tiene hasta LOGIN_RATE_BURST
+intentos acumulados y recupera LOGIN_RATE_PER_MINUTE por minuto. No usa el
+cache de Django (sin CACHES configurado sería LocMem de todos modos) y no
+consulta nada; con varios workers el límite efectivo es por worker.
+
+La IP es REMOTE_ADDR salvo que REST_FRAMEWORK['NUM_PROXIES'] (variable
+NUM_PROXIES) indique cuántos proxies de confianza agregan X-Forwarded-For;
+con 0 el encabezado se ignora y no sirve para cambiar de bucket.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Tuple
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+
+class TokenBucket:
+    """Buckets por clave con capacidad y recarga por segundo"""
+
+    # Con más claves se descarta el bucket usado hace más tiempo (el que más
+    # probablemente ya está lleno, que equivale a no tenerlo)
+    MAX_CLAVES = 100000
+
+    def __init__(self):
+        # clave -> (tokens, último instante (monotonic)), del uso más antiguo al más reciente
+        self._buckets: 'OrderedDict[str, Tuple[float, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, clave: str, capacidad: int, por_segundo: float) -> float:
+        """
+        Tomar un token de la clave
+
+        Retorna 0 si se tomó, o los segundos que faltan para el próximo.
+        """
+        ahora = time.monotonic()
+        with self._lock:
+            tokens, instante = self._buckets.get(clave, (capacidad, ahora))
+            tokens = min(capacidad, tokens + (ahora - instante) * por_segundo)
+            espera = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                espera = (1 - tokens) / por_segundo if por_segundo > 0 else float('inf')
+            self._buckets[clave] = (tokens, ahora)
+            self._buckets.move_to_end(clave)
+            while len(self._buckets) > self.MAX_CLAVES:
+                self._buckets.popitem(last=False)
+            return espera
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+# Buckets de login del proceso
+login_buckets = TokenBucket()
+
+
+class LoginRateThrottle(BaseThrottle):
+    """Throttle de DRF para LoginView: un token por intento, por IP"""
+
+    def allow_request(self, request, view):
+        # get_ident usa REMOTE_ADDR o, con NUM_PROXIES, la IP agregada por el último proxy
+        if settings.LOGIN_RATE_PER_MINUTE <= 0:
+            return True
+        self._espera = login_buckets.consume(
+            self.get_ident(request), settings.LOGIN_RATE_BURST, settings.LOGIN_RATE_PER_MINUTE / 60
+        )
+        return self._espera == 0
+
+    def wait(self):
+        return self._espera
@@ -0,0 +1,24 @@
+"""
+Tokens JWT con el rol del usuario
+
+Los claims role e is_admin viajan en el refresh y se copian a cada access
+derivado (también en /api/auth/token/refresh/). El frontend los lee sin
+consultar el perfil y CachedJWTAuthentication los usa para detectar que su
+copia del usuario quedó vieja frente a un token emitido después.
+"""
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+ROLE_CLAIM = 'role'
+IS_ADMIN_CLAIM = 'is_admin'
+
+
+class UserRefreshToken(RefreshToken):
+    """RefreshToken con los claims de rol del usuario"""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[ROLE_CLAIM] = user.role
+        token[IS_ADMIN_CLAIM] = user.is_admin
+        return token
@@ -2,12 +2,13 @@ from rest_framework import status, generics
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate, get_user_model
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample
 from drf_spectacular.types import OpenApiTypes
 from .serializers import UserSerializer, LoginSerializer, UserDetailSerializer
 from .permissions import IsAdminUser
+from .throttling import LoginRateThrottle
+from .tokens import UserRefreshToken
 
 User = get_user_model()
 
@@ -54,7 +55,7 @@ class RegisterView(generics.CreateAPIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
         
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
         
         return Response({
             'user': UserDetailSerializer(user).data,
@@ -73,6 +74,7 @@ class LoginView(APIView):
     Retorna tokens JWT (access y refresh)
     """
     permission_classes = [AllowAny]
+    throttle_classes = [LoginRateThrottle]
     serializer_class = LoginSerializer
     
     @extend_schema(
@@ -105,7 +107,7 @@ class LoginView(APIView):
                 status=status.HTTP_401_UNAUTHORIZED
             )
         
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
         
         return Response({
             'user': UserDetailSerializer(user).data,
@@ -0,0 +1,28 @@
+# Generated by Django 5.0 on 2026-10-19 01:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+from apps.core.migration_operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('chatbot', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='chatmessage',
+            index=models.Index(fields=['session', 'created_at'], name='chat_mensaje_sesion_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='chatsession',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user', '-updated_at'], name='chat_sesion_activa_idx'),
+        ),
+    ]
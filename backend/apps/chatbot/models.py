@@ -17,6 +17,14 @@ class ChatSession(models.Model):
         verbose_name = 'Sesión de Chat'
         verbose_name_plural = 'Sesiones de Chat'
         ordering = ['-updated_at']
+        indexes = [
+            # Índice parcial: la sesión activa más reciente del usuario
+            models.Index(
+                fields=['user', '-updated_at'],
+                name='chat_sesion_activa_idx',
+                condition=models.Q(is_active=True),
+            ),
+        ]
     
     def __str__(self):
         return f"Chat {self.id} - {self.user.email}"
@@ -40,6 +48,10 @@ class ChatMessage(models.Model):
         verbose_name = 'Mensaje de Chat'
         verbose_name_plural = 'Mensajes de Chat'
         ordering = ['created_at']
+        indexes = [
+            # Historial de una sesión en orden
+            models.Index(fields=['session', 'created_at'], name='chat_mensaje_sesion_idx'),
+        ]
     
     def __str__(self):
         return f"{self.role}: {self.content[:50]}..."
@@ -1,8 +1,10 @@
 import os
 from datetime import datetime, timedelta
+from asgiref.sync import sync_to_async
 from google import genai
 from google.genai import types
 from django.conf import settings
+from apps.core.instrumentation import instrument
 
 
 class GeminiService:
@@ -94,8 +96,13 @@ FORMATO DE RESPUESTAS:
         
         return cache
     
-    def send_message(self, session, user, message, tools):
-        """Envía un mensaje y obtiene respuesta de Gemini con automatic function calling"""
+    async def send_message(self, session, user, message, tools):
+        """
+        Envía un mensaje y obtiene respuesta de Gemini con automatic function calling
+        
+        Async: las llamadas a Gemini usan el cliente aio y las funciones
+        (que usan el ORM) se ejecutan con sync_to_async.
+        """
         print(f"\n{'='*80}")
         print(f"🚀 INICIO - send_message")
         print(f"Usuario: {user.email}")
@@ -112,9 +119,7 @@ FORMATO DE RESPUESTAS:
         history = []
         messages = ChatMessage.objects.filter(session=session).order_by('created_at')
         
-        print(f"📜 Cargando historial: {messages.count()} mensajes previos")
-        
-        for msg in messages:
+        async for msg in messages:
             if msg.role == 'user':
                 history.append(types.Content(
                     role="user",
@@ -126,6 +131,8 @@ FORMATO DE RESPUESTAS:
                     parts=[types.Part.from_text(text=msg.content)]
                 ))
         
+        print(f"📜 Historial cargado: {len(history)} mensajes previos")
+        
         # Agregar el nuevo mensaje del usuario
         history.append(types.Content(
             role="user",
@@ -150,11 +157,12 @@ FORMATO DE RESPUESTAS:
             print(f"🤖 Llamando a Gemini (modelo: {self.model_name})...")
             
             # Primera llamada: Gemini puede decidir llamar funciones
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=history,
-                config=config
-            )
+            with instrument('external'):
+                response = await self.client.aio.models.generate_content(
+                    model=self.model_name,
+                    contents=history,
+                    config=config
+                )
             
             print(f"✅ Respuesta recibida de Gemini\n")
             
@@ -190,7 +198,7 @@ FORMATO DE RESPUESTAS:
                                 # Ejecutar la función
                                 if func_name in function_map:
                                     print(f"   ⚙️  Ejecutando función {func_name}...")
-                                    func_result = function_map[func_name](**func_args)
+                                    func_result = await sync_to_async(function_map[func_name])(**func_args)
                                     print(f"   ✅ Resultado: {func_result}\n")
                                     
                                     # Agregar el function call al historial
@@ -231,11 +239,12 @@ FORMATO DE RESPUESTAS:
                     temperature=0.2,
                 )
                 
-                final_response = self.client.models.generate_content(
-                    model=self.model_name,
-                    contents=history,
-                    config=final_config
-                )
+                with instrument('external'):
+                    final_response = await self.client.aio.models.generate_content(
+                        model=self.model_name,
+                        contents=history,
+                        config=final_config
+                    )
                 
                 final_text = ""
                 if hasattr(final_response, 'candidates') and final_response.candidates:
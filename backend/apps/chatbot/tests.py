@@ -1,3 +1,148 @@
+"""
+Tests para el módulo de Chatbot
+"""
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.core.container import request_scope
+from apps.empresas.models import Empresa
+from apps.inventario.models import Inventario
+from apps.productos.models import Producto
+from .models import ChatMessage, ChatSession
+from .tools.inventario_tools import update_inventario
 
-# Create your tests here.
+User = get_user_model()
+
+
+class ChatHistoryTest(APITestCase):
+    """Tests para el historial y las sesiones de chat"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='externo',
+            email='externo@example.com',
+            password='externo123'
+        )
+        otro = User.objects.create_user(
+            username='otro',
+            email='otro@example.com',
+            password='otro123'
+        )
+        self.client.force_authenticate(user=self.user)
+        
+        self.session = ChatSession.objects.create(user=self.user)
+        for role, content in (('user', 'Hola'), ('model', '¿En qué ayudo?'), ('user', 'Stock bajo')):
+            ChatMessage.objects.create(session=self.session, role=role, content=content)
+        ChatSession.objects.create(user=otro)
+    
+    def test_history_in_order(self):
+        """Test: Mensajes de la sesión en orden de creación"""
+        response = self.client.get(reverse('chat-history'), {'session_id': self.session.id})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [m['content'] for m in response.data['messages']],
+            ['Hola', '¿En qué ayudo?', 'Stock bajo']
+        )
+    
+    def test_sessions_of_user(self):
+        """Test: Solo las sesiones del usuario; ajenas no se ven ni se eliminan"""
+        ajena = ChatSession.objects.exclude(user=self.user).get()
+        
+        response = self.client.get(reverse('chat-sessions'))
+        self.assertEqual([s['id'] for s in response.data], [self.session.id])
+        
+        response = self.client.delete(reverse('chat-session-delete') + f'?session_id={ajena.id}')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(ChatSession.objects.filter(id=ajena.id).exists())
+
+
+class ChatMessageTest(APITestCase):
+    """Tests para el envío de mensajes (vista async)"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='externo',
+            email='externo@example.com',
+            password='externo123'
+        )
+        self.client.force_authenticate(user=self.user)
+        patcher = mock.patch('apps.chatbot.views.GeminiService')
+        self.gemini = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.gemini.send_message = mock.AsyncMock(return_value={'text': 'Hay 3 empresas', 'tool_calls': None})
+    
+    def test_message(self):
+        """Test: Guarda el mensaje y la respuesta en la sesión activa"""
+        response = self.client.post(reverse('chat-message'), {'message': '¿Cuántas empresas hay?'})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['message'], 'Hay 3 empresas')
+        session = ChatSession.objects.get(user=self.user)
+        self.assertEqual(response.data['session_id'], session.id)
+        self.assertEqual(
+            list(session.messages.values_list('role', 'content')),
+            [('user', '¿Cuántas empresas hay?'), ('model', 'Hay 3 empresas')]
+        )
+    
+    def test_message_requires_authentication(self):
+        """Test: Sin autenticación la vista async responde 401"""
+        self.client.force_authenticate(user=None)
+        
+        response = self.client.post(reverse('chat-message'), {'message': 'Hola'})
+        
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.gemini.send_message.assert_not_called()
+
+
+class UpdateInventarioToolTest(TestCase):
+    """Tests para la herramienta update_inventario del chatbot"""
+    
+    def setUp(self):
+        User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='admin123',
+            role='ADMIN'
+        )
+        empresa = Empresa.objects.create(
+            nit='900123456',
+            nombre='TechCorp',
+            direccion='Calle 123 #45-67',
+            telefono='3001234567'
+        )
+        Producto.objects.create(codigo='PROD-001', nombre='Laptop', empresa=empresa)
+    
+    def _update(self, cantidad, producto_codigo='PROD-001'):
+        with request_scope():
+            return update_inventario('900123456', producto_codigo, cantidad, 'admin@example.com')
+    
+    def test_create_then_update(self):
+        """Test: La acción la informa la unidad de trabajo y la respuesta sale de sus entidades"""
+        creado = self._update(5)
+        with CaptureQueriesContext(connection) as queries:
+            actualizado = self._update(8)
+        
+        registro = Inventario.objects.get()
+        self.assertTrue(creado['message'].startswith('✅ Inventario registrado: 5 unidades de Laptop'))
+        self.assertTrue(actualizado['message'].startswith('✅ Inventario actualizado: 8 unidades'))
+        self.assertEqual(actualizado['data']['id'], registro.pk)
+        self.assertEqual(actualizado['data']['empresa_nombre'], 'TechCorp')
+        self.assertEqual(actualizado['data']['cantidad'], 8)
+        # Solo la lectura de la unidad de trabajo: sin exists() ni releer el registro
+        lecturas = [q['sql'] for q in queries.captured_queries
+                    if q['sql'].startswith('SELECT') and 'FROM "inventario_inventario"' in q['sql']]
+        self.assertEqual(len(lecturas), 1)
+    
+    def test_unknown_producto(self):
+        """Test: Producto inexistente responde sin éxito y sin escribir"""
+        resultado = self._update(5, producto_codigo='PROD-999')
+        
+        self.assertFalse(resultado['success'])
+        self.assertIn('PROD-999', resultado['message'])
+        self.assertFalse(Inventario.objects.exists())
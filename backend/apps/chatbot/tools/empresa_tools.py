@@ -1,3 +1,5 @@
+from nexus_domain.interfaces import IEmpresaRepository
+from apps.core.container import container
 from apps.empresas.models import Empresa
 from apps.empresas.serializers import EmpresaSerializer
 from django.contrib.auth import get_user_model
@@ -29,7 +31,7 @@ def create_empresa(nit: str, nombre: str, direccion: str, telefono: str, user_em
             }
         
         # Verificar si ya existe
-        if Empresa.objects.filter(nit=nit).exists():
+        if container.resolve(IEmpresaRepository).exists(nit):
             return {
                 "success": False,
                 "error": "Empresa ya existe",
@@ -1,7 +1,8 @@
+from nexus_domain.exceptions import EntityNotFoundError
+from nexus_domain.use_cases import CreateOrUpdateInventarioUseCase
+from apps.core.container import container
 from apps.inventario.models import Inventario
 from apps.inventario.serializers import InventarioSerializer
-from apps.productos.models import Producto
-from apps.empresas.models import Empresa
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -29,37 +30,38 @@ def update_inventario(empresa_nit: str, producto_codigo: str, cantidad: int, use
                 "message": "🔒 Solo los administradores pueden actualizar inventario"
             }
         
-        # Verificar empresa y producto
+        # Crear o actualizar con el caso de uso (historial de movimientos, ABC);
+        # la unidad de trabajo ya leyó empresa y producto y sabe si creó el registro
         try:
-            empresa = Empresa.objects.get(nit=empresa_nit)
-            producto = Producto.objects.get(codigo=producto_codigo)
-        except Empresa.DoesNotExist:
+            guardado = container.resolve(CreateOrUpdateInventarioUseCase).execute_detailed(
+                empresa_nit=empresa_nit,
+                producto_codigo=producto_codigo,
+                cantidad=cantidad
+            )
+        except EntityNotFoundError as e:
             return {
                 "success": False,
-                "error": "Empresa no encontrada",
-                "message": f"❌ No existe empresa con NIT {empresa_nit}"
+                "error": str(e),
+                "message": f"❌ {e}"
             }
-        except Producto.DoesNotExist:
-            return {
-                "success": False,
-                "error": "Producto no encontrado",
-                "message": f"❌ No existe producto con código {producto_codigo}"
-            }
-        
-        # Buscar o crear inventario
-        inventario, created = Inventario.objects.update_or_create(
-            empresa=empresa,
-            producto=producto,
-            defaults={
-                'cantidad': cantidad
-            }
-        )
+        registro, empresa, producto = guardado.inventario, guardado.empresa, guardado.producto
         
-        action = "registrado" if created else "actualizado"
+        action = "registrado" if guardado.creado else "actualizado"
         
         return {
             "success": True,
-            "data": InventarioSerializer(inventario).data,
+            # Mismos campos que InventarioSerializer
+            "data": {
+                "id": int(registro.id),
+                "empresa": str(empresa.nit),
+                "empresa_nombre": empresa.nombre,
+                "producto": str(producto.codigo),
+                "producto_nombre": producto.nombre,
+                "producto_codigo": str(producto.codigo),
+                "cantidad": int(registro.cantidad),
+                "fecha_registro": registro.created_at.isoformat(),
+                "updated_at": registro.updated_at.isoformat()
+            },
             "message": f"✅ Inventario {action}: {cantidad} unidades de {producto.nombre} para {empresa.nombre}"
         }
     
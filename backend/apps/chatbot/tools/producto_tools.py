@@ -1,3 +1,6 @@
+from nexus_domain.interfaces import IProductoRepository
+from apps.core.container import container
+from apps.productos.autocomplete import autocomplete
 from apps.productos.models import Producto, PrecioMoneda
 from apps.productos.serializers import ProductoSerializer
 from apps.empresas.models import Empresa
@@ -40,7 +43,7 @@ def create_producto(codigo: str, nombre: str, empresa_nit: str, caracteristicas:
             }
         
         # Verificar si el producto ya existe
-        if Producto.objects.filter(codigo=codigo).exists():
+        if container.resolve(IProductoRepository).exists(codigo):
             return {
                 "success": False,
                 "error": "Producto ya existe",
@@ -96,7 +99,7 @@ def list_productos(empresa_nit: str = "", nombre_filtro: str = "", limit: int =
         Diccionario con la lista de productos
     """
     try:
-        queryset = Producto.objects.select_related('empresa').prefetch_related('precios')
+        queryset = Producto.objects.select_related('empresa', 'precio_pivot')
         
         if empresa_nit:
             queryset = queryset.filter(empresa__nit=empresa_nit)
@@ -141,7 +144,7 @@ def get_producto(codigo: str, user_email: str) -> dict:
         Diccionario con los detalles del producto
     """
     try:
-        producto = Producto.objects.select_related('empresa').prefetch_related('precios').get(codigo=codigo)
+        producto = Producto.objects.select_related('empresa', 'precio_pivot').get(codigo=codigo)
         
         return {
             "success": True,
@@ -150,10 +153,19 @@ def get_producto(codigo: str, user_email: str) -> dict:
         }
     
     except Producto.DoesNotExist:
+        sugerencias = autocomplete.search(codigo, limit=5)
+        message = f"❌ No existe producto con código {codigo}"
+        if sugerencias:
+            message += ". ¿Quisiste decir: " + ", ".join(
+                f"{nombre} ({sugerido})" for sugerido, nombre in sugerencias
+            ) + "?"
         return {
             "success": False,
             "error": "Producto no encontrado",
-            "message": f"❌ No existe producto con código {codigo}"
+            "message": message,
+            "sugerencias": [
+                {"codigo": sugerido, "nombre": nombre} for sugerido, nombre in sugerencias
+            ]
         }
     except Exception as e:
         return {
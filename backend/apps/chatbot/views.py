@@ -5,6 +5,7 @@ from rest_framework import status
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 
+from apps.core.async_views import AsyncAPIView
 from .models import ChatSession, ChatMessage
 from .serializers import (
     ChatMessageInputSerializer,
@@ -16,8 +17,12 @@ from .tools.registry import get_all_tools
 
 
 @extend_schema(tags=['Chatbot'])
-class ChatMessageAPIView(APIView):
-    """Endpoint para enviar mensajes al chatbot"""
+class ChatMessageAPIView(AsyncAPIView):
+    """
+    Endpoint para enviar mensajes al chatbot
+    
+    Async: mientras espera a Gemini el worker ASGI atiende otras peticiones
+    """
     permission_classes = [IsAuthenticated]
     
     @extend_schema(
@@ -26,7 +31,7 @@ class ChatMessageAPIView(APIView):
         request=ChatMessageInputSerializer,
         responses={200: ChatMessageResponseSerializer}
     )
-    def post(self, request):
+    async def post(self, request):
         serializer = ChatMessageInputSerializer(data=request.data)
         
         if not serializer.is_valid():
@@ -42,17 +47,17 @@ class ChatMessageAPIView(APIView):
         # Obtener o crear sesión
         if session_id:
             try:
-                session = ChatSession.objects.get(id=session_id, user=user)
+                session = await ChatSession.objects.aget(id=session_id, user=user)
             except ChatSession.DoesNotExist:
-                session = ChatSession.objects.create(user=user)
+                session = await ChatSession.objects.acreate(user=user)
         else:
             # Buscar sesión activa o crear nueva
-            session = ChatSession.objects.filter(user=user, is_active=True).first()
+            session = await ChatSession.objects.filter(user=user, is_active=True).afirst()
             if not session:
-                session = ChatSession.objects.create(user=user)
+                session = await ChatSession.objects.acreate(user=user)
         
         # Guardar mensaje del usuario
-        user_message = ChatMessage.objects.create(
+        user_message = await ChatMessage.objects.acreate(
             session=session,
             role='user',
             content=message
@@ -68,7 +73,7 @@ class ChatMessageAPIView(APIView):
             # Preparar mensaje con contexto del usuario
             user_context_message = f"{message}\n\n[user_email: {user.email}]"
             
-            result = gemini_service.send_message(
+            result = await gemini_service.send_message(
                 session=session,
                 user=user,
                 message=user_context_message,
@@ -76,7 +81,7 @@ class ChatMessageAPIView(APIView):
             )
             
             # Guardar respuesta del modelo
-            bot_message = ChatMessage.objects.create(
+            bot_message = await ChatMessage.objects.acreate(
                 session=session,
                 role='model',
                 content=result['text'],
@@ -84,7 +89,7 @@ class ChatMessageAPIView(APIView):
             )
             
             # Actualizar timestamp de sesión
-            session.save()
+            await session.asave()
             
             return Response({
                 "session_id": session.id,
@@ -0,0 +1,3 @@
+"""
+Utilidades compartidas entre apps (sin modelos)
+"""
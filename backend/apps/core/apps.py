@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.core'
+    
+    def ready(self):
+        # Medir casos de uso, mappers, serialización y SQL de cada petición
+        from django.apps import apps
+        from django.conf import settings
+        from django.db.backends.signals import connection_created
+        from .instrumentation import auto_instrument, install_db_instrumentation
+        
+        if settings.INSTRUMENTATION_ENABLED:
+            auto_instrument([app.name for app in apps.get_app_configs() if app.name.startswith('apps.')])
+            connection_created.connect(install_db_instrumentation)
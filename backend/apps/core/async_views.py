@@ -0,0 +1,45 @@
+"""
+APIView con handlers async para endpoints que esperan servicios externos
+
+DRF 3.14 solo despacha handlers sync. AsyncAPIView hace el mismo recorrido
+que APIView.dispatch pero como corrutina: con workers ASGI (uvicorn) la
+espera de Gemini o MailerSend no ocupa el worker, que sigue atendiendo
+otras peticiones. Bajo WSGI Django ejecuta la vista con async_to_sync y se
+comporta como una vista sync.
+
+Autenticación, permisos y throttling pueden consultar la base de datos y se
+ejecutan con sync_to_async; los handlers usan el ORM async (aget, acreate...)
+o sync_to_async para el resto del código sync.
+"""
+import asyncio
+from asgiref.sync import sync_to_async
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """APIView cuyos handlers (get, post...) son async def"""
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
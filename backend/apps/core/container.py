@@ -0,0 +1,193 @@
+"""
+Contenedor de dependencias: qué implementación recibe cada interfaz
+
+settings.DEPENDENCIES asocia cada clave (ruta de la interfaz, p. ej.
+'nexus_domain.interfaces.IEmpresaRepository') con:
+
+- class: ruta de la implementación
+- scope: singleton (una por proceso), request (una por petición) o
+  transient (una por resolve); por defecto request
+- decorators: rutas de clases que envuelven a la implementación, de la más
+  interna a la más externa; cada una se llama con la instancia envuelta
+  (caché, métricas...)
+
+Los parámetros del constructor anotados con una clave registrada se
+resuelven con el contenedor; así se arman también los casos de uso, que no
+se registran:
+
+    use_case = container.resolve(CreateOrUpdateInventarioUseCase)
+    repository = container.resolve(IEmpresaRepository)
+
+El alcance request lo abre DependencyScopeMiddleware; fuera de una petición
+(comandos, shell) las claves request se comportan como transient. Los
+repositorios Django guardan lo leído en la petición (ChangeTracker), por eso
+su alcance es request y no singleton.
+"""
+import inspect
+import threading
+import typing
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.utils.module_loading import import_string
+
+
+SCOPES = ('singleton', 'request', 'transient')
+
+_request: ContextVar[Optional[Dict[type, Any]]] = ContextVar('dependency_scope', default=None)
+
+
+class Registration:
+    """Implementación, alcance y decoradores de una clave"""
+
+    __slots__ = ('clave', 'clase', 'scope', 'decorators')
+
+    def __init__(self, clave: type, clase: type, scope: str = 'request',
+                 decorators: Tuple[type, ...] = ()):
+        if scope not in SCOPES:
+            raise ImproperlyConfigured(f"Alcance inválido para {clave.__name__}: {scope} (opciones: {', '.join(SCOPES)})")
+        self.clave = clave
+        self.clase = clase
+        self.scope = scope
+        self.decorators = decorators
+
+    @classmethod
+    def from_setting(cls, ruta: str, opciones: dict) -> 'Registration':
+        try:
+            return cls(
+                import_string(ruta),
+                import_string(opciones['class']),
+                opciones.get('scope', 'request'),
+                tuple(import_string(decorator) for decorator in opciones.get('decorators', ()))
+            )
+        except (ImportError, KeyError) as e:
+            raise ImproperlyConfigured(f"DEPENDENCIES['{ruta}'] inválido: {e}") from e
+
+
+class Container:
+    """Resuelve claves registradas y arma clases por sus anotaciones"""
+
+    def __init__(self, registrations: Optional[List[Registration]] = None):
+        self._registrations: Dict[type, Registration] = {
+            registration.clave: registration for registration in registrations or ()
+        }
+        self._singletons: Dict[type, Any] = {}
+        self._lock = threading.RLock()
+        self._resolviendo = threading.local()
+
+    @classmethod
+    def from_settings(cls) -> 'Container':
+        return cls([
+            Registration.from_setting(ruta, opciones)
+            for ruta, opciones in getattr(settings, 'DEPENDENCIES', {}).items()
+        ])
+
+    def __contains__(self, clave: type) -> bool:
+        return clave in self._registrations
+
+    def resolve(self, clave: Union[type, str]) -> Any:
+        """Instancia de una clave registrada, o de una clase armada por sus anotaciones"""
+        if isinstance(clave, str):
+            clave = import_string(clave)
+        registration = self._registrations.get(clave)
+        if registration is None:
+            return self._build(clave)
+
+        if registration.scope == 'singleton':
+            with self._lock:
+                if clave not in self._singletons:
+                    self._singletons[clave] = self._create(registration)
+                return self._singletons[clave]
+        if registration.scope == 'request':
+            instancias = _request.get()
+            if instancias is not None:
+                if clave not in instancias:
+                    instancias[clave] = self._create(registration)
+                return instancias[clave]
+        return self._create(registration)
+
+    def _create(self, registration: Registration) -> Any:
+        instancia = self._build(registration.clase)
+        for decorator in registration.decorators:
+            instancia = decorator(instancia)
+        return instancia
+
+    def _build(self, clase: type) -> Any:
+        """Instanciar resolviendo los parámetros anotados con claves registradas"""
+        en_curso = self._resolviendo.__dict__.setdefault('clases', [])
+        if clase in en_curso:
+            ciclo = ' -> '.join(c.__name__ for c in en_curso + [clase])
+            raise ImproperlyConfigured(f"Dependencia circular: {ciclo}")
+        en_curso.append(clase)
+        try:
+            return clase(**{nombre: self.resolve(clave) for nombre, clave in self._dependencias(clase)})
+        finally:
+            en_curso.pop()
+
+    def _dependencias(self, clase: type) -> Iterator[Tuple[str, type]]:
+        """(parámetro, clave) del constructor con anotación registrada (también Optional)"""
+        try:
+            anotaciones = typing.get_type_hints(clase.__init__)
+        except (NameError, TypeError):
+            return
+        for nombre, parametro in inspect.signature(clase.__init__).parameters.items():
+            anotacion = anotaciones.get(nombre)
+            if typing.get_origin(anotacion) is Union:
+                anotacion = next((a for a in typing.get_args(anotacion) if a is not type(None)), None)
+            if anotacion in self._registrations:
+                yield nombre, anotacion
+            elif parametro.default is inspect.Parameter.empty and parametro.kind not in (
+                    parametro.VAR_POSITIONAL, parametro.VAR_KEYWORD) and nombre != 'self':
+                raise ImproperlyConfigured(
+                    f"{clase.__name__}: el parámetro {nombre} no tiene una dependencia registrada"
+                )
+
+
+@contextmanager
+def request_scope() -> Iterator[None]:
+    """Alcance request: las claves request se crean una vez dentro del bloque"""
+    token = _request.set({})
+    try:
+        yield
+    finally:
+        _request.reset(token)
+
+
+class _ContainerProxy:
+    """Contenedor de settings.DEPENDENCIES, creado al usarlo y reiniciado si cambia"""
+
+    def __init__(self):
+        self._container: Optional[Container] = None
+        self._lock = threading.Lock()
+
+    def _get(self) -> Container:
+        if self._container is None:
+            with self._lock:
+                if self._container is None:
+                    self._container = Container.from_settings()
+        return self._container
+
+    def reset(self) -> None:
+        self._container = None
+
+    def resolve(self, clave: Union[type, str]) -> Any:
+        return self._get().resolve(clave)
+
+    def __contains__(self, clave: type) -> bool:
+        return clave in self._get()
+
+
+# Contenedor del proceso
+container = _ContainerProxy()
+
+
+def _reset_container(setting, **kwargs) -> None:
+    """Receptor de setting_changed (override_settings en tests)"""
+    if setting == 'DEPENDENCIES':
+        container.reset()
+
+
+setting_changed.connect(_reset_container)
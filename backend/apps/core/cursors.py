@@ -0,0 +1,44 @@
+"""
+Recorrido de consultas grandes por lotes
+
+QuerySet.iterator() usa un cursor del lado del servidor en PostgreSQL. Con
+PgBouncer en modo transaction esos cursores están desactivados
+(DISABLE_SERVER_SIDE_CURSORS) y psycopg traería todas las filas a memoria
+en la primera lectura; en ese caso se pagina por llave primaria
+(pk > última ORDER BY pk LIMIT n), una consulta corta por lote.
+"""
+from typing import Iterator
+from django.db import connections
+from django.db.models import QuerySet
+
+
+def server_side_cursors(alias: str = 'default') -> bool:
+    """Verificar si iterator() puede leer por lotes en la base de datos"""
+    connection = connections[alias]
+    return (
+        connection.features.can_use_chunked_reads
+        and not connection.settings_dict.get('DISABLE_SERVER_SIDE_CURSORS')
+    )
+
+
+def iterate(queryset: QuerySet, chunk_size: int) -> Iterator:
+    """
+    Filas de la consulta por lotes de chunk_size
+
+    Sin cursores del servidor se recorre en orden de llave primaria: el
+    queryset debe ser de instancias o un values_list cuya primera columna
+    sea la llave primaria.
+    """
+    if server_side_cursors(queryset.db):
+        yield from queryset.iterator(chunk_size=chunk_size)
+        return
+
+    queryset = queryset.order_by('pk')
+    ultimo = None
+    while True:
+        lote = queryset if ultimo is None else queryset.filter(pk__gt=ultimo)
+        filas = list(lote[:chunk_size])
+        yield from filas
+        if len(filas) < chunk_size:
+            return
+        ultimo = filas[-1].pk if isinstance(filas[-1], queryset.model) else filas[-1][0]
@@ -0,0 +1,266 @@
+"""
+Exportación masiva a CSV, Parquet y XLSX con memoria constante
+
+- CSV: en PostgreSQL se transmite la salida de COPY ... TO STDOUT; en otros
+  motores se recorre la consulta por lotes (apps.core.cursors.iterate).
+- Parquet: se escribe un row group por lote de filas (RecordBatch de Arrow).
+- XLSX: libro en modo write_only (openpyxl).
+
+Parquet y XLSX se escriben en un archivo temporal porque ambos formatos
+necesitan cerrarse (footer / zip) antes de enviarse.
+"""
+import csv
+import io
+import json
+import queue
+import tempfile
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, Iterator, Tuple
+from django.db import connection
+from django.db.models import QuerySet
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.renderers import BaseRenderer
+from nexus_domain.exceptions import ValidationError
+from .cursors import iterate
+
+
+EXPORT_FORMATS: Tuple[str, ...] = ('csv', 'parquet', 'xlsx')
+
+# Filas por lote del cursor y por row group de Parquet
+CHUNK_SIZE = 10000
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+@dataclass(frozen=True)
+class Export:
+    """
+    Definición de una exportación
+
+    queryset es un values_list con las columnas en el mismo orden que
+    columnas: (nombre, tipo), con tipo en string, int, decimal o datetime.
+    La primera columna debe ser la llave primaria (ver apps.core.cursors).
+    """
+    nombre: str
+    queryset: QuerySet
+    columnas: Tuple[Tuple[str, str], ...]
+
+    @property
+    def headers(self) -> Tuple[str, ...]:
+        return tuple(nombre for nombre, _ in self.columnas)
+
+
+class _ExportRenderer(BaseRenderer):
+    """
+    Renderer para negociar ?format=csv|parquet|xlsx
+
+    La vista retorna el archivo directamente; solo los errores pasan por
+    aquí y se envían como JSON.
+    """
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data).encode('utf-8')
+
+
+class CSVExportRenderer(_ExportRenderer):
+    media_type = CONTENT_TYPES['csv']
+    format = 'csv'
+
+
+class ParquetExportRenderer(_ExportRenderer):
+    media_type = CONTENT_TYPES['parquet']
+    format = 'parquet'
+
+
+class XLSXExportRenderer(_ExportRenderer):
+    media_type = CONTENT_TYPES['xlsx']
+    format = 'xlsx'
+
+
+EXPORT_RENDERERS = [CSVExportRenderer, ParquetExportRenderer, XLSXExportRenderer]
+
+
+def _chunks(rows: Iterable[tuple], size: int) -> Iterator[list]:
+    """Agrupar filas en listas de size"""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _iter_rows(queryset: QuerySet) -> Iterator[tuple]:
+    """Filas de la consulta por lotes (cursor del servidor o paginación por llave)"""
+    return iterate(queryset, CHUNK_SIZE)
+
+
+# --- CSV ---
+
+class _QueueWriter:
+    """Archivo de solo escritura que entrega los bloques a una cola acotada"""
+
+    def __init__(self, chunks: queue.Queue, cancelled: threading.Event):
+        self.chunks = chunks
+        self.cancelled = cancelled
+
+    def write(self, data) -> None:
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        while True:
+            if self.cancelled.is_set():
+                # Interrumpe COPY cuando el cliente se desconecta
+                raise IOError("Exportación cancelada")
+            try:
+                self.chunks.put(data, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+
+def _stream_copy(queryset: QuerySet) -> Iterator[bytes]:
+    """Salida de COPY (consulta) TO STDOUT WITH CSV, bloque a bloque"""
+    sql, params = queryset.query.sql_with_params()
+    connection.ensure_connection()
+    raw = connection.connection
+    with raw.cursor() as cursor:
+        copy_sql = "COPY ({}) TO STDOUT WITH CSV".format(cursor.mogrify(sql, params).decode())
+
+    chunks: queue.Queue = queue.Queue(maxsize=64)
+    cancelled = threading.Event()
+    done = object()
+
+    def copy():
+        try:
+            with raw.cursor() as cursor:
+                cursor.copy_expert(copy_sql, _QueueWriter(chunks, cancelled))
+            chunks.put(done)
+        except Exception as e:
+            chunks.put(e)
+
+    # El hilo usa la conexión cruda; el de la petición no la toca mientras
+    # se transmite la respuesta
+    worker = threading.Thread(target=copy, daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = chunks.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        if worker.is_alive():
+            cancelled.set()
+            raw.cancel()
+            # Con conexiones persistentes: verificarla al terminar la petición
+            # en vez de reutilizarla a ciegas
+            connection.errors_occurred = True
+        worker.join()
+
+
+def _stream_csv_rows(queryset: QuerySet) -> Iterator[bytes]:
+    """Filas de la consulta como CSV, un bloque por lote"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for chunk in _chunks(_iter_rows(queryset), CHUNK_SIZE):
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def stream_csv(export: Export) -> Iterator[bytes]:
+    """Encabezado y filas de la exportación en CSV"""
+    header = io.StringIO()
+    csv.writer(header).writerow(export.headers)
+    yield header.getvalue().encode('utf-8')
+
+    if connection.vendor == 'postgresql':
+        yield from _stream_copy(export.queryset)
+    else:
+        yield from _stream_csv_rows(export.queryset)
+
+
+# --- Parquet ---
+
+def write_parquet(export: Export, fileobj) -> None:
+    """Escribir la exportación en Parquet, un row group por lote"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValidationError("Se requiere pyarrow para exportar a Parquet")
+
+    tipos = {
+        'string': pa.string(),
+        'int': pa.int64(),
+        'decimal': pa.decimal128(12, 2),
+        'datetime': pa.timestamp('us', tz='UTC'),
+    }
+    schema = pa.schema([(nombre, tipos[tipo]) for nombre, tipo in export.columnas])
+
+    with pq.ParquetWriter(fileobj, schema) as writer:
+        for chunk in _chunks(_iter_rows(export.queryset), CHUNK_SIZE):
+            arrays = [
+                pa.array(values, type=field.type)
+                for values, field in zip(zip(*chunk), schema)
+            ]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+
+
+# --- XLSX ---
+
+def write_xlsx(export: Export, fileobj) -> None:
+    """Escribir la exportación en XLSX (modo write_only)"""
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ValidationError("Se requiere openpyxl para exportar a XLSX")
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(export.nombre[:31])
+    sheet.append(export.headers)
+    for row in _iter_rows(export.queryset):
+        # Excel no admite zonas horarias
+        sheet.append([
+            timezone.make_naive(value) if isinstance(value, datetime) and timezone.is_aware(value)
+            else value
+            for value in row
+        ])
+    workbook.save(fileobj)
+
+
+def export_response(export: Export, formato: str):
+    """Respuesta HTTP con la exportación en el formato indicado"""
+    if formato not in EXPORT_FORMATS:
+        raise ValidationError(
+            f"Formato no soportado: {formato}. Use {', '.join(EXPORT_FORMATS)}"
+        )
+
+    filename = f"{export.nombre}_{timezone.now():%Y%m%d_%H%M%S}.{formato}"
+    if formato == 'csv':
+        response = StreamingHttpResponse(stream_csv(export), content_type=CONTENT_TYPES['csv'])
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    fileobj = tempfile.TemporaryFile()
+    try:
+        (write_parquet if formato == 'parquet' else write_xlsx)(export, fileobj)
+    except BaseException:
+        fileobj.close()
+        raise
+    fileobj.seek(0)
+    return FileResponse(
+        fileobj, as_attachment=True, filename=filename, content_type=CONTENT_TYPES[formato]
+    )
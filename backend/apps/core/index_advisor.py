@@ -0,0 +1,323 @@
+"""
+Asesor de índices a partir de las consultas reales
+
+Flujo (ver el comando index_advisor):
+1. QueryRecorder registra los SELECT que ejecuta una carga de trabajo (los
+   tests de las apps), agrupados por SQL con sus parámetros de ejemplo.
+2. analizar() extrae de cada SQL, por tabla, las columnas filtradas por
+   igualdad, por rango, las booleanas, el orden, el agrupamiento y las
+   columnas agregadas.
+3. recomendar() arma un índice por acceso con la regla igualdad -> orden ->
+   rango; las booleanas pasan a condición (índice parcial) y las columnas
+   agregadas a INCLUDE (índice cubriente). Se fusionan los índices con el
+   mismo prefijo y se descartan los que ya cubre un índice existente.
+4. explain() resume el plan de cada consulta (Seq Scan, Sort, SCAN, TEMP
+   B-TREE) como evidencia.
+
+El análisis del SQL es por patrones sobre el SQL que genera el ORM, no un
+parser completo: las subconsultas se ignoran.
+"""
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from django.apps import apps
+from django.db import DatabaseError, models
+from django.db.backends.utils import names_digest
+
+
+# Columna calificada: "tabla"."columna"
+_COLUMNA = re.compile(r'"(\w+)"\."(\w+)"')
+_OPERADOR = re.compile(r'\s*(=|<>|!=|<=|>=|<|>|IN\b|NOT IN\b|BETWEEN\b|LIKE\b|IS\b)', re.I)
+_AGREGADO = re.compile(r'\b(SUM|COUNT|AVG|MIN|MAX)\(\s*"(\w+)"\."(\w+)"\s*\)', re.I)
+_ORDEN = re.compile(r'"(\w+)"\."(\w+)"\s*(ASC|DESC)?', re.I)
+_FROM = re.compile(r'\bFROM\s+"(\w+)"', re.I)
+_CLAUSULAS = ('WHERE', 'GROUP BY', 'HAVING', 'ORDER BY', 'LIMIT', 'OFFSET', 'FOR UPDATE')
+
+# Líneas del plan que indican recorrido completo u ordenamiento
+_PLAN_COSTOSO = re.compile(r'Seq Scan|Sort\b|^\s*SCAN\b(?!.*USING)|TEMP B-TREE', re.M)
+
+
+@dataclass
+class IndiceExistente:
+    """Columnas de un índice de la base de datos"""
+    columnas: List[str]
+    unico: bool = False
+
+
+@dataclass
+class Acceso:
+    """Cómo usa una consulta las columnas de una tabla"""
+    tabla: str
+    igualdad: List[str] = field(default_factory=list)
+    rango: List[str] = field(default_factory=list)
+    booleanas: List[Tuple[str, bool]] = field(default_factory=list)
+    orden: List[Tuple[str, bool]] = field(default_factory=list)  # (columna, descendente)
+    union: List[str] = field(default_factory=list)
+    agrupacion: List[str] = field(default_factory=list)
+    agregadas: List[str] = field(default_factory=list)
+    disyuncion: bool = False
+
+
+@dataclass
+class Recomendacion:
+    """Índice recomendado para una tabla"""
+    tabla: str
+    columnas: List[Tuple[str, bool]]
+    include: List[str] = field(default_factory=list)
+    condicion: List[Tuple[str, bool]] = field(default_factory=list)
+    consultas: List[str] = field(default_factory=list)
+    veces: int = 0
+    planes: List[str] = field(default_factory=list)
+
+    @property
+    def nombres_columnas(self) -> List[str]:
+        return [columna for columna, _ in self.columnas]
+
+    def to_index(self) -> Tuple[Optional[type], Optional[models.Index]]:
+        """Modelo e Index de Django equivalentes (None si la tabla no es de un modelo)"""
+        model = _modelo(self.tabla)
+        if model is None:
+            return None, None
+        campos = {f.column: f.name for f in model._meta.concrete_fields}
+        fields = [('-' if desc else '') + campos.get(col, col) for col, desc in self.columnas]
+
+        include = [campos.get(col, col) for col in self.include]
+        condition = None
+        if self.condicion:
+            condition = models.Q(**{campos.get(col, col): valor for col, valor in self.condicion})
+
+        # Mismo formato de nombre que Django, con INCLUDE y condición en el hash
+        tabla = model._meta.db_table
+        digest = names_digest(tabla, *fields, *include, str(self.condicion), length=6)
+        nombre = f"{tabla[:11]}_{fields[0].lstrip('-')[:7]}_{digest}_idx"
+        return model, models.Index(
+            fields=fields, include=include or None, condition=condition, name=nombre
+        )
+
+
+class QueryRecorder:
+    """
+    execute_wrapper que registra los SELECT ejecutados
+
+    Agrupa por SQL (con marcadores de parámetros) y guarda los parámetros
+    de la primera ejecución para el EXPLAIN.
+    """
+
+    def __init__(self):
+        self.consultas: Dict[str, Tuple[Sequence, int]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and sql.lstrip()[:6].upper() == 'SELECT':
+            with self._lock:
+                primeros, veces = self.consultas.get(sql, (params, 0))
+                self.consultas[sql] = (primeros, veces + 1)
+        return execute(sql, params, many, context)
+
+
+def _sin_subconsultas(sql: str) -> str:
+    """Reemplazar cada (SELECT ...) por (?) respetando paréntesis anidados"""
+    resultado = []
+    i = 0
+    while True:
+        inicio = sql.upper().find('(SELECT', i)
+        if inicio == -1:
+            resultado.append(sql[i:])
+            return ''.join(resultado)
+        resultado.append(sql[i:inicio] + '(?)')
+        nivel = 0
+        for j in range(inicio, len(sql)):
+            nivel += {'(': 1, ')': -1}.get(sql[j], 0)
+            if nivel == 0:
+                break
+        i = j + 1
+
+
+def _clausula(sql: str, nombre: str) -> str:
+    """Texto de una cláusula de primer nivel (vacío si no está)"""
+    match = re.search(rf'\b{nombre}\b', sql, re.I)
+    if not match:
+        return ''
+    fin = len(sql)
+    for otra in _CLAUSULAS:
+        siguiente = re.search(rf'\b{otra}\b', sql[match.end():], re.I)
+        if siguiente and otra != nombre:
+            fin = min(fin, match.end() + siguiente.start())
+    return sql[match.end():fin]
+
+
+def _agregar(lista: list, valor) -> None:
+    if valor not in lista:
+        lista.append(valor)
+
+
+def analizar(sql: str) -> Dict[str, Acceso]:
+    """Accesos por tabla de un SELECT generado por el ORM"""
+    sql = _sin_subconsultas(sql)
+    accesos: Dict[str, Acceso] = {}
+
+    def acceso(tabla: str) -> Acceso:
+        return accesos.setdefault(tabla, Acceso(tabla))
+
+    base = _FROM.search(sql)
+    if base:
+        acceso(base.group(1))
+
+    # Columnas de los JOIN ... ON (...)
+    for on in re.finditer(r'\bON\s*\((.*?)\)', sql, re.I):
+        for tabla, columna in _COLUMNA.findall(on.group(1)):
+            _agregar(acceso(tabla).union, columna)
+
+    where = _clausula(sql, 'WHERE')
+    disyuncion = re.search(r'\bOR\b', where, re.I) is not None
+    for match in _COLUMNA.finditer(where):
+        tabla, columna = match.groups()
+        acceso(tabla).disyuncion = disyuncion
+        operador = _OPERADOR.match(where, match.end())
+        antes = where[:match.start()].rstrip()
+        if operador:
+            op = operador.group(1).upper()
+            if op in ('=', 'IN') or (op == 'IS' and re.match(r'\s*IS\s+NULL', where[match.end():], re.I)):
+                _agregar(acceso(tabla).igualdad, columna)
+            elif op in ('<', '<=', '>', '>=', 'BETWEEN'):
+                _agregar(acceso(tabla).rango, columna)
+        elif re.search(r'(=|<>|!=|<=|>=|<|>|\bIN|\bLIKE|\bBETWEEN|\bAND\s+%s)[\s(]*$', antes, re.I):
+            continue  # Lado derecho de una comparación
+        else:
+            negada = re.search(r'\bNOT[\s(]*$', antes, re.I) is not None
+            _agregar(acceso(tabla).booleanas, (columna, not negada))
+
+    group_by = _clausula(sql, 'GROUP BY')
+    if group_by:
+        for tabla, columna in _COLUMNA.findall(group_by):
+            _agregar(acceso(tabla).agrupacion, columna)
+        for _, tabla, columna in _AGREGADO.findall(sql):
+            _agregar(acceso(tabla).agregadas, columna)
+
+    for tabla, columna, direccion in _ORDEN.findall(_clausula(sql, 'ORDER BY')):
+        _agregar(acceso(tabla).orden, (columna, (direccion or '').upper() == 'DESC'))
+
+    return accesos
+
+
+def _indices_de(acceso: Acceso) -> List[Tuple[List[Tuple[str, bool]], List[str]]]:
+    """(columnas clave, INCLUDE) de los índices que sirven al acceso"""
+    if acceso.disyuncion:
+        # Con OR cada condición usa su propio índice
+        return [([(columna, False)], []) for columna in acceso.igualdad + acceso.rango]
+
+    booleanas = {columna for columna, _ in acceso.booleanas}
+    columnas = [(columna, False) for columna in acceso.igualdad if columna not in booleanas]
+    if acceso.orden and not acceso.rango:
+        columnas += [(c, d) for c, d in acceso.orden if c not in dict(columnas)]
+    elif acceso.rango:
+        columnas.append((acceso.rango[0], False))
+
+    include = []
+    if acceso.agregadas:
+        if not columnas:
+            # Agregado por grupo: columnas agrupadas (o la llave del join)
+            # y las columnas agregadas
+            columnas = [(columna, False) for columna in acceso.agrupacion or acceso.union]
+        include = [c for c in acceso.agregadas if c not in dict(columnas)]
+
+    return [(columnas, include)] if columnas else []
+
+
+def _cubierto(recomendacion: 'Recomendacion', existentes: Iterable[IndiceExistente]) -> bool:
+    """
+    Un índice existente ya sirve a la recomendación: empieza con sus
+    columnas y contiene las de INCLUDE, o es único y sus columnas están
+    entre las primeras de la recomendación (búsqueda de una sola fila)
+    """
+    columnas = recomendacion.nombres_columnas
+    for existente in existentes:
+        if existente.columnas[:len(columnas)] == columnas \
+                and set(recomendacion.include) <= set(existente.columnas):
+            return True
+        if existente.unico and set(existente.columnas) <= set(columnas[:len(existente.columnas)]):
+            return True
+    return False
+
+
+def recomendar(consultas: Dict[str, Tuple[Sequence, int]],
+               existentes: Dict[str, List[IndiceExistente]],
+               planes: Optional[Dict[str, Optional[str]]] = None) -> List[Recomendacion]:
+    """
+    Índices recomendados para las consultas registradas, de más a menos usado
+
+    existentes son los índices actuales por tabla; planes el resumen de
+    EXPLAIN por SQL (None si no se pudo obtener). Si hay plan y no muestra
+    recorridos ni ordenamientos, la consulta no genera recomendación.
+    """
+    planes = planes or {}
+    recomendaciones: List[Recomendacion] = []
+    for sql, (_, veces) in consultas.items():
+        plan = planes.get(sql)
+        if plan is not None and not plan:
+            continue
+        for acceso in analizar(sql).values():
+            condicion = [] if acceso.agregadas or acceso.disyuncion else acceso.booleanas
+            for columnas, include in _indices_de(acceso):
+                _fusionar(recomendaciones, Recomendacion(
+                    acceso.tabla, columnas, include, condicion, [sql], veces,
+                    [plan] if plan else []
+                ))
+
+    pendientes = [
+        r for r in recomendaciones
+        if not _cubierto(r, existentes.get(r.tabla, []))
+    ]
+    return sorted(pendientes, key=lambda r: -r.veces)
+
+
+def _fusionar(recomendaciones: List[Recomendacion], nueva: Recomendacion) -> None:
+    """Unir con una recomendación de la misma tabla cuyo prefijo coincide"""
+    for actual in recomendaciones:
+        if actual.tabla != nueva.tabla or actual.condicion != nueva.condicion:
+            continue
+        corta, larga = sorted((actual.columnas, nueva.columnas), key=len)
+        if larga[:len(corta)] == corta:
+            actual.columnas = larga
+            for columna in nueva.include:
+                _agregar(actual.include, columna)
+            actual.include = [c for c in actual.include if c not in actual.nombres_columnas]
+            actual.consultas += nueva.consultas
+            actual.veces += nueva.veces
+            actual.planes += nueva.planes
+            return
+    recomendaciones.append(nueva)
+
+
+def indices_existentes(connection) -> Dict[str, List[IndiceExistente]]:
+    """Índices (y llaves) de cada tabla de la base de datos"""
+    existentes = {}
+    with connection.cursor() as cursor:
+        for tabla in connection.introspection.table_names(cursor):
+            constraints = connection.introspection.get_constraints(cursor, tabla)
+            existentes[tabla] = [
+                IndiceExistente(c['columns'], c['primary_key'] or c['unique'])
+                for c in constraints.values()
+                if c['columns'] and (c['index'] or c['primary_key'] or c['unique'])
+            ]
+    return existentes
+
+
+def explain(connection, sql: str, params: Sequence) -> Optional[str]:
+    """Líneas costosas del plan de la consulta ('' si no hay; None si falló)"""
+    prefijo = connection.ops.explain_query_prefix()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f'{prefijo} {sql}', params)
+            lineas = [str(row[-1]) for row in cursor.fetchall()]
+    except DatabaseError:
+        return None
+    return '\n'.join(linea.strip() for linea in lineas if _PLAN_COSTOSO.search(linea))
+
+
+def _modelo(tabla: str) -> Optional[type]:
+    for model in apps.get_models():
+        if model._meta.db_table == tabla:
+            return model
+    return None
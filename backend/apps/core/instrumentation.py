@@ -0,0 +1,330 @@
+"""
+Instrumentación por petición: en qué se va el tiempo de cada request
+
+RequestMetricsMiddleware abre un RequestMetrics por petición (contextvar,
+así que también lo ven las vistas async y el código en sync_to_async) y al
+terminar lo emite como cabecera Server-Timing y lo acumula en las métricas
+Prometheus de /metrics. Las fases son:
+
+- db: consultas SQL (wrapper de ejecución en cada conexión)
+- use_case: execute() de los casos de uso del dominio
+- mapper: conversiones entidad <-> ORM de los mappers de cada app
+- serialization: to_dict() de entidades, serializers y renderers de DRF
+- external: llamadas a servicios externos (Gemini, MailerSend)
+
+Las fases se solapan (db ocurre dentro de use_case y mapper); en cada fase
+solo cuenta el bloque más externo. Código propio se mide con:
+
+    with instrument('external'):
+        response = await client.post(...)
+
+    @instrumented('mapper')
+    def to_entity(...): ...
+
+Los casos de uso, mappers y serializers se instrumentan al iniciar
+(auto_instrument, desde CoreConfig.ready) para no tocar el paquete de
+dominio, que no depende de Django.
+"""
+import functools
+import inspect
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from importlib import import_module
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+
+PHASES = ('db', 'use_case', 'mapper', 'serialization', 'external')
+
+# Límites (segundos) del histograma de duración de peticiones
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class RequestMetrics:
+    """Tiempos acumulados de una petición por fase"""
+
+    __slots__ = ('inicio', 'tiempos', 'consultas', '_abiertas')
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.tiempos: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.consultas = 0
+        self._abiertas: Dict[str, int] = dict.fromkeys(PHASES, 0)
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self.inicio
+
+    def server_timing(self, total: float) -> str:
+        """Valor de la cabecera Server-Timing (milisegundos)"""
+        partes = [f'total;dur={total * 1000:.1f}']
+        for fase in PHASES:
+            if fase == 'db' and self.consultas:
+                partes.append(f'db;dur={self.tiempos["db"] * 1000:.1f};desc="{self.consultas} consultas"')
+            elif fase != 'db' and self.tiempos[fase]:
+                partes.append(f'{fase};dur={self.tiempos[fase] * 1000:.1f}')
+        return ', '.join(partes)
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar('request_metrics', default=None)
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    """Métricas de la petición en curso (None fuera de una petición)"""
+    return _current.get()
+
+
+@contextmanager
+def collect() -> Iterator[RequestMetrics]:
+    """Abrir un RequestMetrics para el bloque (lo usa el middleware)"""
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def instrument(fase: str) -> Iterator[None]:
+    """Sumar la duración del bloque a la fase de la petición en curso"""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    metrics._abiertas[fase] += 1
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics._abiertas[fase] -= 1
+        if not metrics._abiertas[fase]:
+            metrics.tiempos[fase] += time.perf_counter() - inicio
+
+
+def instrumented(fase: str) -> Callable:
+    """Decorador de instrument() para funciones sync o async"""
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with instrument(fase):
+                    return await func(*args, **kwargs)
+            async_wrapper.__instrumented__ = fase
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return func(*args, **kwargs)
+            with instrument(fase):
+                return func(*args, **kwargs)
+        wrapper.__instrumented__ = fase
+        return wrapper
+    return decorator
+
+
+def instrument_methods(cls: type, fase: str, nombres: Iterable[str]) -> None:
+    """Instrumentar métodos de una clase (también staticmethod y classmethod)"""
+    for nombre in nombres:
+        atributo = inspect.getattr_static(cls, nombre, None)
+        if isinstance(atributo, (staticmethod, classmethod)):
+            if not hasattr(atributo.__func__, '__instrumented__'):
+                setattr(cls, nombre, type(atributo)(instrumented(fase)(atributo.__func__)))
+        elif callable(atributo) and not hasattr(atributo, '__instrumented__'):
+            setattr(cls, nombre, instrumented(fase)(atributo))
+
+
+def _metodos_publicos(cls: type) -> Iterator[str]:
+    return (nombre for nombre, valor in vars(cls).items()
+            if not nombre.startswith('_') and (callable(valor) or isinstance(valor, (staticmethod, classmethod))))
+
+
+def auto_instrument(app_modules: Iterable[str]) -> None:
+    """Instrumentar casos de uso, mappers de las apps y serialización de DRF"""
+    from rest_framework import renderers, serializers
+    from nexus_domain import entities, use_cases
+    from .renderers import RawJSONRenderer
+
+    for valor in vars(use_cases).values():
+        if inspect.isclass(valor) and valor.__name__.endswith('UseCase') and hasattr(valor, 'execute'):
+            instrument_methods(valor, 'use_case', ['execute'])
+
+    for modulo in app_modules:
+        try:
+            mappers = import_module(f'{modulo}.mappers')
+        except ModuleNotFoundError:
+            continue
+        for valor in vars(mappers).values():
+            if inspect.isclass(valor) and valor.__module__ == mappers.__name__ and valor.__name__.endswith('Mapper'):
+                instrument_methods(valor, 'mapper', list(_metodos_publicos(valor)))
+
+    for valor in vars(entities).values():
+        if inspect.isclass(valor) and 'to_dict' in vars(valor):
+            instrument_methods(valor, 'serialization', ['to_dict'])
+    instrument_methods(serializers.Serializer, 'serialization', ['to_representation'])
+    instrument_methods(serializers.ListSerializer, 'serialization', ['to_representation'])
+    instrument_methods(renderers.JSONRenderer, 'serialization', ['render'])
+    instrument_methods(RawJSONRenderer, 'serialization', ['render'])
+
+
+def db_wrapper(execute, sql, params, many, context):
+    """Wrapper de ejecución: tiempo y número de consultas de la petición"""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.tiempos['db'] += time.perf_counter() - inicio
+        metrics.consultas += 1
+
+
+def install_db_instrumentation(connection, **kwargs) -> None:
+    """Agregar db_wrapper a la conexión (idempotente; receptor de connection_created)"""
+    if db_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, db_wrapper)
+
+
+class MetricsRegistry:
+    """
+    Contadores e histogramas Prometheus del proceso
+
+    Cada worker de gunicorn tiene los suyos: /metrics responde con los del
+    worker que atiende la petición (etiqueta pid).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._peticiones: Dict[Tuple[str, str, str], int] = {}
+        # (method, route) -> [cuentas por bucket..., +Inf], suma
+        self._duracion: Dict[Tuple[str, str], Tuple[list, float]] = {}
+        self._fases: Dict[Tuple[str, str], float] = {}
+        self._consultas: Dict[str, int] = {}
+        # (repositorio, método) -> [llamadas, segundos]
+        self._repositorios: Dict[Tuple[str, str], list] = {}
+
+    def observe(self, method: str, route: str, status: int, metrics: RequestMetrics, total: float) -> None:
+        with self._lock:
+            clave = (method, route, str(status))
+            self._peticiones[clave] = self._peticiones.get(clave, 0) + 1
+            cuentas, suma = self._duracion.get((method, route), ([0] * (len(BUCKETS) + 1), 0.0))
+            cuentas[bisect_left(BUCKETS, total)] += 1
+            self._duracion[(method, route)] = (cuentas, suma + total)
+            for fase, segundos in metrics.tiempos.items():
+                if segundos:
+                    self._fases[(route, fase)] = self._fases.get((route, fase), 0.0) + segundos
+            if metrics.consultas:
+                self._consultas[route] = self._consultas.get(route, 0) + metrics.consultas
+
+    def observe_repository(self, repositorio: str, metodo: str, segundos: float) -> None:
+        with self._lock:
+            acumulado = self._repositorios.setdefault((repositorio, metodo), [0, 0.0])
+            acumulado[0] += 1
+            acumulado[1] += segundos
+
+    def clear(self) -> None:
+        with self._lock:
+            self._peticiones.clear()
+            self._duracion.clear()
+            self._fases.clear()
+            self._consultas.clear()
+            self._repositorios.clear()
+
+    def render(self) -> str:
+        """Formato de exposición de texto de Prometheus"""
+        pid = os.getpid()
+        lineas = []
+        with self._lock:
+            lineas += [
+                '# HELP http_requests_total Peticiones atendidas por el worker',
+                '# TYPE http_requests_total counter',
+            ]
+            for (method, route, status), total in sorted(self._peticiones.items()):
+                lineas.append(f'http_requests_total{{pid="{pid}",method="{method}",route="{_escapar(route)}",'
+                              f'status="{status}"}} {total}')
+
+            lineas += [
+                '# HELP http_request_duration_seconds Duración de las peticiones',
+                '# TYPE http_request_duration_seconds histogram',
+            ]
+            for (method, route), (cuentas, suma) in sorted(self._duracion.items()):
+                etiquetas = f'pid="{pid}",method="{method}",route="{_escapar(route)}"'
+                acumulado = 0
+                for limite, cuenta in zip(BUCKETS + ('+Inf',), cuentas):
+                    acumulado += cuenta
+                    lineas.append(f'http_request_duration_seconds_bucket{{{etiquetas},le="{limite}"}} {acumulado}')
+                lineas.append(f'http_request_duration_seconds_sum{{{etiquetas}}} {suma:.6f}')
+                lineas.append(f'http_request_duration_seconds_count{{{etiquetas}}} {acumulado}')
+
+            lineas += [
+                '# HELP http_request_phase_seconds_total Tiempo de las peticiones por fase',
+                '# TYPE http_request_phase_seconds_total counter',
+            ]
+            for (route, fase), segundos in sorted(self._fases.items()):
+                lineas.append(f'http_request_phase_seconds_total{{pid="{pid}",route="{_escapar(route)}",'
+                              f'phase="{fase}"}} {segundos:.6f}')
+
+            lineas += [
+                '# HELP db_queries_total Consultas SQL ejecutadas por las peticiones',
+                '# TYPE db_queries_total counter',
+            ]
+            for route, total in sorted(self._consultas.items()):
+                lineas.append(f'db_queries_total{{pid="{pid}",route="{_escapar(route)}"}} {total}')
+
+            if self._repositorios:
+                lineas += [
+                    '# HELP repository_calls_total Llamadas a métodos de repositorios (MeteredRepository)',
+                    '# TYPE repository_calls_total counter',
+                ]
+                for (repositorio, metodo), (llamadas, _) in sorted(self._repositorios.items()):
+                    lineas.append(f'repository_calls_total{{pid="{pid}",repository="{repositorio}",'
+                                  f'method="{metodo}"}} {llamadas}')
+                lineas += [
+                    '# HELP repository_call_seconds_total Tiempo en métodos de repositorios',
+                    '# TYPE repository_call_seconds_total counter',
+                ]
+                for (repositorio, metodo), (_, segundos) in sorted(self._repositorios.items()):
+                    lineas.append(f'repository_call_seconds_total{{pid="{pid}",repository="{repositorio}",'
+                                  f'method="{metodo}"}} {segundos:.6f}')
+        return '\n'.join(lineas) + '\n'
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Métricas del proceso
+registry = MetricsRegistry()
+
+
+class MeteredRepository:
+    """
+    Decorador de repositorios (ver apps.core.container): llamadas y tiempo
+    por método público en /metrics, etiquetados con la clase envuelta
+
+    Los demás atributos se delegan tal cual, así que puede ir en cualquier
+    posición de la pila de decoradores.
+    """
+
+    def __init__(self, repository):
+        self.repository = repository
+        self.nombre = type(repository).__name__
+
+    def __getattr__(self, nombre: str):
+        atributo = getattr(self.repository, nombre)
+        if nombre.startswith('_') or not callable(atributo):
+            return atributo
+
+        @functools.wraps(atributo)
+        def medido(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return atributo(*args, **kwargs)
+            finally:
+                registry.observe_repository(self.nombre, nombre, time.perf_counter() - inicio)
+        return medido
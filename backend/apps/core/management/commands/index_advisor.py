@@ -0,0 +1,93 @@
+"""
+Recomendar índices a partir de las consultas de los tests
+
+Ejecuta los tests indicados registrando los SELECT, obtiene el plan de cada
+consulta con EXPLAIN sobre la base de datos configurada (con sus volúmenes
+reales) y muestra los índices que faltan como models.Index listos para
+Meta.indexes, de más a menos usados.
+
+Uso:
+    python manage.py index_advisor
+    python manage.py index_advisor apps.inventario apps.chatbot --top 5
+    python manage.py index_advisor --no-explain
+"""
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test.utils import get_runner
+from apps.core.index_advisor import QueryRecorder, explain, indices_existentes, recomendar
+
+
+APPS_LOCALES = ['apps.authentication', 'apps.empresas', 'apps.productos', 'apps.inventario', 'apps.chatbot']
+
+
+class Command(BaseCommand):
+    help = 'Recomendar índices según las consultas que ejecutan los tests'
+
+    def add_arguments(self, parser):
+        parser.add_argument('test_labels', nargs='*', help='Tests a ejecutar (por defecto las apps locales)')
+        parser.add_argument('--top', type=int, default=20, help='Máximo de recomendaciones')
+        parser.add_argument('--no-explain', action='store_true',
+                            help='No ejecutar EXPLAIN sobre la base de datos configurada')
+        parser.add_argument('--database', default='default', help='Alias de la base de datos')
+
+    def handle(self, *args, **options):
+        recorder = QueryRecorder()
+        existentes = {}
+        alias = options['database']
+
+        class AdvisorRunner(get_runner(settings)):
+            def teardown_databases(self, old_config, **kwargs):
+                # Índices del esquema migrado, antes de destruir la base de prueba
+                existentes.update(indices_existentes(connections[alias]))
+                super().teardown_databases(old_config, **kwargs)
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            fallidos = AdvisorRunner(verbosity=0, interactive=False).run_tests(
+                options['test_labels'] or APPS_LOCALES
+            )
+        if fallidos:
+            self.stderr.write(self.style.WARNING(f"{fallidos} tests fallaron; se analiza lo registrado"))
+
+        planes = {}
+        if not options['no_explain']:
+            for sql, (params, _) in recorder.consultas.items():
+                planes[sql] = explain(connections[alias], sql, params)
+            if all(plan is None for plan in planes.values()):
+                self.stderr.write(self.style.WARNING('EXPLAIN no disponible (¿base de datos sin migrar?)'))
+
+        recomendaciones = []
+        for recomendacion in recomendar(recorder.consultas, existentes, planes):
+            model, index = recomendacion.to_index()
+            # Solo tablas de las apps del proyecto
+            if model is not None and model.__module__.startswith('apps.'):
+                recomendaciones.append((model, index, recomendacion))
+
+        self.stdout.write(
+            f"{len(recorder.consultas)} consultas distintas, "
+            f"{len(recomendaciones)} índices recomendados"
+        )
+        for posicion, (model, index, recomendacion) in enumerate(recomendaciones[:options['top']], 1):
+            self.stdout.write(self.style.SUCCESS(
+                f"\n{posicion}. {model._meta.label}: {recomendacion.veces} ejecuciones, "
+                f"{len(recomendacion.consultas)} consultas"
+            ))
+            self.stdout.write(f"   {self._codigo(index)}")
+            for plan in dict.fromkeys(recomendacion.planes):
+                self.stdout.write(f"   plan: {plan.splitlines()[0]}")
+            self.stdout.write(f"   {recomendacion.consultas[0][:200]}")
+
+    @staticmethod
+    def _codigo(index) -> str:
+        """Index como código para Meta.indexes"""
+        partes = [f"fields={index.fields!r}"]
+        if index.include:
+            partes.append(f"include={list(index.include)!r}")
+        if index.condition is not None:
+            condicion = ', '.join(f"{campo}={valor!r}" for campo, valor in index.condition.children)
+            partes.append(f"condition=models.Q({condicion})")
+        partes.append(f"name={index.name!r}")
+        return f"models.Index({', '.join(partes)})"
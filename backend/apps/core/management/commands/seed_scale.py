@@ -0,0 +1,378 @@
+"""
+Generar datos sintéticos a escala de producción
+
+Crea empresas con NITs válidos (dígito de verificación de la DIAN),
+productos con códigos por categoría y marca, precios en COP y en parte en
+USD/EUR/MXN, inventario con puntos de reorden y clases ABC pendientes,
+movimientos de stock recientes y sesiones de chat. Todo se inserta con
+bulk_create por lotes (una transacción por lote).
+
+Los datos pertenecen a usuarios @seed.nexus.test (el primero administrador,
+todos con la contraseña --password), así --clear los elimina sin tocar el
+resto de la base y las pruebas de carga pueden iniciar sesión con ellos.
+--clear borra tabla por tabla, de las hijas a Empresa, por lotes de
+--batch-size filas y sin los receptores de post_delete: así cada lote es un
+DELETE y no se cargan millones de filas para la cascada en Python.
+
+Uso:
+    python manage.py seed_scale --empresas 1000 --productos 100000 --inventario 200000
+    python manage.py seed_scale --empresas 10000 --productos 1000000 --inventario 1000000 --chats 5000
+    python manage.py seed_scale --clear
+"""
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete
+from django.utils import timezone
+from nexus_domain.entities import Inventario as InventarioEntity
+from apps.chatbot.models import ChatMessage, ChatSession
+from apps.empresas.orm_models import Empresa
+from apps.empresas.repositories import empresa_cache, empresa_modificada
+from apps.inventario.orm_models import Inventario, MovimientoInventario
+from apps.productos.autocomplete import autocomplete, producto_eliminado
+from apps.productos.orm_models import PrecioMoneda, PrecioPivot, Producto, TasaCambio
+from apps.productos.repositories import producto_cache, producto_modificado
+
+
+SEED_DOMAIN = 'seed.nexus.test'
+SEED_PASSWORD = 'Seed-scale-123'
+
+# Receptores de post_delete que desactivan el borrado rápido de Django; solo
+# mantienen cachés del proceso, que --clear descarta al terminar
+RECEPTORES_POST_DELETE = (
+    (empresa_modificada, Empresa),
+    (producto_eliminado, Producto),
+    (producto_modificado, Producto),
+)
+
+# Valor en COP de una unidad de cada moneda
+TASAS = {'USD': Decimal('3950'), 'EUR': Decimal('4300'), 'MXN': Decimal('230')}
+# Probabilidad de que un producto tenga precio propio en la moneda
+PROBABILIDAD_MONEDA = {'USD': 0.7, 'EUR': 0.3, 'MXN': 0.15}
+
+CATEGORIAS = {
+    'LAP': ('Laptop', 1_800_000, 9_000_000),
+    'MOU': ('Mouse', 25_000, 450_000),
+    'TEC': ('Teclado', 40_000, 900_000),
+    'MON': ('Monitor', 450_000, 4_500_000),
+    'CAB': ('Cable', 8_000, 120_000),
+    'AUD': ('Audífonos', 35_000, 1_600_000),
+    'IMP': ('Impresora', 350_000, 3_200_000),
+    'CAM': ('Cámara', 250_000, 7_000_000),
+    'ROU': ('Router', 90_000, 1_200_000),
+    'TAB': ('Tableta', 600_000, 5_500_000),
+    'DIS': ('Disco', 150_000, 1_800_000),
+    'MEM': ('Memoria', 30_000, 700_000),
+}
+MARCAS = ['Lenovo', 'Logitech', 'Samsung', 'Dell', 'HP', 'Asus', 'Acer', 'Sony',
+          'Xiaomi', 'Kingston', 'Epson', 'Canon', 'Redragon', 'Genius']
+ATRIBUTOS = ['inalámbrico', 'gamer', 'ergonómico', 'compacto', 'profesional', 'USB-C',
+             'HDMI', 'bluetooth', 'portátil', 'mecánico', 'curvo', 'externo']
+COLORES = ['negro', 'blanco', 'gris', 'plata', 'azul', 'rojo']
+
+RAZONES = ['Distribuciones', 'Comercializadora', 'Tecnología', 'Suministros', 'Importaciones',
+           'Soluciones', 'Almacenes', 'Inversiones', 'Servicios', 'Grupo']
+NOMBRES = ['Andina', 'del Caribe', 'Pacífico', 'Cafetera', 'del Valle', 'Santander', 'Antioquia',
+           'Llanos', 'Orinoquía', 'Boyacá', 'Bolívar', 'Cundinamarca', 'Nariño', 'Magdalena']
+SOCIEDADES = ['S.A.S.', 'S.A.', 'Ltda.', 'y Cía. S.C.A.']
+CIUDADES = ['Bogotá', 'Medellín', 'Cali', 'Barranquilla', 'Cartagena', 'Bucaramanga', 'Pereira',
+            'Manizales', 'Cúcuta', 'Ibagué', 'Santa Marta', 'Villavicencio']
+VIAS = ['Calle', 'Carrera', 'Avenida', 'Diagonal', 'Transversal']
+
+PREGUNTAS = [
+    '¿Qué productos tienen stock bajo?',
+    '¿Cuánto inventario tiene la empresa {nit}?',
+    'Muéstrame el pronóstico de demanda de {nit}',
+    'Busca laptops Lenovo',
+    '¿Cuáles son los productos clase A?',
+]
+
+# Pesos de la DIAN para el dígito de verificación (desde el último dígito)
+PESOS_DV = (3, 7, 13, 17, 19, 23, 29, 37, 41, 43, 47, 53, 59, 67, 71)
+
+
+def digito_verificacion(numero: str) -> int:
+    """Dígito de verificación de un NIT (módulo 11 de la DIAN)"""
+    residuo = sum(int(d) * peso for d, peso in zip(reversed(numero), PESOS_DV)) % 11
+    return residuo if residuo < 2 else 11 - residuo
+
+
+def generar_nit(i: int) -> str:
+    """NIT de persona jurídica con dígito de verificación, p. ej. 900001234-7"""
+    numero = f"{900_000_000 + i * 7919 % 99_999_989:09d}"
+    return f"{numero}-{digito_verificacion(numero)}"
+
+
+class Command(BaseCommand):
+    help = 'Generar empresas, productos, precios, inventario y chats sintéticos con inserciones masivas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--empresas', type=int, default=100)
+        parser.add_argument('--productos', type=int, default=10_000)
+        parser.add_argument('--inventario', type=int, default=20_000,
+                            help='Registros empresa + producto (hasta empresas × productos)')
+        parser.add_argument('--movimientos', type=int, default=10,
+                            help='Salidas de stock de los últimos 90 días por registro de inventario')
+        parser.add_argument('--chats', type=int, default=100, help='Sesiones de chat')
+        parser.add_argument('--usuarios', type=int, default=10, help='Usuarios dueños de los datos')
+        parser.add_argument('--password', default=SEED_PASSWORD, help='Contraseña de los usuarios')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Filas por INSERT/transacción')
+        parser.add_argument('--seed', type=int, default=42, help='Semilla aleatoria')
+        parser.add_argument('--clear', action='store_true', help='Eliminar los datos generados y salir')
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        if options['clear']:
+            self._clear()
+            return
+
+        empresas, productos, inventario = options['empresas'], options['productos'], options['inventario']
+        if min(empresas, productos, options['usuarios']) < 1:
+            raise CommandError('Se necesita al menos una empresa, un producto y un usuario')
+        if inventario > empresas * productos:
+            raise CommandError(f'--inventario no puede superar empresas × productos ({empresas * productos})')
+        if Empresa.objects.filter(created_by__email__endswith=f'@{SEED_DOMAIN}').exists():
+            raise CommandError('Ya hay datos generados; elimínelos antes con --clear')
+
+        self.rng = random.Random(options['seed'])
+        inicio = time.perf_counter()
+
+        usuarios = self._usuarios(options['usuarios'], options['password'])
+        self._tasas()
+        puntos_empresa = self._empresas(empresas, usuarios[0])
+        puntos_producto = self._productos(productos, empresas, usuarios[0])
+        self._inventario(inventario, empresas, productos, puntos_empresa, puntos_producto)
+        if options['movimientos']:
+            self._movimientos(options['movimientos'])
+        if options['chats']:
+            self._chats(options['chats'], usuarios, empresas)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Datos generados en {time.perf_counter() - inicio:.1f}s. "
+            f"Administrador: {usuarios[0].email} / {options['password']}"
+        ))
+
+    # --- Limpieza ---
+
+    def _clear(self):
+        User = get_user_model()
+        usuarios = User.objects.filter(email__endswith=f'@{SEED_DOMAIN}')
+        empresas = Empresa.objects.filter(created_by__in=usuarios)
+        productos = Producto.objects.filter(empresa__in=empresas)
+        inventario = Inventario.objects.filter(Q(empresa__in=empresas) | Q(producto__in=productos))
+        sesiones = ChatSession.objects.filter(user__in=usuarios)
+        # Hijas antes que padres: al borrar un lote ya no queda nada en cascada
+        tablas = [
+            ChatMessage.objects.filter(session__in=sesiones),
+            sesiones,
+            MovimientoInventario.objects.filter(inventario__in=inventario),
+            inventario,
+            PrecioMoneda.objects.filter(producto__in=productos),
+            PrecioPivot.objects.filter(producto__in=productos),
+            productos,
+            empresas,
+        ]
+
+        for receptor, sender in RECEPTORES_POST_DELETE:
+            post_delete.disconnect(receptor, sender=sender)
+        try:
+            eliminados = sum(self._borrar(queryset) for queryset in tablas)
+        finally:
+            for receptor, sender in RECEPTORES_POST_DELETE:
+                post_delete.connect(receptor, sender=sender)
+            empresa_cache.invalidate()
+            producto_cache.invalidate()
+            autocomplete.invalidate()
+
+        eliminados += usuarios.delete()[0]
+        self.stdout.write(self.style.SUCCESS(f"Eliminados {eliminados} registros generados"))
+
+    def _borrar(self, queryset) -> int:
+        """Eliminar las filas del queryset por lotes de batch_size (una transacción por lote)"""
+        nombre = queryset.model._meta.verbose_name_plural
+        eliminados = 0
+        while True:
+            ids = list(queryset.order_by().values_list('pk', flat=True)[:self.batch_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                borrados, _ = queryset.model.objects.filter(pk__in=ids).delete()
+            eliminados += borrados
+            self.stdout.write(f"\r{nombre}: {eliminados}", ending='')
+            self.stdout.flush()
+        if eliminados:
+            self.stdout.write('')
+        return eliminados
+
+    # --- Generación ---
+
+    def _lotes(self, total: int):
+        """Rangos [inicio, fin) de batch_size"""
+        for inicio in range(0, total, self.batch_size):
+            yield inicio, min(inicio + self.batch_size, total)
+
+    def _progreso(self, nombre: str, hechos: int, total: int):
+        self.stdout.write(f"\r{nombre}: {hechos}/{total}", ending='' if hechos < total else '\n')
+        self.stdout.flush()
+
+    def _usuarios(self, cantidad: int, password: str):
+        User = get_user_model()
+        # Un solo hash para todos: el costo del hasher es por contraseña
+        hashed = make_password(password)
+        usuarios = [
+            User(username=f'seed-{i}@{SEED_DOMAIN}', email=f'seed-{i}@{SEED_DOMAIN}',
+                 first_name='Seed', last_name=str(i), password=hashed,
+                 role=User.Role.ADMIN if i == 0 else User.Role.EXTERNO)
+            for i in range(cantidad)
+        ]
+        User.objects.bulk_create(usuarios)
+        return list(User.objects.filter(email__endswith=f'@{SEED_DOMAIN}').order_by('pk'))
+
+    def _tasas(self):
+        for moneda, tasa in TASAS.items():
+            if not TasaCambio.objects.filter(moneda=moneda).exists():
+                TasaCambio.objects.create(moneda=moneda, tasa=tasa)
+
+    def _empresas(self, total: int, admin):
+        """Crear empresas; retorna su punto de reorden (o None) por índice"""
+        rng = self.rng
+        puntos = [rng.choice((None, None, None, 5, 15, 20)) for _ in range(total)]
+        for inicio, fin in self._lotes(total):
+            with transaction.atomic():
+                Empresa.objects.bulk_create(
+                    Empresa(
+                        nit=generar_nit(i),
+                        nombre=f"{rng.choice(RAZONES)} {rng.choice(NOMBRES)} {i} {rng.choice(SOCIEDADES)}",
+                        direccion=f"{rng.choice(VIAS)} {rng.randint(1, 200)} #{rng.randint(1, 120)}-"
+                                  f"{rng.randint(1, 99)}, {rng.choice(CIUDADES)}",
+                        telefono=f"60{rng.randint(1, 8)}{rng.randint(1_000_000, 9_999_999)}",
+                        created_by=admin,
+                        punto_reorden=puntos[i],
+                        clasificacion_abc_vigente=False,
+                    )
+                    for i in range(inicio, fin)
+                )
+            self._progreso('Empresas', fin, total)
+        return puntos
+
+    def _codigo(self, i: int) -> str:
+        return f"{list(CATEGORIAS)[i % len(CATEGORIAS)]}-{MARCAS[i // len(CATEGORIAS) % len(MARCAS)][:3].upper()}-{i:07d}"
+
+    def _productos(self, total: int, empresas: int, admin):
+        """Crear productos con precios por moneda; retorna su punto de reorden por índice"""
+        rng = self.rng
+        categorias = list(CATEGORIAS.items())
+        puntos = [rng.choice((None, None, 3, 8, 25)) for _ in range(total)]
+        for inicio, fin in self._lotes(total):
+            productos, precios, pivotes = [], [], []
+            for i in range(inicio, fin):
+                prefijo, (tipo, minimo, maximo) = categorias[i % len(categorias)]
+                marca = MARCAS[i // len(categorias) % len(MARCAS)]
+                codigo = self._codigo(i)
+                productos.append(Producto(
+                    codigo=codigo,
+                    nombre=f"{tipo} {marca} {rng.choice(ATRIBUTOS)} {rng.randint(1, 999)}",
+                    caracteristicas={'color': rng.choice(COLORES), 'garantia_meses': rng.choice((6, 12, 24)),
+                                     'peso_kg': round(rng.uniform(0.05, 4), 2)},
+                    # Productos repartidos por igual entre las empresas
+                    empresa_id=generar_nit(i % empresas),
+                    created_by=admin,
+                    punto_reorden=puntos[i],
+                ))
+                cop = Decimal(rng.randrange(minimo, maximo, 100))
+                fila = {'COP': cop}
+                for moneda, probabilidad in PROBABILIDAD_MONEDA.items():
+                    if rng.random() < probabilidad:
+                        # Precio propio cercano a la conversión
+                        fila[moneda] = (cop / TASAS[moneda] * Decimal(rng.uniform(0.95, 1.1))).quantize(Decimal('0.01'))
+                precios.extend(PrecioMoneda(producto_id=codigo, moneda=m, precio=p) for m, p in fila.items())
+                pivotes.append(PrecioPivot(producto_id=codigo, **{
+                    f'precio_{m.lower()}': p for m, p in fila.items()
+                }))
+            with transaction.atomic():
+                Producto.objects.bulk_create(productos)
+                PrecioMoneda.objects.bulk_create(precios)
+                PrecioPivot.objects.bulk_create(pivotes)
+            self._progreso('Productos', fin, total)
+        return puntos
+
+    def _inventario(self, total: int, empresas: int, productos: int, puntos_empresa, puntos_producto):
+        """
+        Registro k: producto k % productos en la empresa (dueña + k // productos)
+
+        Cada producto aparece primero en su empresa y luego en las siguientes,
+        así las parejas empresa + producto no se repiten.
+        """
+        rng = self.rng
+        for inicio, fin in self._lotes(total):
+            registros = []
+            for k in range(inicio, fin):
+                producto = k % productos
+                empresa = (producto % empresas + k // productos) % empresas
+                punto = InventarioEntity.resolve_punto_reorden(puntos_producto[producto], puntos_empresa[empresa])
+                # ~10% agotado o bajo el punto de reorden
+                cantidad = rng.randint(0, punto - 1) if rng.random() < 0.1 else rng.randint(punto, punto * 20)
+                registros.append(Inventario(empresa_id=generar_nit(empresa), producto_id=self._codigo(producto),
+                                            cantidad=cantidad, punto_reorden=punto))
+            with transaction.atomic():
+                Inventario.objects.bulk_create(registros)
+            self._progreso('Inventario', fin, total)
+
+    def _movimientos(self, por_registro: int):
+        """Salidas de stock de los últimos 90 días (consumo para los pronósticos)"""
+        rng = self.rng
+        ahora = timezone.now()
+        ids = list(Inventario.objects.filter(
+            empresa__created_by__email__endswith=f'@{SEED_DOMAIN}'
+        ).values_list('pk', 'cantidad'))
+        total = len(ids) * por_registro
+        hechos = 0
+        for inicio, fin in self._lotes(len(ids)):
+            movimientos, dias = [], []
+            for pk, cantidad in ids[inicio:fin]:
+                for _ in range(por_registro):
+                    salida = rng.randint(1, 5)
+                    movimientos.append(MovimientoInventario(
+                        inventario_id=pk, cantidad_anterior=cantidad + salida,
+                        cantidad_nueva=cantidad, delta=-salida
+                    ))
+                    dias.append(rng.randrange(90))
+            with transaction.atomic():
+                creados = MovimientoInventario.objects.bulk_create(movimientos, batch_size=self.batch_size)
+                # fecha es auto_now_add: se fija después con un UPDATE por día
+                por_dia = {}
+                for movimiento, dia in zip(creados, dias):
+                    por_dia.setdefault(dia, []).append(movimiento.pk)
+                for dia, pks in por_dia.items():
+                    for desde in range(0, len(pks), self.batch_size):
+                        MovimientoInventario.objects.filter(
+                            pk__in=pks[desde:desde + self.batch_size]
+                        ).update(fecha=ahora - timedelta(days=dia))
+            hechos += len(movimientos)
+            self._progreso('Movimientos', hechos, total)
+
+    def _chats(self, total: int, usuarios, empresas: int):
+        """Sesiones de chat con algunas preguntas y respuestas"""
+        rng = self.rng
+        for inicio, fin in self._lotes(total):
+            with transaction.atomic():
+                # Solo la última sesión de cada usuario queda activa
+                sesiones = ChatSession.objects.bulk_create(
+                    ChatSession(user=usuarios[i % len(usuarios)], is_active=i >= total - len(usuarios))
+                    for i in range(inicio, fin)
+                )
+                mensajes = []
+                for sesion in sesiones:
+                    for _ in range(rng.randint(1, 4)):
+                        pregunta = rng.choice(PREGUNTAS).format(nit=generar_nit(rng.randrange(empresas)))
+                        mensajes.append(ChatMessage(session=sesion, role='user', content=pregunta))
+                        mensajes.append(ChatMessage(session=sesion, role='model',
+                                                    content=f'Consulté el inventario: {rng.randint(1, 50)} resultados.'))
+                ChatMessage.objects.bulk_create(mensajes)
+            self._progreso('Chats', fin, total)
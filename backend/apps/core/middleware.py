@@ -0,0 +1,191 @@
+"""
+Middleware de métricas por petición, profiler bajo demanda y alcance de
+dependencias
+
+RequestMetricsMiddleware (primero en MIDDLEWARE) mide cada petición con
+apps.core.instrumentation, agrega la cabecera Server-Timing y alimenta
+/metrics. Funciona con WSGI y ASGI sin cambiar de hilo.
+
+Profiler: un administrador envía la cabecera X-Profile (cprofile o
+pyinstrument) y recibe el reporte del perfil en lugar de la respuesta
+(la original queda en X-Profiled-Status). pyinstrument es opcional y
+muestrea la pila; sin él se usa cProfile. Bajo ASGI el perfil incluye lo
+que el event loop ejecute de otras peticiones mientras tanto.
+
+DependencyScopeMiddleware abre el alcance request del contenedor de
+dependencias (apps.core.container) durante cada petición.
+"""
+import cProfile
+import io
+import pstats
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from .container import request_scope
+from .instrumentation import collect, install_db_instrumentation, registry
+
+try:
+    from pyinstrument import Profiler as Pyinstrument
+except ImportError:  # dependencia opcional
+    Pyinstrument = None
+
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+# Líneas del reporte de cProfile
+PROFILE_TOP = 60
+
+
+class RequestMetricsMiddleware:
+    """Server-Timing, métricas Prometheus y profiler por cabecera"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.INSTRUMENTATION_ENABLED:
+            return self.get_response(request)
+
+        self._instalar_db()
+        profiler = self._profiler(request)
+        with collect() as metrics:
+            if profiler is None:
+                response = self.get_response(request)
+            else:
+                profiler.start()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    profiler.stop()
+        return self._terminar(request, response, metrics, profiler)
+
+    async def __acall__(self, request):
+        if not settings.INSTRUMENTATION_ENABLED:
+            return await self.get_response(request)
+
+        self._instalar_db()
+        # Autenticar al administrador puede consultar la base de datos
+        profiler = await sync_to_async(self._profiler)(request) if PROFILE_HEADER in request.META else None
+        with collect() as metrics:
+            if profiler is None:
+                response = await self.get_response(request)
+            else:
+                profiler.start()
+                try:
+                    response = await self.get_response(request)
+                finally:
+                    profiler.stop()
+        return self._terminar(request, response, metrics, profiler)
+
+    @staticmethod
+    def _instalar_db():
+        # Conexiones abiertas antes de cargar la app (connection_created no las vio)
+        for alias in settings.DATABASES:
+            install_db_instrumentation(connections[alias])
+
+    def _terminar(self, request, response, metrics, profiler):
+        total = metrics.total
+        if settings.SERVER_TIMING_ENABLED:
+            response['Server-Timing'] = metrics.server_timing(total)
+
+        match = request.resolver_match
+        route = match.route if match is not None else 'unmatched'
+        if route != 'metrics':
+            registry.observe(request.method, route, response.status_code, metrics, total)
+
+        if profiler is not None:
+            reporte = profiler.reporte()
+            reporte['X-Profiled-Status'] = str(response.status_code)
+            reporte['Server-Timing'] = response.get('Server-Timing', '')
+            return reporte
+        return response
+
+    def _profiler(self, request):
+        """Profiler pedido con X-Profile, solo para administradores"""
+        tipo = request.META.get(PROFILE_HEADER, '').lower()
+        if not tipo or not settings.PROFILER_ENABLED or not self._es_admin(request):
+            return None
+        if tipo == 'pyinstrument' and Pyinstrument is not None:
+            return _PyinstrumentProfiler(async_mode=self.async_mode)
+        return _CProfileProfiler()
+
+    @staticmethod
+    def _es_admin(request) -> bool:
+        """Administrador autenticado con las clases de DRF (JWT)"""
+        drf_request = Request(request, authenticators=[
+            authentication_class() for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+        ])
+        try:
+            user = drf_request.user
+        except APIException:
+            return False
+        return user.is_authenticated and (getattr(user, 'is_admin', False) or user.is_superuser)
+
+
+class DependencyScopeMiddleware:
+    """Una instancia por petición de las dependencias con alcance request"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with request_scope():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        # El contextvar viaja a sync_to_async: las vistas sync ven el mismo alcance
+        with request_scope():
+            return await self.get_response(request)
+
+
+class _CProfileProfiler:
+    """cProfile: funciones ordenadas por tiempo acumulado (texto)"""
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+
+    def reporte(self) -> HttpResponse:
+        salida = io.StringIO()
+        pstats.Stats(self._profile, stream=salida).sort_stats('cumulative').print_stats(PROFILE_TOP)
+        return HttpResponse(salida.getvalue(), content_type='text/plain; charset=utf-8')
+
+
+class _PyinstrumentProfiler:
+    """pyinstrument: muestreo de la pila (HTML)"""
+
+    def __init__(self, async_mode: bool):
+        self._profiler = Pyinstrument(async_mode='enabled' if async_mode else 'disabled')
+
+    def start(self):
+        self._profiler.start()
+
+    def stop(self):
+        self._profiler.stop()
+
+    def reporte(self) -> HttpResponse:
+        return HttpResponse(self._profiler.output_html(), content_type='text/html; charset=utf-8')
@@ -0,0 +1,26 @@
+"""
+Operaciones de migración para tablas grandes
+
+CREATE INDEX normal bloquea las escrituras de la tabla mientras se construye
+el índice. En PostgreSQL AddIndexConcurrently usa CREATE INDEX CONCURRENTLY
+(requiere atomic = False en la migración); en otros motores (SQLite en los
+tests) se crea el índice con AddIndex normal.
+"""
+from django.contrib.postgres import operations as postgres_operations
+from django.db import migrations
+
+
+class AddIndexConcurrently(postgres_operations.AddIndexConcurrently):
+    """AddIndex sin bloquear escrituras en PostgreSQL"""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            migrations.AddIndex.database_forwards(self, app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            migrations.AddIndex.database_backwards(self, app_label, schema_editor, from_state, to_state)
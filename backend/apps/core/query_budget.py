@@ -0,0 +1,71 @@
+"""
+Presupuestos de consultas SQL por acción de ViewSet
+
+Cada acción declara el máximo de consultas que puede ejecutar:
+
+    class EmpresaViewSet(viewsets.ModelViewSet):
+        @query_budget(2)
+        def list(self, request, *args, **kwargs):
+            ...
+
+Los tests usan QueryBudgetTestMixin para ejecutar la petición y fallar si se
+excede el presupuesto (por ejemplo, al introducir un N+1).
+"""
+from typing import Callable, Iterable, Optional
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+QUERY_BUDGET_ATTR = 'query_budget'
+
+
+def query_budget(max_queries: int) -> Callable:
+    """Declarar el máximo de consultas SQL de una acción"""
+    if max_queries < 0:
+        raise ValueError("El presupuesto de consultas no puede ser negativo")
+    
+    def decorator(func: Callable) -> Callable:
+        setattr(func, QUERY_BUDGET_ATTR, max_queries)
+        return func
+    
+    return decorator
+
+
+def get_query_budget(viewset: type, action: str) -> Optional[int]:
+    """Presupuesto declarado para una acción (None si no tiene)"""
+    return getattr(getattr(viewset, action, None), QUERY_BUDGET_ATTR, None)
+
+
+class QueryBudgetTestMixin:
+    """
+    Mixin para TestCase con aserciones de presupuesto de consultas
+    
+    El presupuesto no depende del número de filas: los tests deben crear
+    varios registros para que un N+1 lo exceda.
+    """
+    
+    def assertQueryBudget(self, viewset: type, action: str, request: Callable):
+        """Ejecutar request() y fallar si supera el presupuesto de la acción"""
+        budget = get_query_budget(viewset, action)
+        if budget is None:
+            self.fail(f"{viewset.__name__}.{action} no declara @query_budget")
+        
+        with CaptureQueriesContext(connection) as context:
+            response = request()
+        
+        if len(context) > budget:
+            queries = '\n'.join(
+                f"  {i}. {query['sql']}" for i, query in enumerate(context.captured_queries, 1)
+            )
+            self.fail(
+                f"{viewset.__name__}.{action} ejecutó {len(context)} consultas "
+                f"(presupuesto: {budget}):\n{queries}"
+            )
+        return response
+    
+    def assertBudgetsDeclared(self, viewset: type,
+                              actions: Iterable[str] = ('list', 'retrieve')):
+        """Verificar que las acciones indicadas declaren presupuesto"""
+        missing = [action for action in actions if get_query_budget(viewset, action) is None]
+        if missing:
+            self.fail(f"{viewset.__name__} sin @query_budget en: {', '.join(missing)}")
@@ -0,0 +1,40 @@
+"""
+Renderers compartidos
+"""
+import re
+import uuid
+from rest_framework.renderers import JSONRenderer
+from nexus_domain.value_objects import RawJSON
+
+
+class RawJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer que copia los valores RawJSON tal cual en la respuesta
+    
+    Cada RawJSON se codifica primero como un marcador de texto único y luego
+    se reemplaza por su JSON original, sin decodificarlo ni re-codificarlo.
+    """
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        nonce = uuid.uuid4().hex
+        raws = []
+        base_encoder = self.encoder_class
+        
+        class Encoder(base_encoder):
+            def default(self, obj):
+                if isinstance(obj, RawJSON):
+                    raws.append(obj.raw.encode('utf-8'))
+                    return f'__rawjson_{nonce}_{len(raws) - 1}__'
+                return super().default(obj)
+        
+        self.encoder_class = Encoder
+        try:
+            content = super().render(data, accepted_media_type, renderer_context)
+        finally:
+            self.encoder_class = base_encoder
+        
+        if not raws:
+            return content
+        
+        pattern = re.compile(rb'"__rawjson_' + nonce.encode() + rb'_(\d+)__"')
+        return pattern.sub(lambda match: raws[int(match.group(1))], content)
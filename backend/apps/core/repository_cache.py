@@ -0,0 +1,109 @@
+"""
+Caché por proceso de entidades leídas por los repositorios
+
+Empresas y productos cambian poco y se leen en cada petición (retrieve,
+exists al crear inventario...). EntityCache guarda por llave la entidad
+leída, o su ausencia, durante REPOSITORY_CACHE_SECONDS (las ausencias
+REPOSITORY_CACHE_MISS_SECONDS), con a lo sumo REPOSITORY_CACHE_SIZE
+entradas (LRU):
+- las escrituras del proceso invalidan la llave al instante y de nuevo al
+  confirmar la transacción (los repositorios con caché y las señales
+  post_save/post_delete de los modelos)
+- las de otros procesos se ven al vencer la entrada
+- dentro de un bloque atómico no se guardan lecturas: podrían ser datos
+  sin confirmar
+Con REPOSITORY_CACHE_SECONDS=0 los repositorios no usan la caché.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+from django.conf import settings
+from django.db import transaction
+
+
+# Entrada de una llave que no existe en la base de datos
+AUSENTE = object()
+
+
+class EntityCache:
+    """LRU de entidades (o AUSENTE) por llave, con vencimiento"""
+
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+        # llave -> (vence (monotonic), entidad o AUSENTE), de la menos a la más usada
+        self._entradas: 'OrderedDict[Hashable, Tuple[float, object]]' = OrderedDict()
+        self._generacion = 0
+        self._lock = threading.Lock()
+
+    def get(self, llave: Hashable) -> Optional[object]:
+        """
+        Copia de la entidad en caché, AUSENTE, o None si no está o venció
+        """
+        with self._lock:
+            entrada = self._entradas.get(llave)
+            if entrada is None or time.monotonic() >= entrada[0]:
+                if entrada is not None:
+                    del self._entradas[llave]
+                return None
+            self._entradas.move_to_end(llave)
+        valor = entrada[1]
+        # Copia por lectura: los casos de uso modifican la entidad antes de guardarla
+        return valor if valor is AUSENTE else copy.copy(valor)
+
+    def generacion(self) -> int:
+        """Marca para set(): descarta cargas que se cruzaron con una invalidación"""
+        return self._generacion
+
+    def set(self, llave: Hashable, valor: Optional[object], generacion: int) -> None:
+        """Guardar la entidad recién leída (None: la llave no existe)"""
+        ttl = settings.REPOSITORY_CACHE_SECONDS if valor is not None else settings.REPOSITORY_CACHE_MISS_SECONDS
+        if ttl <= 0 or transaction.get_connection().in_atomic_block:
+            return
+        valor = copy.copy(valor) if valor is not None else AUSENTE
+        with self._lock:
+            if generacion != self._generacion:
+                return
+            self._entradas[llave] = (time.monotonic() + ttl, valor)
+            self._entradas.move_to_end(llave)
+            while len(self._entradas) > settings.REPOSITORY_CACHE_SIZE:
+                self._entradas.popitem(last=False)
+
+    def get_or_load(self, llave: Hashable, cargar: Callable[[Hashable], Optional[object]]
+                    ) -> Tuple[Optional[object], bool]:
+        """
+        (entidad o None, si vino de la caché); en un fallo la lee con
+        cargar(llave) y la guarda
+        """
+        valor = self.get(llave)
+        if valor is not None:
+            return (None if valor is AUSENTE else valor), True
+        generacion = self.generacion()
+        entidad = cargar(llave)
+        self.set(llave, entidad, generacion)
+        return entidad, False
+
+    def invalidate(self, llave: Optional[Hashable] = None) -> None:
+        """Descartar una llave, o todas si no se indica"""
+        with self._lock:
+            self._generacion += 1
+            if llave is None:
+                self._entradas.clear()
+            else:
+                self._entradas.pop(llave, None)
+
+    def invalidate_on_commit(self, *llaves: Hashable) -> None:
+        """Descartar las llaves (todas si no se indican) ahora y otra vez al confirmar"""
+        def descartar():
+            if not llaves:
+                self.invalidate()
+            for llave in llaves:
+                self.invalidate(llave)
+        
+        descartar()
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(descartar)
+
+    def __len__(self) -> int:
+        return len(self._entradas)
@@ -0,0 +1,91 @@
+"""
+Búsqueda de texto ordenada por relevancia para los repositorios
+
+- PostgreSQL: columna search_vector (tsvector con stemming en español que
+  mantiene un trigger en cada escritura) combinada con similitud de trigramas
+  (pg_trgm) para tolerar errores de escritura; ambas con índice GIN.
+- Otros motores (SQLite en tests): TrigramIndex del dominio en memoria, que
+  se pone al día en la misma consulta que trae los resultados.
+"""
+import threading
+from datetime import datetime, timezone as dt_timezone
+from typing import List, Tuple
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramWordSimilarity
+)
+from django.db import connections
+from django.db.models import F, Model, Q, QuerySet
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from nexus_domain.search import TrigramIndex
+
+
+class TextSearch:
+    """
+    Búsqueda por los campos de texto de un modelo
+
+    campos son las columnas que alimentan search_vector (ver la migración
+    del modelo); el modelo debe tener updated_at para el índice en memoria.
+    El queryset recibido no debe estar filtrado: el índice en memoria toma
+    las claves ausentes como eliminadas.
+    """
+
+    def __init__(self, campos: Tuple[str, ...], config: str = 'spanish'):
+        self.campos = campos
+        self.config = config
+        self._index = TrigramIndex()
+        self._actualizado = datetime.min.replace(tzinfo=dt_timezone.utc)
+        self._lock = threading.Lock()
+
+    def search(self, queryset: QuerySet, texto: str, limit: int = 100,
+               offset: int = 0) -> List[Model]:
+        """Registros del queryset que coinciden con el texto, de más a menos relevante"""
+        if connections[queryset.db].vendor == 'postgresql':
+            return list(self._search_postgres(queryset, texto)[offset:offset + limit])
+        return self._search_memoria(queryset, texto, limit, offset)
+
+    def _search_postgres(self, queryset: QuerySet, texto: str) -> QuerySet:
+        """Texto completo (websearch) o similitud de trigramas por palabra"""
+        consulta = SearchQuery(texto, config=self.config, search_type='websearch')
+        similitud = Greatest(*(TrigramWordSimilarity(texto, campo) for campo in self.campos))
+
+        coincide = Q(search_vector=consulta)
+        for campo in self.campos:
+            # %> usa el índice GIN gin_trgm_ops del campo
+            coincide |= Q(**{f'{campo}__trigram_word_similar': texto})
+
+        return queryset.annotate(
+            relevancia=SearchRank(F('search_vector'), consulta) + similitud
+        ).filter(coincide).order_by('-relevancia', 'pk')
+
+    def _search_memoria(self, queryset: QuerySet, texto: str, limit: int,
+                        offset: int) -> List[Model]:
+        """
+        Búsqueda con el índice en memoria
+
+        Una sola consulta trae los candidatos del índice y las filas
+        modificadas desde la última búsqueda; con ellas se reindexa y se
+        descartan las claves eliminadas antes de ordenar.
+        """
+        with self._lock:
+            inicio = timezone.now()
+            candidatos = [clave for clave, _ in self._index.search(texto)]
+            rows = {
+                row.pk: row for row in queryset.filter(
+                    Q(pk__in=candidatos) | Q(updated_at__gte=self._actualizado)
+                )
+            }
+
+            for row in rows.values():
+                if row.updated_at >= self._actualizado:
+                    self._index.add(row.pk, *(getattr(row, campo) for campo in self.campos))
+            for clave in candidatos:
+                if clave not in rows:
+                    self._index.remove(clave)
+            self._actualizado = inicio
+
+            resultados = self._index.search(texto, limit=offset + limit)
+
+        return [rows[clave] for clave, _ in resultados[offset:] if clave in rows]
@@ -0,0 +1,440 @@
+"""
+Tests para las utilidades compartidas
+"""
+import os
+from io import StringIO
+from unittest import mock
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Count, Q, Sum
+from django.db.models.signals import post_delete
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from nexus_domain.interfaces import IEmpresaRepository, IInventarioRepository, IProductoRepository
+from nexus_domain.entities import Empresa as EmpresaEntity, Producto as ProductoEntity
+from nexus_domain.repositories import InMemoryEmpresaRepository, InMemoryInventarioRepository, InMemoryProductoRepository
+from nexus_domain.use_cases import CreateOrUpdateInventarioUseCase
+from nexus_domain.value_objects import NIT, Phone, ProductCode
+from config.database import connection_settings
+from apps.authentication.tokens import UserRefreshToken
+from apps.chatbot.models import ChatMessage, ChatSession
+from apps.empresas.models import Empresa
+from apps.empresas.repositories import CachingEmpresaRepository, DjangoEmpresaRepository
+from apps.inventario.models import Inventario, MovimientoInventario
+from apps.productos.models import PrecioMoneda, Producto
+from apps.productos.repositories import CachingProductoRepository
+from .container import Container, Registration, container, request_scope
+from .cursors import iterate, server_side_cursors
+from .index_advisor import QueryRecorder, analizar, indices_existentes, recomendar
+from .instrumentation import MeteredRepository, collect, instrument, registry
+from .management.commands.seed_scale import SEED_DOMAIN, digito_verificacion, generar_nit
+from .repository_cache import EntityCache
+
+User = get_user_model()
+
+
+class IndexAdvisorTest(TestCase):
+    """Tests para el asesor de índices"""
+    
+    def _registrar(self, *querysets):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            for queryset in querysets:
+                list(queryset)
+        return recorder.consultas
+    
+    def _indices(self, consultas, existentes=None):
+        return {
+            (r.tabla, tuple(r.columnas), tuple(r.include), tuple(r.condicion))
+            for r in recomendar(consultas, existentes or {})
+        }
+    
+    def test_records_and_recommends(self):
+        """Test: Igualdad + orden, rango; lo ya indexado no se recomienda"""
+        consultas = self._registrar(
+            ChatMessage.objects.filter(session_id=1),
+            ChatMessage.objects.filter(session_id=2),
+            Inventario.objects.order_by().filter(cantidad__lte=5),
+        )
+        self.assertEqual([veces for _, veces in consultas.values()], [2, 1])
+        
+        indices = self._indices(consultas)
+        self.assertIn(
+            ('chatbot_chatmessage', (('session_id', False), ('created_at', False)), (), ()), indices
+        )
+        self.assertIn(('inventario_inventario', (('cantidad', False),), (), ()), indices)
+        
+        # Los índices de la migración ya cubren ambas consultas
+        self.assertEqual(self._indices(consultas, indices_existentes(connection)), set())
+    
+    def test_partial_and_covering(self):
+        """Test: Booleanas como condición; columnas agregadas como INCLUDE"""
+        activa = ChatSession.objects.filter(user_id=1, is_active=True).order_by('-updated_at')
+        accesos = analizar(str(activa.query))
+        self.assertEqual(accesos['chatbot_chatsession'].booleanas, [('is_active', True)])
+        
+        por_empresa = Inventario.objects.values('empresa__nit').annotate(
+            total_productos=Count('producto'), total_cantidad=Sum('cantidad')
+        ).order_by('-total_cantidad')
+        indices = self._indices({str(activa.query): ((), 1), str(por_empresa.query): ((), 1)})
+        
+        self.assertIn(
+            ('chatbot_chatsession', (('user_id', False), ('updated_at', True)), (), (('is_active', True),)),
+            indices
+        )
+        self.assertIn(
+            ('inventario_inventario', (('empresa_id', False),), ('producto_id', 'cantidad'), ()),
+            indices
+        )
+    
+    def test_or_and_unique_keys(self):
+        """Test: Con OR cada columna por separado; la llave primaria ya sirve"""
+        consulta = Producto.objects.filter(
+            Q(codigo__in=['A', 'B']) | Q(updated_at__gte=timezone.now())
+        ).order_by('nombre')
+        recomendaciones = recomendar({str(consulta.query): ((), 1)}, indices_existentes(connection))
+        
+        self.assertEqual(recomendaciones, [])
+        
+        sin_indices = self._indices({str(consulta.query): ((), 1)}, {
+            'productos_producto': [i for i in indices_existentes(connection)['productos_producto']
+                                   if i.unico]
+        })
+        self.assertEqual(sin_indices, {('productos_producto', (('updated_at', False),), (), ())})
+    
+    def test_to_index(self):
+        """Test: La recomendación se traduce a models.Index con nombres de campo"""
+        consulta = ChatSession.objects.filter(user_id=1, is_active=True).order_by('-updated_at')
+        recomendacion, = recomendar({str(consulta.query): ((), 1)}, {})
+        
+        model, index = recomendacion.to_index()
+        
+        self.assertIs(model, ChatSession)
+        self.assertEqual(index.fields, ['user', '-updated_at'])
+        self.assertEqual(index.condition, Q(is_active=True))
+        self.assertLessEqual(len(index.name), 30)
+
+
+class ConnectionSettingsTest(SimpleTestCase):
+    """Tests para los modos de conexión a la base de datos"""
+    
+    def test_modes(self):
+        """Test: Persistente con verificación; PgBouncer sin cursores del servidor"""
+        self.assertEqual(connection_settings('per_request'), {'CONN_MAX_AGE': 0})
+        self.assertEqual(
+            connection_settings('persistent', max_age=120),
+            {'CONN_MAX_AGE': 120, 'CONN_HEALTH_CHECKS': True}
+        )
+        self.assertTrue(connection_settings('pgbouncer')['DISABLE_SERVER_SIDE_CURSORS'])
+        with self.assertRaises(ImproperlyConfigured):
+            connection_settings('pgpool')
+    
+    def test_asgi(self):
+        """Test: Con workers ASGI no hay conexiones persistentes"""
+        with self.assertRaises(ImproperlyConfigured):
+            connection_settings('persistent', asgi=True)
+        self.assertEqual(connection_settings('pgbouncer', max_age=120, asgi=True)['CONN_MAX_AGE'], 0)
+    
+    def test_pool_requires_django_5_1(self):
+        """Test: El pool de psycopg solo con Django 5.1+ y sin CONN_MAX_AGE"""
+        with mock.patch('django.VERSION', (5, 0, 0, 'final', 0)):
+            with self.assertRaises(ImproperlyConfigured):
+                connection_settings('pool')
+        with mock.patch('django.VERSION', (5, 1, 0, 'final', 0)):
+            pool = connection_settings('pool', pool_max_size=4)
+        self.assertEqual(pool['CONN_MAX_AGE'], 0)
+        self.assertEqual(pool['OPTIONS']['pool']['max_size'], 4)
+
+
+class IterateTest(TestCase):
+    """Tests para el recorrido por lotes"""
+    
+    def setUp(self):
+        empresa = Empresa.objects.create(
+            nit='900123456',
+            nombre='TechCorp',
+            direccion='Calle 123 #45-67',
+            telefono='3001234567'
+        )
+        for i in (3, 1, 5, 2, 4):
+            Producto.objects.create(codigo=f'PROD-00{i}', nombre=f'Producto {i}', empresa=empresa)
+        self.codigos = [f'PROD-00{i}' for i in range(1, 6)]
+    
+    def test_without_server_side_cursors(self):
+        """Test: Con PgBouncer (sin cursores del servidor) se pagina por llave"""
+        with mock.patch.dict(connection.settings_dict, DISABLE_SERVER_SIDE_CURSORS=True):
+            self.assertFalse(server_side_cursors())
+            with self.assertNumQueries(3):
+                filas = list(iterate(Producto.objects.values_list('codigo', 'nombre'), 2))
+            instancias = list(iterate(Producto.objects.all(), 2))
+        
+        self.assertEqual([codigo for codigo, _ in filas], self.codigos)
+        self.assertEqual([p.codigo for p in instancias], self.codigos)
+    
+    def test_with_server_side_cursors(self):
+        """Test: Con cursores por lotes se respeta el orden del queryset"""
+        self.assertTrue(server_side_cursors())
+        filas = list(iterate(Producto.objects.order_by('-codigo').values_list('codigo', flat=True), 2))
+        self.assertEqual(filas, self.codigos[::-1])
+
+
+class InstrumentationTest(TestCase):
+    """Tests para la instrumentación por petición"""
+    
+    def setUp(self):
+        registry.clear()
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(
+            username='admin', email='admin@example.com', password='admin123', role=User.Role.ADMIN
+        )
+        self.externo_user = User.objects.create_user(
+            username='externo', email='externo@example.com', password='externo123', role=User.Role.EXTERNO
+        )
+        Empresa.objects.create(nit='900123456', nombre='TechCorp',
+                               direccion='Calle 123 #45-67', telefono='3001234567')
+    
+    def _token(self, user):
+        return f'Bearer {UserRefreshToken.for_user(user).access_token}'
+    
+    def test_nested_blocks_count_once(self):
+        """Test: en una fase solo cuenta el bloque más externo"""
+        with collect() as metrics:
+            with mock.patch('apps.core.instrumentation.time.perf_counter', side_effect=[0.0, 1.0, 3.0]):
+                with instrument('mapper'):
+                    with instrument('mapper'):
+                        pass
+        self.assertEqual(metrics.tiempos['mapper'], 3.0)
+        # Fuera de una petición no se mide nada
+        with instrument('mapper'):
+            pass
+    
+    @override_settings(SERVER_TIMING_ENABLED=True)
+    def test_server_timing_header(self):
+        """Test: la respuesta incluye los tiempos por fase en Server-Timing"""
+        response = self.client.get('/api/empresas/', HTTP_AUTHORIZATION=self._token(self.externo_user))
+        self.assertEqual(response.status_code, 200)
+        server_timing = response['Server-Timing']
+        self.assertTrue(server_timing.startswith('total;dur='))
+        for fase in ('db;dur=', 'consultas"', 'use_case;dur=', 'mapper;dur=', 'serialization;dur='):
+            self.assertIn(fase, server_timing)
+    
+    @override_settings(SERVER_TIMING_ENABLED=False)
+    def test_server_timing_disabled(self):
+        """Test: sin SERVER_TIMING_ENABLED la respuesta no expone tiempos"""
+        response = self.client.get('/api/empresas/', HTTP_AUTHORIZATION=self._token(self.externo_user))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Server-Timing', response)
+    
+    @override_settings(METRICS_TOKEN='secreto')
+    def test_metrics_endpoint(self):
+        """Test: /metrics expone las peticiones por ruta en formato Prometheus"""
+        self.client.get('/api/empresas/', HTTP_AUTHORIZATION=self._token(self.externo_user))
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secreto')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        contenido = response.content.decode()
+        self.assertIn('method="GET",route="api/empresas/$",status="200"', contenido)
+        self.assertIn('phase="use_case"', contenido)
+        self.assertIn('db_queries_total{', contenido)
+        # /metrics no se cuenta a sí mismo
+        self.assertNotIn('route="metrics"', contenido)
+    
+    @override_settings(METRICS_TOKEN='secreto')
+    def test_metrics_token(self):
+        """Test: con METRICS_TOKEN /metrics exige el token"""
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secreto').status_code, 200)
+    
+    @override_settings(METRICS_TOKEN='')
+    def test_metrics_without_token_denied(self):
+        """Test: sin METRICS_TOKEN /metrics no responde métricas"""
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer ').status_code, 403)
+    
+    @override_settings(PROFILER_ENABLED=True)
+    def test_profiler_admin_only(self):
+        """Test: X-Profile devuelve el perfil solo a administradores"""
+        response = self.client.get('/api/empresas/', HTTP_AUTHORIZATION=self._token(self.admin_user),
+                                   HTTP_X_PROFILE='cprofile')
+        self.assertEqual(response['X-Profiled-Status'], '200')
+        self.assertIn('cumulative', response.content.decode())
+        
+        response = self.client.get('/api/empresas/', HTTP_AUTHORIZATION=self._token(self.externo_user),
+                                   HTTP_X_PROFILE='cprofile')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Profiled-Status', response)
+
+
+class SeedScaleTest(TestCase):
+    """Tests para el generador de datos sintéticos"""
+    
+    def test_seed_and_clear(self):
+        """Test: seed_scale genera los volúmenes pedidos y --clear los elimina"""
+        call_command('seed_scale', empresas=3, productos=20, inventario=50, movimientos=2,
+                     chats=4, usuarios=2, stdout=StringIO())
+        
+        empresas = Empresa.objects.filter(created_by__email__endswith=f'@{SEED_DOMAIN}')
+        self.assertEqual(empresas.count(), 3)
+        self.assertEqual(Producto.objects.filter(empresa__in=empresas).count(), 20)
+        self.assertEqual(Inventario.objects.filter(empresa__in=empresas).count(), 50)
+        self.assertEqual(ChatSession.objects.filter(user__email__endswith=f'@{SEED_DOMAIN}').count(), 4)
+        for nit in empresas.values_list('nit', flat=True):
+            numero, dv = nit.split('-')
+            self.assertEqual(digito_verificacion(numero), int(dv))
+        self.assertEqual(digito_verificacion('800197268'), 4)
+        
+        with self.assertRaises(CommandError):
+            call_command('seed_scale', stdout=StringIO())
+        
+        otra = Empresa.objects.create(nit='800197268-4', nombre='Otra', direccion='Calle 1', telefono='3000000000')
+        
+        call_command('seed_scale', clear=True, batch_size=7, stdout=StringIO())
+        self.assertFalse(Empresa.objects.filter(nit__in=[generar_nit(i) for i in range(3)]).exists())
+        self.assertFalse(User.objects.filter(email__endswith=f'@{SEED_DOMAIN}').exists())
+        self.assertFalse(MovimientoInventario.objects.exists())
+        self.assertFalse(PrecioMoneda.objects.exists())
+        self.assertFalse(ChatMessage.objects.exists())
+        self.assertTrue(Empresa.objects.filter(pk=otra.pk).exists())
+        # Los receptores desconectados durante el borrado vuelven a estar conectados
+        self.assertTrue(post_delete.has_listeners(Producto))
+
+
+@override_settings(REPOSITORY_CACHE_SECONDS=30, REPOSITORY_CACHE_MISS_SECONDS=5, REPOSITORY_CACHE_SIZE=2)
+class RepositoryCacheTest(SimpleTestCase):
+    """Tests para los repositorios con caché (sobre repositorios en memoria)"""
+    
+    def setUp(self):
+        self.empresas = mock.Mock(wraps=InMemoryEmpresaRepository())
+        self.repository = CachingEmpresaRepository(self.empresas, cache=EntityCache('empresas'))
+        self.repository.save(EmpresaEntity(NIT('900111111'), 'Distribuciones Andina', 'Calle 1',
+                                           Phone('3001234567')))
+    
+    def test_read_through_returns_copies(self):
+        """Test: La segunda lectura sale de la caché y es una copia"""
+        empresa = self.repository.find_by_nit('900111111')
+        empresa.nombre = 'Modificada sin guardar'
+        
+        self.assertEqual(self.repository.find_by_nit('900111111').nombre, 'Distribuciones Andina')
+        self.assertTrue(self.repository.exists('900111111'))
+        self.assertEqual(self.empresas.find_by_nit.call_count, 1)
+    
+    def test_negative_cache_and_write_invalidation(self):
+        """Test: exists falso se guarda en caché y save lo invalida"""
+        self.assertFalse(self.repository.exists('900222222'))
+        self.assertFalse(self.repository.exists('900222222'))
+        self.assertEqual(self.empresas.find_by_nit.call_count, 1)
+        
+        self.repository.save(EmpresaEntity(NIT('900222222'), 'Tecnología del Caribe', 'Calle 2',
+                                           Phone('3007654321')))
+        self.assertTrue(self.repository.exists('900222222'))
+        
+        self.assertTrue(self.repository.delete('900222222'))
+        self.assertFalse(self.repository.exists('900222222'))
+        self.assertEqual(self.empresas.find_by_nit.call_count, 3)
+    
+    def test_ttl_and_lru(self):
+        """Test: Las ausencias vencen antes que las entidades y la caché es acotada (LRU)"""
+        productos = mock.Mock(wraps=InMemoryProductoRepository())
+        repository = CachingProductoRepository(productos, cache=EntityCache('productos'))
+        for codigo in ('PROD-001', 'PROD-002', 'PROD-003'):
+            productos.save(ProductoEntity(ProductCode(codigo), f'Producto {codigo}', NIT('900111111')))
+        
+        with mock.patch('apps.core.repository_cache.time.monotonic', return_value=100):
+            repository.find_by_codigo('PROD-001')
+            repository.exists('PROD-999')
+        with mock.patch('apps.core.repository_cache.time.monotonic', return_value=110):
+            repository.find_by_codigo('PROD-001')
+            repository.exists('PROD-999')
+        self.assertEqual(productos.find_by_codigo.call_count, 3)
+        
+        # Tamaño 2: PROD-002 y PROD-003 desplazan a PROD-999 y luego a PROD-001
+        repository.find_by_codigo('PROD-002')
+        repository.find_by_codigo('PROD-003')
+        self.assertEqual(len(repository.cache), 2)
+        repository.find_by_codigo('PROD-001')
+        self.assertEqual(productos.find_by_codigo.call_count, 6)
+    
+    def test_selected_by_settings(self):
+        """Test: El contenedor entrega a las vistas los repositorios Django con caché"""
+        empresas = container.resolve(IEmpresaRepository)
+        if isinstance(empresas, MeteredRepository):
+            empresas = empresas.repository
+        self.assertIsInstance(empresas, CachingEmpresaRepository)
+        self.assertIsInstance(empresas.repository, DjangoEmpresaRepository)
+
+
+@override_settings(DEPENDENCIES={
+    'nexus_domain.interfaces.IEmpresaRepository': {
+        'class': 'nexus_domain.repositories.InMemoryEmpresaRepository',
+        'scope': 'singleton',
+        'decorators': ['apps.empresas.repositories.CachingEmpresaRepository',
+                       'apps.core.instrumentation.MeteredRepository'],
+    },
+    'nexus_domain.interfaces.IProductoRepository': {
+        'class': 'nexus_domain.repositories.InMemoryProductoRepository',
+        'scope': 'request',
+    },
+    'nexus_domain.interfaces.IInventarioRepository': {
+        'class': 'nexus_domain.repositories.InMemoryInventarioRepository',
+        'scope': 'transient',
+    },
+})
+class ContainerTest(SimpleTestCase):
+    """Tests para el contenedor de dependencias"""
+    
+    def test_scopes(self):
+        """Test: singleton una por proceso, request una por alcance, transient una por resolve"""
+        self.assertIs(container.resolve(IEmpresaRepository), container.resolve(IEmpresaRepository))
+        self.assertIsNot(container.resolve(IInventarioRepository), container.resolve(IInventarioRepository))
+        
+        # Fuera de una petición request se comporta como transient
+        self.assertIsNot(container.resolve(IProductoRepository), container.resolve(IProductoRepository))
+        with request_scope():
+            productos = container.resolve(IProductoRepository)
+            self.assertIs(container.resolve('nexus_domain.interfaces.IProductoRepository'), productos)
+        with request_scope():
+            self.assertIsNot(container.resolve(IProductoRepository), productos)
+    
+    def test_decorators_and_metrics(self):
+        """Test: Los decoradores envuelven del más interno al más externo y se miden las llamadas"""
+        registry.clear()
+        empresas = container.resolve(IEmpresaRepository)
+        
+        self.assertIsInstance(empresas, MeteredRepository)
+        self.assertIsInstance(empresas.repository, CachingEmpresaRepository)
+        self.assertIsInstance(empresas.repository.repository, InMemoryEmpresaRepository)
+        
+        empresas.save(EmpresaEntity(NIT('900111111'), 'Distribuciones Andina', 'Calle 1', Phone('3001234567')))
+        self.assertTrue(empresas.exists('900111111'))
+        self.assertIn('repository_calls_total{pid="%d",repository="CachingEmpresaRepository",method="exists"} 1'
+                      % os.getpid(), registry.render())
+    
+    def test_use_case_autowiring(self):
+        """Test: Los casos de uso se arman con las dependencias registradas"""
+        with request_scope():
+            use_case = container.resolve(CreateOrUpdateInventarioUseCase)
+            self.assertIs(use_case.empresa_repository, container.resolve(IEmpresaRepository))
+            self.assertIs(use_case.producto_repository, container.resolve(IProductoRepository))
+            self.assertIsInstance(use_case.inventario_repository, InMemoryInventarioRepository)
+    
+    def test_configuration_errors(self):
+        """Test: Dependencias circulares, sin registrar o mal configuradas"""
+        class A:
+            def __init__(self, b):
+                self.b = b
+        
+        class B:
+            def __init__(self, a: A):
+                self.a = a
+        
+        A.__init__.__annotations__['b'] = B
+        ciclo = Container([Registration(A, A), Registration(B, B)])
+        with self.assertRaisesMessage(ImproperlyConfigured, 'Dependencia circular: A -> B -> A'):
+            ciclo.resolve(A)
+        with self.assertRaisesMessage(ImproperlyConfigured, 'el parámetro a no tiene una dependencia registrada'):
+            Container().resolve(B)
+        with self.assertRaises(ImproperlyConfigured):
+            Registration.from_setting('nexus_domain.interfaces.IEmpresaRepository', {'class': 'no.existe.Clase'})
@@ -0,0 +1,89 @@
+"""
+Upserts de una sola sentencia (INSERT ... ON CONFLICT DO UPDATE)
+
+Los repositorios asignan las llaves foráneas por id (empresa_id,
+created_by_id) sin consultar los objetos relacionados; si la referencia no
+existe, la base de datos la rechaza y el error se traduce a una excepción de
+dominio.
+"""
+from typing import Iterable, TypeVar
+from django.db import IntegrityError, models
+from nexus_domain.exceptions import BusinessRuleViolationError, EntityNotFoundError
+
+
+ModelT = TypeVar('ModelT', bound=models.Model)
+
+# SQLSTATE de PostgreSQL para violación de llave foránea
+FOREIGN_KEY_VIOLATION = '23503'
+
+
+def is_foreign_key_violation(error: IntegrityError) -> bool:
+    """Verificar si el error de integridad es una referencia inexistente"""
+    if getattr(error.__cause__, 'sqlstate', None) == FOREIGN_KEY_VIOLATION:
+        return True
+    return 'foreign key' in str(error).lower()
+
+
+def upsert(orm_obj: ModelT, unique_fields: Iterable[str],
+           update_fields: Iterable[str]) -> ModelT:
+    """
+    Insertar o actualizar orm_obj en una sola sentencia
+    
+    Si ya existe una fila con los mismos unique_fields solo se actualizan
+    update_fields; el resto (created_at, created_by...) conserva el valor
+    original. No ejecuta save() ni señales del modelo.
+    
+    Las llaves foráneas de Django se verifican al confirmar la transacción:
+    en modo autocommit bulk_create confirma su propia transacción y el error
+    de referencia se detecta aquí mismo; dentro de una transacción externa
+    aparece al confirmarla.
+    """
+    model = type(orm_obj)
+    try:
+        model.objects.bulk_create(
+            [orm_obj],
+            update_conflicts=True,
+            unique_fields=list(unique_fields),
+            update_fields=list(update_fields)
+        )
+    except IntegrityError as e:
+        nombre = model._meta.verbose_name
+        if is_foreign_key_violation(e):
+            raise EntityNotFoundError(f"Referencia inexistente al guardar {nombre}") from e
+        raise BusinessRuleViolationError(f"No se pudo guardar {nombre}: {e}") from e
+    
+    orm_obj._state.adding = False
+    return orm_obj
+
+
+class ChangeTracker:
+    """
+    Último valor leído de un campo por llave primaria
+    
+    Permite decidir después de un upsert si el campo cambió sin volver a
+    consultar la fila. Una llave registrada como nueva (no existía al
+    consultarla) nunca se considera cambiada; una llave desconocida sí.
+    """
+    _NUEVO = object()
+    _DESCONOCIDO = object()
+    
+    def __init__(self):
+        self._values = {}
+    
+    def loaded(self, key, value) -> None:
+        """Registrar el valor leído de la base de datos"""
+        self._values[key] = value
+    
+    def missing(self, key) -> None:
+        """Registrar que la fila no existía"""
+        self._values[key] = self._NUEVO
+    
+    def changed(self, key, value) -> bool:
+        """Verificar si value difiere de lo leído y registrarlo como el nuevo valor"""
+        previous = self._values.get(key, self._DESCONOCIDO)
+        self._values[key] = value
+        return previous is not self._NUEVO and previous != value
+    
+    def is_new(self, key) -> bool:
+        """Verificar si la fila no existía al consultarla"""
+        return self._values.get(key) is self._NUEVO
@@ -0,0 +1,22 @@
+"""
+Métricas Prometheus del proceso
+"""
+import hmac
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+from .instrumentation import registry
+
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@require_GET
+def metrics(request):
+    """Métricas del worker; exige 'Authorization: Bearer <METRICS_TOKEN>' (sin token, deshabilitado)"""
+    if not settings.METRICS_TOKEN:
+        return HttpResponse(status=403)
+    esperado = f'Bearer {settings.METRICS_TOKEN}'
+    if not hmac.compare_digest(request.META.get('HTTP_AUTHORIZATION', ''), esperado):
+        return HttpResponse(status=401)
+    return HttpResponse(registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class EmpresasConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.empresas'
+    
+    def ready(self):
+        # Invalidar la caché de empresas del proceso
+        from django.db.models.signals import post_delete, post_save
+        from .orm_models import Empresa
+        from .repositories import empresa_modificada
+        
+        post_save.connect(empresa_modificada, sender=Empresa)
+        post_delete.connect(empresa_modificada, sender=Empresa)
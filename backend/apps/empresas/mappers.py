@@ -20,7 +20,8 @@ class EmpresaMapper:
             telefono=Phone(orm_obj.telefono),
             created_at=orm_obj.created_at,
             updated_at=orm_obj.updated_at,
-            created_by_id=str(orm_obj.created_by.id) if orm_obj.created_by else None
+            created_by_id=str(orm_obj.created_by_id) if orm_obj.created_by_id else None,
+            punto_reorden=orm_obj.punto_reorden
         )
     
     @staticmethod
@@ -33,8 +34,12 @@ class EmpresaMapper:
         orm_obj.nombre = entity.nombre
         orm_obj.direccion = entity.direccion
         orm_obj.telefono = str(entity.telefono)
+        orm_obj.punto_reorden = entity.punto_reorden
         
-        # created_by se maneja por separado en el repositorio
-        # porque requiere acceso al modelo User
+        # Llave foránea por id: no se consulta el modelo User
+        created_by_id = entity.created_by_id
+        orm_obj.created_by_id = (
+            int(created_by_id) if created_by_id and str(created_by_id).isdigit() else None
+        )
         
         return orm_obj
@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-19 00:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empresas', '0002_empresa_punto_reorden'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='empresa',
+            name='clasificacion_abc_vigente',
+            field=models.BooleanField(default=False, verbose_name='Clasificación ABC vigente'),
+        ),
+    ]
@@ -0,0 +1,100 @@
+# Generated by Django 5.0 on 2026-10-19 00:47
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+VECTOR = (
+    "setweight(to_tsvector('spanish', coalesce(NEW.nombre, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(NEW.nit, '')), 'B')"
+)
+
+# Filas por lote al llenar search_vector: cada lote es una transacción corta
+BATCH_SIZE = 5000
+
+TRIGGER_SQL = [
+    f"""
+    CREATE OR REPLACE FUNCTION empresas_empresa_search_vector() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {VECTOR};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS empresas_empresa_search_vector ON empresas_empresa",
+    """
+    CREATE TRIGGER empresas_empresa_search_vector
+    BEFORE INSERT OR UPDATE ON empresas_empresa
+    FOR EACH ROW EXECUTE FUNCTION empresas_empresa_search_vector()
+    """,
+]
+
+# Las filas nuevas ya pasan por el trigger; se llenan las existentes por lotes
+FILL_SQL = f"""
+    UPDATE empresas_empresa SET search_vector = {VECTOR.replace('NEW.', '')}
+    WHERE nit IN (
+        SELECT nit FROM empresas_empresa WHERE search_vector IS NULL LIMIT %s
+    )
+"""
+
+INDEX_SQL = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS empresas_empresa_search_vector_gin ON empresas_empresa USING gin (search_vector)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS empresas_empresa_nombre_trgm ON empresas_empresa USING gin (nombre gin_trgm_ops)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS empresas_empresa_nit_trgm ON empresas_empresa USING gin (nit gin_trgm_ops)",
+]
+
+BACKWARD_SQL = [
+    "DROP INDEX CONCURRENTLY IF EXISTS empresas_empresa_nit_trgm",
+    "DROP INDEX CONCURRENTLY IF EXISTS empresas_empresa_nombre_trgm",
+    "DROP INDEX CONCURRENTLY IF EXISTS empresas_empresa_search_vector_gin",
+    "DROP TRIGGER IF EXISTS empresas_empresa_search_vector ON empresas_empresa",
+    "DROP FUNCTION IF EXISTS empresas_empresa_search_vector()",
+]
+
+
+def forwards(apps, schema_editor):
+    """
+    Trigger, search_vector de las filas existentes por lotes e índices GIN
+    sin bloquear escrituras (solo PostgreSQL; en otros motores la búsqueda
+    es en memoria)
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in TRIGGER_SQL:
+        schema_editor.execute(sql)
+    with schema_editor.connection.cursor() as cursor:
+        while True:
+            cursor.execute(FILL_SQL, [BATCH_SIZE])
+            if cursor.rowcount < BATCH_SIZE:
+                break
+    for sql in INDEX_SQL:
+        schema_editor.execute(sql)
+
+
+def backwards(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in BACKWARD_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción y
+    # cada lote de search_vector se confirma por separado
+    atomic = False
+
+    dependencies = [
+        ('empresas', '0003_empresa_clasificacion_abc_vigente'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='empresa',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0 on 2026-10-19 01:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+from apps.core.migration_operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('empresas', '0004_busqueda_texto'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='empresa',
+            index=models.Index(fields=['-created_at'], name='empresa_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='empresa',
+            index=models.Index(condition=models.Q(('clasificacion_abc_vigente', False)), fields=['-created_at'], name='empresa_abc_pendiente_idx'),
+        ),
+    ]
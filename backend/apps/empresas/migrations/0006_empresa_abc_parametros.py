@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-19 02:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empresas', '0005_indices_consultas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='empresa',
+            name='abc_parametros',
+            field=models.JSONField(blank=True, null=True, verbose_name='Parámetros de clasificación ABC'),
+        ),
+    ]
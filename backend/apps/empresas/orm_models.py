@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchVectorField
 
 User = get_user_model()
 
@@ -13,13 +14,37 @@ class Empresa(models.Model):
     direccion = models.TextField(verbose_name='Dirección')
     telefono = models.CharField(max_length=20, verbose_name='Teléfono')
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='empresas_creadas')
+    punto_reorden = models.PositiveIntegerField(
+        null=True, blank=True, verbose_name='Punto de reorden por defecto'
+    )
+    # False cuando cambian cantidades o precios de su inventario
+    clasificacion_abc_vigente = models.BooleanField(
+        default=False, verbose_name='Clasificación ABC vigente'
+    )
+    # Umbrales y moneda de la última clasificación ABC pedida (ABCClassifier)
+    abc_parametros = models.JSONField(
+        null=True, blank=True, verbose_name='Parámetros de clasificación ABC'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # nombre (español) y NIT; en PostgreSQL lo calcula un trigger
+    # (migración 0004), junto con los índices GIN de texto y trigramas
+    search_vector = SearchVectorField(null=True, editable=False)
     
     class Meta:
         verbose_name = 'Empresa'
         verbose_name_plural = 'Empresas'
         ordering = ['-created_at']
+        # Índices elegidos con el comando index_advisor
+        indexes = [
+            models.Index(fields=['-created_at'], name='empresa_created_idx'),
+            # Índice parcial: solo las empresas con clasificación ABC pendiente
+            models.Index(
+                fields=['-created_at'],
+                name='empresa_abc_pendiente_idx',
+                condition=models.Q(clasificacion_abc_vigente=False),
+            ),
+        ]
     
     def __str__(self):
         return f"{self.nombre} ({self.nit})"
@@ -2,56 +2,87 @@
 Implementación Django de los repositorios de dominio
 """
 from typing import List, Optional
-from django.contrib.auth import get_user_model
 from nexus_domain.interfaces import IEmpresaRepository
-from nexus_domain.entities import Empresa as EmpresaEntity
+from nexus_domain.entities import Empresa as EmpresaEntity, Inventario
 from nexus_domain.value_objects import NIT
+from apps.core.repository_cache import EntityCache
+from apps.core.search import TextSearch
+from apps.core.upsert import ChangeTracker, upsert
 from .orm_models import Empresa as EmpresaORM
+from apps.inventario.orm_models import Inventario as InventarioORM
 from .mappers import EmpresaMapper
 
-User = get_user_model()
-
 
 class DjangoEmpresaRepository(IEmpresaRepository):
     """Implementación Django del repositorio de empresas"""
     
+    # Campos que se sobrescriben cuando la empresa ya existe
+    UPSERT_FIELDS = ('nombre', 'direccion', 'telefono', 'punto_reorden', 'updated_at')
+    
+    # Búsqueda por nombre y NIT, compartida por las instancias del proceso
+    SEARCH = TextSearch(campos=('nombre', 'nit'))
+    
+    def __init__(self):
+        # Punto de reorden leído por NIT, para propagarlo solo si cambia
+        self._punto_reorden = ChangeTracker()
+    
     def save(self, empresa: EmpresaEntity) -> EmpresaEntity:
-        """Guardar o actualizar empresa"""
-        try:
-            # Intentar obtener registro existente
-            orm_obj = EmpresaORM.objects.get(nit=str(empresa.nit))
-            orm_obj = EmpresaMapper.to_orm(empresa, orm_obj)
-        except EmpresaORM.DoesNotExist:
-            # Crear nuevo registro
-            orm_obj = EmpresaMapper.to_orm(empresa)
+        """
+        Guardar o actualizar empresa en una sola sentencia (upsert)
         
-        # Asignar created_by si existe
-        if empresa.created_by_id:
-            try:
-                orm_obj.created_by = User.objects.get(id=int(empresa.created_by_id))
-            except (User.DoesNotExist, ValueError):
-                pass
+        El creador se asigna por id y solo se guarda al crear la empresa.
+        """
+        nit = str(empresa.nit)
+        nueva = self._punto_reorden.is_new(nit)
+        orm_obj = upsert(
+            EmpresaMapper.to_orm(empresa),
+            unique_fields=('nit',),
+            update_fields=self.UPSERT_FIELDS
+        )
         
-        orm_obj.save()
+        if self._punto_reorden.changed(nit, orm_obj.punto_reorden):
+            self._sync_punto_reorden(orm_obj)
+        if not nueva:
+            # La fila existente conserva su created_at, que es el de la entidad
+            orm_obj.created_at = empresa.created_at
         return EmpresaMapper.to_entity(orm_obj)
     
+    def _sync_punto_reorden(self, orm_obj: EmpresaORM) -> None:
+        """Propagar el punto de reorden a los registros sin valor por producto"""
+        efectivo = Inventario.resolve_punto_reorden(None, orm_obj.punto_reorden)
+        InventarioORM.objects.filter(
+            empresa_id=orm_obj.nit,
+            producto__punto_reorden__isnull=True
+        ).update(punto_reorden=efectivo)
+    
     def find_by_nit(self, nit: NIT) -> Optional[EmpresaEntity]:
         """Buscar empresa por NIT"""
         try:
-            orm_obj = EmpresaORM.objects.get(nit=str(nit))
+            orm_obj = EmpresaORM.objects.defer('search_vector').get(nit=str(nit))
+            self._punto_reorden.loaded(orm_obj.nit, orm_obj.punto_reorden)
             return EmpresaMapper.to_entity(orm_obj)
         except EmpresaORM.DoesNotExist:
             return None
     
+    def track(self, nit: str, empresa: Optional[EmpresaEntity]) -> None:
+        """Registrar una lectura hecha fuera del repositorio (p. ej. desde una caché)"""
+        if empresa is None:
+            self._punto_reorden.missing(str(nit))
+        else:
+            self._punto_reorden.loaded(str(nit), empresa.punto_reorden)
+    
     def find_all(self, limit: int = 100, offset: int = 0) -> List[EmpresaEntity]:
         """Obtener todas las empresas con paginación"""
-        queryset = EmpresaORM.objects.all()[offset:offset + limit]
+        queryset = EmpresaORM.objects.defer('search_vector')[offset:offset + limit]
         return [EmpresaMapper.to_entity(orm_obj) for orm_obj in queryset]
     
-    def search_by_nombre(self, nombre: str) -> List[EmpresaEntity]:
-        """Buscar empresas por nombre (búsqueda parcial)"""
-        queryset = EmpresaORM.objects.filter(nombre__icontains=nombre)
-        return [EmpresaMapper.to_entity(orm_obj) for orm_obj in queryset]
+    def search_by_nombre(self, nombre: str, limit: int = 100,
+                         offset: int = 0) -> List[EmpresaEntity]:
+        """Buscar empresas por nombre o NIT, ordenadas por relevancia"""
+        resultados = self.SEARCH.search(
+            EmpresaORM.objects.defer('search_vector'), nombre, limit, offset
+        )
+        return [EmpresaMapper.to_entity(orm_obj) for orm_obj in resultados]
     
     def delete(self, nit: NIT) -> bool:
         """Eliminar empresa por NIT"""
@@ -64,4 +95,58 @@ class DjangoEmpresaRepository(IEmpresaRepository):
     
     def exists(self, nit: str) -> bool:
         """Verificar si existe empresa con el NIT dado"""
-        return EmpresaORM.objects.filter(nit=nit).exists()
+        existe = EmpresaORM.objects.filter(nit=nit).exists()
+        if not existe:
+            self._punto_reorden.missing(nit)
+        return existe
+
+
+# Empresas leídas por NIT, compartidas por las peticiones del proceso
+empresa_cache = EntityCache('empresas')
+
+
+class CachingEmpresaRepository(IEmpresaRepository):
+    """
+    Repositorio de empresas con caché de lectura por NIT
+    
+    find_by_nit y exists se resuelven desde empresa_cache (también la
+    ausencia del NIT); save y delete escriben en el repositorio envuelto e
+    invalidan la entrada. Listados y búsquedas no pasan por la caché.
+    """
+    
+    def __init__(self, repository: Optional[IEmpresaRepository] = None,
+                 cache: EntityCache = empresa_cache):
+        self.repository = repository if repository is not None else DjangoEmpresaRepository()
+        self.cache = cache
+    
+    def save(self, empresa: EmpresaEntity) -> EmpresaEntity:
+        guardada = self.repository.save(empresa)
+        self.cache.invalidate_on_commit(str(empresa.nit))
+        return guardada
+    
+    def find_by_nit(self, nit: NIT) -> Optional[EmpresaEntity]:
+        empresa, _ = self.cache.get_or_load(str(nit), self.repository.find_by_nit)
+        if hasattr(self.repository, 'track'):
+            # save() decide con la última lectura si propagar el punto de reorden
+            self.repository.track(str(nit), empresa)
+        return empresa
+    
+    def find_all(self, limit: int = 100, offset: int = 0) -> List[EmpresaEntity]:
+        return self.repository.find_all(limit=limit, offset=offset)
+    
+    def search_by_nombre(self, nombre: str, limit: int = 100,
+                         offset: int = 0) -> List[EmpresaEntity]:
+        return self.repository.search_by_nombre(nombre, limit=limit, offset=offset)
+    
+    def delete(self, nit: NIT) -> bool:
+        eliminada = self.repository.delete(nit)
+        self.cache.invalidate_on_commit(str(nit))
+        return eliminada
+    
+    def exists(self, nit: str) -> bool:
+        return self.find_by_nit(nit) is not None
+
+
+def empresa_modificada(sender, instance, **kwargs) -> None:
+    """Receptor de post_save/post_delete de Empresa"""
+    empresa_cache.invalidate_on_commit(instance.nit)
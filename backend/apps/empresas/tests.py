@@ -6,7 +6,9 @@ from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.urls import reverse
+from apps.core.query_budget import QueryBudgetTestMixin
 from .models import Empresa
+from .views import EmpresaViewSet
 
 User = get_user_model()
 
@@ -303,3 +305,43 @@ class EmpresaPermissionsTest(APITestCase):
         self.client.force_authenticate(user=self.externo)
         response = self.client.get(self.list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class EmpresaQueryBudgetTest(QueryBudgetTestMixin, APITestCase):
+    """Tests de presupuesto de consultas para el API de Empresas"""
+    
+    def setUp(self):
+        """Varias empresas con creador para detectar consultas N+1"""
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='admin123',
+            role='ADMIN'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        
+        for i in range(5):
+            Empresa.objects.create(
+                nit=f'90011122{i}',
+                nombre=f'Empresa {i}',
+                direccion='Av. Principal 100',
+                telefono='3009876543',
+                created_by=self.admin_user
+            )
+    
+    def test_budgets_declared(self):
+        """Test: list y retrieve declaran presupuesto"""
+        self.assertBudgetsDeclared(EmpresaViewSet)
+    
+    def test_list_within_budget(self):
+        """Test: Listar empresas no depende del número de filas"""
+        response = self.assertQueryBudget(
+            EmpresaViewSet, 'list', lambda: self.client.get(reverse('empresa-list'))
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_retrieve_within_budget(self):
+        """Test: Obtener una empresa"""
+        url = reverse('empresa-detail', kwargs={'pk': '900111220'})
+        response = self.assertQueryBudget(EmpresaViewSet, 'retrieve', lambda: self.client.get(url))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
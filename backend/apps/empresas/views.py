@@ -12,6 +12,7 @@ from nexus_domain.use_cases.empresa_use_cases import (
     UpdateEmpresaUseCase,
     DeleteEmpresaUseCase
 )
+from nexus_domain.interfaces import IEmpresaRepository
 from nexus_domain.exceptions import (
     DomainException,
     ValidationError,
@@ -21,7 +22,8 @@ from nexus_domain.exceptions import (
 )
 
 from apps.authentication.permissions import IsExternoOrReadOnly
-from .repositories import DjangoEmpresaRepository
+from apps.core.container import container
+from apps.core.query_budget import query_budget
 
 
 @extend_schema(tags=['Empresas'])
@@ -39,8 +41,8 @@ class EmpresaViewSet(viewsets.ModelViewSet):
     ordering_fields = ['nombre', 'created_at']
     
     def _get_repository(self):
-        """Obtener instancia del repositorio"""
-        return DjangoEmpresaRepository()
+        """Repositorio de empresas del contenedor de dependencias"""
+        return container.resolve(IEmpresaRepository)
     
     def _handle_domain_exception(self, exception: DomainException) -> Response:
         """Mapear excepciones de dominio a respuestas HTTP"""
@@ -65,6 +67,7 @@ class EmpresaViewSet(viewsets.ModelViewSet):
             OpenApiParameter(name='ordering', description='Ordenar por campo (nombre, created_at)', type=OpenApiTypes.STR),
         ]
     )
+    @query_budget(1)
     def list(self, request, *args, **kwargs):
         """Listar empresas usando caso de uso"""
         try:
@@ -104,7 +107,8 @@ class EmpresaViewSet(viewsets.ModelViewSet):
                 nombre=request.data.get('nombre'),
                 direccion=request.data.get('direccion'),
                 telefono=request.data.get('telefono'),
-                user_id=str(request.user.id)
+                user_id=str(request.user.id),
+                punto_reorden=request.data.get('punto_reorden')
             )
             
             return Response(empresa.to_dict(), status=status.HTTP_201_CREATED)
@@ -116,6 +120,7 @@ class EmpresaViewSet(viewsets.ModelViewSet):
         summary="Obtener empresa",
         description="Obtener detalles de una empresa específica por NIT"
     )
+    @query_budget(1)
     def retrieve(self, request, *args, **kwargs):
         """Obtener empresa usando caso de uso"""
         try:
@@ -145,7 +150,10 @@ class EmpresaViewSet(viewsets.ModelViewSet):
                 nit=nit,
                 nombre=request.data.get('nombre'),
                 direccion=request.data.get('direccion'),
-                telefono=request.data.get('telefono')
+                telefono=request.data.get('telefono'),
+                punto_reorden=request.data.get('punto_reorden'),
+                # Reemplazo completo: sin punto de reorden se hereda el valor por defecto
+                clear_punto_reorden=request.data.get('punto_reorden') is None
             )
             
             return Response(empresa.to_dict(), status=status.HTTP_200_OK)
@@ -173,6 +181,11 @@ class EmpresaViewSet(viewsets.ModelViewSet):
                 kwargs_update['direccion'] = request.data['direccion']
             if 'telefono' in request.data:
                 kwargs_update['telefono'] = request.data['telefono']
+            if 'punto_reorden' in request.data:
+                if request.data['punto_reorden'] is None:
+                    kwargs_update['clear_punto_reorden'] = True
+                else:
+                    kwargs_update['punto_reorden'] = request.data['punto_reorden']
             
             empresa = use_case.execute(**kwargs_update)
             
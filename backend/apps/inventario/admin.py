@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .orm_models import Inventario
+from .orm_models import Inventario, MovimientoInventario
 
 
 @admin.register(Inventario)
@@ -8,3 +8,10 @@ class InventarioAdmin(admin.ModelAdmin):
     list_filter = ('empresa', 'fecha_registro')
     search_fields = ('empresa__nombre', 'producto__nombre', 'producto__codigo')
     readonly_fields = ('fecha_registro', 'updated_at')
+
+
+@admin.register(MovimientoInventario)
+class MovimientoInventarioAdmin(admin.ModelAdmin):
+    list_display = ('inventario', 'cantidad_anterior', 'cantidad_nueva', 'delta', 'fecha')
+    list_filter = ('fecha',)
+    readonly_fields = ('fecha',)
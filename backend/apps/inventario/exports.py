@@ -0,0 +1,36 @@
+"""
+Exportación del inventario con precios pivotados por moneda
+"""
+from typing import Optional
+from nexus_domain.analytics import MONEDAS
+from apps.core.exporters import Export
+from apps.productos.orm_models import PrecioPivot
+from .orm_models import Inventario
+
+
+COLUMNAS = (
+    ('id', 'int'),
+    ('empresa_nit', 'string'),
+    ('empresa_nombre', 'string'),
+    ('producto_codigo', 'string'),
+    ('producto_nombre', 'string'),
+    ('cantidad', 'int'),
+    ('punto_reorden', 'int'),
+    ('clase_abc', 'string'),
+    *((f'precio_{moneda.lower()}', 'decimal') for moneda in MONEDAS),
+    ('updated_at', 'datetime'),
+)
+
+
+def inventario_export(empresa_nit: Optional[str] = None) -> Export:
+    """Un registro por fila de inventario (opcionalmente de una empresa)"""
+    queryset = Inventario.objects.order_by('id')
+    if empresa_nit:
+        queryset = queryset.filter(empresa_id=empresa_nit)
+
+    precios = PrecioPivot.price_columns('producto__precio_pivot')
+    queryset = queryset.annotate(**precios).values_list(
+        'id', 'empresa_id', 'empresa__nombre', 'producto_id', 'producto__nombre',
+        'cantidad', 'punto_reorden', 'clase_abc', *precios, 'updated_at'
+    )
+    return Export(nombre='inventario', queryset=queryset, columnas=COLUMNAS)
@@ -0,0 +1,36 @@
+"""
+Recalcular la clasificación ABC de las empresas con cambios pendientes
+
+Pensado para ejecutarse periódicamente (cron); el listado por clase ABC usa
+la última clasificación persistida.
+
+Uso:
+    python manage.py reclasificar_abc
+    python manage.py reclasificar_abc --empresa 900123456
+"""
+import time
+from django.core.management.base import BaseCommand
+from nexus_domain.interfaces import IInventarioRepository
+from nexus_domain.use_cases.inventario_use_cases import RefreshABCClassificationUseCase
+from apps.core.container import container, request_scope
+
+
+class Command(BaseCommand):
+    help = 'Reclasificar ABC las empresas con inventario o precios modificados'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--empresa', metavar='NIT',
+                            help='Reclasificar solo esta empresa (por defecto todas las pendientes)')
+    
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        with request_scope():
+            use_case = RefreshABCClassificationUseCase(container.resolve(IInventarioRepository))
+            reclasificadas = use_case.execute(options['empresa'])
+        
+        duracion = time.perf_counter() - inicio
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(reclasificadas)} empresas reclasificadas en {duracion:.1f}s"
+        ))
+        for nit in reclasificadas:
+            self.stdout.write(f"  {nit}")
@@ -15,9 +15,11 @@ class InventarioMapper:
         """Convertir modelo ORM a entidad de dominio"""
         return InventarioEntity(
             id=str(orm_obj.id),
-            empresa_nit=NIT(orm_obj.empresa.nit),
-            producto_codigo=ProductCode(orm_obj.producto.codigo),
+            empresa_nit=NIT(orm_obj.empresa_id),
+            producto_codigo=ProductCode(orm_obj.producto_id),
             cantidad=Quantity(orm_obj.cantidad),
+            punto_reorden=orm_obj.punto_reorden,
+            clase_abc=orm_obj.clase_abc,
             created_at=orm_obj.fecha_registro,
             updated_at=orm_obj.updated_at
         )
@@ -28,7 +30,8 @@ class InventarioMapper:
         if orm_obj is None:
             orm_obj = InventarioORM()
         
-        # Solo actualizar cantidad, las FKs se manejan en el repositorio
+        # Solo actualizar cantidad, las FKs y el punto de reorden efectivo
+        # se manejan en el repositorio
         orm_obj.cantidad = int(entity.cantidad)
         
         return orm_obj
@@ -0,0 +1,24 @@
+# Generated by Django 5.0 on 2026-10-19 00:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empresas', '0002_empresa_punto_reorden'),
+        ('inventario', '0001_initial'),
+        ('productos', '0002_producto_punto_reorden'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inventario',
+            name='punto_reorden',
+            field=models.IntegerField(default=10, verbose_name='Punto de reorden efectivo'),
+        ),
+        migrations.AddIndex(
+            model_name='inventario',
+            index=models.Index(condition=models.Q(('cantidad__lt', models.F('punto_reorden'))), fields=['empresa', 'cantidad'], name='inventario_low_stock_idx'),
+        ),
+    ]
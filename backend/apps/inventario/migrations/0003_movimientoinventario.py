@@ -0,0 +1,31 @@
+# Generated by Django 5.0 on 2026-10-19 00:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0002_inventario_punto_reorden'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MovimientoInventario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cantidad_anterior', models.IntegerField(verbose_name='Cantidad anterior')),
+                ('cantidad_nueva', models.IntegerField(verbose_name='Cantidad nueva')),
+                ('delta', models.IntegerField(verbose_name='Variación')),
+                ('fecha', models.DateTimeField(auto_now_add=True, verbose_name='Fecha del movimiento')),
+                ('inventario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='movimientos', to='inventario.inventario')),
+            ],
+            options={
+                'verbose_name': 'Movimiento de inventario',
+                'verbose_name_plural': 'Movimientos de inventario',
+                'ordering': ['-fecha'],
+                'indexes': [models.Index(fields=['inventario', 'fecha'], name='movimiento_inv_fecha_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0 on 2026-10-19 00:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empresas', '0003_empresa_clasificacion_abc_vigente'),
+        ('inventario', '0003_movimientoinventario'),
+        ('productos', '0002_producto_punto_reorden'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inventario',
+            name='clase_abc',
+            field=models.CharField(blank=True, choices=[('A', 'A'), ('B', 'B'), ('C', 'C')], max_length=1, null=True, verbose_name='Clase ABC'),
+        ),
+        migrations.AddIndex(
+            model_name='inventario',
+            index=models.Index(fields=['empresa', 'clase_abc'], name='inventario_clase_abc_idx'),
+        ),
+    ]
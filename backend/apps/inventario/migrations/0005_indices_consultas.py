@@ -0,0 +1,32 @@
+# Generated by Django 5.0 on 2026-10-19 01:11
+
+from django.db import migrations, models
+
+from apps.core.migration_operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('empresas', '0005_indices_consultas'),
+        ('inventario', '0004_inventario_clase_abc'),
+        ('productos', '0007_indices_consultas'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='inventario',
+            index=models.Index(fields=['empresa', '-fecha_registro'], include=('producto', 'cantidad'), name='inventario_empresa_fecha_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='inventario',
+            index=models.Index(fields=['-fecha_registro'], name='inventario_fecha_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='inventario',
+            index=models.Index(fields=['cantidad'], name='inventario_cantidad_idx'),
+        ),
+    ]
@@ -2,6 +2,6 @@
 Mantener compatibilidad con Django migrations
 Re-exportar modelos desde orm_models
 """
-from .orm_models import Inventario
+from .orm_models import Inventario, MovimientoInventario
 
-__all__ = ['Inventario']
+__all__ = ['Inventario', 'MovimientoInventario']
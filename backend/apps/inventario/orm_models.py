@@ -1,4 +1,7 @@
 from django.db import models
+from django.db.models import F, Q
+from nexus_domain.entities import Inventario as InventarioEntity
+from nexus_domain.entities.inventario import CLASES_ABC, DEFAULT_PUNTO_REORDEN
 from apps.empresas.models import Empresa
 from apps.productos.models import Producto
 
@@ -10,6 +13,16 @@ class Inventario(models.Model):
     empresa = models.ForeignKey(Empresa, on_delete=models.CASCADE, related_name='inventario')
     producto = models.ForeignKey(Producto, on_delete=models.CASCADE, related_name='inventario')
     cantidad = models.IntegerField(default=0, verbose_name='Cantidad en stock')
+    # Punto de reorden efectivo (producto > empresa > defecto), desnormalizado
+    # para comparar contra cantidad sin joins
+    punto_reorden = models.IntegerField(
+        default=DEFAULT_PUNTO_REORDEN, verbose_name='Punto de reorden efectivo'
+    )
+    clase_abc = models.CharField(
+        max_length=1, null=True, blank=True,
+        choices=[(clase, clase) for clase in CLASES_ABC],
+        verbose_name='Clase ABC'
+    )
     fecha_registro = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de registro')
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -18,6 +31,99 @@ class Inventario(models.Model):
         verbose_name_plural = 'Inventarios'
         unique_together = ('empresa', 'producto')
         ordering = ['-fecha_registro']
+        indexes = [
+            # Índice parcial: solo contiene las filas en stock bajo
+            models.Index(
+                fields=['empresa', 'cantidad'],
+                name='inventario_low_stock_idx',
+                condition=Q(cantidad__lt=F('punto_reorden')),
+            ),
+            models.Index(fields=['empresa', 'clase_abc'], name='inventario_clase_abc_idx'),
+            # Inventario de una empresa en el orden por defecto; con INCLUDE
+            # los totales por empresa se leen solo del índice (PostgreSQL)
+            models.Index(
+                fields=['empresa', '-fecha_registro'],
+                include=['producto', 'cantidad'],
+                name='inventario_empresa_fecha_idx',
+            ),
+            models.Index(fields=['-fecha_registro'], name='inventario_fecha_idx'),
+            # Stock bajo con umbral explícito (cantidad <= n)
+            models.Index(fields=['cantidad'], name='inventario_cantidad_idx'),
+        ]
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Recordar la cantidad cargada para registrar movimientos al guardar"""
+        instance = super().from_db(db, field_names, values)
+        instance._cantidad_db = instance.__dict__.get('cantidad')
+        return instance
+    
+    def save(self, *args, **kwargs):
+        """
+        Guardar registro
+        
+        - Al crear: resolver el punto de reorden efectivo
+        - Si cambia la cantidad: registrar el movimiento en el historial e
+          invalidar la clasificación ABC de la empresa
+        """
+        if self._state.adding:
+            self.punto_reorden = InventarioEntity.resolve_punto_reorden(
+                self.producto.punto_reorden,
+                self.empresa.punto_reorden
+            )
+            anterior = 0
+        else:
+            anterior = getattr(self, '_cantidad_db', None)
+        
+        super().save(*args, **kwargs)
+        
+        if anterior is not None and self.cantidad != anterior:
+            MovimientoInventario.objects.create(
+                inventario=self,
+                cantidad_anterior=anterior,
+                cantidad_nueva=self.cantidad,
+                delta=self.cantidad - anterior
+            )
+            self.invalidar_clasificacion_abc(nit=self.empresa_id)
+        self._cantidad_db = self.cantidad
+    
+    def delete(self, *args, **kwargs):
+        """Eliminar registro e invalidar la clasificación ABC de la empresa"""
+        empresa_id = self.empresa_id
+        result = super().delete(*args, **kwargs)
+        self.invalidar_clasificacion_abc(nit=empresa_id)
+        return result
+    
+    @staticmethod
+    def invalidar_clasificacion_abc(**filtros) -> None:
+        """Marcar como pendiente la clasificación ABC de las empresas filtradas"""
+        Empresa.objects.filter(clasificacion_abc_vigente=True, **filtros).update(
+            clasificacion_abc_vigente=False
+        )
     
     def __str__(self):
         return f"{self.empresa.nombre} - {self.producto.nombre} ({self.cantidad})"
+
+
+class MovimientoInventario(models.Model):
+    """
+    Historial de cambios de cantidad de un registro de inventario
+    
+    Base para derivar el consumo por producto (deltas negativos)
+    """
+    inventario = models.ForeignKey(Inventario, on_delete=models.CASCADE, related_name='movimientos')
+    cantidad_anterior = models.IntegerField(verbose_name='Cantidad anterior')
+    cantidad_nueva = models.IntegerField(verbose_name='Cantidad nueva')
+    delta = models.IntegerField(verbose_name='Variación')
+    fecha = models.DateTimeField(auto_now_add=True, verbose_name='Fecha del movimiento')
+    
+    class Meta:
+        verbose_name = 'Movimiento de inventario'
+        verbose_name_plural = 'Movimientos de inventario'
+        ordering = ['-fecha']
+        indexes = [
+            models.Index(fields=['inventario', 'fecha'], name='movimiento_inv_fecha_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.inventario_id}: {self.cantidad_anterior} -> {self.cantidad_nueva}"
@@ -1,19 +1,29 @@
 """
 Implementación Django de los repositorios de dominio para Inventario
 """
-from typing import List, Optional
+import dataclasses
+from datetime import date, datetime, time
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+from django.db import transaction
+from django.db.models import F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
 from nexus_domain.interfaces import IInventarioRepository
+from nexus_domain.analytics import ABCClassifier, InventorySnapshot
 from nexus_domain.entities import Inventario as InventarioEntity
 from nexus_domain.value_objects import NIT, ProductCode
-from .orm_models import Inventario as InventarioORM
+from .orm_models import Inventario as InventarioORM, MovimientoInventario
 from apps.empresas.orm_models import Empresa as EmpresaORM
-from apps.productos.orm_models import Producto as ProductoORM
+from apps.productos.orm_models import Producto as ProductoORM, PrecioPivot
 from .mappers import InventarioMapper
 
 
 class DjangoInventarioRepository(IInventarioRepository):
     """Implementación Django del repositorio de inventario"""
     
+    # Máximo de IDs por UPDATE ... WHERE id IN (...)
+    ABC_BATCH_SIZE = 5000
+    
     def save(self, inventario: InventarioEntity) -> InventarioEntity:
         """Guardar o actualizar inventario"""
         # Obtener empresa y producto
@@ -56,7 +66,7 @@ class DjangoInventarioRepository(IInventarioRepository):
     def find_by_id(self, inventario_id: str) -> Optional[InventarioEntity]:
         """Buscar inventario por ID"""
         try:
-            orm_obj = InventarioORM.objects.select_related('empresa', 'producto').get(id=int(inventario_id))
+            orm_obj = InventarioORM.objects.get(id=int(inventario_id))
             return InventarioMapper.to_entity(orm_obj)
         except (InventarioORM.DoesNotExist, ValueError):
             return None
@@ -64,7 +74,7 @@ class DjangoInventarioRepository(IInventarioRepository):
     def find_by_empresa_and_producto(self, empresa_nit: NIT, producto_codigo: ProductCode) -> Optional[InventarioEntity]:
         """Buscar inventario por empresa y producto"""
         try:
-            orm_obj = InventarioORM.objects.select_related('empresa', 'producto').get(
+            orm_obj = InventarioORM.objects.get(
                 empresa__nit=str(empresa_nit),
                 producto__codigo=str(producto_codigo)
             )
@@ -74,21 +84,37 @@ class DjangoInventarioRepository(IInventarioRepository):
     
     def find_all(self, limit: int = 100, offset: int = 0) -> List[InventarioEntity]:
         """Obtener todo el inventario con paginación"""
-        queryset = InventarioORM.objects.select_related('empresa', 'producto').all()[offset:offset + limit]
+        queryset = InventarioORM.objects.all()[offset:offset + limit]
         return [InventarioMapper.to_entity(orm_obj) for orm_obj in queryset]
     
     def find_by_empresa(self, empresa_nit: NIT) -> List[InventarioEntity]:
         """Buscar inventario por empresa"""
-        queryset = InventarioORM.objects.select_related('empresa', 'producto').filter(
+        queryset = InventarioORM.objects.filter(
             empresa__nit=str(empresa_nit)
         )
         return [InventarioMapper.to_entity(orm_obj) for orm_obj in queryset]
     
-    def find_low_stock(self, threshold: int = 10) -> List[InventarioEntity]:
-        """Buscar items con stock bajo"""
-        queryset = InventarioORM.objects.select_related('empresa', 'producto').filter(
-            cantidad__lte=threshold
+    def find_low_stock(self, threshold: Optional[int] = None) -> List[InventarioEntity]:
+        """
+        Buscar items con stock bajo
+        
+        Sin threshold compara contra el punto de reorden de cada registro
+        (cubierto por el índice parcial inventario_low_stock_idx)
+        """
+        queryset = InventarioORM.objects
+        if threshold is None:
+            queryset = queryset.filter(cantidad__lt=F('punto_reorden'))
+        else:
+            queryset = queryset.filter(cantidad__lte=threshold)
+        return [InventarioMapper.to_entity(orm_obj) for orm_obj in queryset]
+    
+    def find_by_clase_abc(self, clase_abc: str, empresa_nit: Optional[str] = None) -> List[InventarioEntity]:
+        """Buscar inventario por clase ABC (índice empresa + clase)"""
+        queryset = InventarioORM.objects.filter(
+            clase_abc=clase_abc
         )
+        if empresa_nit:
+            queryset = queryset.filter(empresa_id=str(empresa_nit))
         return [InventarioMapper.to_entity(orm_obj) for orm_obj in queryset]
     
     def delete(self, inventario_id: str) -> bool:
@@ -106,3 +132,72 @@ class DjangoInventarioRepository(IInventarioRepository):
             empresa__nit=empresa_nit,
             producto__codigo=producto_codigo
         ).exists()
+    
+    def load_snapshot(self, empresa_nit: Optional[str] = None) -> InventorySnapshot:
+        """
+        Cargar inventario con precios por moneda en una sola consulta
+        
+        Los precios salen del pivote (un join, sin agrupar); si un producto
+        no tiene precio en una moneda se convierte con TasaCambio.
+        """
+        queryset = InventarioORM.objects.order_by()
+        if empresa_nit:
+            queryset = queryset.filter(empresa_id=str(empresa_nit))
+        
+        precios = PrecioPivot.price_columns('producto__precio_pivot', convertir=True)
+        rows = queryset.annotate(**precios).values_list(
+            'id', 'empresa_id', 'producto_id', 'cantidad', 'punto_reorden', *precios
+        )
+        return InventorySnapshot.from_rows(rows)
+    
+    def load_consumo(self, empresa_nit: str, desde: date) -> List[Tuple[str, date, float]]:
+        """Consumo diario por producto (suma de salidas de stock) agregado en SQL"""
+        return list(
+            MovimientoInventario.objects.order_by().filter(
+                inventario__empresa_id=str(empresa_nit),
+                fecha__gte=timezone.make_aware(datetime.combine(desde, time.min)),
+                delta__lt=0
+            ).annotate(
+                dia=TruncDate('fecha')
+            ).values(
+                'inventario__producto_id', 'dia'
+            ).annotate(
+                consumo=Sum(-F('delta'))
+            ).values_list('inventario__producto_id', 'dia', 'consumo')
+        )
+    
+    def find_stale_abc_empresas(self, empresa_nit: Optional[str] = None) -> List[str]:
+        """NITs de empresas con clasificación ABC pendiente"""
+        queryset = EmpresaORM.objects.filter(clasificacion_abc_vigente=False)
+        if empresa_nit:
+            queryset = queryset.filter(nit=str(empresa_nit))
+        return list(queryset.values_list('nit', flat=True))
+    
+    def find_abc_classifier(self, empresa_nit: str) -> Optional[ABCClassifier]:
+        """Parámetros guardados en Empresa.abc_parametros"""
+        parametros = EmpresaORM.objects.filter(nit=str(empresa_nit)).values_list(
+            'abc_parametros', flat=True
+        ).first()
+        return ABCClassifier(**parametros) if parametros else None
+    
+    def save_abc_classifier(self, empresa_nit: str, classifier: ABCClassifier) -> None:
+        EmpresaORM.objects.filter(nit=str(empresa_nit)).update(abc_parametros=dataclasses.asdict(classifier))
+    
+    def mark_abc_current(self, empresa_nit: str) -> None:
+        """Marcar vigente antes de leer; invalidar_clasificacion_abc la vuelve a dejar pendiente"""
+        EmpresaORM.objects.filter(nit=str(empresa_nit)).update(clasificacion_abc_vigente=True)
+    
+    def mark_abc_stale(self, empresa_nit: str) -> None:
+        InventarioORM.invalidar_clasificacion_abc(nit=str(empresa_nit))
+    
+    def update_abc_classes(self, empresa_nit: str, clases: Mapping[str, Sequence[int]]) -> int:
+        """Escribir solo los registros cuya clase cambió, por lotes de IDs"""
+        actualizados = 0
+        with transaction.atomic():
+            for clase, ids in clases.items():
+                for start in range(0, len(ids), self.ABC_BATCH_SIZE):
+                    actualizados += InventarioORM.objects.filter(
+                        empresa_id=str(empresa_nit),
+                        id__in=ids[start:start + self.ABC_BATCH_SIZE]
+                    ).exclude(clase_abc=clase).update(clase_abc=clase)
+        return actualizados
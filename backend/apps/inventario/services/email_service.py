@@ -1,10 +1,16 @@
 import os
 import base64
-import requests
+import httpx
 from decouple import config
+from apps.core.instrumentation import instrument
 
 
-def send_pdf_via_email(pdf_path, recipient_email):
+# Segundos de espera a MailerSend (conexión y respuesta)
+MAILERSEND_TIMEOUT = 30
+
+
+async def send_pdf_via_email(pdf_path, recipient_email):
+    """Enviar el PDF con la API de MailerSend (cliente HTTP async)"""
     try:
         print(f"📧 [EMAIL SERVICE] Iniciando envío de email a {recipient_email}")
         
@@ -281,8 +287,10 @@ Saludos cordiales,
         
         print(f"📧 [EMAIL SERVICE] Enviando petición a MailerSend API...")
         
-        # Enviar email usando requests
-        response = requests.post(url, json=payload, headers=headers)
+        # Enviar email sin bloquear el worker mientras MailerSend responde
+        with instrument('external'):
+            async with httpx.AsyncClient(timeout=MAILERSEND_TIMEOUT) as client:
+                response = await client.post(url, json=payload, headers=headers)
         
         print(f"📧 [EMAIL SERVICE] Status code: {response.status_code}")
         print(f"📧 [EMAIL SERVICE] Response: {response.text}")
@@ -98,6 +98,7 @@ def generate_inventory_pdf(empresa_nit=None):
         str: Ruta del archivo PDF generado
     """
     from apps.inventario.models import Inventario
+    from apps.productos.models import PrecioPivot
     
     # Crear directorio media/pdfs si no existe
     pdf_dir = os.path.join(settings.MEDIA_ROOT, 'pdfs')
@@ -210,14 +211,19 @@ def generate_inventory_pdf(empresa_nit=None):
     elements.append(Spacer(1, 0.2*inch))
     
     # Obtener datos
-    inventario_qs = Inventario.objects.select_related('empresa', 'producto').prefetch_related('producto__precios')
+    inventario_qs = Inventario.objects.select_related('empresa', 'producto').annotate(
+        **PrecioPivot.price_columns('producto__precio_pivot', convertir=True, monedas=('COP',))
+    )
     if empresa_nit:
         inventario_qs = inventario_qs.filter(empresa__nit=empresa_nit)
     
-    # Estadísticas rápidas
-    total_items = inventario_qs.count()
-    total_cantidad = sum(item.cantidad for item in inventario_qs)
-    total_empresas = inventario_qs.values('empresa').distinct().count()
+    # Estadísticas rápidas (snapshot columnar en una sola consulta)
+    from nexus_domain.interfaces import IInventarioRepository
+    from apps.core.container import container
+    snapshot = container.resolve(IInventarioRepository).load_snapshot(empresa_nit)
+    total_items = len(snapshot)
+    total_cantidad = snapshot.total_cantidad()
+    total_empresas = snapshot.count_empresas()
     
     stats_data = [
         ['Total de Productos', 'Cantidad Total', 'Empresas'],
@@ -259,14 +265,14 @@ def generate_inventory_pdf(empresa_nit=None):
     
     total_value = 0
     for item in inventario_qs:
-        # Buscar precio en COP
-        precio_cop = item.producto.precios.filter(moneda='COP').first()
-        precio = precio_cop.precio if precio_cop else 0
-        precio_str = f'${precio:,.0f}' if precio_cop else 'N/A'
+        # Precio en COP (convertido si el producto no lo tiene)
+        precio_cop = item.precio_cop
+        precio = precio_cop if precio_cop is not None else 0
+        precio_str = f'${precio:,.0f}' if precio_cop is not None else 'N/A'
         
         item_total = precio * item.cantidad
         total_value += item_total
-        total_str = f'${item_total:,.0f}' if precio_cop else 'N/A'
+        total_str = f'${item_total:,.0f}' if precio_cop is not None else 'N/A'
         
         data.append([
             item.empresa.nombre[:20],  # Limitar longitud
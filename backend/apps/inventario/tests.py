@@ -0,0 +1,626 @@
+"""
+Tests para el módulo de Inventario
+"""
+import csv
+import importlib.util
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+from decimal import Decimal
+from datetime import date
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+import httpx
+from rest_framework import status
+from rest_framework.test import APITestCase
+from nexus_domain.entities import Inventario as InventarioEntity
+from nexus_domain.exceptions import EntityNotFoundError
+from nexus_domain.use_cases import CreateOrUpdateInventarioUseCase
+from nexus_domain.value_objects import NIT, ProductCode, Quantity
+from apps.empresas.models import Empresa
+from apps.productos.models import Producto, PrecioMoneda, TasaCambio
+from .models import Inventario, MovimientoInventario
+from apps.core.container import container, request_scope
+from apps.core.query_budget import QueryBudgetTestMixin
+from .repositories import DjangoInventarioRepository
+from .unit_of_work import DjangoUnitOfWork
+from .views import InventarioViewSet
+
+User = get_user_model()
+
+
+class InventarioSnapshotTest(TestCase):
+    """Tests para la carga del snapshot columnar de inventario"""
+    
+    def setUp(self):
+        """Configuración inicial para cada test"""
+        self.empresa = Empresa.objects.create(
+            nit='900123456',
+            nombre='TechCorp',
+            direccion='Calle 123 #45-67',
+            telefono='3001234567'
+        )
+        self.producto_a = Producto.objects.create(
+            codigo='PROD-001', nombre='Laptop', empresa=self.empresa
+        )
+        self.producto_b = Producto.objects.create(
+            codigo='PROD-002', nombre='Mouse', empresa=self.empresa
+        )
+        PrecioMoneda.objects.create(producto=self.producto_a, moneda='COP', precio=Decimal('1000.00'))
+        PrecioMoneda.objects.create(producto=self.producto_a, moneda='USD', precio=Decimal('0.25'))
+        
+        Inventario.objects.create(empresa=self.empresa, producto=self.producto_a, cantidad=3)
+        Inventario.objects.create(empresa=self.empresa, producto=self.producto_b, cantidad=0)
+        self.repository = DjangoInventarioRepository()
+    
+    def test_load_snapshot_single_query(self):
+        """Test: El snapshot se carga en una sola consulta con precios pivotados"""
+        with self.assertNumQueries(1):
+            snapshot = self.repository.load_snapshot()
+        
+        self.assertEqual(len(snapshot), 2)
+        self.assertEqual(snapshot.total_cantidad(), 3)
+        self.assertEqual(snapshot.valuation('COP'), 3000.0)
+        self.assertEqual(snapshot.valuation('USD'), 0.75)
+        self.assertEqual(snapshot.stock_status_counts()['AGOTADO'], 1)
+    
+    def test_load_snapshot_converts_missing_prices(self):
+        """Test: Sin precio nativo en una moneda se convierte con la tasa de cambio"""
+        TasaCambio.objects.create(moneda='EUR', tasa=Decimal('4500'))
+        PrecioMoneda.objects.create(producto=self.producto_b, moneda='EUR', precio=Decimal('10.00'))
+        Inventario.objects.filter(producto=self.producto_b).update(cantidad=2)
+        
+        with self.assertNumQueries(1):
+            snapshot = self.repository.load_snapshot()
+        
+        # Laptop usa su precio COP nativo; Mouse convierte 10 EUR a COP
+        self.assertEqual(snapshot.valuation('COP'), 3000.0 + 2 * 45000.0)
+        # Sin tasa USD no se puede convertir el precio del Mouse
+        self.assertEqual(snapshot.valuation('USD'), 0.75)
+        # Laptop convierte 1000 COP a EUR
+        self.assertAlmostEqual(snapshot.valuation('EUR'), 3 * 0.22 + 2 * 10.0)
+    
+    def test_load_snapshot_by_empresa(self):
+        """Test: Filtrar snapshot por empresa"""
+        snapshot = self.repository.load_snapshot('999999999')
+        self.assertEqual(len(snapshot), 0)
+
+
+class InventarioPuntoReordenTest(TestCase):
+    """Tests para puntos de reorden por producto y empresa"""
+    
+    def setUp(self):
+        """Configuración inicial para cada test"""
+        self.empresa = Empresa.objects.create(
+            nit='900123456',
+            nombre='TechCorp',
+            direccion='Calle 123 #45-67',
+            telefono='3001234567',
+            punto_reorden=20
+        )
+        self.producto_a = Producto.objects.create(
+            codigo='PROD-001', nombre='Laptop', empresa=self.empresa, punto_reorden=5
+        )
+        self.producto_b = Producto.objects.create(
+            codigo='PROD-002', nombre='Mouse', empresa=self.empresa
+        )
+        self.inv_a = Inventario.objects.create(empresa=self.empresa, producto=self.producto_a, cantidad=8)
+        self.inv_b = Inventario.objects.create(empresa=self.empresa, producto=self.producto_b, cantidad=8)
+        self.repository = DjangoInventarioRepository()
+    
+    def test_punto_reorden_resuelto_al_crear(self):
+        """Test: Producto tiene prioridad sobre empresa"""
+        self.assertEqual(self.inv_a.punto_reorden, 5)
+        self.assertEqual(self.inv_b.punto_reorden, 20)
+    
+    def test_find_low_stock_usa_punto_reorden(self):
+        """Test: Sin threshold se compara contra el punto de reorden de cada item"""
+        low = self.repository.find_low_stock()
+        
+        self.assertEqual([str(inv.producto_codigo) for inv in low], ['PROD-002'])
+    
+    def test_find_low_stock_con_threshold_global(self):
+        """Test: Un threshold explícito mantiene el comportamiento global"""
+        low = self.repository.find_low_stock(threshold=10)
+        
+        self.assertEqual(len(low), 2)
+    
+    def test_cambio_en_producto_se_propaga(self):
+        """Test: Actualizar el punto de reorden del producto sincroniza el inventario"""
+        from apps.productos.repositories import DjangoProductoRepository
+        
+        producto_repo = DjangoProductoRepository()
+        producto = producto_repo.find_by_codigo('PROD-001')
+        producto.update_info(punto_reorden=50)
+        producto_repo.save(producto)
+        
+        self.inv_a.refresh_from_db()
+        self.assertEqual(self.inv_a.punto_reorden, 50)
+    
+    def test_cambio_en_empresa_respeta_producto(self):
+        """Test: El punto de reorden de la empresa no pisa el del producto"""
+        from apps.empresas.repositories import DjangoEmpresaRepository
+        
+        empresa_repo = DjangoEmpresaRepository()
+        empresa = empresa_repo.find_by_nit('900123456')
+        empresa.update_info(punto_reorden=3)
+        empresa_repo.save(empresa)
+        
+        self.inv_a.refresh_from_db()
+        self.inv_b.refresh_from_db()
+        self.assertEqual(self.inv_a.punto_reorden, 5)
+        self.assertEqual(self.inv_b.punto_reorden, 3)
+
+
+class InventarioMovimientosTest(TestCase):
+    """Tests para el historial de movimientos y el consumo derivado"""
+    
+    def setUp(self):
+        """Configuración inicial para cada test"""
+        self.empresa = Empresa.objects.create(
+            nit='900123456',
+            nombre='TechCorp',
+            direccion='Calle 123 #45-67',
+            telefono='3001234567'
+        )
+        self.producto = Producto.objects.create(
+            codigo='PROD-001', nombre='Laptop', empresa=self.empresa
+        )
+        self.inventario = Inventario.objects.create(
+            empresa=self.empresa, producto=self.producto, cantidad=100
+        )
+        self.repository = DjangoInventarioRepository()
+    
+    def test_cambios_de_cantidad_registran_movimientos(self):
+        """Test: Crear y cambiar la cantidad deja un movimiento por cambio"""
+        inventario = Inventario.objects.get(pk=self.inventario.pk)
+        inventario.cantidad = 70
+        inventario.save()
+        inventario.save()
+        
+        deltas = list(MovimientoInventario.objects.order_by('id').values_list('delta', flat=True))
+        self.assertEqual(deltas, [100, -30])
+    
+    def test_load_consumo_agrega_salidas_por_dia(self):
+        """Test: El consumo solo suma las salidas de stock"""
+        for cantidad in (90, 95, 80):
+            self.inventario.cantidad = cantidad
+            self.inventario.save()
+        
+        consumo = self.repository.load_consumo('900123456', date.today())
+        
+        self.assertEqual(len(consumo), 1)
+        self.assertEqual(consumo[0][0], 'PROD-001')
+        self.assertEqual(consumo[0][2], 25)
+
+
+class InventarioUnitOfWorkTest(TestCase):
+    """Tests para CreateOrUpdateInventarioUseCase con DjangoUnitOfWork"""
+    
+    def setUp(self):
+        """Configuración inicial para cada test"""
+        self.empresa = Empresa.objects.create(
+            nit='900123456',
+            nombre='TechCorp',
+            direccion='Calle 123 #45-67',
+            telefono='3001234567',
+            punto_reorden=15
+        )
+        self.producto = Producto.objects.create(
+            codigo='PROD-001', nombre='Laptop', empresa=self.empresa
+        )
+        self.otro = Producto.objects.create(
+            codigo='PROD-002', nombre='Mouse', empresa=self.empresa, punto_reorden=40
+        )
+        self.inventario = Inventario.objects.create(
+            empresa=self.empresa, producto=self.producto, cantidad=100
+        )
+        Empresa.objects.filter(nit='900123456').update(clasificacion_abc_vigente=True)
+    
+    def _use_case(self):
+        use_case = container.resolve(CreateOrUpdateInventarioUseCase)
+        self.assertIsInstance(use_case.unit_of_work, DjangoUnitOfWork)
+        return use_case
+    
+    def test_update_in_one_batch(self):
+        """Test: Actualizar lee cada entidad una vez y escribe cantidad, movimiento y ABC"""
+        with request_scope():
+            use_case = self._use_case()
+            with self.assertNumQueries(8):
+                # empresa, producto e inventario; SAVEPOINT, UPDATE, INSERT, UPDATE, RELEASE
+                inventario = use_case.execute('900123456', 'PROD-001', 70)
+        
+        self.assertEqual(inventario.id, str(self.inventario.pk))
+        self.assertEqual(Inventario.objects.get(pk=self.inventario.pk).cantidad, 70)
+        self.assertEqual(
+            list(MovimientoInventario.objects.order_by('id').values_list('delta', flat=True)), [100, -30]
+        )
+        self.assertFalse(Empresa.objects.get(nit='900123456').clasificacion_abc_vigente)
+    
+    def test_create_resolves_punto_reorden(self):
+        """Test: Crear asigna id y punto de reorden sin volver a consultar empresa ni producto"""
+        with request_scope():
+            guardado = self._use_case().execute_detailed('900123456', 'PROD-002', 5)
+        inventario = guardado.inventario
+        self.assertTrue(guardado.creado)
+        
+        orm_obj = Inventario.objects.get(pk=int(inventario.id))
+        self.assertEqual((orm_obj.cantidad, orm_obj.punto_reorden), (5, 40))
+        self.assertEqual(inventario.punto_reorden, 40)
+        self.assertEqual(orm_obj.movimientos.get().delta, 5)
+    
+    def test_unchanged_quantity_writes_nothing(self):
+        """Test: Sin cambio de cantidad no hay escrituras"""
+        with request_scope():
+            use_case = self._use_case()
+            with self.assertNumQueries(3):
+                use_case.execute('900123456', 'PROD-001', 100)
+        
+        self.assertTrue(Empresa.objects.get(nit='900123456').clasificacion_abc_vigente)
+
+    def test_concurrent_create_updates_existing_row(self):
+        """Test: Si otra petición crea el registro antes del commit se actualiza el suyo"""
+        with request_scope():
+            unit_of_work = self._use_case().unit_of_work
+            with unit_of_work:
+                self.assertIsNone(unit_of_work.get_inventario('900123456', 'PROD-002'))
+                otro = Inventario.objects.create(empresa=self.empresa, producto=self.otro, cantidad=30)
+                inventario = InventarioEntity(None, NIT('900123456'), ProductCode('PROD-002'), Quantity(50))
+                unit_of_work.add(inventario)
+
+        self.assertEqual(inventario.id, str(otro.pk))
+        self.assertFalse(unit_of_work.was_created(inventario))
+        self.assertEqual(Inventario.objects.get(pk=otro.pk).cantidad, 50)
+        self.assertEqual(
+            list(otro.movimientos.order_by('id').values_list('cantidad_anterior', 'delta')),
+            [(0, 30), (30, 20)]
+        )
+
+    def test_deleted_producto_raises_not_found(self):
+        """Test: Un producto eliminado después de leerlo es EntityNotFoundError, no un error 500"""
+        with request_scope():
+            unit_of_work = self._use_case().unit_of_work
+            self.assertIsNotNone(unit_of_work.get_producto('PROD-002'))
+            Producto.objects.filter(codigo='PROD-002').delete()
+            unit_of_work.add(InventarioEntity(None, NIT('900123456'), ProductCode('PROD-002'), Quantity(5)))
+            with self.assertRaises(EntityNotFoundError):
+                unit_of_work.commit()
+
+        self.assertFalse(Inventario.objects.filter(producto_id='PROD-002').exists())
+
+
+class InventarioForecastAPITest(APITestCase):
+    """Tests para el endpoint de pronóstico de demanda"""
+    
+    def setUp(self):
+        """Configuración inicial para cada test de API"""
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='admin123',
+            role='ADMIN'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        
+        empresa = Empresa.objects.create(
+            nit='900123456',
+            nombre='TechCorp',
+            direccion='Calle 123 #45-67',
+            telefono='3001234567'
+        )
+        producto = Producto.objects.create(codigo='PROD-001', nombre='Laptop', empresa=empresa)
+        inventario = Inventario.objects.create(empresa=empresa, producto=producto, cantidad=80)
+        inventario.cantidad = 50
+        inventario.save()
+        # Día local (TruncDate usa TIME_ZONE) del movimiento registrado
+        self.hasta = timezone.localdate(inventario.movimientos.latest('fecha').fecha)
+        
+        self.url = reverse('inventario-forecast')
+    
+    def test_forecast_por_empresa(self):
+        """Test: El pronóstico usa el consumo registrado"""
+        response = self.client.get(self.url, {
+            'empresa': '900123456', 'metodo': 'sma', 'ventana': 1,
+            'periodos': 1, 'dias_periodo': 1, 'hasta': self.hasta.isoformat()
+        })
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['producto_codigo'], 'PROD-001')
+        self.assertEqual(response.data[0]['demanda'], 30.0)
+        self.assertEqual(response.data[0]['cantidad'], 50)
+    
+    def test_forecast_requiere_empresa(self):
+        """Test: Sin empresa el endpoint responde 400"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_forecast_periodos_acotados(self):
+        """Test: Periodos fuera de rango o fecha inválida responden 400"""
+        for params in ({'periodos': 10 ** 9}, {'dias_periodo': 10 ** 6}, {'periodos': 0},
+                       {'hasta': 'ayer'}, {'lead_time': 'inf'}, {'lead_time': 'nan'}):
+            response = self.client.get(self.url, {'empresa': '900123456', **params})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+    
+    def test_forecast_empresa_inexistente(self):
+        """Test: Empresa inexistente responde 404"""
+        response = self.client.get(self.url, {'empresa': '999999999'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class InventarioClasificacionABCTest(TestCase):
+    """Tests para la clasificación ABC persistida e incremental"""
+    
+    def setUp(self):
+        """Configuración inicial para cada test"""
+        self.empresa = Empresa.objects.create(
+            nit='900123456',
+            nombre='TechCorp',
+            direccion='Calle 123 #45-67',
+            telefono='3001234567'
+        )
+        self.items = {}
+        for codigo, cantidad, precio in (('PROD-001', 10, 800), ('PROD-002', 10, 150), ('PROD-003', 10, 50)):
+            producto = Producto.objects.create(codigo=codigo, nombre=f'Producto {codigo}', empresa=self.empresa)
+            PrecioMoneda.objects.create(producto=producto, moneda='COP', precio=Decimal(precio))
+            self.items[codigo] = Inventario.objects.create(
+                empresa=self.empresa, producto=producto, cantidad=cantidad
+            )
+        self.repository = DjangoInventarioRepository()
+    
+    def _clases(self):
+        return dict(Inventario.objects.values_list('producto_id', 'clase_abc'))
+    
+    def _refresh(self):
+        from nexus_domain.use_cases import RefreshABCClassificationUseCase
+        return RefreshABCClassificationUseCase(self.repository).execute('900123456')
+    
+    def test_clasificacion_y_filtro(self):
+        """Test: Clasificar persiste la clase y permite filtrar por ella"""
+        self.assertEqual(self._refresh(), ['900123456'])
+        
+        self.assertEqual(self._clases(), {'PROD-001': 'A', 'PROD-002': 'B', 'PROD-003': 'C'})
+        low = self.repository.find_by_clase_abc('A', '900123456')
+        self.assertEqual([str(inv.producto_codigo) for inv in low], ['PROD-001'])
+    
+    def test_reclasificacion_solo_si_hay_cambios(self):
+        """Test: Sin cambios no se recalcula; un cambio de cantidad invalida la empresa"""
+        self._refresh()
+        self.assertEqual(self._refresh(), [])
+        
+        item = Inventario.objects.get(pk=self.items['PROD-003'].pk)
+        item.cantidad = 1000
+        item.save()
+        
+        self.assertEqual(self._refresh(), ['900123456'])
+        self.assertEqual(self._clases()['PROD-003'], 'A')
+    
+    def test_cambio_de_precio_invalida_clasificacion(self):
+        """Test: Cambiar un precio marca la empresa como pendiente"""
+        self._refresh()
+        
+        precio = PrecioMoneda.objects.get(producto_id='PROD-002', moneda='COP')
+        precio.precio = Decimal('5000')
+        precio.save()
+        
+        self.assertEqual(self.repository.find_stale_abc_empresas(), ['900123456'])
+        self._refresh()
+        self.assertEqual(self._clases()['PROD-002'], 'A')
+    
+    def test_cambio_durante_clasificacion_queda_pendiente(self):
+        """Test: Un cambio posterior a leer el snapshot no se pierde al marcar vigente"""
+        load_snapshot = self.repository.load_snapshot
+        
+        def load_snapshot_y_cambio(empresa_nit=None):
+            snapshot = load_snapshot(empresa_nit)
+            item = Inventario.objects.get(pk=self.items['PROD-003'].pk)
+            item.cantidad = 1000
+            item.save()
+            return snapshot
+        
+        with mock.patch.object(self.repository, 'load_snapshot', load_snapshot_y_cambio):
+            self.assertEqual(self._refresh(), ['900123456'])
+        
+        self.assertEqual(self.repository.find_stale_abc_empresas(), ['900123456'])
+        self._refresh()
+        self.assertEqual(self._clases()['PROD-003'], 'A')
+    
+    def test_reclasificacion_conserva_parametros(self):
+        """Test: La reclasificación usa los umbrales guardados al clasificar"""
+        from nexus_domain.analytics import ABCClassifier
+        from nexus_domain.use_cases import ClassifyABCUseCase
+        from apps.empresas.repositories import DjangoEmpresaRepository
+        classifier = ABCClassifier(umbral_a=0.9, umbral_b=0.99, moneda='COP')
+        ClassifyABCUseCase(self.repository, DjangoEmpresaRepository()).execute('900123456', classifier)
+        self.assertEqual(self._clases()['PROD-002'], 'A')
+        
+        Inventario.invalidar_clasificacion_abc(nit='900123456')
+        self.assertEqual(self._refresh(), ['900123456'])
+        
+        self.assertEqual(self._clases(), {'PROD-001': 'A', 'PROD-002': 'A', 'PROD-003': 'B'})
+        self.assertEqual(self.repository.find_abc_classifier('900123456'), classifier)
+    
+    def test_comando_reclasificar_abc(self):
+        """Test: El comando reclasifica solo las empresas pendientes"""
+        out = io.StringIO()
+        call_command('reclasificar_abc', '--empresa', '900123456', stdout=out)
+        self.assertIn('1 empresas reclasificadas', out.getvalue())
+        self.assertEqual(self._clases(), {'PROD-001': 'A', 'PROD-002': 'B', 'PROD-003': 'C'})
+        
+        out = io.StringIO()
+        call_command('reclasificar_abc', stdout=out)
+        self.assertIn('0 empresas reclasificadas', out.getvalue())
+
+
+class InventarioQueryBudgetTest(QueryBudgetTestMixin, APITestCase):
+    """Tests de presupuesto de consultas para el API de Inventario"""
+    
+    def setUp(self):
+        """Varios registros de inventario para detectar consultas N+1"""
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='admin123',
+            role='ADMIN'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        
+        empresa = Empresa.objects.create(
+            nit='900123456',
+            nombre='TechCorp',
+            direccion='Calle 123 #45-67',
+            telefono='3001234567'
+        )
+        for i in range(5):
+            producto = Producto.objects.create(codigo=f'PROD-00{i}', nombre='Laptop', empresa=empresa)
+            self.inventario = Inventario.objects.create(empresa=empresa, producto=producto, cantidad=i)
+        self.list_url = reverse('inventario-list')
+    
+    def test_budgets_declared(self):
+        """Test: list y retrieve declaran presupuesto"""
+        self.assertBudgetsDeclared(InventarioViewSet, ('list', 'retrieve', 'low_stock'))
+    
+    def test_list_within_budget(self):
+        """Test: Listar inventario (todo y por empresa)"""
+        for params in ({}, {'empresa': '900123456'}):
+            response = self.assertQueryBudget(
+                InventarioViewSet, 'list', lambda: self.client.get(self.list_url, params)
+            )
+            self.assertEqual(len(response.data), 5)
+    
+    def test_list_by_clase_abc_within_budget(self):
+        """Test: Filtrar por clase ABC usa la clasificación persistida"""
+        call_command('reclasificar_abc', stdout=io.StringIO())
+        
+        response = self.assertQueryBudget(
+            InventarioViewSet, 'list', lambda: self.client.get(self.list_url, {'clase_abc': 'C'})
+        )
+        self.assertEqual(len(response.data), 5)
+    
+    def test_retrieve_within_budget(self):
+        """Test: Obtener un registro de inventario"""
+        url = reverse('inventario-detail', kwargs={'pk': self.inventario.pk})
+        response = self.assertQueryBudget(InventarioViewSet, 'retrieve', lambda: self.client.get(url))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_low_stock_within_budget(self):
+        """Test: Listar items con stock bajo"""
+        response = self.assertQueryBudget(
+            InventarioViewSet, 'low_stock',
+            lambda: self.client.get(reverse('inventario-low-stock'))
+        )
+        self.assertEqual(len(response.data), 5)
+
+
+class InventarioExportTest(APITestCase):
+    """Tests para la exportación masiva del inventario"""
+    
+    def setUp(self):
+        admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='admin123',
+            role='ADMIN'
+        )
+        self.client.force_authenticate(user=admin_user)
+        
+        empresa = Empresa.objects.create(
+            nit='900123456',
+            nombre='TechCorp',
+            direccion='Calle 123 #45-67',
+            telefono='3001234567'
+        )
+        producto = Producto.objects.create(codigo='PROD-001', nombre='Laptop', empresa=empresa)
+        PrecioMoneda.objects.create(producto=producto, moneda='COP', precio=Decimal('1000.00'))
+        PrecioMoneda.objects.create(producto=producto, moneda='USD', precio=Decimal('0.25'))
+        Inventario.objects.create(empresa=empresa, producto=producto, cantidad=5)
+        self.url = reverse('inventario-export')
+    
+    def test_export_csv_pivota_precios(self):
+        """Test: CSV en streaming con una columna por moneda"""
+        response = self.client.get(self.url, {'format': 'csv'})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['producto_codigo'], 'PROD-001')
+        self.assertEqual(Decimal(rows[0]['precio_cop']), Decimal('1000'))
+        self.assertEqual(Decimal(rows[0]['precio_usd']), Decimal('0.25'))
+        self.assertEqual(rows[0]['precio_eur'], '')
+    
+    def test_export_filtra_por_empresa(self):
+        """Test: Solo el encabezado si la empresa no tiene inventario"""
+        response = self.client.get(self.url, {'format': 'csv', 'empresa': '900999999'})
+        
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+    
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow no instalado')
+    def test_export_parquet(self):
+        """Test: Parquet con tipos decimales y la misma columna por moneda"""
+        import pyarrow.parquet as pq
+        
+        response = self.client.get(self.url, {'format': 'parquet'})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        table = pq.read_table(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(table.column('cantidad').to_pylist(), [5])
+        self.assertEqual(table.column('precio_usd').to_pylist(), [Decimal('0.25')])
+
+
+class InventarioEmailTest(APITestCase):
+    """Tests para el envío del PDF por email (vista async)"""
+    
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='admin123',
+            role='ADMIN'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        self.url = reverse('inventario-send-email')
+        
+        pdf = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
+        pdf.write(b'%PDF-1.4')
+        pdf.close()
+        self.pdf_path = pdf.name
+        self.addCleanup(os.remove, pdf.name)
+    
+    @mock.patch.dict('os.environ', {'MAILERSEND_API_KEY': 'test-key'})
+    def test_send_email(self):
+        """Test: Genera el PDF y lo envía con el cliente HTTP async"""
+        respuesta = httpx.Response(202, headers={'X-Message-Id': 'msg-1'})
+        with mock.patch('apps.inventario.services.pdf_generator.generate_inventory_pdf',
+                        return_value=self.pdf_path) as generar, \
+                mock.patch.object(httpx.AsyncClient, 'post', new=mock.AsyncMock(return_value=respuesta)) as post:
+            response = self.client.post(self.url, {'email': 'gerencia@example.com', 'empresa': '900123456'})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        generar.assert_called_once_with('900123456')
+        self.assertEqual(post.await_args.kwargs['json']['to'][0]['email'], 'gerencia@example.com')
+    
+    def test_send_email_requires_email(self):
+        """Test: Sin destinatario responde 400"""
+        response = self.client.post(self.url, {})
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_send_email_solo_admin(self):
+        """Test: Un usuario externo no puede enviar el PDF"""
+        externo = User.objects.create_user(
+            username='externo',
+            email='externo@example.com',
+            password='externo123',
+            role='EXTERNO'
+        )
+        self.client.force_authenticate(user=externo)
+        
+        response = self.client.post(self.url, {'email': 'gerencia@example.com'})
+        
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
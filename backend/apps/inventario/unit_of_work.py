@@ -0,0 +1,166 @@
+"""
+Unidad de trabajo Django para los casos de uso de inventario
+
+DjangoUnitOfWork lee con los repositorios del contenedor (empresas y
+productos pasan por la caché) y al confirmar escribe todos los registros
+pendientes en una transacción, por lotes y sin volver a consultar empresa ni
+producto:
+- un INSERT ... ON CONFLICT DO NOTHING para los registros nuevos (con una
+  cantidad marcador y el punto de reorden resuelto desde las entidades ya
+  leídas) y un SELECT ... FOR UPDATE que los relee: las filas con el
+  marcador son las creadas por esta unidad (was_created); si otra petición
+  creó el registro entre la lectura y el commit se actualiza el suyo, con
+  su cantidad como anterior del movimiento
+- un UPDATE para los registros creados y los que cambiaron de cantidad
+- un INSERT para los movimientos y un UPDATE que invalida la clasificación
+  ABC de las empresas afectadas
+
+Reemplaza lo que Inventario.save hace registro a registro; bulk_create y
+bulk_update no llaman a save() ni emiten señales.
+
+Las llaves foráneas se verifican al confirmar: una empresa o un producto
+eliminado después de leerlo se traduce a EntityNotFoundError, también
+cuando la unidad corre dentro de una transacción externa.
+"""
+from datetime import datetime
+from functools import reduce
+from operator import or_
+from typing import Dict, List, Tuple
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from apps.core.upsert import is_foreign_key_violation
+from nexus_domain.entities import Inventario as InventarioEntity
+from nexus_domain.exceptions import EntityNotFoundError
+from nexus_domain.repositories import UnitOfWork
+from .orm_models import Inventario as InventarioORM, MovimientoInventario
+
+
+# Cantidad de una fila recién insertada hasta el UPDATE de la misma
+# transacción; ninguna fila confirmada la tiene (la cantidad no es negativa)
+SIN_ESCRIBIR = -1
+
+
+class DjangoUnitOfWork(UnitOfWork):
+    """Unidad de trabajo con escrituras por lotes al confirmar"""
+
+    def _flush(self, pendientes: List[InventarioEntity]) -> None:
+        ahora = timezone.now()
+        nuevos: List[Tuple[InventarioEntity, InventarioORM]] = []
+        # (entidad, registro ORM, cantidad anterior)
+        cambiados: List[Tuple[InventarioEntity, InventarioORM, int]] = []
+        otros: List[InventarioEntity] = []
+        for inventario in pendientes:
+            anterior = self.cantidad_leida(inventario)
+            if inventario.id is None:
+                nuevos.append((inventario, self._nuevo(inventario)))
+            elif anterior is None:
+                # Leído fuera de la unidad: sin cantidad anterior para el movimiento
+                otros.append(inventario)
+            elif int(inventario.cantidad) != anterior:
+                orm_obj = InventarioORM(id=int(inventario.id), cantidad=int(inventario.cantidad), updated_at=ahora)
+                cambiados.append((inventario, orm_obj, anterior))
+
+        if not (nuevos or cambiados or otros):
+            return
+        
+        # Dentro de una transacción externa las llaves foráneas se verifican
+        # al confirmarla: se fuerza la verificación antes de salir
+        anidada = connection.in_atomic_block
+        try:
+            with transaction.atomic():
+                if nuevos:
+                    cambiados += self._crear(nuevos, ahora)
+                if cambiados:
+                    InventarioORM.objects.bulk_update(
+                        [orm_obj for _, orm_obj, _ in cambiados], ['cantidad', 'updated_at']
+                    )
+                # Un registro creado en cantidad 0 no deja movimiento
+                movimientos = [
+                    (inventario, orm_obj, anterior) for inventario, orm_obj, anterior in cambiados
+                    if orm_obj.cantidad != anterior
+                ]
+                if movimientos:
+                    MovimientoInventario.objects.bulk_create([
+                        MovimientoInventario(
+                            inventario_id=orm_obj.id,
+                            cantidad_anterior=anterior,
+                            cantidad_nueva=orm_obj.cantidad,
+                            delta=orm_obj.cantidad - anterior
+                        )
+                        for _, orm_obj, anterior in movimientos
+                    ])
+                    InventarioORM.invalidar_clasificacion_abc(nit__in={
+                        str(inventario.empresa_nit) for inventario, _, _ in movimientos
+                    })
+                for inventario in otros:
+                    self._save(inventario)
+                if nuevos and anidada:
+                    connection.check_constraints(
+                        table_names=[InventarioORM._meta.db_table]
+                    )
+        except IntegrityError as e:
+            if is_foreign_key_violation(e):
+                raise EntityNotFoundError("Empresa o producto no encontrado al guardar inventario") from e
+            raise
+        
+        for inventario, _, _ in cambiados:
+            inventario.updated_at = ahora
+    
+    def _crear(self, nuevos: List[Tuple[InventarioEntity, InventarioORM]],
+               ahora: datetime) -> List[Tuple[InventarioEntity, InventarioORM, int]]:
+        """
+        Insertar los registros que no existen y bloquear todos los de nuevos
+        
+        Retorna (entidad, registro ORM a actualizar, cantidad anterior) de los
+        creados y de los que cambian de cantidad, y copia a las entidades lo
+        asignado en la base de datos (id, punto de reorden, fecha de creación).
+        """
+        cantidades: Dict[Tuple[str, str], int] = {}
+        for _, orm_obj in nuevos:
+            cantidades[orm_obj.empresa_id, orm_obj.producto_id] = orm_obj.cantidad
+            orm_obj.cantidad = SIN_ESCRIBIR
+        InventarioORM.objects.bulk_create([orm_obj for _, orm_obj in nuevos], ignore_conflicts=True)
+        filas = {
+            (fila.empresa_id, fila.producto_id): fila
+            for fila in InventarioORM.objects.select_for_update().filter(reduce(or_, (
+                Q(empresa_id=empresa_id, producto_id=producto_id)
+                for empresa_id, producto_id in cantidades
+            )))
+        }
+        
+        cambiados: List[Tuple[InventarioEntity, InventarioORM, int]] = []
+        for inventario, orm_obj in nuevos:
+            clave = (orm_obj.empresa_id, orm_obj.producto_id)
+            fila = filas[clave]
+            inventario.id = str(fila.id)
+            inventario.punto_reorden = fila.punto_reorden
+            inventario.created_at = fila.fecha_registro
+            inventario.updated_at = fila.updated_at
+            if fila.cantidad == SIN_ESCRIBIR:
+                self._creados.append(inventario)
+                anterior = 0
+            elif cantidades[clave] != fila.cantidad:
+                anterior = fila.cantidad
+            else:
+                continue
+            orm_obj = InventarioORM(id=fila.id, cantidad=cantidades[clave], updated_at=ahora)
+            cambiados.append((inventario, orm_obj, anterior))
+        return cambiados
+    
+    def _nuevo(self, inventario: InventarioEntity) -> InventarioORM:
+        """Registro ORM nuevo con el punto de reorden efectivo (producto > empresa > defecto)"""
+        empresa = self.get_empresa(inventario.empresa_nit)
+        producto = self.get_producto(inventario.producto_codigo)
+        if empresa is None or producto is None:
+            raise ValueError(
+                f"Empresa o producto no encontrado: {inventario.empresa_nit}, {inventario.producto_codigo}"
+            )
+        return InventarioORM(
+            empresa_id=str(inventario.empresa_nit),
+            producto_id=str(inventario.producto_codigo),
+            cantidad=int(inventario.cantidad),
+            punto_reorden=InventarioEntity.resolve_punto_reorden(
+                producto.punto_reorden, empresa.punto_reorden
+            )
+        )
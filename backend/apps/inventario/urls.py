@@ -1,10 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import InventarioViewSet
+from .views import InventarioEmailAPIView, InventarioViewSet
 
 router = DefaultRouter()
 router.register(r'', InventarioViewSet, basename='inventario')
 
 urlpatterns = [
+    # Antes del router: su ruta de detalle tomaría send_email como pk
+    path('send_email/', InventarioEmailAPIView.as_view(), name='inventario-send-email'),
     path('', include(router.urls)),
 ]
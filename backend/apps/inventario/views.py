@@ -3,9 +3,12 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.http import FileResponse
+from django.utils import timezone
 from drf_spectacular.utils import extend_schema, OpenApiParameter, inline_serializer
 from drf_spectacular.types import OpenApiTypes
 from rest_framework import serializers as s
+from asgiref.sync import sync_to_async
+from datetime import date
 import os
 
 # Domain imports
@@ -15,8 +18,12 @@ from nexus_domain.use_cases.inventario_use_cases import (
     AddStockUseCase,
     RemoveStockUseCase,
     DeleteInventarioUseCase,
-    GetLowStockItemsUseCase
+    GetLowStockItemsUseCase,
+    ForecastDemandUseCase,
+    ClassifyABCUseCase
 )
+from nexus_domain.analytics import ABCClassifier, DemandForecaster, MAX_DIAS_PERIODO, MAX_PERIODOS
+from nexus_domain.interfaces import IEmpresaRepository, IInventarioRepository, IProductoRepository
 from nexus_domain.exceptions import (
     DomainException,
     ValidationError,
@@ -27,10 +34,12 @@ from nexus_domain.exceptions import (
 )
 
 from apps.authentication.permissions import IsAdminUser
-from apps.empresas.repositories import DjangoEmpresaRepository
-from apps.productos.repositories import DjangoProductoRepository
+from apps.core.async_views import AsyncAPIView
+from apps.core.container import container
+from apps.core.exporters import EXPORT_FORMATS, EXPORT_RENDERERS, export_response
+from apps.core.query_budget import query_budget
+from .exports import inventario_export
 from .orm_models import Inventario
-from .repositories import DjangoInventarioRepository
 
 
 @extend_schema(tags=['Inventario'])
@@ -42,16 +51,16 @@ class InventarioViewSet(viewsets.ModelViewSet):
     """
     permission_classes = [IsAdminUser]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['empresa', 'producto']
+    filterset_fields = ['empresa', 'producto', 'clase_abc']
     search_fields = ['empresa__nombre', 'producto__nombre']
     ordering_fields = ['fecha_registro', 'cantidad']
     
     def _get_repositories(self):
-        """Obtener instancias de los repositorios"""
+        """Repositorios del contenedor de dependencias"""
         return (
-            DjangoInventarioRepository(),
-            DjangoEmpresaRepository(),
-            DjangoProductoRepository()
+            container.resolve(IInventarioRepository),
+            container.resolve(IEmpresaRepository),
+            container.resolve(IProductoRepository)
         )
     
     def _handle_domain_exception(self, exception: DomainException) -> Response:
@@ -76,8 +85,10 @@ class InventarioViewSet(viewsets.ModelViewSet):
         parameters=[
             OpenApiParameter(name='empresa', description='Filtrar por NIT de empresa', type=OpenApiTypes.STR),
             OpenApiParameter(name='producto', description='Filtrar por código de producto', type=OpenApiTypes.STR),
+            OpenApiParameter(name='clase_abc', description='Filtrar por clase ABC (A, B o C)', type=OpenApiTypes.STR),
         ]
     )
+    @query_budget(2)
     def list(self, request, *args, **kwargs):
         """Listar inventario usando caso de uso"""
         try:
@@ -86,9 +97,13 @@ class InventarioViewSet(viewsets.ModelViewSet):
             
             # Obtener parámetros
             empresa_nit = request.query_params.get('empresa')
+            clase_abc = request.query_params.get('clase_abc')
             
             # GetInventarioUseCase solo acepta empresa_nit, no paginación
-            if empresa_nit:
+            if clase_abc:
+                # Clasificación persistida; la recalcula el comando reclasificar_abc
+                inventarios = use_case.execute(empresa_nit=empresa_nit, clase_abc=clase_abc)
+            elif empresa_nit:
                 inventarios = use_case.execute(empresa_nit=empresa_nit)
             else:
                 inventarios = use_case.execute()
@@ -106,8 +121,7 @@ class InventarioViewSet(viewsets.ModelViewSet):
     def create(self, request, *args, **kwargs):
         """Crear inventario usando caso de uso"""
         try:
-            inventario_repo, empresa_repo, producto_repo = self._get_repositories()
-            use_case = CreateOrUpdateInventarioUseCase(inventario_repo, empresa_repo, producto_repo)
+            use_case = container.resolve(CreateOrUpdateInventarioUseCase)
             
             inventario = use_case.execute(
                 empresa_nit=request.data.get('empresa'),
@@ -124,18 +138,21 @@ class InventarioViewSet(viewsets.ModelViewSet):
         summary="Obtener registro de inventario",
         description="Obtener detalles de un registro específico de inventario"
     )
+    @query_budget(1)
     def retrieve(self, request, *args, **kwargs):
         """Obtener inventario usando ORM directo (mantener compatibilidad con IDs)"""
         try:
             inventario_id = kwargs.get('pk')
-            orm_obj = Inventario.objects.select_related('empresa', 'producto').get(id=inventario_id)
+            orm_obj = Inventario.objects.get(id=inventario_id)
             
             # Convertir a formato compatible
             data = {
                 'id': orm_obj.id,
-                'empresa': orm_obj.empresa.nit,
-                'producto': orm_obj.producto.codigo,
+                'empresa': orm_obj.empresa_id,
+                'producto': orm_obj.producto_id,
                 'cantidad': orm_obj.cantidad,
+                'punto_reorden': orm_obj.punto_reorden,
+                'clase_abc': orm_obj.clase_abc,
                 'fecha_registro': orm_obj.fecha_registro,
                 'updated_at': orm_obj.updated_at
             }
@@ -155,8 +172,7 @@ class InventarioViewSet(viewsets.ModelViewSet):
     def update(self, request, *args, **kwargs):
         """Actualizar inventario usando caso de uso"""
         try:
-            inventario_repo, empresa_repo, producto_repo = self._get_repositories()
-            use_case = CreateOrUpdateInventarioUseCase(inventario_repo, empresa_repo, producto_repo)
+            use_case = container.resolve(CreateOrUpdateInventarioUseCase)
             
             inventario = use_case.execute(
                 empresa_nit=request.data.get('empresa'),
@@ -199,6 +215,158 @@ class InventarioViewSet(viewsets.ModelViewSet):
         except DomainException as e:
             return self._handle_domain_exception(e)
     
+    @extend_schema(
+        summary="Listar items con stock bajo",
+        description="Items con cantidad por debajo de su punto de reorden, o de un threshold global si se indica",
+        parameters=[
+            OpenApiParameter(
+                name='threshold',
+                description='Threshold global (opcional); por defecto el punto de reorden de cada item',
+                required=False,
+                type=OpenApiTypes.INT
+            ),
+        ]
+    )
+    @action(detail=False, methods=['get'])
+    @query_budget(1)
+    def low_stock(self, request):
+        """Listar items con stock bajo usando caso de uso"""
+        threshold = request.query_params.get('threshold')
+        if threshold is not None and not threshold.isdigit():
+            return Response(
+                {'error': 'threshold debe ser un entero no negativo'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            inventario_repo, _, _ = self._get_repositories()
+            use_case = GetLowStockItemsUseCase(inventario_repo)
+            
+            inventarios = use_case.execute(
+                threshold=int(threshold) if threshold is not None else None
+            )
+            
+            data = [inv.to_dict() for inv in inventarios]
+            return Response(data, status=status.HTTP_200_OK)
+            
+        except DomainException as e:
+            return self._handle_domain_exception(e)
+    
+    @extend_schema(
+        summary="Pronóstico de demanda y puntos de reorden",
+        description="Demanda esperada, stock de seguridad y punto de reorden por SKU de una empresa, "
+                    "calculados desde el historial de movimientos de inventario",
+        parameters=[
+            OpenApiParameter(name='empresa', description='NIT de la empresa', required=True, type=OpenApiTypes.STR),
+            OpenApiParameter(name='metodo', description='sma (promedio móvil) o ses (suavizado exponencial)', type=OpenApiTypes.STR),
+            OpenApiParameter(name='periodos', description=f'Número de periodos de historia (defecto 12, máximo {MAX_PERIODOS})', type=OpenApiTypes.INT),
+            OpenApiParameter(name='dias_periodo', description=f'Días por periodo (defecto 7, máximo {MAX_DIAS_PERIODO})', type=OpenApiTypes.INT),
+            OpenApiParameter(name='hasta', description='Último día de la historia, AAAA-MM-DD (defecto hoy)', type=OpenApiTypes.DATE),
+            OpenApiParameter(name='ventana', description='Periodos del promedio móvil (defecto 4)', type=OpenApiTypes.INT),
+            OpenApiParameter(name='alpha', description='Factor de suavizado (defecto 0.3)', type=OpenApiTypes.FLOAT),
+            OpenApiParameter(name='lead_time', description='Tiempo de reposición en periodos (defecto 1)', type=OpenApiTypes.FLOAT),
+            OpenApiParameter(name='nivel_servicio', description='Nivel de servicio (defecto 0.95)', type=OpenApiTypes.FLOAT),
+        ]
+    )
+    @action(detail=False, methods=['get'])
+    def forecast(self, request):
+        """Pronosticar demanda usando caso de uso"""
+        params = request.query_params
+        empresa_nit = params.get('empresa')
+        if not empresa_nit:
+            return Response(
+                {'error': 'El parámetro empresa es requerido'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            periodos = int(params.get('periodos', 12))
+            dias_periodo = int(params.get('dias_periodo', 7))
+            hasta = date.fromisoformat(params['hasta']) if params.get('hasta') else timezone.localdate()
+            opciones = {
+                'metodo': params.get('metodo', 'ses'),
+                'ventana': int(params.get('ventana', 4)),
+                'alpha': float(params.get('alpha', 0.3)),
+                'lead_time': float(params.get('lead_time', 1)),
+                'nivel_servicio': float(params.get('nivel_servicio', 0.95)),
+            }
+        except ValueError:
+            return Response(
+                {'error': 'Parámetros numéricos inválidos'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            inventario_repo, empresa_repo, _ = self._get_repositories()
+            use_case = ForecastDemandUseCase(inventario_repo, empresa_repo)
+            
+            result = use_case.execute(
+                empresa_nit=empresa_nit,
+                periodos=periodos,
+                dias_periodo=dias_periodo,
+                forecaster=DemandForecaster(**opciones),
+                hasta=hasta
+            )
+            
+            return Response(result.to_dicts(), status=status.HTTP_200_OK)
+            
+        except DomainException as e:
+            return self._handle_domain_exception(e)
+    
+    @extend_schema(
+        summary="Clasificación ABC del inventario",
+        description=(
+            "Recalcular y guardar la clase ABC (Pareto por valor) de cada registro de una empresa. "
+            "Los umbrales y la moneda enviados quedan guardados para las reclasificaciones periódicas"
+        ),
+        request=inline_serializer(
+            name='ABCRequest',
+            fields={
+                'empresa': s.CharField(help_text='NIT de la empresa'),
+                'moneda': s.CharField(required=False, help_text='Moneda de valoración (defecto COP)'),
+                'umbral_a': s.FloatField(required=False, help_text='Participación acumulada clase A (defecto 0.8)'),
+                'umbral_b': s.FloatField(required=False, help_text='Participación acumulada clase B (defecto 0.95)'),
+            }
+        )
+    )
+    @action(detail=False, methods=['post'])
+    def abc(self, request):
+        """Clasificar inventario de una empresa usando caso de uso"""
+        empresa_nit = request.data.get('empresa')
+        if not empresa_nit:
+            return Response(
+                {'error': 'El campo empresa es requerido'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Sin parámetros se usan los guardados para la empresa
+        classifier = None
+        try:
+            if any(campo in request.data for campo in ('umbral_a', 'umbral_b', 'moneda')):
+                classifier = ABCClassifier(
+                    umbral_a=float(request.data.get('umbral_a', 0.8)),
+                    umbral_b=float(request.data.get('umbral_b', 0.95)),
+                    moneda=request.data.get('moneda', 'COP')
+                )
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'Umbrales inválidos'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except DomainException as e:
+            return self._handle_domain_exception(e)
+        
+        try:
+            inventario_repo, empresa_repo, _ = self._get_repositories()
+            use_case = ClassifyABCUseCase(inventario_repo, empresa_repo)
+            
+            result = use_case.execute(empresa_nit=empresa_nit, classifier=classifier)
+            
+            return Response(result, status=status.HTTP_200_OK)
+            
+        except DomainException as e:
+            return self._handle_domain_exception(e)
+    
     @extend_schema(
         summary="Exportar inventario a PDF",
         description="Generar y descargar un PDF con el inventario. Se puede filtrar por empresa.",
@@ -253,6 +421,36 @@ class InventarioViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    @extend_schema(
+        summary="Exportar inventario",
+        description="Exportar el inventario con un precio por moneda en CSV, Parquet o XLSX. "
+                    "Pensado para cargas en herramientas de BI; la memoria no crece con el número de filas",
+        parameters=[
+            OpenApiParameter(name='format', description=f"Formato: {', '.join(EXPORT_FORMATS)} (defecto csv)", type=OpenApiTypes.STR),
+            OpenApiParameter(name='empresa', description='Filtrar por NIT de empresa', type=OpenApiTypes.STR),
+        ],
+        responses={200: OpenApiTypes.BINARY}
+    )
+    @action(detail=False, methods=['get'], renderer_classes=EXPORT_RENDERERS)
+    def export(self, request):
+        """Exportar inventario en streaming"""
+        try:
+            export = inventario_export(request.query_params.get('empresa'))
+            return export_response(export, request.query_params.get('format', 'csv'))
+        except DomainException as e:
+            return self._handle_domain_exception(e)
+
+
+@extend_schema(tags=['Inventario'])
+class InventarioEmailAPIView(AsyncAPIView):
+    """
+    Envío del PDF de inventario por email
+    
+    Async: mientras MailerSend responde el worker ASGI atiende otras
+    peticiones. Solo administradores.
+    """
+    permission_classes = [IsAdminUser]
+    
     @extend_schema(
         summary="Enviar PDF de inventario por email",
         description="Generar PDF del inventario y enviarlo por correo electrónico",
@@ -274,8 +472,7 @@ class InventarioViewSet(viewsets.ModelViewSet):
             )
         }
     )
-    @action(detail=False, methods=['post'])
-    def send_email(self, request):
+    async def post(self, request):
         """
         Enviar PDF de inventario por email
         Body: {
@@ -296,11 +493,11 @@ class InventarioViewSet(viewsets.ModelViewSet):
             from .services.pdf_generator import generate_inventory_pdf
             from .services.email_service import send_pdf_via_email
             
-            # Generar PDF
-            pdf_path = generate_inventory_pdf(empresa_nit)
+            # Generar PDF (consultas y reportlab, sync)
+            pdf_path = await sync_to_async(generate_inventory_pdf)(empresa_nit)
             
             # Enviar por email
-            result = send_pdf_via_email(pdf_path, email)
+            result = await send_pdf_via_email(pdf_path, email)
             
             if result['success']:
                 return Response({
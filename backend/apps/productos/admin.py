@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .orm_models import Producto, PrecioMoneda
+from .orm_models import Producto, PrecioMoneda, TasaCambio, ImportacionCatalogo
 
 
 class PrecioMonedaInline(admin.TabularInline):
@@ -21,3 +21,17 @@ class PrecioMonedaAdmin(admin.ModelAdmin):
     list_display = ('producto', 'moneda', 'precio', 'created_at')
     list_filter = ('moneda',)
     search_fields = ('producto__codigo', 'producto__nombre')
+
+
+@admin.register(TasaCambio)
+class TasaCambioAdmin(admin.ModelAdmin):
+    list_display = ('moneda', 'tasa', 'updated_at')
+    readonly_fields = ('updated_at',)
+
+
+@admin.register(ImportacionCatalogo)
+class ImportacionCatalogoAdmin(admin.ModelAdmin):
+    list_display = ('id', 'formato', 'estado', 'filas_procesadas', 'productos_creados',
+                    'total_errores', 'created_by', 'created_at')
+    list_filter = ('estado', 'formato')
+    readonly_fields = ('created_at', 'updated_at')
@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class ProductosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.productos'
+    
+    def ready(self):
+        # Mantener al día el índice de autocompletado y la caché del proceso
+        from django.db.models.signals import post_delete, post_save
+        from .autocomplete import producto_eliminado, producto_guardado
+        from .orm_models import Producto
+        from .repositories import producto_modificado
+        
+        post_save.connect(producto_guardado, sender=Producto)
+        post_delete.connect(producto_eliminado, sender=Producto)
+        post_save.connect(producto_modificado, sender=Producto)
+        post_delete.connect(producto_modificado, sender=Producto)
@@ -0,0 +1,180 @@
+"""
+Autocompletado de productos por código y nombre
+
+Cada proceso (worker de gunicorn) mantiene un PrefixIndex del dominio con la
+proyección (codigo, nombre) del catálogo:
+- se construye en la primera consulta, no al importar el módulo; la
+  construcción corre fuera del lock (las consultas siguen usando el índice
+  anterior) y el índice nuevo se intercambia al terminar
+- las escrituras del propio proceso lo actualizan al confirmar su
+  transacción (señales post_save/post_delete y el upsert del repositorio)
+- las de otros procesos se detectan comparando cada
+  AUTOCOMPLETE_REFRESH_SECONDS el total de filas y el último updated_at:
+  se traen solo las filas modificadas y, si el total no cuadra (hubo
+  eliminaciones), se reconstruye
+Con más de AUTOCOMPLETE_MAX_PRODUCTOS productos no se usa el índice y se
+consulta la base de datos, para acotar la memoria del proceso.
+"""
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional, Tuple
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from nexus_domain.search import PrefixIndex
+from apps.core.cursors import iterate
+from .orm_models import Producto as ProductoORM
+
+
+class ProductoAutocomplete:
+    """Índice de autocompletado de productos del proceso"""
+
+    CHUNK_SIZE = 10000
+
+    def __init__(self):
+        self._index: Optional[PrefixIndex] = None
+        self._ultimo: Optional[datetime] = None
+        self._revisado = 0.0
+        # Cambios del proceso durante una construcción: (codigo, nombre o None si se eliminó)
+        self._pendientes: Optional[List[Tuple[str, Optional[str]]]] = None
+        # Cambia con invalidate(): una construcción en curso ya no se instala
+        self._generacion = 0
+        self._lock = threading.Lock()
+
+    def search(self, consulta: str, limit: int = 10) -> List[Tuple[str, str]]:
+        """[(codigo, nombre)] de los productos que completan la consulta"""
+        consulta = (consulta or '').strip()
+        if not consulta or limit <= 0:
+            return []
+
+        self._refresh()
+        with self._lock:
+            if self._index is not None:
+                return self._index.search(consulta, limit)
+
+        return self._search_db(consulta, limit)
+
+    def update(self, codigo: str, nombre: str) -> None:
+        """Reflejar un producto creado o modificado en este proceso"""
+        with self._lock:
+            if self._pendientes is not None:
+                self._pendientes.append((codigo, nombre))
+            if self._index is not None:
+                self._index.add(codigo, nombre)
+
+    def remove(self, codigo: str) -> None:
+        """Reflejar un producto eliminado en este proceso"""
+        with self._lock:
+            if self._pendientes is not None:
+                self._pendientes.append((codigo, None))
+            if self._index is not None:
+                self._index.remove(codigo)
+
+    def update_on_commit(self, codigo: str, nombre: str) -> None:
+        """update() cuando se confirme la transacción en curso (no si se revierte)"""
+        transaction.on_commit(lambda: self.update(codigo, nombre))
+
+    def remove_on_commit(self, codigo: str) -> None:
+        """remove() cuando se confirme la transacción en curso (no si se revierte)"""
+        transaction.on_commit(lambda: self.remove(codigo))
+
+    def invalidate(self) -> None:
+        """Descartar el índice; se reconstruye en la próxima consulta"""
+        with self._lock:
+            self._index = None
+            self._ultimo = None
+            self._revisado = 0.0
+            self._pendientes = None
+            self._generacion += 1
+
+    def _refresh(self) -> None:
+        """
+        Construir o poner al día el índice si pasó el intervalo de revisión
+
+        Solo un hilo revisa por intervalo; las consultas a la base de datos y
+        la construcción corren fuera del lock.
+        """
+        with self._lock:
+            ahora = time.monotonic()
+            if self._revisado and ahora - self._revisado < settings.AUTOCOMPLETE_REFRESH_SECONDS:
+                return
+            self._revisado = ahora
+            index, ultimo, generacion = self._index, self._ultimo, self._generacion
+
+        version = ProductoORM.objects.order_by().aggregate(
+            total=Count('pk'), ultimo=Max('updated_at')
+        )
+        if version['total'] > settings.AUTOCOMPLETE_MAX_PRODUCTOS:
+            with self._lock:
+                if self._generacion == generacion:
+                    self._index = None
+            return
+
+        if index is not None and ultimo is not None and version['ultimo'] != ultimo:
+            # >= porque otra escritura pudo compartir el último updated_at
+            cambios = list(self._proyeccion(updated_at__gte=ultimo))
+            with self._lock:
+                if self._index is index:
+                    for codigo, nombre in cambios:
+                        index.add(codigo, nombre)
+                    self._ultimo = version['ultimo']
+        if index is None or ultimo is None or len(index) != version['total']:
+            self._rebuild(generacion, version['ultimo'])
+
+    def _rebuild(self, generacion: int, ultimo: Optional[datetime]) -> None:
+        """Construir un índice nuevo fuera del lock e intercambiarlo por el actual"""
+        with self._lock:
+            if self._pendientes is not None:
+                # Otra construcción en curso
+                return
+            self._pendientes = []
+        try:
+            nuevo = PrefixIndex.build(self._proyeccion())
+        except BaseException:
+            with self._lock:
+                self._pendientes = None
+                self._revisado = 0.0
+            raise
+
+        with self._lock:
+            if self._generacion != generacion:
+                return
+            # Escrituras del proceso confirmadas mientras se construía
+            for codigo, nombre in self._pendientes or ():
+                if nombre is None:
+                    nuevo.remove(codigo)
+                else:
+                    nuevo.add(codigo, nombre)
+            self._index = nuevo
+            self._ultimo = ultimo
+            self._pendientes = None
+
+    def _proyeccion(self, **filtros):
+        """(codigo, nombre) de los productos, por lotes"""
+        return iterate(
+            ProductoORM.objects.filter(**filtros).order_by().values_list('codigo', 'nombre'),
+            self.CHUNK_SIZE
+        )
+
+    def _search_db(self, consulta: str, limit: int) -> List[Tuple[str, str]]:
+        """Respaldo sin índice: prefijo de código o de nombre en la base de datos"""
+        return list(
+            ProductoORM.objects.filter(
+                Q(codigo__istartswith=consulta) | Q(nombre__istartswith=consulta)
+            ).order_by('nombre', 'codigo').values_list('codigo', 'nombre')[:limit]
+        )
+
+
+# Índice compartido por las vistas, el repositorio y el chatbot del proceso
+autocomplete = ProductoAutocomplete()
+
+
+def producto_guardado(sender, instance, **kwargs) -> None:
+    """Receptor de post_save de Producto"""
+    autocomplete.update_on_commit(instance.codigo, instance.nombre)
+
+
+def producto_eliminado(sender, instance, **kwargs) -> None:
+    """Receptor de post_delete de Producto"""
+    autocomplete.remove_on_commit(instance.codigo)
@@ -0,0 +1,38 @@
+"""
+Exportación del catálogo de productos con precios pivotados por moneda
+"""
+from typing import Optional
+from django.db.models import TextField
+from django.db.models.functions import Cast
+from nexus_domain.analytics import MONEDAS
+from apps.core.exporters import Export
+from .orm_models import PrecioPivot, Producto
+
+
+COLUMNAS = (
+    ('codigo', 'string'),
+    ('nombre', 'string'),
+    ('empresa_nit', 'string'),
+    ('punto_reorden', 'int'),
+    ('caracteristicas', 'string'),
+    *((f'precio_{moneda.lower()}', 'decimal') for moneda in MONEDAS),
+    ('created_at', 'datetime'),
+)
+
+
+def catalogo_export(empresa_nit: Optional[str] = None) -> Export:
+    """Un registro por producto (opcionalmente de una empresa)"""
+    queryset = Producto.objects.order_by('codigo')
+    if empresa_nit:
+        queryset = queryset.filter(empresa_id=empresa_nit)
+
+    precios = PrecioPivot.price_columns()
+    # caracteristicas como texto JSON, sin decodificar en Python
+    queryset = queryset.annotate(
+        caracteristicas_json=Cast('caracteristicas', output_field=TextField()),
+        **precios
+    ).values_list(
+        'codigo', 'nombre', 'empresa_id', 'punto_reorden', 'caracteristicas_json',
+        *precios, 'created_at'
+    )
+    return Export(nombre='productos', queryset=queryset, columnas=COLUMNAS)
@@ -0,0 +1,150 @@
+"""
+Importación masiva del catálogo: lectura por streaming de CSV, XLSX y NDJSON
+
+Cada lector produce filas (número de fila, valores) sin cargar el archivo
+completo en memoria; la numeración es estable entre ejecuciones para poder
+reanudar desde el punto de control.
+
+El API solo deja las importaciones PENDIENTE; las ejecuta fuera de la
+petición el comando importar_catalogo --pendientes. El paso a EN_PROCESO es
+un UPDATE condicional, así dos procesos no ejecutan la misma importación.
+"""
+import csv
+import io
+import json
+import os
+from typing import BinaryIO, Iterator
+from nexus_domain.exceptions import BusinessRuleViolationError, ValidationError
+from nexus_domain.use_cases.catalogo_use_cases import (
+    CatalogRowError,
+    FilaCatalogo,
+    ImportCatalogUseCase,
+    ImportProgress
+)
+from .orm_models import ImportacionCatalogo
+from .repositories import DjangoCatalogoImportRepository
+
+
+FORMATOS_POR_EXTENSION = {
+    '.csv': ImportacionCatalogo.Formato.CSV,
+    '.xlsx': ImportacionCatalogo.Formato.XLSX,
+    '.ndjson': ImportacionCatalogo.Formato.NDJSON,
+    '.jsonl': ImportacionCatalogo.Formato.NDJSON,
+}
+
+
+def detect_formato(nombre_archivo: str) -> str:
+    """Formato de importación según la extensión del archivo"""
+    extension = os.path.splitext(nombre_archivo)[1].lower()
+    try:
+        return FORMATOS_POR_EXTENSION[extension]
+    except KeyError:
+        raise ValidationError(f"Formato de archivo no soportado: {extension or nombre_archivo}")
+
+
+def iter_csv(fileobj: BinaryIO) -> Iterator[FilaCatalogo]:
+    """Filas de un CSV con encabezados (la fila 1 es la primera de datos)"""
+    text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+    yield from enumerate(csv.DictReader(text), start=1)
+
+
+def iter_ndjson(fileobj: BinaryIO) -> Iterator[FilaCatalogo]:
+    """Un objeto JSON por línea; las líneas inválidas se entregan como texto"""
+    for numero, line in enumerate(fileobj, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield numero, json.loads(line)
+        except ValueError:
+            yield numero, line.decode('utf-8', errors='replace')
+
+
+def iter_xlsx(fileobj: BinaryIO) -> Iterator[FilaCatalogo]:
+    """Filas de la primera hoja de un XLSX (requiere openpyxl)"""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValidationError("Se requiere openpyxl para importar archivos XLSX")
+
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        headers = [str(h).strip() if h is not None else '' for h in next(rows, ())]
+        for numero, values in enumerate(rows, start=1):
+            if any(value is not None for value in values):
+                yield numero, dict(zip(headers, values))
+    finally:
+        workbook.close()
+
+
+LECTORES = {
+    ImportacionCatalogo.Formato.CSV: iter_csv,
+    ImportacionCatalogo.Formato.XLSX: iter_xlsx,
+    ImportacionCatalogo.Formato.NDJSON: iter_ndjson,
+}
+
+
+def iter_rows(fileobj: BinaryIO, formato: str) -> Iterator[FilaCatalogo]:
+    """Filas del archivo según su formato"""
+    try:
+        lector = LECTORES[formato]
+    except KeyError:
+        raise ValidationError(f"Formato de archivo no soportado: {formato}")
+    return lector(fileobj)
+
+
+def encolar_importacion(importacion: ImportacionCatalogo) -> bool:
+    """Dejar PENDIENTE una importación FALLIDA para reanudarla; False si no estaba FALLIDA"""
+    encolada = ImportacionCatalogo.objects.filter(
+        pk=importacion.pk, estado=ImportacionCatalogo.Estado.FALLIDA
+    ).update(estado=ImportacionCatalogo.Estado.PENDIENTE)
+    importacion.refresh_from_db()
+    return bool(encolada)
+
+
+def ejecutar_importacion(importacion: ImportacionCatalogo,
+                         chunk_size: int = ImportCatalogUseCase.CHUNK_SIZE,
+                         forzar: bool = False) -> ImportProgress:
+    """
+    Ejecutar (o reanudar) una importación desde su último punto de control
+
+    Solo toma importaciones PENDIENTE o FALLIDA (con forzar también una que
+    quedó EN_PROCESO porque su proceso murió). Si falla, la importación
+    queda FALLIDA con el avance del último lote guardado y puede reanudarse.
+    """
+    estados = [ImportacionCatalogo.Estado.PENDIENTE, ImportacionCatalogo.Estado.FALLIDA]
+    if forzar:
+        estados.append(ImportacionCatalogo.Estado.EN_PROCESO)
+    reclamada = ImportacionCatalogo.objects.filter(pk=importacion.pk, estado__in=estados).update(
+        estado=ImportacionCatalogo.Estado.EN_PROCESO
+    )
+    importacion.refresh_from_db()
+    if not reclamada:
+        raise BusinessRuleViolationError(
+            f"La importación {importacion.pk} no se puede ejecutar: está {importacion.estado}"
+        )
+
+    progress = ImportProgress(
+        importacion_id=str(importacion.pk),
+        filas_procesadas=importacion.filas_procesadas,
+        productos_creados=importacion.productos_creados,
+        precios_creados=importacion.precios_creados,
+        total_errores=importacion.total_errores,
+        errores=[CatalogRowError(**error) for error in importacion.errores]
+    )
+
+    use_case = ImportCatalogUseCase(DjangoCatalogoImportRepository(), chunk_size)
+    user_id = str(importacion.created_by_id) if importacion.created_by_id else None
+    try:
+        with importacion.archivo.open('rb') as fileobj:
+            progress = use_case.execute(iter_rows(fileobj, importacion.formato), progress, user_id)
+    except Exception:
+        ImportacionCatalogo.objects.filter(pk=importacion.pk).update(
+            estado=ImportacionCatalogo.Estado.FALLIDA
+        )
+        raise
+    finally:
+        importacion.refresh_from_db()
+
+    return progress
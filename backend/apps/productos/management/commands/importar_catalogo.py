@@ -0,0 +1,94 @@
+"""
+Importar el catálogo de productos desde un archivo CSV, XLSX o NDJSON
+
+Uso:
+    python manage.py importar_catalogo catalogo.csv
+    python manage.py importar_catalogo catalogo.ndjson --chunk-size 10000
+    python manage.py importar_catalogo --reanudar 12
+    python manage.py importar_catalogo --pendientes
+
+--pendientes ejecuta las importaciones registradas por el API (pensado para
+cron o un worker); --forzar reanuda una importación que quedó EN_PROCESO
+porque su proceso murió.
+"""
+import os
+import time
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+from nexus_domain.exceptions import DomainException
+from nexus_domain.use_cases.catalogo_use_cases import ImportCatalogUseCase
+from apps.productos.importers import detect_formato, ejecutar_importacion
+from apps.productos.orm_models import ImportacionCatalogo
+
+
+class Command(BaseCommand):
+    help = 'Importar productos con precios por moneda desde un archivo (reanudable)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', nargs='?', help='Ruta del archivo a importar')
+        parser.add_argument('--formato', choices=ImportacionCatalogo.Formato.values,
+                            help='Formato del archivo (por defecto según la extensión)')
+        parser.add_argument('--reanudar', type=int, metavar='ID',
+                            help='Reanudar una importación existente')
+        parser.add_argument('--pendientes', action='store_true',
+                            help='Ejecutar las importaciones PENDIENTE registradas por el API')
+        parser.add_argument('--forzar', action='store_true',
+                            help='Con --reanudar: tomar también una importación EN_PROCESO')
+        parser.add_argument('--chunk-size', type=int, default=ImportCatalogUseCase.CHUNK_SIZE,
+                            help='Filas por lote/transacción')
+    
+    def handle(self, *args, **options):
+        if options['pendientes']:
+            pendientes = ImportacionCatalogo.objects.filter(
+                estado=ImportacionCatalogo.Estado.PENDIENTE
+            ).order_by('pk')
+            for importacion in pendientes:
+                try:
+                    self._ejecutar(importacion, options['chunk_size'])
+                except CommandError as e:
+                    self.stderr.write(str(e))
+            return
+        
+        if options['reanudar']:
+            try:
+                importacion = ImportacionCatalogo.objects.get(pk=options['reanudar'])
+            except ImportacionCatalogo.DoesNotExist:
+                raise CommandError(f"Importación {options['reanudar']} no encontrada")
+        elif options['archivo']:
+            importacion = self._crear_importacion(options['archivo'], options['formato'])
+        else:
+            raise CommandError('Indique un archivo, --reanudar ID o --pendientes')
+        
+        self._ejecutar(importacion, options['chunk_size'], options['forzar'])
+    
+    def _ejecutar(self, importacion: ImportacionCatalogo, chunk_size: int, forzar: bool = False) -> None:
+        self.stdout.write(f"Importación {importacion.pk}: desde la fila {importacion.filas_procesadas + 1}")
+        inicio = time.perf_counter()
+        try:
+            progress = ejecutar_importacion(importacion, chunk_size=chunk_size, forzar=forzar)
+        except DomainException as e:
+            raise CommandError(f"{e} (reanude con --reanudar {importacion.pk})")
+        
+        duracion = time.perf_counter() - inicio
+        self.stdout.write(self.style.SUCCESS(
+            f"Importación {importacion.pk} completada en {duracion:.1f}s: "
+            f"{progress.productos_creados} productos, {progress.precios_creados} precios, "
+            f"{progress.total_errores} filas con error"
+        ))
+        for error in progress.errores[:20]:
+            self.stdout.write(f"  fila {error.fila} ({error.codigo or '-'}): {error.error}")
+    
+    def _crear_importacion(self, ruta: str, formato: str = None) -> ImportacionCatalogo:
+        """Copiar el archivo al almacenamiento y registrar la importación"""
+        if not os.path.isfile(ruta):
+            raise CommandError(f"No existe el archivo {ruta}")
+        try:
+            formato = formato or detect_formato(ruta)
+        except DomainException as e:
+            raise CommandError(str(e))
+        
+        importacion = ImportacionCatalogo(formato=formato)
+        with open(ruta, 'rb') as fileobj:
+            importacion.archivo.save(os.path.basename(ruta), File(fileobj), save=False)
+        importacion.save()
+        return importacion
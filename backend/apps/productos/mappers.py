@@ -1,9 +1,10 @@
 """
 Mappers: Conversión entre entidades de dominio y modelos ORM de Django
 """
+import json
 from typing import Optional
 from nexus_domain.entities import Producto as ProductoEntity
-from nexus_domain.value_objects import ProductCode, NIT
+from nexus_domain.value_objects import ProductCode, NIT, RawJSON
 from .orm_models import Producto as ProductoORM
 
 
@@ -12,38 +13,53 @@ class ProductoMapper:
     
     @staticmethod
     def to_entity(orm_obj: ProductoORM) -> ProductoEntity:
-        """Convertir modelo ORM a entidad de dominio"""
-        # Convertir caracteristicas dict a string JSON
-        import json
-        caracteristicas_str = json.dumps(orm_obj.caracteristicas) if orm_obj.caracteristicas else ""
+        """
+        Convertir modelo ORM a entidad de dominio
+        
+        Si la consulta trae caracteristicas_raw (JSON como texto), las
+        características se entregan como RawJSON sin decodificar
+        """
+        raw = getattr(orm_obj, 'caracteristicas_raw', None)
+        caracteristicas = RawJSON(raw) if raw is not None else orm_obj.caracteristicas
         
         return ProductoEntity(
             codigo=ProductCode(orm_obj.codigo),
             nombre=orm_obj.nombre,
-            empresa_nit=NIT(orm_obj.empresa.nit),
-            caracteristicas=caracteristicas_str,
+            empresa_nit=NIT(orm_obj.empresa_id),
+            caracteristicas=caracteristicas,
             created_at=orm_obj.created_at,
             updated_at=orm_obj.updated_at,
-            created_by_id=str(orm_obj.created_by.id) if orm_obj.created_by else None
+            created_by_id=str(orm_obj.created_by_id) if orm_obj.created_by_id else None,
+            punto_reorden=orm_obj.punto_reorden
         )
     
     @staticmethod
     def to_orm(entity: ProductoEntity, orm_obj: Optional[ProductoORM] = None) -> ProductoORM:
         """Convertir entidad de dominio a modelo ORM"""
-        import json
-        
         if orm_obj is None:
             orm_obj = ProductoORM()
         
         orm_obj.codigo = str(entity.codigo)
         orm_obj.nombre = entity.nombre
+        orm_obj.punto_reorden = entity.punto_reorden
         
-        # Convertir caracteristicas string a dict
-        try:
-            orm_obj.caracteristicas = json.loads(entity.caracteristicas) if entity.caracteristicas else {}
-        except json.JSONDecodeError:
-            orm_obj.caracteristicas = {"descripcion": entity.caracteristicas}
+        # Los objetos se guardan tal cual; el texto (p. ej. del chatbot) se
+        # interpreta como JSON o se guarda como descripción
+        caracteristicas = entity.get_caracteristicas()
+        if not caracteristicas:
+            caracteristicas = {}
+        elif isinstance(caracteristicas, str):
+            try:
+                caracteristicas = json.loads(caracteristicas)
+            except json.JSONDecodeError:
+                caracteristicas = {"descripcion": caracteristicas}
+        orm_obj.caracteristicas = caracteristicas
         
-        # empresa y created_by se manejan en el repositorio
+        # Llaves foráneas por id: no se consultan Empresa ni User
+        orm_obj.empresa_id = str(entity.empresa_nit)
+        created_by_id = entity.created_by_id
+        orm_obj.created_by_id = (
+            int(created_by_id) if created_by_id and str(created_by_id).isdigit() else None
+        )
         
         return orm_obj
@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-19 00:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='producto',
+            name='punto_reorden',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Punto de reorden'),
+        ),
+    ]
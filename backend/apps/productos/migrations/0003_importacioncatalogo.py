@@ -0,0 +1,38 @@
+# Generated by Django 5.0 on 2026-10-19 00:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0002_producto_punto_reorden'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportacionCatalogo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('archivo', models.FileField(upload_to='importaciones/', verbose_name='Archivo')),
+                ('formato', models.CharField(choices=[('csv', 'CSV'), ('xlsx', 'Excel (XLSX)'), ('ndjson', 'JSON por líneas (NDJSON)')], max_length=10, verbose_name='Formato')),
+                ('estado', models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('EN_PROCESO', 'En proceso'), ('COMPLETADA', 'Completada'), ('FALLIDA', 'Fallida')], default='PENDIENTE', max_length=20, verbose_name='Estado')),
+                ('filas_procesadas', models.PositiveIntegerField(default=0, verbose_name='Filas procesadas')),
+                ('productos_creados', models.PositiveIntegerField(default=0, verbose_name='Productos creados')),
+                ('precios_creados', models.PositiveIntegerField(default=0, verbose_name='Precios creados')),
+                ('total_errores', models.PositiveIntegerField(default=0, verbose_name='Total de errores')),
+                ('errores', models.JSONField(default=list, verbose_name='Errores')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='importaciones_catalogo', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Importación de catálogo',
+                'verbose_name_plural': 'Importaciones de catálogo',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
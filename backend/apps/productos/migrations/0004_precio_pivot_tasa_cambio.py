@@ -0,0 +1,45 @@
+# Generated by Django 5.0 on 2026-10-19 00:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0003_importacioncatalogo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PrecioPivot',
+            fields=[
+                ('producto', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='precio_pivot', serialize=False, to='productos.producto')),
+                ('precio_cop', models.DecimalField(decimal_places=2, max_digits=12, null=True)),
+                ('precio_usd', models.DecimalField(decimal_places=2, max_digits=12, null=True)),
+                ('precio_eur', models.DecimalField(decimal_places=2, max_digits=12, null=True)),
+                ('precio_mxn', models.DecimalField(decimal_places=2, max_digits=12, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Precios por producto (pivote)',
+                'verbose_name_plural': 'Precios por producto (pivote)',
+            },
+        ),
+        migrations.CreateModel(
+            name='TasaCambio',
+            fields=[
+                ('moneda', models.CharField(choices=[('USD', 'Dólar Estadounidense'), ('EUR', 'Euro'), ('COP', 'Peso Colombiano'), ('MXN', 'Peso Mexicano')], max_length=3, primary_key=True, serialize=False, verbose_name='Moneda')),
+                ('tasa', models.DecimalField(decimal_places=8, max_digits=18, verbose_name='Valor en COP')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Tasa de cambio',
+                'verbose_name_plural': 'Tasas de cambio',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='tasacambio',
+            constraint=models.CheckConstraint(check=models.Q(('tasa__gt', 0)), name='tasa_cambio_positiva'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations
+from django.db.models import Case, Max, When
+
+
+MONEDAS = ('COP', 'USD', 'EUR', 'MXN')
+
+
+def poblar_precio_pivot(apps, schema_editor):
+    """Calcular el pivote de los precios existentes"""
+    PrecioMoneda = apps.get_model('productos', 'PrecioMoneda')
+    PrecioPivot = apps.get_model('productos', 'PrecioPivot')
+
+    rows = PrecioMoneda.objects.order_by().values('producto_id').annotate(**{
+        f'precio_{moneda.lower()}': Max(Case(When(moneda=moneda, then='precio')))
+        for moneda in MONEDAS
+    })
+    PrecioPivot.objects.bulk_create((PrecioPivot(**row) for row in rows.iterator()), batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0004_precio_pivot_tasa_cambio'),
+    ]
+
+    operations = [
+        migrations.RunPython(poblar_precio_pivot, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,100 @@
+# Generated by Django 5.0 on 2026-10-19 00:47
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+VECTOR = (
+    "setweight(to_tsvector('spanish', coalesce(NEW.nombre, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(NEW.codigo, '')), 'B')"
+)
+
+# Filas por lote al llenar search_vector: cada lote es una transacción corta
+BATCH_SIZE = 5000
+
+TRIGGER_SQL = [
+    f"""
+    CREATE OR REPLACE FUNCTION productos_producto_search_vector() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {VECTOR};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS productos_producto_search_vector ON productos_producto",
+    """
+    CREATE TRIGGER productos_producto_search_vector
+    BEFORE INSERT OR UPDATE ON productos_producto
+    FOR EACH ROW EXECUTE FUNCTION productos_producto_search_vector()
+    """,
+]
+
+# Las filas nuevas ya pasan por el trigger; se llenan las existentes por lotes
+FILL_SQL = f"""
+    UPDATE productos_producto SET search_vector = {VECTOR.replace('NEW.', '')}
+    WHERE codigo IN (
+        SELECT codigo FROM productos_producto WHERE search_vector IS NULL LIMIT %s
+    )
+"""
+
+INDEX_SQL = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS productos_producto_search_vector_gin ON productos_producto USING gin (search_vector)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS productos_producto_nombre_trgm ON productos_producto USING gin (nombre gin_trgm_ops)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS productos_producto_codigo_trgm ON productos_producto USING gin (codigo gin_trgm_ops)",
+]
+
+BACKWARD_SQL = [
+    "DROP INDEX CONCURRENTLY IF EXISTS productos_producto_codigo_trgm",
+    "DROP INDEX CONCURRENTLY IF EXISTS productos_producto_nombre_trgm",
+    "DROP INDEX CONCURRENTLY IF EXISTS productos_producto_search_vector_gin",
+    "DROP TRIGGER IF EXISTS productos_producto_search_vector ON productos_producto",
+    "DROP FUNCTION IF EXISTS productos_producto_search_vector()",
+]
+
+
+def forwards(apps, schema_editor):
+    """
+    Trigger, search_vector de las filas existentes por lotes e índices GIN
+    sin bloquear escrituras (solo PostgreSQL; en otros motores la búsqueda
+    es en memoria)
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in TRIGGER_SQL:
+        schema_editor.execute(sql)
+    with schema_editor.connection.cursor() as cursor:
+        while True:
+            cursor.execute(FILL_SQL, [BATCH_SIZE])
+            if cursor.rowcount < BATCH_SIZE:
+                break
+    for sql in INDEX_SQL:
+        schema_editor.execute(sql)
+
+
+def backwards(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in BACKWARD_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción y
+    # cada lote de search_vector se confirma por separado
+    atomic = False
+
+    dependencies = [
+        ('productos', '0005_poblar_precio_pivot'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='producto',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(forwards, backwards),
+    ]
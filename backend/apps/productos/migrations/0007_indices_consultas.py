@@ -0,0 +1,33 @@
+# Generated by Django 5.0 on 2026-10-19 01:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+from apps.core.migration_operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('empresas', '0005_indices_consultas'),
+        ('productos', '0006_busqueda_texto'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='producto',
+            index=models.Index(fields=['empresa', '-created_at'], include=('codigo',), name='producto_empresa_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='producto',
+            index=models.Index(fields=['-created_at'], name='producto_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='producto',
+            index=models.Index(fields=['updated_at'], name='producto_updated_idx'),
+        ),
+    ]
@@ -2,6 +2,6 @@
 Mantener compatibilidad con Django migrations
 Re-exportar modelos desde orm_models
 """
-from .orm_models import Producto, PrecioMoneda
+from .orm_models import Producto, PrecioMoneda, PrecioPivot, TasaCambio, ImportacionCatalogo
 
-__all__ = ['Producto', 'PrecioMoneda']
+__all__ = ['Producto', 'PrecioMoneda', 'PrecioPivot', 'TasaCambio', 'ImportacionCatalogo']
@@ -1,5 +1,9 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, DecimalField, F, FloatField, Func, Max, Subquery, Value, When
+from django.db.models.functions import Cast, Coalesce, Round
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchVectorField
+from nexus_domain.analytics import MONEDAS
 from apps.empresas.models import Empresa
 
 User = get_user_model()
@@ -11,13 +15,29 @@ class Producto(models.Model):
     caracteristicas = models.JSONField(default=dict, verbose_name='Características')
     empresa = models.ForeignKey(Empresa, on_delete=models.CASCADE, related_name='productos')
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='productos_creados')
+    punto_reorden = models.PositiveIntegerField(
+        null=True, blank=True, verbose_name='Punto de reorden'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # nombre (español) y código; en PostgreSQL lo calcula un trigger
+    # (migración 0006), junto con los índices GIN de texto y trigramas
+    search_vector = SearchVectorField(null=True, editable=False)
     
     class Meta:
         verbose_name = 'Producto'
         verbose_name_plural = 'Productos'
         ordering = ['-created_at']
+        # Índices elegidos con el comando index_advisor
+        indexes = [
+            # Productos de una empresa en el orden por defecto; INCLUDE permite
+            # contar productos por empresa solo con el índice (PostgreSQL)
+            models.Index(fields=['empresa', '-created_at'], include=['codigo'],
+                         name='producto_empresa_created_idx'),
+            models.Index(fields=['-created_at'], name='producto_created_idx'),
+            # Cambios desde la última revisión (autocompletado y búsqueda)
+            models.Index(fields=['updated_at'], name='producto_updated_idx'),
+        ]
     
     def __str__(self):
         return f"{self.nombre} ({self.codigo})"
@@ -44,5 +64,231 @@ class PrecioMoneda(models.Model):
         verbose_name_plural = 'Precios por Moneda'
         unique_together = ('producto', 'moneda')
     
+    def save(self, *args, **kwargs):
+        """Guardar precio, actualizar el pivote e invalidar la clasificación ABC"""
+        super().save(*args, **kwargs)
+        self._precio_cambiado()
+    
+    def delete(self, *args, **kwargs):
+        """Eliminar precio, actualizar el pivote e invalidar la clasificación ABC"""
+        result = super().delete(*args, **kwargs)
+        self._precio_cambiado()
+        return result
+    
+    def _precio_cambiado(self):
+        self.precios_cambiados([self.producto_id])
+    
+    @staticmethod
+    def precios_cambiados(producto_ids) -> None:
+        """
+        El valor de los productos cambió en todas las empresas que los tienen
+        en inventario: actualizar el pivote e invalidar la clasificación ABC
+        
+        Las escrituras por lotes (bulk_create, delete por queryset) la llaman
+        una vez al final en lugar de pasar por save/delete fila a fila.
+        """
+        from apps.inventario.orm_models import Inventario
+        
+        producto_ids = set(producto_ids)
+        PrecioPivot.refresh(producto_ids)
+        Inventario.invalidar_clasificacion_abc(inventario__producto_id__in=producto_ids)
+    
     def __str__(self):
         return f"{self.producto.codigo} - {self.precio} {self.moneda}"
+
+
+class PrecioPivot(models.Model):
+    """
+    Precios de un producto en columnas, una por moneda
+    
+    Tabla desnormalizada que se mantiene desde PrecioMoneda (save/delete,
+    importación masiva): los consumidores leen todos los precios del
+    producto con un join en lugar de agrupar o consultar PrecioMoneda.
+    """
+    producto = models.OneToOneField(
+        Producto, on_delete=models.CASCADE, primary_key=True, related_name='precio_pivot'
+    )
+    precio_cop = models.DecimalField(max_digits=12, decimal_places=2, null=True)
+    precio_usd = models.DecimalField(max_digits=12, decimal_places=2, null=True)
+    precio_eur = models.DecimalField(max_digits=12, decimal_places=2, null=True)
+    precio_mxn = models.DecimalField(max_digits=12, decimal_places=2, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    COLUMNAS = tuple(f'precio_{moneda.lower()}' for moneda in MONEDAS)
+    
+    class Meta:
+        verbose_name = 'Precios por producto (pivote)'
+        verbose_name_plural = 'Precios por producto (pivote)'
+    
+    def por_moneda(self) -> dict:
+        """Precios definidos del producto: {moneda: precio}"""
+        return {
+            moneda: getattr(self, columna)
+            for moneda, columna in zip(MONEDAS, self.COLUMNAS)
+            if getattr(self, columna) is not None
+        }
+    
+    @classmethod
+    def refresh(cls, producto_ids) -> None:
+        """Recalcular el pivote de los productos indicados desde PrecioMoneda"""
+        producto_ids = set(producto_ids)
+        rows = PrecioMoneda.objects.filter(producto_id__in=producto_ids).order_by().values(
+            'producto_id'
+        ).annotate(**{
+            columna: Max(Case(When(moneda=moneda, then='precio')))
+            for moneda, columna in zip(MONEDAS, cls.COLUMNAS)
+        })
+        pivots = [cls(**row) for row in rows]
+        
+        with transaction.atomic():
+            cls.objects.filter(
+                producto_id__in=producto_ids - {pivot.producto_id for pivot in pivots}
+            ).delete()
+            cls.objects.bulk_create(
+                pivots,
+                update_conflicts=True,
+                unique_fields=['producto'],
+                update_fields=[*cls.COLUMNAS, 'updated_at']
+            )
+    
+    @classmethod
+    def price_columns(cls, lookup: str = 'precio_pivot', convertir: bool = False,
+                      monedas=MONEDAS) -> dict:
+        """
+        Anotaciones precio_<moneda> leídas del pivote
+        
+        lookup es la ruta desde el modelo consultado hasta PrecioPivot. Con
+        convertir=True, si el producto no tiene precio en una moneda se
+        calcula desde otra con TasaCambio (subconsultas escalares sobre una
+        tabla de pocas filas, en la misma sentencia).
+        """
+        if not convertir:
+            return {
+                f'precio_{moneda.lower()}': F(f'{lookup}__precio_{moneda.lower()}')
+                for moneda in monedas
+            }
+        
+        salida = DecimalField(max_digits=18, decimal_places=2)
+        columns = {}
+        for moneda in monedas:
+            alternativas = [F(f'{lookup}__precio_{moneda.lower()}')]
+            for origen in MONEDAS:
+                if origen != moneda:
+                    alternativas.append(Round(
+                        F(f'{lookup}__precio_{origen.lower()}') * TasaCambio.factor(origen, moneda),
+                        2
+                    ))
+            columns[f'precio_{moneda.lower()}'] = Coalesce(*alternativas, output_field=salida)
+        return columns
+
+
+class _Division(Func):
+    """Cociente decimal de dos expresiones"""
+    arg_joiner = ' / '
+    template = '(%(expressions)s)'
+    output_field = DecimalField(max_digits=18, decimal_places=8)
+    
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # SQLite guarda los decimales sin fracción como INTEGER y los divide
+        # como enteros
+        numerador, denominador = self.get_source_expressions()
+        clone = self.copy()
+        clone.set_source_expressions([Cast(numerador, FloatField()), denominador])
+        return super(_Division, clone).as_sql(compiler, connection, **extra_context)
+
+
+class TasaCambio(models.Model):
+    """
+    Tasa de cambio de una moneda respecto a la moneda base (COP)
+    
+    tasa es el valor en COP de una unidad de la moneda; la conversión entre
+    dos monedas cualesquiera pasa por la base.
+    """
+    MONEDA_BASE = PrecioMoneda.Moneda.COP
+    
+    moneda = models.CharField(
+        max_length=3, choices=PrecioMoneda.Moneda.choices, primary_key=True, verbose_name='Moneda'
+    )
+    tasa = models.DecimalField(max_digits=18, decimal_places=8, verbose_name='Valor en COP')
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Tasa de cambio'
+        verbose_name_plural = 'Tasas de cambio'
+        constraints = [
+            models.CheckConstraint(check=models.Q(tasa__gt=0), name='tasa_cambio_positiva'),
+        ]
+    
+    @classmethod
+    def _tasa(cls, moneda: str):
+        """Expresión con la tasa de la moneda (1 para la moneda base)"""
+        if moneda == cls.MONEDA_BASE:
+            return Value(1, output_field=DecimalField(max_digits=18, decimal_places=8))
+        return Subquery(cls.objects.filter(moneda=moneda).values('tasa')[:1])
+    
+    @classmethod
+    def factor(cls, origen: str, destino: str):
+        """Expresión para convertir de origen a destino (NULL si falta una tasa)"""
+        return _Division(cls._tasa(origen), cls._tasa(destino))
+    
+    def save(self, *args, **kwargs):
+        """Guardar tasa; las valoraciones convertidas de todas las empresas cambian"""
+        super().save(*args, **kwargs)
+        self._tasa_cambiada()
+    
+    def delete(self, *args, **kwargs):
+        """Eliminar tasa e invalidar las clasificaciones ABC"""
+        result = super().delete(*args, **kwargs)
+        self._tasa_cambiada()
+        return result
+    
+    def _tasa_cambiada(self):
+        from apps.inventario.orm_models import Inventario
+        
+        Inventario.invalidar_clasificacion_abc()
+    
+    def __str__(self):
+        return f"1 {self.moneda} = {self.tasa} {self.MONEDA_BASE}"
+
+
+class ImportacionCatalogo(models.Model):
+    """
+    Importación masiva del catálogo desde un archivo (CSV, XLSX o NDJSON)
+    
+    filas_procesadas es el punto de control para reanudarla si se interrumpe
+    """
+    class Formato(models.TextChoices):
+        CSV = 'csv', 'CSV'
+        XLSX = 'xlsx', 'Excel (XLSX)'
+        NDJSON = 'ndjson', 'JSON por líneas (NDJSON)'
+    
+    class Estado(models.TextChoices):
+        PENDIENTE = 'PENDIENTE', 'Pendiente'
+        EN_PROCESO = 'EN_PROCESO', 'En proceso'
+        COMPLETADA = 'COMPLETADA', 'Completada'
+        FALLIDA = 'FALLIDA', 'Fallida'
+    
+    archivo = models.FileField(upload_to='importaciones/', verbose_name='Archivo')
+    formato = models.CharField(max_length=10, choices=Formato.choices, verbose_name='Formato')
+    estado = models.CharField(
+        max_length=20, choices=Estado.choices, default=Estado.PENDIENTE, verbose_name='Estado'
+    )
+    filas_procesadas = models.PositiveIntegerField(default=0, verbose_name='Filas procesadas')
+    productos_creados = models.PositiveIntegerField(default=0, verbose_name='Productos creados')
+    precios_creados = models.PositiveIntegerField(default=0, verbose_name='Precios creados')
+    total_errores = models.PositiveIntegerField(default=0, verbose_name='Total de errores')
+    # Primeros errores por fila: [{fila, codigo, error}]
+    errores = models.JSONField(default=list, verbose_name='Errores')
+    created_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, related_name='importaciones_catalogo'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Importación de catálogo'
+        verbose_name_plural = 'Importaciones de catálogo'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"Importación {self.pk} ({self.get_estado_display()})"
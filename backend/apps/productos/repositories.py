@@ -1,73 +1,123 @@
 """
 Implementación Django de los repositorios de dominio para Productos
 """
-from typing import List, Optional
-from django.contrib.auth import get_user_model
-from nexus_domain.interfaces import IProductoRepository
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from django.db import IntegrityError, transaction
+from django.db.models import OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+from nexus_domain.interfaces import ICatalogoImportRepository, IProductoRepository
 from nexus_domain.entities import Producto as ProductoEntity
+from nexus_domain.exceptions import BusinessRuleViolationError
+from nexus_domain.use_cases.catalogo_use_cases import ImportProgress
 from nexus_domain.value_objects import ProductCode, NIT
-from .orm_models import Producto as ProductoORM
+from nexus_domain.entities.inventario import DEFAULT_PUNTO_REORDEN
+from apps.core.repository_cache import EntityCache
+from apps.core.search import TextSearch
+from apps.core.upsert import ChangeTracker, upsert
+from .autocomplete import autocomplete
+from .orm_models import Producto as ProductoORM, PrecioMoneda, PrecioPivot, ImportacionCatalogo
 from apps.empresas.orm_models import Empresa as EmpresaORM
+from apps.inventario.orm_models import Inventario as InventarioORM
 from .mappers import ProductoMapper
 
-User = get_user_model()
-
 
 class DjangoProductoRepository(IProductoRepository):
     """Implementación Django del repositorio de productos"""
     
+    # Campos que se sobrescriben cuando el producto ya existe
+    UPSERT_FIELDS = ('nombre', 'caracteristicas', 'empresa', 'punto_reorden', 'updated_at')
+    
+    # Búsqueda por nombre y código, compartida por las instancias del proceso
+    SEARCH = TextSearch(campos=('nombre', 'codigo'))
+    
+    def __init__(self):
+        # Punto de reorden leído por código, para propagarlo solo si cambia
+        self._punto_reorden = ChangeTracker()
+    
     def save(self, producto: ProductoEntity) -> ProductoEntity:
-        """Guardar o actualizar producto"""
-        try:
-            # Intentar obtener registro existente
-            orm_obj = ProductoORM.objects.get(codigo=str(producto.codigo))
-            orm_obj = ProductoMapper.to_orm(producto, orm_obj)
-        except ProductoORM.DoesNotExist:
-            # Crear nuevo registro
-            orm_obj = ProductoMapper.to_orm(producto)
+        """
+        Guardar o actualizar producto en una sola sentencia (upsert)
         
-        # Asignar empresa
-        try:
-            orm_obj.empresa = EmpresaORM.objects.get(nit=str(producto.empresa_nit))
-        except EmpresaORM.DoesNotExist:
-            raise ValueError(f"Empresa con NIT {producto.empresa_nit} no encontrada")
-        
-        # Asignar created_by si existe
-        if producto.created_by_id:
-            try:
-                orm_obj.created_by = User.objects.get(id=int(producto.created_by_id))
-            except (User.DoesNotExist, ValueError):
-                pass
+        Empresa y creador se asignan por id; si la empresa no existe se lanza
+        EntityNotFoundError.
+        """
+        codigo = str(producto.codigo)
+        nuevo = self._punto_reorden.is_new(codigo)
+        orm_obj = upsert(
+            ProductoMapper.to_orm(producto),
+            unique_fields=('codigo',),
+            update_fields=self.UPSERT_FIELDS
+        )
         
-        orm_obj.save()
+        if self._punto_reorden.changed(codigo, orm_obj.punto_reorden):
+            self._sync_punto_reorden(orm_obj)
+        if not nuevo:
+            # La fila existente conserva su created_at, que es el de la entidad
+            orm_obj.created_at = producto.created_at
+        # El upsert no emite post_save
+        autocomplete.update_on_commit(orm_obj.codigo, orm_obj.nombre)
         return ProductoMapper.to_entity(orm_obj)
     
+    def _sync_punto_reorden(self, orm_obj: ProductoORM) -> None:
+        """Propagar el punto de reorden efectivo al inventario del producto"""
+        if orm_obj.punto_reorden is not None:
+            efectivo = Value(orm_obj.punto_reorden)
+        else:
+            # Sin valor propio: heredar el de cada empresa o el valor por defecto
+            efectivo = Coalesce(
+                Subquery(EmpresaORM.objects.filter(
+                    nit=OuterRef('empresa_id')
+                ).values('punto_reorden')[:1]),
+                Value(DEFAULT_PUNTO_REORDEN)
+            )
+        InventarioORM.objects.filter(producto_id=orm_obj.codigo).update(
+            punto_reorden=efectivo
+        )
+    
+    def _read_queryset(self):
+        """
+        Consultas de lectura: caracteristicas llega como texto JSON
+        (caracteristicas_raw) y el mapper lo envuelve en RawJSON sin decodificarlo
+        """
+        return ProductoORM.objects.defer('caracteristicas', 'search_vector').annotate(
+            caracteristicas_raw=Cast('caracteristicas', output_field=TextField())
+        )
+    
     def find_by_codigo(self, codigo: ProductCode) -> Optional[ProductoEntity]:
         """Buscar producto por código"""
         try:
-            orm_obj = ProductoORM.objects.select_related('empresa').get(codigo=str(codigo))
+            orm_obj = self._read_queryset().get(codigo=str(codigo))
+            self._punto_reorden.loaded(orm_obj.codigo, orm_obj.punto_reorden)
             return ProductoMapper.to_entity(orm_obj)
         except ProductoORM.DoesNotExist:
             return None
     
+    def track(self, codigo: str, producto: Optional[ProductoEntity]) -> None:
+        """Registrar una lectura hecha fuera del repositorio (p. ej. desde una caché)"""
+        if producto is None:
+            self._punto_reorden.missing(str(codigo))
+        else:
+            self._punto_reorden.loaded(str(codigo), producto.punto_reorden)
+    
     def find_all(self, limit: int = 100, offset: int = 0) -> List[ProductoEntity]:
         """Obtener todos los productos con paginación"""
-        queryset = ProductoORM.objects.select_related('empresa').all()[offset:offset + limit]
+        queryset = self._read_queryset()[offset:offset + limit]
         return [ProductoMapper.to_entity(orm_obj) for orm_obj in queryset]
     
     def find_by_empresa(self, empresa_nit: NIT) -> List[ProductoEntity]:
         """Buscar productos por empresa"""
-        queryset = ProductoORM.objects.select_related('empresa').filter(
+        queryset = self._read_queryset().filter(
             empresa__nit=str(empresa_nit)
         )
         return [ProductoMapper.to_entity(orm_obj) for orm_obj in queryset]
     
-    def search_by_nombre(self, nombre: str) -> List[ProductoEntity]:
-        """Buscar productos por nombre (búsqueda parcial)"""
-        queryset = ProductoORM.objects.select_related('empresa').filter(
-            nombre__icontains=nombre
-        )
-        return [ProductoMapper.to_entity(orm_obj) for orm_obj in queryset]
+    def search_by_nombre(self, nombre: str, limit: int = 100,
+                         offset: int = 0) -> List[ProductoEntity]:
+        """Buscar productos por nombre o código, ordenados por relevancia"""
+        resultados = self.SEARCH.search(self._read_queryset(), nombre, limit, offset)
+        return [ProductoMapper.to_entity(orm_obj) for orm_obj in resultados]
     
     def delete(self, codigo: ProductCode) -> bool:
         """Eliminar producto por código"""
@@ -80,4 +130,130 @@ class DjangoProductoRepository(IProductoRepository):
     
     def exists(self, codigo: str) -> bool:
         """Verificar si existe producto con el código dado"""
-        return ProductoORM.objects.filter(codigo=codigo).exists()
+        existe = ProductoORM.objects.filter(codigo=codigo).exists()
+        if not existe:
+            self._punto_reorden.missing(codigo)
+        return existe
+
+
+class DjangoCatalogoImportRepository(ICatalogoImportRepository):
+    """
+    Implementación Django de la importación masiva del catálogo
+    
+    Los lotes se escriben con bulk_create, sin pasar por save(): los
+    productos importados son nuevos, así que no tienen inventario cuyo punto
+    de reorden o clasificación ABC haya que actualizar. Las filas del pivote
+    de precios se arman en memoria con los precios del lote.
+    """
+    
+    def existing_codigos(self, codigos: Sequence[str]) -> Set[str]:
+        """Códigos de producto que ya existen"""
+        return set(
+            ProductoORM.objects.filter(codigo__in=codigos).values_list('codigo', flat=True)
+        )
+    
+    def existing_empresas(self, nits: Sequence[str]) -> Set[str]:
+        """NITs de empresa que existen"""
+        return set(EmpresaORM.objects.filter(nit__in=nits).values_list('nit', flat=True))
+    
+    def save_chunk(self, productos: List[ProductoEntity], precios: List[Tuple[str, str, Decimal]],
+                   progress: ImportProgress) -> None:
+        """Guardar productos, precios y punto de control en una transacción"""
+        try:
+            with transaction.atomic():
+                ProductoORM.objects.bulk_create(
+                    [ProductoMapper.to_orm(producto) for producto in productos]
+                )
+                PrecioMoneda.objects.bulk_create([
+                    PrecioMoneda(producto_id=codigo, moneda=moneda, precio=precio)
+                    for codigo, moneda, precio in precios
+                ])
+                PrecioPivot.objects.bulk_create(self._pivots(precios))
+                self.save_progress(progress)
+                if productos:
+                    # bulk_create no emite post_save: descartar ausencias en caché
+                    producto_cache.invalidate_on_commit(*(str(producto.codigo) for producto in productos))
+        except IntegrityError as e:
+            # Otro proceso creó alguno de los productos: al reanudar se reporta
+            # como existente
+            raise BusinessRuleViolationError(
+                f"Conflicto al guardar el lote hasta la fila {progress.filas_procesadas}; "
+                f"reanude la importación"
+            ) from e
+    
+    @staticmethod
+    def _pivots(precios: List[Tuple[str, str, Decimal]]) -> List[PrecioPivot]:
+        """Filas del pivote calculadas en memoria desde los precios del lote"""
+        pivots: Dict[str, PrecioPivot] = {}
+        for codigo, moneda, precio in precios:
+            pivot = pivots.setdefault(codigo, PrecioPivot(producto_id=codigo))
+            setattr(pivot, f'precio_{moneda.lower()}', precio)
+        return list(pivots.values())
+    
+    def save_progress(self, progress: ImportProgress) -> None:
+        """Actualizar el registro de la importación con el avance"""
+        estado = (ImportacionCatalogo.Estado.COMPLETADA if progress.completada
+                  else ImportacionCatalogo.Estado.EN_PROCESO)
+        ImportacionCatalogo.objects.filter(pk=progress.importacion_id).update(
+            estado=estado,
+            filas_procesadas=progress.filas_procesadas,
+            productos_creados=progress.productos_creados,
+            precios_creados=progress.precios_creados,
+            total_errores=progress.total_errores,
+            errores=[error.to_dict() for error in progress.errores],
+            updated_at=timezone.now()
+        )
+
+
+# Productos leídos por código, compartidos por las peticiones del proceso
+producto_cache = EntityCache('productos')
+
+
+class CachingProductoRepository(IProductoRepository):
+    """
+    Repositorio de productos con caché de lectura por código
+    
+    find_by_codigo y exists se resuelven desde producto_cache (también la
+    ausencia del código); save y delete escriben en el repositorio envuelto
+    e invalidan la entrada. Listados y búsquedas no pasan por la caché.
+    """
+    
+    def __init__(self, repository: Optional[IProductoRepository] = None,
+                 cache: EntityCache = producto_cache):
+        self.repository = repository if repository is not None else DjangoProductoRepository()
+        self.cache = cache
+    
+    def save(self, producto: ProductoEntity) -> ProductoEntity:
+        guardado = self.repository.save(producto)
+        self.cache.invalidate_on_commit(str(producto.codigo))
+        return guardado
+    
+    def find_by_codigo(self, codigo: ProductCode) -> Optional[ProductoEntity]:
+        producto, _ = self.cache.get_or_load(str(codigo), self.repository.find_by_codigo)
+        if hasattr(self.repository, 'track'):
+            # save() decide con la última lectura si propagar el punto de reorden
+            self.repository.track(str(codigo), producto)
+        return producto
+    
+    def find_all(self, limit: int = 100, offset: int = 0) -> List[ProductoEntity]:
+        return self.repository.find_all(limit=limit, offset=offset)
+    
+    def find_by_empresa(self, empresa_nit: NIT) -> List[ProductoEntity]:
+        return self.repository.find_by_empresa(empresa_nit)
+    
+    def search_by_nombre(self, nombre: str, limit: int = 100,
+                         offset: int = 0) -> List[ProductoEntity]:
+        return self.repository.search_by_nombre(nombre, limit=limit, offset=offset)
+    
+    def delete(self, codigo: ProductCode) -> bool:
+        eliminado = self.repository.delete(codigo)
+        self.cache.invalidate_on_commit(str(codigo))
+        return eliminado
+    
+    def exists(self, codigo: str) -> bool:
+        return self.find_by_codigo(codigo) is not None
+
+
+def producto_modificado(sender, instance, **kwargs) -> None:
+    """Receptor de post_save/post_delete de Producto"""
+    producto_cache.invalidate_on_commit(instance.codigo)
@@ -1,5 +1,8 @@
 from rest_framework import serializers
-from .orm_models import Producto, PrecioMoneda
+from .orm_models import Producto, PrecioMoneda, PrecioPivot
+
+# Formato de PrecioMoneda.precio para los precios leídos del pivote
+_PRECIO = serializers.DecimalField(max_digits=12, decimal_places=2)
 
 
 class PrecioMonedaSerializer(serializers.ModelSerializer):
@@ -16,8 +19,13 @@ class PrecioMonedaSerializer(serializers.ModelSerializer):
 
 
 class ProductoSerializer(serializers.ModelSerializer):
-    """Serializer for Producto with nested prices"""
-    precios = PrecioMonedaSerializer(many=True, required=False)
+    """
+    Serializer for Producto with prices
+    
+    Prices are written as PrecioMoneda rows and read back from PrecioPivot
+    (select_related('precio_pivot') avoids one query per product).
+    """
+    precios = PrecioMonedaSerializer(many=True, required=False, write_only=True)
     empresa_nombre = serializers.CharField(source='empresa.nombre', read_only=True)
     created_by = serializers.StringRelatedField(read_only=True)
     
@@ -27,14 +35,24 @@ class ProductoSerializer(serializers.ModelSerializer):
                   'precios', 'created_by', 'created_at', 'updated_at')
         read_only_fields = ('created_by', 'created_at', 'updated_at')
     
+    def to_representation(self, instance):
+        """Agregar los precios leídos del pivote"""
+        data = super().to_representation(instance)
+        try:
+            precios = instance.precio_pivot.por_moneda()
+        except PrecioPivot.DoesNotExist:
+            precios = {}
+        data['precios'] = [
+            {'moneda': moneda, 'precio': _PRECIO.to_representation(precio)}
+            for moneda, precio in precios.items()
+        ]
+        return data
+    
     def create(self, validated_data):
         """Crear producto con precios"""
         precios_data = validated_data.pop('precios', [])
         producto = Producto.objects.create(**validated_data)
-        
-        for precio_data in precios_data:
-            PrecioMoneda.objects.create(producto=producto, **precio_data)
-        
+        self._crear_precios(producto, precios_data)
         return producto
     
     def update(self, instance, validated_data):
@@ -46,12 +64,22 @@ class ProductoSerializer(serializers.ModelSerializer):
             setattr(instance, attr, value)
         instance.save()
         
-        # Actualizar precios si se proporcionaron
+        # Reemplazar precios si se proporcionaron
         if precios_data is not None:
-            # Eliminar precios existentes
             instance.precios.all().delete()
-            # Crear nuevos precios
-            for precio_data in precios_data:
-                PrecioMoneda.objects.create(producto=instance, **precio_data)
+            self._crear_precios(instance, precios_data)
         
         return instance
+    
+    @staticmethod
+    def _crear_precios(producto: Producto, precios_data) -> None:
+        """Un INSERT para los precios y una sola actualización del pivote y de ABC"""
+        PrecioMoneda.objects.bulk_create([
+            PrecioMoneda(producto=producto, **precio_data) for precio_data in precios_data
+        ])
+        # bulk_create y el delete por queryset no pasan por PrecioMoneda.save/delete
+        PrecioMoneda.precios_cambiados([producto.pk])
+        # Releer el pivote actualizado al serializar
+        pivot = Producto._meta.get_field('precio_pivot')
+        if pivot.is_cached(producto):
+            pivot.delete_cached_value(producto)
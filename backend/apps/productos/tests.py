@@ -0,0 +1,675 @@
+"""
+Tests para el módulo de Productos
+"""
+import csv
+import io
+import shutil
+import tempfile
+from unittest import mock
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APITestCase
+from nexus_domain.entities import Producto as ProductoEntity
+from nexus_domain.search import PrefixIndex
+from nexus_domain.exceptions import BusinessRuleViolationError, EntityNotFoundError
+from nexus_domain.value_objects import NIT, ProductCode
+from apps.core.query_budget import QueryBudgetTestMixin
+from apps.empresas.models import Empresa
+from apps.inventario.models import Inventario
+from .autocomplete import autocomplete
+from .importers import ejecutar_importacion
+from .models import Producto, PrecioMoneda, PrecioPivot, TasaCambio, ImportacionCatalogo
+from .repositories import DjangoCatalogoImportRepository, DjangoProductoRepository
+from .serializers import ProductoSerializer
+from .views import ProductoViewSet
+
+User = get_user_model()
+
+
+class ProductoQueryBudgetTest(QueryBudgetTestMixin, APITestCase):
+    """Tests de presupuesto de consultas para el API de Productos"""
+    
+    def setUp(self):
+        """Varios productos con creador para detectar consultas N+1"""
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='admin123',
+            role='ADMIN'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        
+        empresa = Empresa.objects.create(
+            nit='900123456',
+            nombre='TechCorp',
+            direccion='Calle 123 #45-67',
+            telefono='3001234567'
+        )
+        for i in range(5):
+            Producto.objects.create(
+                codigo=f'PROD-00{i}',
+                nombre=f'Laptop {i}',
+                empresa=empresa,
+                created_by=self.admin_user
+            )
+        self.list_url = reverse('producto-list')
+    
+    def test_budgets_declared(self):
+        """Test: list y retrieve declaran presupuesto"""
+        self.assertBudgetsDeclared(ProductoViewSet)
+    
+    def test_list_within_budget(self):
+        """Test: Listar productos (todos, por empresa y por búsqueda)"""
+        for params in ({}, {'empresa': '900123456'}, {'search': 'Laptop'}):
+            response = self.assertQueryBudget(
+                ProductoViewSet, 'list', lambda: self.client.get(self.list_url, params)
+            )
+            self.assertEqual(len(response.data), 5)
+    
+    def test_retrieve_within_budget(self):
+        """Test: Obtener un producto"""
+        url = reverse('producto-detail', kwargs={'pk': 'PROD-000'})
+        response = self.assertQueryBudget(ProductoViewSet, 'retrieve', lambda: self.client.get(url))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created_by_id'], str(self.admin_user.id))
+
+
+class ProductoCaracteristicasTest(APITestCase):
+    """Tests de características estructuradas en el API de Productos"""
+    
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='admin123',
+            role='ADMIN'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        
+        self.empresa = Empresa.objects.create(
+            nit='900123456',
+            nombre='TechCorp',
+            direccion='Calle 123 #45-67',
+            telefono='3001234567'
+        )
+        self.caracteristicas = {'color': 'negro', 'ram': 16, 'puertos': ['usb', 'hdmi']}
+    
+    def test_create_persists_structured_value(self):
+        """Test: El objeto enviado se guarda como objeto JSON, no como texto"""
+        response = self.client.post(reverse('producto-list'), {
+            'codigo': 'PROD-001',
+            'nombre': 'Laptop',
+            'empresa': '900123456',
+            'caracteristicas': self.caracteristicas
+        }, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['caracteristicas'], self.caracteristicas)
+        self.assertEqual(
+            Producto.objects.get(codigo='PROD-001').caracteristicas, self.caracteristicas
+        )
+    
+    def test_list_and_retrieve_pass_raw_json_through(self):
+        """Test: Lectura devuelve las características sin doble codificación"""
+        Producto.objects.create(
+            codigo='PROD-001',
+            nombre='Laptop',
+            empresa=self.empresa,
+            caracteristicas=self.caracteristicas
+        )
+        
+        listed = self.client.get(reverse('producto-list')).json()
+        detail = self.client.get(reverse('producto-detail', kwargs={'pk': 'PROD-001'})).json()
+        
+        self.assertEqual(listed[0]['caracteristicas'], self.caracteristicas)
+        self.assertEqual(detail['caracteristicas'], self.caracteristicas)
+    
+    def test_patch_null_punto_reorden_inherits_empresa(self):
+        """Test: punto_reorden null quita el valor propio y el inventario hereda el de la empresa"""
+        Empresa.objects.filter(nit='900123456').update(punto_reorden=25)
+        producto = Producto.objects.create(
+            codigo='PROD-001', nombre='Laptop', empresa=self.empresa, punto_reorden=5
+        )
+        inventario = Inventario.objects.create(empresa_id='900123456', producto=producto, cantidad=8)
+        url = reverse('producto-detail', kwargs={'pk': 'PROD-001'})
+        
+        response = self.client.patch(url, {'punto_reorden': None}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.json()['punto_reorden'])
+        inventario.refresh_from_db()
+        self.assertEqual(inventario.punto_reorden, 25)
+    
+    def test_put_without_punto_reorden_clears_it(self):
+        """Test: Un PUT sin punto_reorden reemplaza el valor propio por el heredado"""
+        Producto.objects.create(codigo='PROD-001', nombre='Laptop', empresa=self.empresa, punto_reorden=5)
+        url = reverse('producto-detail', kwargs={'pk': 'PROD-001'})
+        
+        response = self.client.put(url, {'nombre': 'Laptop Pro'}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(Producto.objects.get(codigo='PROD-001').punto_reorden)
+    
+    def test_bool_punto_reorden_rejected(self):
+        """Test: true/false no es un punto de reorden válido"""
+        Producto.objects.create(codigo='PROD-001', nombre='Laptop', empresa=self.empresa)
+        url = reverse('producto-detail', kwargs={'pk': 'PROD-001'})
+        
+        response = self.client.patch(url, {'punto_reorden': True}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ProductoUpsertTest(TestCase):
+    """Tests del guardado con upsert de una sola sentencia"""
+    
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='admin123',
+            role='ADMIN'
+        )
+        self.empresa = Empresa.objects.create(
+            nit='900123456',
+            nombre='TechCorp',
+            direccion='Calle 123 #45-67',
+            telefono='3001234567'
+        )
+        self.repository = DjangoProductoRepository()
+    
+    def _producto(self, **kwargs):
+        return ProductoEntity(
+            codigo=ProductCode('PROD-001'),
+            nombre=kwargs.pop('nombre', 'Laptop'),
+            empresa_nit=NIT('900123456'),
+            created_by_id=str(self.admin_user.id),
+            **kwargs
+        )
+    
+    def test_create_is_single_statement(self):
+        """Test: Crear un producto nuevo ejecuta una sola consulta"""
+        self.assertFalse(self.repository.exists('PROD-001'))
+        
+        with self.assertNumQueries(1):
+            producto = self.repository.save(self._producto(punto_reorden=5))
+        
+        self.assertEqual(producto.created_by_id, str(self.admin_user.id))
+        self.assertEqual(Producto.objects.get(codigo='PROD-001').empresa_id, '900123456')
+    
+    def test_update_is_single_statement(self):
+        """Test: Actualizar sin cambiar el punto de reorden es una sola consulta"""
+        Producto.objects.create(
+            codigo='PROD-001', nombre='Laptop', empresa=self.empresa,
+            created_by=self.admin_user
+        )
+        producto = self.repository.find_by_codigo('PROD-001')
+        producto.update_info(nombre='Laptop Pro')
+        
+        with self.assertNumQueries(1):
+            actualizado = self.repository.save(producto)
+        
+        orm_obj = Producto.objects.get(codigo='PROD-001')
+        self.assertEqual(orm_obj.nombre, 'Laptop Pro')
+        self.assertEqual(orm_obj.created_by_id, self.admin_user.id)
+        self.assertEqual(actualizado.created_at, orm_obj.created_at)
+    
+    def test_update_does_not_change_creator(self):
+        """Test: El creador solo se asigna al crear el producto"""
+        Producto.objects.create(
+            codigo='PROD-001', nombre='Laptop', empresa=self.empresa,
+            created_by=self.admin_user
+        )
+        
+        self.repository.save(self._producto(nombre='Laptop Pro', punto_reorden=None))
+        
+        self.assertEqual(
+            Producto.objects.get(codigo='PROD-001').created_by_id, self.admin_user.id
+        )
+
+
+class ProductoUpsertReferenciaTest(TransactionTestCase):
+    """Referencias inexistentes en el upsert (requiere confirmar la transacción)"""
+    
+    def test_missing_empresa_raises_domain_error(self):
+        """Test: Una empresa inexistente se traduce a EntityNotFoundError"""
+        producto = ProductoEntity(
+            codigo=ProductCode('PROD-001'),
+            nombre='Laptop',
+            empresa_nit=NIT('900999999')
+        )
+        
+        with self.assertRaises(EntityNotFoundError):
+            DjangoProductoRepository().save(producto)
+        
+        self.assertFalse(Producto.objects.filter(codigo='PROD-001').exists())
+
+
+class PrecioPivotTest(TestCase):
+    """Tests para el pivote de precios por moneda y las tasas de cambio"""
+    
+    def setUp(self):
+        empresa = Empresa.objects.create(
+            nit='900123456',
+            nombre='TechCorp',
+            direccion='Calle 123 #45-67',
+            telefono='3001234567'
+        )
+        self.producto = Producto.objects.create(codigo='PROD-001', nombre='Laptop', empresa=empresa)
+    
+    def test_pivot_follows_precio_writes(self):
+        """Test: Crear, modificar y eliminar precios actualiza el pivote"""
+        cop = PrecioMoneda.objects.create(producto=self.producto, moneda='COP', precio='1000.00')
+        PrecioMoneda.objects.create(producto=self.producto, moneda='USD', precio='0.25')
+        
+        pivot = PrecioPivot.objects.get(producto=self.producto)
+        self.assertEqual(str(pivot.precio_cop), '1000.00')
+        self.assertEqual(str(pivot.precio_usd), '0.25')
+        self.assertIsNone(pivot.precio_eur)
+        
+        cop.precio = '1200.00'
+        cop.save()
+        cop.delete()
+        pivot.refresh_from_db()
+        self.assertIsNone(pivot.precio_cop)
+        self.assertEqual(str(pivot.precio_usd), '0.25')
+        
+        self.producto.precios.get().delete()
+        self.assertFalse(PrecioPivot.objects.filter(producto=self.producto).exists())
+    
+    def test_serializer_update_replaces_pivot(self):
+        """Test: Reemplazar los precios desde el serializer recalcula el pivote"""
+        PrecioMoneda.objects.create(producto=self.producto, moneda='COP', precio='1000.00')
+        
+        serializer = ProductoSerializer(
+            self.producto, data={'precios': [{'moneda': 'MXN', 'precio': '50.00'}]}, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        
+        pivot = PrecioPivot.objects.get(producto=self.producto)
+        self.assertIsNone(pivot.precio_cop)
+        self.assertEqual(str(pivot.precio_mxn), '50.00')
+    
+    def test_serializer_reads_prices_from_pivot(self):
+        """Test: El serializer lee los precios del pivote, sin consultar PrecioMoneda"""
+        PrecioMoneda.objects.create(producto=self.producto, moneda='COP', precio='1000.00')
+        PrecioMoneda.objects.create(producto=self.producto, moneda='USD', precio='0.25')
+        producto = Producto.objects.select_related('empresa', 'precio_pivot').get(pk=self.producto.pk)
+        
+        with self.assertNumQueries(0):
+            data = ProductoSerializer(producto).data
+        
+        self.assertEqual(data['precios'], [
+            {'moneda': 'COP', 'precio': '1000.00'}, {'moneda': 'USD', 'precio': '0.25'}
+        ])
+    
+    def test_serializer_refreshes_pivot_once_per_product(self):
+        """Test: Escribir varios precios actualiza el pivote una sola vez"""
+        serializer = ProductoSerializer(self.producto, data={'precios': [
+            {'moneda': 'COP', 'precio': '1000.00'},
+            {'moneda': 'USD', 'precio': '0.25'},
+            {'moneda': 'EUR', 'precio': '0.23'},
+        ]}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        
+        with mock.patch.object(PrecioPivot, 'refresh', wraps=PrecioPivot.refresh) as refresh:
+            serializer.save()
+        
+        refresh.assert_called_once()
+        self.assertEqual(len(serializer.data['precios']), 3)
+        self.assertEqual(str(PrecioPivot.objects.get(producto=self.producto).precio_eur), '0.23')
+    
+    def test_price_columns_convert_through_base(self):
+        """Test: La conversión entre dos monedas no base pasa por COP"""
+        TasaCambio.objects.create(moneda='USD', tasa='4000')
+        TasaCambio.objects.create(moneda='EUR', tasa='5000')
+        PrecioMoneda.objects.create(producto=self.producto, moneda='EUR', precio='8.00')
+        
+        precios = Producto.objects.annotate(
+            **PrecioPivot.price_columns(convertir=True)
+        ).values('precio_cop', 'precio_usd', 'precio_eur', 'precio_mxn').get()
+        
+        self.assertEqual(precios['precio_cop'], 40000)
+        self.assertEqual(precios['precio_usd'], 10)
+        self.assertEqual(precios['precio_eur'], 8)
+        self.assertIsNone(precios['precio_mxn'])
+
+
+class ProductoBusquedaTest(TestCase):
+    """Tests para la búsqueda de productos por relevancia"""
+    
+    def setUp(self):
+        self.empresa = Empresa.objects.create(
+            nit='900123456',
+            nombre='TechCorp',
+            direccion='Calle 123 #45-67',
+            telefono='3001234567'
+        )
+        Producto.objects.create(codigo='PROD-001', nombre='Laptop Lenovo', empresa=self.empresa)
+        Producto.objects.create(codigo='PROD-002', nombre='Mouse inalámbrico', empresa=self.empresa)
+        Producto.objects.create(codigo='PROD-003', nombre='Funda para laptop', empresa=self.empresa)
+        self.repository = DjangoProductoRepository()
+    
+    def _codigos(self, texto, **kwargs):
+        return [str(p.codigo) for p in self.repository.search_by_nombre(texto, **kwargs)]
+    
+    def test_ranked_and_typo_tolerant(self):
+        """Test: Tolera errores de escritura y ordena por relevancia"""
+        with self.assertNumQueries(1):
+            self.assertEqual(self._codigos('laptpo'), ['PROD-001', 'PROD-003'])
+        self.assertEqual(self._codigos('laptop lenovo'), ['PROD-001'])
+        self.assertEqual(self._codigos('inalambrico'), ['PROD-002'])
+        self.assertEqual(self._codigos('PROD-003')[0], 'PROD-003')
+        self.assertEqual(self._codigos('laptop', limit=1, offset=1), ['PROD-003'])
+    
+    def test_index_follows_writes(self):
+        """Test: Productos creados, renombrados o eliminados se reflejan en la búsqueda"""
+        self.assertEqual(self._codigos('mouse'), ['PROD-002'])
+        
+        Producto.objects.create(codigo='PROD-004', nombre='Mouse gamer', empresa=self.empresa)
+        Producto.objects.filter(codigo='PROD-002').delete()
+        producto = Producto.objects.get(codigo='PROD-001')
+        producto.nombre = 'Mouse ergonómico'
+        producto.save()
+        
+        self.assertEqual(self._codigos('mouse'), ['PROD-001', 'PROD-004'])
+        self.assertEqual(self._codigos('lenovo'), [])
+
+
+@override_settings(AUTOCOMPLETE_REFRESH_SECONDS=0)
+class ProductoAutocompleteTest(QueryBudgetTestMixin, APITestCase):
+    """Tests para el autocompletado de productos"""
+    
+    def setUp(self):
+        admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='admin123',
+            role='ADMIN'
+        )
+        self.client.force_authenticate(user=admin_user)
+        
+        self.empresa = Empresa.objects.create(
+            nit='900123456',
+            nombre='TechCorp',
+            direccion='Calle 123 #45-67',
+            telefono='3001234567'
+        )
+        Producto.objects.create(codigo='PROD-001', nombre='Laptop Lenovo', empresa=self.empresa)
+        Producto.objects.create(codigo='PROD-002', nombre='Mouse inalámbrico', empresa=self.empresa)
+        Producto.objects.create(codigo='PROD-003', nombre='Funda para laptop', empresa=self.empresa)
+        # El índice es del proceso: no debe arrastrar datos de otros tests
+        autocomplete.invalidate()
+        self.url = reverse('producto-autocomplete')
+    
+    def _codigos(self, q, **params):
+        response = self.client.get(self.url, {'q': q, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['codigo'] for item in response.data]
+    
+    def test_autocomplete(self):
+        """Test: Prefijos de palabras del nombre y de código, sin tildes ni mayúsculas"""
+        self.assertEqual(self._codigos('lap'), ['PROD-003', 'PROD-001'])
+        self.assertEqual(self._codigos('inalam'), ['PROD-002'])
+        self.assertEqual(self._codigos('lap len'), ['PROD-001'])
+        self.assertEqual(self._codigos('prod-00', limit=2), ['PROD-001', 'PROD-002'])
+        self.assertEqual(self._codigos('PROD-002'), ['PROD-002'])
+        self.assertEqual(self._codigos(''), [])
+        self.assertEqual(
+            self.client.get(self.url, {'q': 'lap', 'limit': 'x'}).status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+    
+    def test_within_budget(self):
+        """Test: Construir el índice y consultarlo no depende del número de productos"""
+        response = self.assertQueryBudget(
+            ProductoViewSet, 'autocomplete', lambda: self.client.get(self.url, {'q': 'lap'})
+        )
+        self.assertEqual(len(response.data), 2)
+        self.assertQueryBudget(
+            ProductoViewSet, 'autocomplete', lambda: self.client.get(self.url, {'q': 'mouse'})
+        )
+    
+    def test_index_follows_writes(self):
+        """Test: Escrituras del proceso (señales y upsert) y de otros procesos"""
+        self.assertEqual(self._codigos('mouse'), ['PROD-002'])
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            Producto.objects.create(codigo='PROD-004', nombre='Mouse gamer', empresa=self.empresa)
+            Producto.objects.get(codigo='PROD-002').delete()
+            repository = DjangoProductoRepository()
+            producto = repository.find_by_codigo(ProductCode('PROD-001'))
+            producto.nombre = 'Mouse ergonómico'
+            repository.save(producto)
+        # Lo agregado después de construir el índice va al final, sin orden
+        self.assertCountEqual(self._codigos('mouse'), ['PROD-004', 'PROD-001'])
+        self.assertEqual(self._codigos('lenovo'), [])
+        
+        # Otro worker: update() no emite señales, se detecta por updated_at
+        Producto.objects.filter(codigo='PROD-003').update(
+            nombre='Mouse pad', updated_at=timezone.now()
+        )
+        self.assertEqual(self._codigos('mouse pa'), ['PROD-003'])
+    
+    def test_rolled_back_write_not_indexed(self):
+        """Test: Un producto de una transacción revertida no llega al índice"""
+        self.assertEqual(self._codigos('teclado'), [])
+        
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    Producto.objects.create(codigo='PROD-004', nombre='Teclado', empresa=self.empresa)
+                    raise IntegrityError('rollback')
+            except IntegrityError:
+                pass
+        
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self._codigos('teclado'), [])
+    
+    def test_rebuild_runs_outside_lock(self):
+        """Test: Las escrituras confirmadas durante la construcción llegan al índice nuevo"""
+        build = PrefixIndex.build
+        
+        def build_con_escritura(items):
+            index = build(items)
+            # Otro hilo confirma una escritura mientras se construye
+            self.assertFalse(autocomplete._lock.locked())
+            autocomplete.update('PROD-009', 'Mouse vertical')
+            return index
+        
+        with mock.patch.object(PrefixIndex, 'build', side_effect=build_con_escritura):
+            self.assertCountEqual(self._codigos('mouse'), ['PROD-002', 'PROD-009'])
+    
+    @override_settings(AUTOCOMPLETE_MAX_PRODUCTOS=2)
+    def test_database_fallback(self):
+        """Test: Sobre el máximo de productos se consulta la base de datos"""
+        self.assertEqual(self._codigos('laptop'), ['PROD-001'])
+        self.assertEqual(self._codigos('prod-00', limit=2), ['PROD-003', 'PROD-001'])
+
+
+class ImportacionCatalogoTest(APITestCase):
+    """Tests para la importación masiva del catálogo"""
+    
+    CSV = (
+        "codigo,nombre,empresa,punto_reorden,precio_COP,precio_USD\n"
+        "PROD-001,Laptop,900123456,5,2500000,650.50\n"
+        "PROD-002,Mouse,900123456,,45000,\n"
+        "PROD-003,X,900123456,,,\n"
+        "PROD-004,Teclado,900999999,,,\n"
+        "PROD-005,Monitor,900123456,,abc,\n"
+        "PROD-006,Webcam,900123456,,120000,\n"
+    )
+    
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='admin123',
+            role='ADMIN'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        Empresa.objects.create(
+            nit='900123456',
+            nombre='TechCorp',
+            direccion='Calle 123 #45-67',
+            telefono='3001234567'
+        )
+        self.url = reverse('producto-importar')
+    
+    def _upload(self, nombre, contenido):
+        return self.client.post(
+            self.url,
+            {'archivo': SimpleUploadedFile(nombre, contenido.encode('utf-8'))},
+            format='multipart'
+        )
+    
+    def _procesar(self, response):
+        """Ejecutar las importaciones pendientes y consultar el estado de la subida"""
+        call_command('importar_catalogo', '--pendientes', stdout=io.StringIO())
+        return self.client.get(reverse('producto-importacion', args=[response.data['importacion_id']]))
+    
+    def test_importar_csv_reporta_errores_por_fila(self):
+        """Test: Importar CSV crea productos y precios y reporta filas inválidas"""
+        response = self._upload('catalogo.csv', self.CSV)
+        
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['estado'], 'PENDIENTE')
+        self.assertFalse(Producto.objects.exists())
+        
+        response = self._procesar(response)
+        self.assertEqual(response.data['estado'], 'COMPLETADA')
+        self.assertEqual(response.data['productos_creados'], 3)
+        self.assertEqual(response.data['precios_creados'], 4)
+        self.assertEqual([e['fila'] for e in response.data['errores']], [3, 5, 4])
+        
+        laptop = Producto.objects.get(codigo='PROD-001')
+        self.assertEqual(laptop.punto_reorden, 5)
+        self.assertEqual(laptop.created_by, self.admin_user)
+        self.assertEqual(
+            str(PrecioMoneda.objects.get(producto=laptop, moneda='USD').precio), '650.50'
+        )
+        self.assertEqual(str(laptop.precio_pivot.precio_usd), '650.50')
+    
+    def test_importar_ndjson(self):
+        """Test: NDJSON con precios anidados y líneas inválidas"""
+        contenido = (
+            '{"codigo": "PROD-001", "nombre": "Laptop", "empresa": "900123456", '
+            '"caracteristicas": {"ram": 16}, "precios": {"COP": 2500000, "EUR": 600}}\n'
+            '\n'
+            '{no es json\n'
+        )
+        
+        response = self._procesar(self._upload('catalogo.ndjson', contenido))
+        
+        self.assertEqual(response.data['productos_creados'], 1)
+        self.assertEqual(response.data['errores'][0]['fila'], 3)
+        self.assertEqual(Producto.objects.get(codigo='PROD-001').caracteristicas, {'ram': 16})
+        self.assertEqual(PrecioMoneda.objects.filter(producto_id='PROD-001').count(), 2)
+    
+    def test_formato_no_soportado(self):
+        """Test: Archivo con extensión desconocida"""
+        response = self._upload('catalogo.txt', self.CSV)
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_reanudar_importacion_interrumpida(self):
+        """Test: Una importación interrumpida continúa desde el último lote guardado"""
+        importacion = ImportacionCatalogo.objects.create(
+            archivo=SimpleUploadedFile('catalogo.csv', self.CSV.encode('utf-8')),
+            formato='csv',
+            created_by=self.admin_user
+        )
+        original = DjangoCatalogoImportRepository.save_chunk
+        llamadas = []
+        
+        def save_chunk_interrumpido(repo, productos, precios, progress):
+            llamadas.append(progress.filas_procesadas)
+            if len(llamadas) == 2:
+                raise ConnectionError("conexión perdida")
+            return original(repo, productos, precios, progress)
+        
+        with mock.patch.object(DjangoCatalogoImportRepository, 'save_chunk', save_chunk_interrumpido):
+            with self.assertRaises(ConnectionError):
+                ejecutar_importacion(importacion, chunk_size=2)
+        
+        self.assertEqual(importacion.estado, 'FALLIDA')
+        self.assertEqual(importacion.filas_procesadas, 2)
+        
+        response = self.client.post(reverse('producto-importacion', args=[importacion.pk]))
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['estado'], 'PENDIENTE')
+        
+        response = self._procesar(response)
+        self.assertEqual(response.data['estado'], 'COMPLETADA')
+        self.assertEqual(response.data['filas_procesadas'], 6)
+        self.assertEqual(response.data['productos_creados'], 3)
+        self.assertEqual(response.data['total_errores'], 3)
+        self.assertEqual(Producto.objects.count(), 3)
+    
+    def test_importacion_en_proceso_no_se_ejecuta_dos_veces(self):
+        """Test: Una importación EN_PROCESO no se reanuda ni se vuelve a ejecutar"""
+        importacion = ImportacionCatalogo.objects.create(
+            archivo=SimpleUploadedFile('catalogo.csv', self.CSV.encode('utf-8')),
+            formato='csv',
+            estado=ImportacionCatalogo.Estado.EN_PROCESO
+        )
+        
+        response = self.client.post(reverse('producto-importacion', args=[importacion.pk]))
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        with self.assertRaises(BusinessRuleViolationError):
+            ejecutar_importacion(importacion)
+        self.assertFalse(Producto.objects.exists())
+        
+        # Tras una caída del proceso se puede forzar desde la consola
+        call_command('importar_catalogo', '--reanudar', importacion.pk, '--forzar', stdout=io.StringIO())
+        importacion.refresh_from_db()
+        self.assertEqual(importacion.estado, 'COMPLETADA')
+
+
+class ProductoExportTest(APITestCase):
+    """Tests para la exportación del catálogo"""
+    
+    def setUp(self):
+        admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='admin123',
+            role='ADMIN'
+        )
+        self.client.force_authenticate(user=admin_user)
+        
+        empresa = Empresa.objects.create(
+            nit='900123456',
+            nombre='TechCorp',
+            direccion='Calle 123 #45-67',
+            telefono='3001234567'
+        )
+        producto = Producto.objects.create(
+            codigo='PROD-001', nombre='Laptop', empresa=empresa, caracteristicas={'ram': 16}
+        )
+        Producto.objects.create(codigo='PROD-002', nombre='Mouse', empresa=empresa)
+        PrecioMoneda.objects.create(producto=producto, moneda='EUR', precio='600.00')
+    
+    def test_export_csv(self):
+        """Test: Un producto por fila, con características JSON y precios por moneda"""
+        response = self.client.get(reverse('producto-export'), {'format': 'csv'})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual([row['codigo'] for row in rows], ['PROD-001', 'PROD-002'])
+        self.assertEqual(rows[0]['caracteristicas'], '{"ram": 16}')
+        self.assertEqual(float(rows[0]['precio_eur']), 600.0)
+        self.assertEqual(rows[1]['precio_eur'], '')
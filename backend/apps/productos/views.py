@@ -1,4 +1,6 @@
 from rest_framework import viewsets, filters, status
+from rest_framework.decorators import action
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema, OpenApiParameter
@@ -12,6 +14,7 @@ from nexus_domain.use_cases.producto_use_cases import (
     UpdateProductoUseCase,
     DeleteProductoUseCase
 )
+from nexus_domain.interfaces import IEmpresaRepository, IProductoRepository
 from nexus_domain.exceptions import (
     DomainException,
     ValidationError,
@@ -21,8 +24,18 @@ from nexus_domain.exceptions import (
 )
 
 from apps.authentication.permissions import IsAdminUser
-from apps.empresas.repositories import DjangoEmpresaRepository
-from .repositories import DjangoProductoRepository
+from apps.core.container import container
+from apps.core.exporters import EXPORT_FORMATS, EXPORT_RENDERERS, export_response
+from apps.core.query_budget import query_budget
+from apps.core.renderers import RawJSONRenderer
+from .autocomplete import autocomplete as producto_autocomplete
+from .exports import catalogo_export
+from .importers import detect_formato, encolar_importacion
+from .orm_models import ImportacionCatalogo
+
+
+# Máximo de sugerencias por consulta de autocompletado
+AUTOCOMPLETE_MAX_LIMIT = 50
 
 
 @extend_schema(tags=['Productos'])
@@ -33,14 +46,16 @@ class ProductoViewSet(viewsets.ModelViewSet):
     Solo administradores pueden crear, editar y eliminar productos
     """
     permission_classes = [IsAdminUser]
+    # caracteristicas leídas como RawJSON se copian tal cual a la respuesta
+    renderer_classes = [RawJSONRenderer, BrowsableAPIRenderer]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['empresa', 'codigo']
     search_fields = ['nombre', 'codigo']
     ordering_fields = ['nombre', 'created_at']
     
     def _get_repositories(self):
-        """Obtener instancias de los repositorios"""
-        return DjangoProductoRepository(), DjangoEmpresaRepository()
+        """Repositorios del contenedor de dependencias"""
+        return container.resolve(IProductoRepository), container.resolve(IEmpresaRepository)
     
     def _handle_domain_exception(self, exception: DomainException) -> Response:
         """Mapear excepciones de dominio a respuestas HTTP"""
@@ -65,6 +80,7 @@ class ProductoViewSet(viewsets.ModelViewSet):
             OpenApiParameter(name='search', description='Buscar por nombre o código', type=OpenApiTypes.STR),
         ]
     )
+    @query_budget(1)
     def list(self, request, *args, **kwargs):
         """Listar productos usando caso de uso"""
         try:
@@ -85,7 +101,7 @@ class ProductoViewSet(viewsets.ModelViewSet):
             else:
                 productos = use_case.execute(limit=page_size, offset=offset)
             
-            data = [producto.to_dict() for producto in productos]
+            data = [producto.to_dict(raw_json=True) for producto in productos]
             return Response(data, status=status.HTTP_200_OK)
             
         except DomainException as e:
@@ -101,20 +117,13 @@ class ProductoViewSet(viewsets.ModelViewSet):
             producto_repo, empresa_repo = self._get_repositories()
             use_case = CreateProductoUseCase(producto_repo, empresa_repo)
             
-            # Convertir caracteristicas dict a string JSON si es necesario
-            import json
-            caracteristicas = request.data.get('caracteristicas', {})
-            if isinstance(caracteristicas, dict):
-                caracteristicas_str = json.dumps(caracteristicas)
-            else:
-                caracteristicas_str = caracteristicas
-            
             producto = use_case.execute(
                 codigo=request.data.get('codigo'),
                 nombre=request.data.get('nombre'),
                 empresa_nit=request.data.get('empresa'),
-                caracteristicas=caracteristicas_str,
-                user_id=str(request.user.id)
+                caracteristicas=request.data.get('caracteristicas'),
+                user_id=str(request.user.id),
+                punto_reorden=request.data.get('punto_reorden')
             )
             
             return Response(producto.to_dict(), status=status.HTTP_201_CREATED)
@@ -126,6 +135,7 @@ class ProductoViewSet(viewsets.ModelViewSet):
         summary="Obtener producto",
         description="Obtener detalles de un producto específico por código"
     )
+    @query_budget(1)
     def retrieve(self, request, *args, **kwargs):
         """Obtener producto usando caso de uso"""
         try:
@@ -135,7 +145,7 @@ class ProductoViewSet(viewsets.ModelViewSet):
             codigo = kwargs.get('pk')
             producto = use_case.execute(codigo)
             
-            return Response(producto.to_dict(), status=status.HTTP_200_OK)
+            return Response(producto.to_dict(raw_json=True), status=status.HTTP_200_OK)
             
         except DomainException as e:
             return self._handle_domain_exception(e)
@@ -152,18 +162,13 @@ class ProductoViewSet(viewsets.ModelViewSet):
             
             codigo = kwargs.get('pk')
             
-            # Convertir caracteristicas
-            import json
-            caracteristicas = request.data.get('caracteristicas', {})
-            if isinstance(caracteristicas, dict):
-                caracteristicas_str = json.dumps(caracteristicas)
-            else:
-                caracteristicas_str = caracteristicas
-            
             producto = use_case.execute(
                 codigo=codigo,
                 nombre=request.data.get('nombre'),
-                caracteristicas=caracteristicas_str
+                caracteristicas=request.data.get('caracteristicas'),
+                punto_reorden=request.data.get('punto_reorden'),
+                # Reemplazo completo: sin punto de reorden se hereda el de la empresa
+                clear_punto_reorden=request.data.get('punto_reorden') is None
             )
             
             return Response(producto.to_dict(), status=status.HTTP_200_OK)
@@ -186,13 +191,13 @@ class ProductoViewSet(viewsets.ModelViewSet):
             
             if 'nombre' in request.data:
                 kwargs_update['nombre'] = request.data['nombre']
-            if 'caracteristicas' in request.data:
-                import json
-                caracteristicas = request.data['caracteristicas']
-                if isinstance(caracteristicas, dict):
-                    kwargs_update['caracteristicas'] = json.dumps(caracteristicas)
+            if 'punto_reorden' in request.data:
+                if request.data['punto_reorden'] is None:
+                    kwargs_update['clear_punto_reorden'] = True
                 else:
-                    kwargs_update['caracteristicas'] = caracteristicas
+                    kwargs_update['punto_reorden'] = request.data['punto_reorden']
+            if 'caracteristicas' in request.data:
+                kwargs_update['caracteristicas'] = request.data['caracteristicas']
             
             producto = use_case.execute(**kwargs_update)
             
@@ -221,3 +226,120 @@ class ProductoViewSet(viewsets.ModelViewSet):
             
         except DomainException as e:
             return self._handle_domain_exception(e)
+    
+    @extend_schema(
+        summary="Autocompletar productos",
+        description="Productos cuyo código o alguna palabra del nombre empieza con el texto. "
+                    "Usa un índice en memoria del proceso: pensado para consultar en cada tecla",
+        parameters=[
+            OpenApiParameter(name='q', description='Texto escrito (código o nombre)', type=OpenApiTypes.STR),
+            OpenApiParameter(name='limit', description=f'Máximo de resultados (defecto 10, máximo {AUTOCOMPLETE_MAX_LIMIT})', type=OpenApiTypes.INT),
+        ]
+    )
+    @action(detail=False, methods=['get'])
+    @query_budget(2)
+    def autocomplete(self, request):
+        """Autocompletar por código y nombre"""
+        try:
+            limit = min(int(request.query_params.get('limit', 10)), AUTOCOMPLETE_MAX_LIMIT)
+        except ValueError:
+            return Response({'error': 'limit debe ser un entero'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        resultados = producto_autocomplete.search(request.query_params.get('q', ''), limit)
+        data = [{'codigo': codigo, 'nombre': nombre} for codigo, nombre in resultados]
+        return Response(data, status=status.HTTP_200_OK)
+    
+    @extend_schema(
+        summary="Exportar catálogo",
+        description="Exportar productos con un precio por moneda en CSV, Parquet o XLSX. "
+                    "Pensado para cargas en herramientas de BI; la memoria no crece con el número de filas",
+        parameters=[
+            OpenApiParameter(name='format', description=f"Formato: {', '.join(EXPORT_FORMATS)} (defecto csv)", type=OpenApiTypes.STR),
+            OpenApiParameter(name='empresa', description='Filtrar por NIT de empresa', type=OpenApiTypes.STR),
+        ],
+        responses={200: OpenApiTypes.BINARY}
+    )
+    @action(detail=False, methods=['get'], renderer_classes=EXPORT_RENDERERS)
+    def export(self, request):
+        """Exportar catálogo en streaming"""
+        try:
+            export = catalogo_export(request.query_params.get('empresa'))
+            return export_response(export, request.query_params.get('format', 'csv'))
+        except DomainException as e:
+            return self._handle_domain_exception(e)
+    
+    @extend_schema(
+        summary="Importar catálogo",
+        description="Importar productos con precios por moneda desde un archivo CSV, XLSX o NDJSON "
+                    "(campo archivo, multipart). Columnas: codigo, nombre, empresa, caracteristicas, "
+                    "punto_reorden y precio_<MONEDA> (o precios en NDJSON). Las filas inválidas se "
+                    "reportan sin detener la importación. La importación queda PENDIENTE y la ejecuta "
+                    "el comando importar_catalogo --pendientes; su avance se consulta en "
+                    "importar/{id}/ (solo administradores)"
+    )
+    @action(detail=False, methods=['post'])
+    def importar(self, request):
+        """Registrar una importación del catálogo para ejecutarla fuera de la petición"""
+        archivo = request.FILES.get('archivo')
+        if archivo is None:
+            return Response(
+                {'error': 'El archivo es requerido'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            formato = request.data.get('formato') or detect_formato(archivo.name)
+            if formato not in ImportacionCatalogo.Formato.values:
+                raise ValidationError(f"Formato de archivo no soportado: {formato}")
+            
+            importacion = ImportacionCatalogo.objects.create(
+                archivo=archivo,
+                formato=formato,
+                created_by=request.user
+            )
+            
+            return Response(self._importacion_data(importacion), status=status.HTTP_202_ACCEPTED)
+            
+        except DomainException as e:
+            return self._handle_domain_exception(e)
+    
+    @extend_schema(
+        summary="Estado o reanudación de una importación",
+        description="GET: avance y errores por fila de una importación. "
+                    "POST: volver a encolar una importación FALLIDA; continúa desde el último lote "
+                    "guardado (solo administradores)"
+    )
+    @action(detail=False, methods=['get', 'post'], url_path=r'importar/(?P<importacion_id>[0-9]+)')
+    def importacion(self, request, importacion_id=None):
+        """Consultar o reanudar una importación del catálogo"""
+        try:
+            importacion = ImportacionCatalogo.objects.get(pk=importacion_id)
+        except ImportacionCatalogo.DoesNotExist:
+            return Response(
+                {'error': f'Importación {importacion_id} no encontrada'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        if request.method == 'POST':
+            if encolar_importacion(importacion):
+                return Response(self._importacion_data(importacion), status=status.HTTP_202_ACCEPTED)
+            if importacion.estado == ImportacionCatalogo.Estado.EN_PROCESO:
+                return Response(
+                    {'error': f'La importación {importacion_id} ya está en proceso'},
+                    status=status.HTTP_409_CONFLICT
+                )
+        
+        return Response(self._importacion_data(importacion), status=status.HTTP_200_OK)
+    
+    def _importacion_data(self, importacion: ImportacionCatalogo) -> dict:
+        """Avance y errores por fila de una importación"""
+        return {
+            'importacion_id': str(importacion.pk),
+            'estado': importacion.estado,
+            'formato': importacion.formato,
+            'filas_procesadas': importacion.filas_procesadas,
+            'productos_creados': importacion.productos_creados,
+            'precios_creados': importacion.precios_creados,
+            'total_errores': importacion.total_errores,
+            'errores': importacion.errores,
+        }
@@ -0,0 +1,89 @@
+"""
+Benchmark del costo de autenticación por petición
+
+Autentica el mismo token JWT con JWTAuthentication de simplejwt (una
+consulta a la tabla de usuarios por petición) y con CachedJWTAuthentication
+(usuario desde la caché del proceso), y con esta última también sin caché
+(AUTH_USER_CACHE_SECONDS=0). Se mide solo authenticate(): decodificar y
+validar el token más resolver el usuario.
+
+Uso (desde backend/, contra la base de datos configurada):
+    python benchmarks/bench_auth.py
+    python benchmarks/bench_auth.py --requests 20000 --email admin@example.com
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+from rest_framework_simplejwt.authentication import JWTAuthentication  # noqa: E402
+from apps.authentication.authentication import CachedJWTAuthentication, user_cache  # noqa: E402
+from apps.authentication.tokens import UserRefreshToken  # noqa: E402
+
+
+def medir(authenticator, request: Request, peticiones: int) -> Tuple[float, float]:
+    """(µs por petición, consultas por petición)"""
+    consultas = []
+
+    def contar(execute, sql, params, many, context):
+        consultas.append(sql)
+        return execute(sql, params, many, context)
+
+    authenticator.authenticate(request)  # calentar conexión y caché
+    with connection.execute_wrapper(contar):
+        inicio = time.perf_counter()
+        for _ in range(peticiones):
+            authenticator.authenticate(request)
+        segundos = time.perf_counter() - inicio
+    return segundos / peticiones * 1e6, len(consultas) / peticiones
+
+
+def run(peticiones: int, email: str = None) -> Dict[str, Tuple[float, float]]:
+    """Costo por variante: {nombre: (µs/petición, consultas/petición)}"""
+    User = get_user_model()
+    usuario = User.objects.get(email=email) if email else User.objects.order_by('pk').first()
+    if usuario is None:
+        raise SystemExit('No hay usuarios: cree uno o indique --email')
+
+    token = UserRefreshToken.for_user(usuario).access_token
+    request = Request(RequestFactory().get('/api/productos/', HTTP_AUTHORIZATION=f'Bearer {token}'))
+
+    resultados = {'JWTAuthentication': medir(JWTAuthentication(), request, peticiones)}
+    with override_settings(AUTH_USER_CACHE_SECONDS=0):
+        user_cache.invalidate()
+        resultados['Cached (sin caché)'] = medir(CachedJWTAuthentication(), request, peticiones)
+    user_cache.invalidate()
+    resultados['CachedJWTAuthentication'] = medir(CachedJWTAuthentication(), request, peticiones)
+    return resultados
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=5000, help='Peticiones por variante')
+    parser.add_argument('--email', help='Usuario del token (por defecto el primero)')
+    args = parser.parse_args()
+
+    resultados = run(args.requests, args.email)
+
+    print(f"authenticate() x {args.requests}, motor {connection.vendor}")
+    print(f"{'Variante':<25} {'µs/petición':>12} {'consultas/petición':>19}")
+    for nombre, (micros, consultas) in resultados.items():
+        print(f"{nombre:<25} {micros:>12.1f} {consultas:>19.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+"""
+Prueba de carga: chats concurrentes con workers WSGI (sync) y ASGI
+
+Gemini se reemplaza por una respuesta que tarda --latency segundos, sin
+red. Se envían --chats mensajes a /api/chatbot/message/ y, a la vez,
+--quick peticiones cortas a /api/auth/profile/ repartidos entre --workers:
+- wsgi: cada worker es un hilo con el WSGIHandler que atiende una petición
+  a la vez, como un worker sync de gunicorn; la vista async del chat corre
+  con async_to_sync y el worker queda ocupado durante la espera
+- asgi: cada worker es un event loop con el ASGIHandler, como un worker
+  uvicorn; la espera de Gemini no bloquea las demás peticiones
+Se reporta cuánto tardan en completarse todos los chats y la latencia de
+las peticiones cortas mientras tanto.
+
+Uso (desde backend/, contra la base de datos configurada):
+    python benchmarks/bench_chat_concurrency.py
+    python benchmarks/bench_chat_concurrency.py --chats 60 --latency 3 --workers 3
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# El cliente de Gemini exige una clave aunque la prueba no lo llame
+os.environ.setdefault('GEMINI_API_KEY', 'benchmark')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.handlers.asgi import ASGIHandler  # noqa: E402
+from django.core.handlers.wsgi import WSGIHandler  # noqa: E402
+from django.db import connections  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from google.genai import models, types  # noqa: E402
+from apps.authentication.tokens import UserRefreshToken  # noqa: E402
+from apps.chatbot.models import ChatSession  # noqa: E402
+
+
+CHAT_URL = '/api/chatbot/message/'
+QUICK_URL = '/api/auth/profile/'
+HOST = 'localhost'
+
+# (url, es_chat)
+Peticion = Tuple[str, bool]
+
+
+def fake_gemini(latencia: float):
+    """AsyncModels.generate_content que espera latencia segundos y responde texto"""
+    async def generate_content(self, *, model, contents, config=None):
+        await asyncio.sleep(latencia)
+        return types.GenerateContentResponse(candidates=[types.Candidate(
+            content=types.Content(role='model', parts=[types.Part.from_text(text='Listo')])
+        )])
+    return generate_content
+
+
+def peticiones(chats: int, rapidas: int) -> List[Peticion]:
+    """Chats y peticiones cortas intercaladas: las cortas llegan con chats en curso"""
+    lista = []
+    for i in range(max(chats, rapidas)):
+        if i < chats:
+            lista.append((CHAT_URL, True))
+        if i < rapidas:
+            lista.append((QUICK_URL, False))
+    return lista
+
+
+def run_wsgi(lista: List[Peticion], workers: int, token: str) -> List[Tuple[bool, float, int]]:
+    """[(es_chat, segundos, status)] con workers hilos sync"""
+    handler = WSGIHandler()
+    factory = RequestFactory()
+    inicio = time.perf_counter()
+
+    def atender(peticion: Peticion):
+        url, es_chat = peticion
+        if es_chat:
+            request = factory.post(url, data=json.dumps({'message': 'Hola'}),
+                                   content_type='application/json', HTTP_HOST=HOST,
+                                   HTTP_AUTHORIZATION=f'Bearer {token}')
+        else:
+            request = factory.get(url, HTTP_HOST=HOST, HTTP_AUTHORIZATION=f'Bearer {token}')
+        estado = []
+        response = handler(request.environ, lambda status, headers, exc_info=None: estado.append(status))
+        for _ in response:
+            pass
+        response.close()
+        return es_chat, time.perf_counter() - inicio, int(estado[0][:3])
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        resultados = list(pool.map(atender, lista))
+    connections.close_all()
+    return resultados
+
+
+def run_asgi(lista: List[Peticion], workers: int, token: str) -> List[Tuple[bool, float, int]]:
+    """[(es_chat, segundos, status)] con workers event loops"""
+    handler = ASGIHandler()
+    inicio = time.perf_counter()
+    resultados = []
+    lock = threading.Lock()
+
+    async def atender(peticion: Peticion):
+        url, es_chat = peticion
+        body = json.dumps({'message': 'Hola'}).encode() if es_chat else b''
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+            'method': 'POST' if es_chat else 'GET', 'scheme': 'http', 'path': url,
+            'raw_path': url.encode(), 'query_string': b'', 'root_path': '',
+            'headers': [(b'host', HOST.encode()), (b'authorization', f'Bearer {token}'.encode()),
+                        (b'content-type', b'application/json'),
+                        (b'content-length', str(len(body)).encode())],
+            'client': ('127.0.0.1', 50000), 'server': (HOST, 80),
+        }
+        recibido = False
+        estado = []
+
+        async def receive():
+            nonlocal recibido
+            if not recibido:
+                recibido = True
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+            await asyncio.sleep(3600)  # el cliente sigue conectado
+
+        async def send(mensaje):
+            if mensaje['type'] == 'http.response.start':
+                estado.append(mensaje['status'])
+
+        await handler(scope, receive, send)
+        with lock:
+            resultados.append((es_chat, time.perf_counter() - inicio, estado[0]))
+
+    def worker(parte: List[Peticion]):
+        async def main():
+            await asyncio.gather(*(atender(p) for p in parte))
+        asyncio.run(main())
+
+    hilos = [threading.Thread(target=worker, args=(lista[i::workers],)) for i in range(workers)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    return resultados
+
+
+def run(chats: int, rapidas: int, workers: int, latencia: float, modos: List[str],
+        email: str = None) -> Dict[str, tuple]:
+    """{modo: (s todos los chats, chats/s, ms p50 cortas, ms máx cortas, errores)}"""
+    User = get_user_model()
+    usuario = User.objects.get(email=email) if email else User.objects.order_by('pk').first()
+    if usuario is None:
+        raise SystemExit('No hay usuarios: cree uno o indique --email')
+    token = str(UserRefreshToken.for_user(usuario).access_token)
+    sesiones = set(ChatSession.objects.filter(user=usuario).values_list('pk', flat=True))
+
+    lista = peticiones(chats, rapidas)
+    resultados = {}
+    try:
+        with mock.patch.object(models.AsyncModels, 'generate_content', fake_gemini(latencia)), \
+                mock.patch('builtins.print'):
+            for modo in modos:
+                medidas = (run_wsgi if modo == 'wsgi' else run_asgi)(lista, workers, token)
+                fin_chats = max((s for es_chat, s, _ in medidas if es_chat), default=0)
+                cortas = [s * 1000 for es_chat, s, _ in medidas if not es_chat]
+                errores = sum(1 for _, _, status in medidas if status != 200)
+                resultados[modo] = (
+                    fin_chats, chats / fin_chats if fin_chats else 0,
+                    statistics.median(cortas) if cortas else 0, max(cortas, default=0), errores,
+                )
+    finally:
+        # Sesiones y mensajes creados por la prueba
+        ChatSession.objects.filter(user=usuario).exclude(pk__in=sesiones).delete()
+    return resultados
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--chats', type=int, default=30, help='Mensajes de chat simultáneos')
+    parser.add_argument('--quick', type=int, default=30, help='Peticiones cortas simultáneas')
+    parser.add_argument('--workers', type=int, default=3, help='Workers (gunicorn --workers)')
+    parser.add_argument('--latency', type=float, default=2.0, help='Segundos de respuesta de Gemini')
+    parser.add_argument('--modes', nargs='+', choices=['wsgi', 'asgi'], default=['wsgi', 'asgi'])
+    parser.add_argument('--email', help='Usuario de las peticiones (por defecto el primero)')
+    args = parser.parse_args()
+
+    resultados = run(args.chats, args.quick, args.workers, args.latency, args.modes, args.email)
+
+    print(f"{args.chats} chats (Gemini {args.latency:.1f} s) + {args.quick} GET {QUICK_URL}, "
+          f"{args.workers} workers")
+    print(f"{'Modo':<6} {'s chats':>8} {'chats/s':>8} {'ms p50 cortas':>14} {'ms máx cortas':>14} {'errores':>8}")
+    for modo, (segundos, por_segundo, p50, maximo, errores) in resultados.items():
+        print(f"{modo:<6} {segundos:>8.2f} {por_segundo:>8.2f} {p50:>14.0f} {maximo:>14.0f} {errores:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""
+Benchmark de peticiones por segundo según el modo de conexión a la base de datos
+
+Envía peticiones autenticadas (JWT) al WSGIHandler de Django con el mismo
+ciclo que gunicorn, incluido el cierre de conexiones al terminar cada
+petición. Se repite con cada modo de config/database.py y se cuentan las
+conexiones abiertas. Cada hilo de --concurrency equivale a un worker.
+
+Uso (desde backend/, contra la base de datos configurada):
+    python benchmarks/bench_connections.py
+    python benchmarks/bench_connections.py --requests 2000 --concurrency 3
+    python benchmarks/bench_connections.py --modes per_request persistent pgbouncer
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.exceptions import ImproperlyConfigured  # noqa: E402
+from django.core.handlers.wsgi import WSGIHandler  # noqa: E402
+from django.db import connections  # noqa: E402
+from django.db.backends.signals import connection_created  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+from config.database import CONNECTION_MODES, connection_settings  # noqa: E402
+
+
+URL = '/api/productos/'
+# Claves que cambia cada modo en DATABASES['default']
+CLAVES_MODO = ('CONN_MAX_AGE', 'CONN_HEALTH_CHECKS', 'DISABLE_SERVER_SIDE_CURSORS', 'OPTIONS')
+
+
+class Conexiones:
+    """Contador de conexiones nuevas (señal connection_created)"""
+
+    def __init__(self):
+        self.total = 0
+        self._lock = threading.Lock()
+        connection_created.connect(self._creada)
+
+    def _creada(self, sender, connection, **kwargs):
+        with self._lock:
+            self.total += 1
+
+
+def configurar(modo: str, max_age: int) -> None:
+    """Aplicar el modo a DATABASES['default'] (compartido por todos los hilos)"""
+    connections.close_all()
+    settings_dict = connections['default'].settings_dict
+    base_options = {k: v for k, v in settings_dict.get('OPTIONS', {}).items() if k != 'pool'}
+    for clave in CLAVES_MODO:
+        settings_dict.pop(clave, None)
+    settings_dict.update(connection_settings(modo, max_age=max_age))
+    settings_dict['OPTIONS'] = {**base_options, **settings_dict.get('OPTIONS', {})}
+    settings_dict.setdefault('CONN_HEALTH_CHECKS', False)
+
+
+def worker(handler: WSGIHandler, environ: dict, peticiones: int, errores: List[int]) -> None:
+    """Peticiones secuenciales, como un worker sync de gunicorn"""
+    def start_response(status, headers, exc_info=None):
+        if not status.startswith('200'):
+            errores.append(int(status[:3]))
+
+    for _ in range(peticiones):
+        response = handler(dict(environ), start_response)
+        for _ in response:
+            pass
+        # close() emite request_finished: cierra o conserva la conexión
+        response.close()
+    connections.close_all()
+
+
+def run(modos: List[str], peticiones: int, concurrency: int, max_age: int,
+        email: str = None) -> Dict[str, tuple]:
+    """Peticiones por segundo por modo: {modo: (segundos, req/s, conexiones, errores)}"""
+    User = get_user_model()
+    usuario = User.objects.get(email=email) if email else User.objects.filter(role='ADMIN').first()
+    if usuario is None:
+        raise SystemExit('No hay usuarios ADMIN: cree uno o indique --email')
+
+    host = next((h for h in settings.ALLOWED_HOSTS if h != '*'), 'localhost')
+    environ = RequestFactory().get(
+        URL, {'page_size': 10}, HTTP_HOST=host,
+        HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(usuario)}'
+    ).environ
+    handler = WSGIHandler()
+    conexiones = Conexiones()
+
+    resultados = {}
+    for modo in modos:
+        try:
+            configurar(modo, max_age)
+        except ImproperlyConfigured as e:
+            print(f"{modo}: omitido ({e})")
+            continue
+
+        errores: List[int] = []
+        antes = conexiones.total
+        hilos = [
+            threading.Thread(target=worker, args=(handler, environ, peticiones // concurrency, errores))
+            for _ in range(concurrency)
+        ]
+        inicio = time.perf_counter()
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        segundos = time.perf_counter() - inicio
+
+        total = peticiones // concurrency * concurrency
+        resultados[modo] = (segundos, total / segundos, conexiones.total - antes, len(errores))
+    return resultados
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=500, help='Peticiones por modo')
+    parser.add_argument('--concurrency', type=int, default=1, help='Hilos (workers) simultáneos')
+    parser.add_argument('--modes', nargs='+', choices=CONNECTION_MODES,
+                        default=['per_request', 'persistent'], help='Modos a comparar')
+    parser.add_argument('--max-age', type=int, default=60, help='CONN_MAX_AGE de los modos persistentes')
+    parser.add_argument('--email', help='Usuario de las peticiones (por defecto el primer ADMIN)')
+    args = parser.parse_args()
+
+    resultados = run(args.modes, args.requests, args.concurrency, args.max_age, args.email)
+
+    print(f"GET {URL}?page_size=10 con {args.concurrency} hilo(s), "
+          f"motor {connections['default'].vendor}")
+    print(f"{'Modo':<12} {'segundos':>9} {'req/s':>9} {'ms/petición':>12} {'conexiones':>11} {'errores':>8}")
+    for modo, (segundos, rps, abiertas, errores) in resultados.items():
+        print(f"{modo:<12} {segundos:>9.2f} {rps:>9.1f} {1000 / rps * args.concurrency:>12.2f} "
+              f"{abiertas:>11} {errores:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark del login por algoritmo de hash de contraseñas
+
+Para cada hasher (argon2, bcrypt, pbkdf2, con el costo de settings) crea un
+usuario temporal y mide EmailBackend.authenticate() con contraseña
+correcta, incorrecta y con un email inexistente (deberían costar lo mismo),
+y los logins por segundo con --concurrency hilos. El usuario se elimina al
+terminar.
+
+Uso (desde backend/, contra la base de datos configurada):
+    python benchmarks/bench_login.py
+    python benchmarks/bench_login.py --requests 200 --concurrency 4 --hashers argon2 pbkdf2
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection, connections  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from apps.authentication.backends import EmailBackend  # noqa: E402
+
+
+HASHERS = {
+    'argon2': 'apps.authentication.hashers.Argon2PasswordHasher',
+    'bcrypt': 'apps.authentication.hashers.BCryptSHA256PasswordHasher',
+    'pbkdf2': 'apps.authentication.hashers.PBKDF2PasswordHasher',
+}
+EMAIL = 'bench-login@example.invalid'
+PASSWORD = 'Bench-login-123'
+
+
+def ms_por_login(backend: EmailBackend, email: str, password: str, peticiones: int) -> float:
+    """Mediana de ms por authenticate()"""
+    tiempos = []
+    for _ in range(peticiones):
+        inicio = time.perf_counter()
+        backend.authenticate(None, email=email, password=password)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def logins_por_segundo(backend: EmailBackend, peticiones: int, concurrency: int) -> float:
+    """Logins correctos por segundo con varios hilos"""
+    def worker():
+        for _ in range(peticiones // concurrency):
+            backend.authenticate(None, email=EMAIL, password=PASSWORD)
+        connections.close_all()
+
+    hilos = [threading.Thread(target=worker) for _ in range(concurrency)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    return peticiones // concurrency * concurrency / (time.perf_counter() - inicio)
+
+
+def run(hashers: List[str], peticiones: int, concurrency: int) -> Dict[str, Tuple[float, ...]]:
+    """{hasher: (ms correcta, ms incorrecta, ms inexistente, logins/s)}"""
+    User = get_user_model()
+    backend = EmailBackend()
+    resultados = {}
+    for nombre in hashers:
+        with override_settings(PASSWORD_HASHERS=[HASHERS[nombre]]):
+            try:
+                User.objects.filter(email=EMAIL).delete()
+                User.objects.create_user(username=EMAIL, email=EMAIL, password=PASSWORD)
+            except ValueError as e:  # librería del hasher no instalada
+                print(f"{nombre}: omitido ({e})")
+                continue
+            try:
+                backend.authenticate(None, email=EMAIL, password=PASSWORD)  # calentar
+                resultados[nombre] = (
+                    ms_por_login(backend, EMAIL, PASSWORD, peticiones),
+                    ms_por_login(backend, EMAIL, 'incorrecta', peticiones),
+                    ms_por_login(backend, 'nadie@example.invalid', PASSWORD, peticiones),
+                    logins_por_segundo(backend, peticiones, concurrency),
+                )
+            finally:
+                User.objects.filter(email=EMAIL).delete()
+    return resultados
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=50, help='Logins por medición')
+    parser.add_argument('--concurrency', type=int, default=2, help='Hilos para logins/s')
+    parser.add_argument('--hashers', nargs='+', choices=list(HASHERS), default=list(HASHERS),
+                        help='Hashers a comparar')
+    args = parser.parse_args()
+
+    resultados = run(args.hashers, args.requests, args.concurrency)
+
+    print(f"EmailBackend.authenticate(), motor {connection.vendor}, "
+          f"argon2 t={settings.ARGON2_TIME_COST} m={settings.ARGON2_MEMORY_COST}KiB "
+          f"p={settings.ARGON2_PARALLELISM}, bcrypt rounds={settings.BCRYPT_ROUNDS}, "
+          f"pbkdf2 iteraciones={settings.PBKDF2_ITERATIONS}")
+    print(f"{'Hasher':<8} {'ms correcta':>12} {'ms incorrecta':>14} {'ms inexistente':>15} "
+          f"{'logins/s':>9} {'2000 logins (s)':>16}")
+    for nombre, (correcta, incorrecta, inexistente, por_segundo) in resultados.items():
+        print(f"{nombre:<8} {correcta:>12.1f} {incorrecta:>14.1f} {inexistente:>15.1f} "
+              f"{por_segundo:>9.1f} {2000 / por_segundo:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,282 @@
+"""
+Benchmark de cada método de los repositorios Django contra una base sembrada
+
+Siembra --rows registros de inventario sintéticos (un producto por registro,
+100 por empresa, precios en COP y USD) con NITs y códigos propios de la
+prueba; si ya hay exactamente --rows se reutilizan. Cada método se mide
+--rounds veces (después de calentar) y se reportan mínimo, mediana, media y
+desviación. Las escrituras corren en una transacción que se revierte.
+
+Los resultados se guardan en JSON (--json) junto con el commit, el motor y
+el número de filas; --compare contra un JSON anterior muestra la variación
+de la mediana y termina con error si alguna empeora más de --max-regression.
+
+Uso (desde backend/, contra la base de datos configurada):
+    python benchmarks/bench_repositories.py --rows 1000
+    python benchmarks/bench_repositories.py --rows 100000 --json resultados/100k.json
+    python benchmarks/bench_repositories.py --rows 100000 --compare resultados/100k.json
+    python benchmarks/bench_repositories.py --drop
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection, transaction  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from nexus_domain.analytics import ABCClassifier  # noqa: E402
+from nexus_domain.entities import Inventario  # noqa: E402
+from nexus_domain.value_objects import NIT, ProductCode, Quantity  # noqa: E402
+from apps.empresas.orm_models import Empresa as EmpresaORM  # noqa: E402
+from apps.empresas.repositories import DjangoEmpresaRepository  # noqa: E402
+from apps.inventario.orm_models import Inventario as InventarioORM, MovimientoInventario  # noqa: E402
+from apps.inventario.repositories import DjangoInventarioRepository  # noqa: E402
+from apps.productos.orm_models import PrecioMoneda, PrecioPivot, Producto as ProductoORM  # noqa: E402
+from apps.productos.repositories import DjangoProductoRepository  # noqa: E402
+
+
+# Prefijos reservados para los datos de la prueba
+NIT_PREFIX = '77'
+CODIGO_PREFIX = 'BENCH-'
+PRODUCTOS_POR_EMPRESA = 100
+BATCH_SIZE = 5000
+
+
+def nit(i: int) -> str:
+    return f"{NIT_PREFIX}{i:08d}"
+
+
+def codigo(i: int) -> str:
+    return f"{CODIGO_PREFIX}{i:07d}"
+
+
+def drop() -> None:
+    """Eliminar los datos sembrados (cascada a productos, precios e inventario)"""
+    EmpresaORM.objects.filter(nit__startswith=NIT_PREFIX).delete()
+
+
+def seed(rows: int) -> None:
+    """Sembrar rows registros de inventario (reutiliza si ya hay exactamente rows)"""
+    if ProductoORM.objects.filter(codigo__startswith=CODIGO_PREFIX).count() == rows:
+        return
+    drop()
+    print(f"Sembrando {rows} registros...", file=sys.stderr)
+    n_empresas = (rows + PRODUCTOS_POR_EMPRESA - 1) // PRODUCTOS_POR_EMPRESA
+    with transaction.atomic():
+        EmpresaORM.objects.bulk_create(
+            (EmpresaORM(nit=nit(e), nombre=f"Empresa Bench {e}", direccion=f"Calle {e} #1-23",
+                        telefono='3001234567', clasificacion_abc_vigente=False)
+             for e in range(n_empresas)),
+            batch_size=BATCH_SIZE
+        )
+        for start in range(0, rows, BATCH_SIZE):
+            indices = range(start, min(start + BATCH_SIZE, rows))
+            ProductoORM.objects.bulk_create(
+                ProductoORM(codigo=codigo(i), nombre=f"Producto Bench {i}",
+                            empresa_id=nit(i // PRODUCTOS_POR_EMPRESA), caracteristicas={'lote': i % 13})
+                for i in indices
+            )
+            PrecioMoneda.objects.bulk_create(
+                PrecioMoneda(producto_id=codigo(i), moneda=moneda, precio=precio)
+                for i in indices
+                for moneda, precio in (('COP', Decimal(10000 + i % 9973)), ('USD', Decimal(3 + i % 97)))
+            )
+            PrecioPivot.objects.bulk_create(
+                PrecioPivot(producto_id=codigo(i), precio_cop=Decimal(10000 + i % 9973),
+                            precio_usd=Decimal(3 + i % 97))
+                for i in indices
+            )
+            InventarioORM.objects.bulk_create(
+                InventarioORM(empresa_id=nit(i // PRODUCTOS_POR_EMPRESA), producto_id=codigo(i),
+                              cantidad=i % 50)
+                for i in indices
+            )
+        # Salidas de stock de la primera empresa para load_consumo
+        ahora = timezone.now()
+        movimientos = [
+            MovimientoInventario(inventario=registro, cantidad_anterior=10, cantidad_nueva=10 - dia % 5,
+                                 delta=-(dia % 5))
+            for registro in InventarioORM.objects.filter(empresa_id=nit(0))
+            for dia in range(1, 30)
+        ]
+        creados = MovimientoInventario.objects.bulk_create(movimientos, batch_size=BATCH_SIZE)
+        for dia in range(1, 30):
+            MovimientoInventario.objects.filter(
+                pk__in=[m.pk for m in creados[dia - 1::29]]
+            ).update(fecha=ahora - timedelta(days=dia))
+
+
+def measure(func: Callable[[], object], rounds: int, write: bool = False) -> Dict[str, float]:
+    """Estadísticas en segundos de rounds llamadas (las escrituras se revierten)"""
+    def llamar():
+        if not write:
+            return func()
+        with transaction.atomic():
+            func()
+            transaction.set_rollback(True)
+
+    llamar()  # calentar
+    tiempos = []
+    for _ in range(rounds):
+        inicio = time.perf_counter()
+        llamar()
+        tiempos.append(time.perf_counter() - inicio)
+    return {
+        'min': min(tiempos),
+        'median': statistics.median(tiempos),
+        'mean': statistics.fmean(tiempos),
+        'stddev': statistics.stdev(tiempos) if rounds > 1 else 0.0,
+        'rounds': rounds,
+    }
+
+
+def casos(rows: int) -> List[Tuple[str, Callable[[], object], bool]]:
+    """(nombre, llamada, es escritura) por método de cada repositorio"""
+    empresas = DjangoEmpresaRepository()
+    productos = DjangoProductoRepository()
+    inventario = DjangoInventarioRepository()
+
+    empresa_nit = nit(0)
+    producto_codigo = codigo(rows // 2)
+    medio_nit = nit(rows // 2 // PRODUCTOS_POR_EMPRESA)
+    inventario_id = InventarioORM.objects.get(producto_id=producto_codigo).pk
+    empresa = empresas.find_by_nit(empresa_nit)
+    producto = productos.find_by_codigo(producto_codigo)
+    registro = inventario.find_by_id(inventario_id)
+    nuevo = Inventario(None, NIT(medio_nit), ProductCode(codigo(rows - 1)), Quantity(5))
+    InventarioORM.objects.filter(producto_id=codigo(rows - 1)).delete()
+    clases = ABCClassifier().group_ids(inventario.load_snapshot(empresa_nit))
+    desde = date.today() - timedelta(days=84)
+
+    return [
+        ('empresa.save', lambda: empresas.save(empresa), True),
+        ('empresa.find_by_nit', lambda: empresas.find_by_nit(empresa_nit), False),
+        ('empresa.find_all', lambda: empresas.find_all(limit=100), False),
+        ('empresa.search_by_nombre', lambda: empresas.search_by_nombre('bench 12', limit=100), False),
+        ('empresa.exists', lambda: empresas.exists(empresa_nit), False),
+        ('empresa.delete', lambda: empresas.delete(medio_nit), True),
+        ('producto.save', lambda: productos.save(producto), True),
+        ('producto.find_by_codigo', lambda: productos.find_by_codigo(producto_codigo), False),
+        ('producto.find_all', lambda: productos.find_all(limit=100), False),
+        ('producto.find_by_empresa', lambda: productos.find_by_empresa(medio_nit), False),
+        ('producto.search_by_nombre', lambda: productos.search_by_nombre('producto bench 123', limit=100), False),
+        ('producto.exists', lambda: productos.exists(producto_codigo), False),
+        ('producto.delete', lambda: productos.delete(producto_codigo), True),
+        ('inventario.save (update)', lambda: inventario.save(registro), True),
+        ('inventario.save (insert)', lambda: inventario.save(nuevo), True),
+        ('inventario.find_by_id', lambda: inventario.find_by_id(inventario_id), False),
+        ('inventario.find_by_empresa_and_producto',
+         lambda: inventario.find_by_empresa_and_producto(medio_nit, producto_codigo), False),
+        ('inventario.find_all', lambda: inventario.find_all(limit=100), False),
+        ('inventario.find_by_empresa', lambda: inventario.find_by_empresa(medio_nit), False),
+        ('inventario.find_low_stock', lambda: inventario.find_low_stock(), False),
+        ('inventario.find_by_clase_abc', lambda: inventario.find_by_clase_abc('A', empresa_nit), False),
+        ('inventario.exists', lambda: inventario.exists(medio_nit, producto_codigo), False),
+        ('inventario.load_snapshot (empresa)', lambda: inventario.load_snapshot(empresa_nit), False),
+        ('inventario.load_snapshot (todo)', lambda: inventario.load_snapshot(), False),
+        ('inventario.load_consumo', lambda: inventario.load_consumo(empresa_nit, desde), False),
+        ('inventario.find_stale_abc_empresas', lambda: inventario.find_stale_abc_empresas(), False),
+        ('inventario.update_abc_classes', lambda: inventario.update_abc_classes(empresa_nit, clases), True),
+        ('inventario.delete', lambda: inventario.delete(inventario_id), True),
+    ]
+
+
+def commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def run(rows: int, rounds: int, filtro: str = '') -> dict:
+    """Resultados en el formato del JSON (segundos)"""
+    seed(rows)
+    benchmarks = []
+    for nombre, func, write in casos(rows):
+        if filtro in nombre:
+            benchmarks.append({'name': nombre, 'stats': measure(func, rounds, write)})
+    return {
+        'commit': commit(),
+        'datetime': timezone.now().isoformat(),
+        'machine': platform.node(),
+        'python': platform.python_version(),
+        'vendor': connection.vendor,
+        'rows': rows,
+        'benchmarks': benchmarks,
+    }
+
+
+def compare(resultados: dict, anterior: dict, max_regression: float) -> bool:
+    """Imprimir la variación de la mediana; False si alguna supera max_regression (%)"""
+    previas = {b['name']: b['stats']['median'] for b in anterior['benchmarks']}
+    if anterior.get('rows') != resultados['rows']:
+        print(f"Aviso: la referencia tiene {anterior.get('rows')} filas y esta corrida {resultados['rows']}")
+    print(f"\nContra {anterior.get('commit') or 'referencia'} ({anterior.get('datetime', '')[:19]})")
+    print(f"{'Método':<42} {'ms antes':>10} {'ms ahora':>10} {'cambio':>8}")
+    ok = True
+    for benchmark in resultados['benchmarks']:
+        antes = previas.get(benchmark['name'])
+        if antes is None:
+            continue
+        ahora = benchmark['stats']['median']
+        cambio = (ahora - antes) / antes * 100
+        marca = ''
+        if cambio > max_regression:
+            ok = False
+            marca = ' <-'
+        print(f"{benchmark['name']:<42} {antes * 1000:>10.3f} {ahora * 1000:>10.3f} {cambio:>+7.1f}%{marca}")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1000, help='Registros de inventario (1000, 100000, 1000000)')
+    parser.add_argument('--rounds', type=int, default=50, help='Mediciones por método')
+    parser.add_argument('-k', dest='filtro', default='', help='Solo métodos cuyo nombre contenga el texto')
+    parser.add_argument('--json', help='Guardar los resultados en este archivo')
+    parser.add_argument('--compare', help='JSON de una corrida anterior')
+    parser.add_argument('--max-regression', type=float, default=10.0,
+                        help='Máximo %% de aumento de la mediana aceptado con --compare')
+    parser.add_argument('--drop', action='store_true', help='Eliminar los datos sembrados y salir')
+    args = parser.parse_args()
+
+    if args.drop:
+        drop()
+        return
+
+    resultados = run(args.rows, args.rounds, args.filtro)
+
+    print(f"Repositorios Django, motor {resultados['vendor']}, {args.rows} filas, {args.rounds} rondas")
+    print(f"{'Método':<42} {'ms mín':>9} {'ms mediana':>11} {'ms media':>9} {'ms desv':>8}")
+    for benchmark in resultados['benchmarks']:
+        stats = benchmark['stats']
+        print(f"{benchmark['name']:<42} {stats['min'] * 1000:>9.3f} {stats['median'] * 1000:>11.3f} "
+              f"{stats['mean'] * 1000:>9.3f} {stats['stddev'] * 1000:>8.3f}")
+
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json).write_text(json.dumps(resultados, indent=2))
+
+    if args.compare and not compare(resultados, json.loads(Path(args.compare).read_text()),
+                                    args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+"""
+Prueba de carga HTTP de extremo a extremo contra un servidor en ejecución
+
+--users usuarios virtuales (corrutinas con httpx) inician sesión y repiten
+escenarios elegidos al azar según --mix durante --duration segundos:
+- dashboard: GET /api/auth/dashboard/stats/
+- list: páginas de productos, empresas e inventario de una empresa
+- search: búsqueda de productos y empresas (?search=)
+- stock: PUT /api/inventario/<id>/ con una nueva cantidad (administrador)
+- export: GET /api/inventario/export_pdf/ de una empresa
+- chat: POST /api/chatbot/message/ (llama a Gemini de verdad: peso 0 por defecto)
+Se reportan peticiones por segundo, errores y latencias p50/p95/p99 por
+escenario; --json guarda el reporte.
+
+No depende de Django: los datos se toman de la API. Con los usuarios de
+seed_scale (por defecto) el administrador puede actualizar stock.
+
+Uso (con el servidor corriendo, p. ej. gunicorn o runserver):
+    python manage.py seed_scale --empresas 1000 --productos 100000 --inventario 200000
+    python benchmarks/loadtest.py --url http://localhost:8000 --users 50 --duration 60
+    python benchmarks/loadtest.py --mix dashboard=1,list=3,search=3,stock=2,export=1,chat=1 --json carga.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+
+SEED_EMAIL = 'seed-0@seed.nexus.test'
+SEED_PASSWORD = 'Seed-scale-123'
+MIX = 'dashboard=1,list=4,search=4,stock=2,export=1,chat=0'
+BUSQUEDAS = ['laptop lenovo', 'mouse inalambrico', 'monitor curvo', 'samsung', 'router',
+             'teclado mecanico', 'audifonos sony', 'laptpo lenvo']
+EMPRESAS_BUSQUEDAS = ['distribuciones', 'andina', 'tecnologia', 'caribe', 'suministros']
+PREGUNTAS = ['¿Qué productos tienen stock bajo?', '¿Cuántos productos tiene el inventario?']
+
+
+class Datos:
+    """NITs e IDs de inventario tomados de la API para armar las peticiones"""
+
+    def __init__(self, nits: List[str], inventario: List[dict]):
+        self.nits = nits
+        self.inventario = inventario
+
+
+class Resultados:
+    """Latencias (s) y errores por escenario"""
+
+    def __init__(self):
+        self.latencias: Dict[str, List[float]] = defaultdict(list)
+        self.errores: Dict[str, int] = defaultdict(int)
+        self.estados: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def registrar(self, escenario: str, segundos: float, status: Optional[int]):
+        self.latencias[escenario].append(segundos)
+        if status is None or status >= 400:
+            self.errores[escenario] += 1
+        self.estados[escenario][status or 0] += 1
+
+
+def percentil(valores: List[float], p: float) -> float:
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p / 100))]
+
+
+def parse_mix(texto: str) -> Dict[str, int]:
+    mix = {}
+    for parte in texto.split(','):
+        nombre, _, peso = parte.partition('=')
+        if nombre not in ESCENARIOS:
+            raise SystemExit(f"Escenario desconocido: {nombre} (opciones: {', '.join(ESCENARIOS)})")
+        mix[nombre] = int(peso or 1)
+    return {nombre: peso for nombre, peso in mix.items() if peso > 0}
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    response = await client.post('/api/auth/login/', json={'email': email, 'password': password})
+    if response.status_code != 200:
+        raise SystemExit(f"Login de {email} falló ({response.status_code}): {response.text[:200]}")
+    return response.json()['tokens']['access']
+
+
+async def cargar_datos(client: httpx.AsyncClient) -> Datos:
+    empresas = (await client.get('/api/empresas/', params={'page_size': 100})).json()
+    empresas = empresas.get('results', empresas) if isinstance(empresas, dict) else empresas
+    nits = [empresa['nit'] for empresa in empresas]
+    if not nits:
+        raise SystemExit('No hay empresas: ejecute manage.py seed_scale')
+    inventario = (await client.get('/api/inventario/', params={'empresa': nits[0]})).json()
+    return Datos(nits, inventario if isinstance(inventario, list) else inventario.get('results', []))
+
+
+# --- Escenarios: cada uno hace una petición y retorna la respuesta ---
+
+async def dashboard(client, datos, rng):
+    return await client.get('/api/auth/dashboard/stats/')
+
+
+async def listar(client, datos, rng):
+    opcion = rng.randrange(3)
+    if opcion == 0:
+        return await client.get('/api/productos/', params={'page': rng.randint(1, 50), 'page_size': 50})
+    if opcion == 1:
+        return await client.get('/api/empresas/', params={'page': rng.randint(1, 5)})
+    return await client.get('/api/inventario/', params={'empresa': rng.choice(datos.nits)})
+
+
+async def buscar(client, datos, rng):
+    if rng.random() < 0.7:
+        return await client.get('/api/productos/', params={'search': rng.choice(BUSQUEDAS), 'page_size': 20})
+    return await client.get('/api/empresas/', params={'search': rng.choice(EMPRESAS_BUSQUEDAS)})
+
+
+async def stock(client, datos, rng):
+    if not datos.inventario:
+        return None
+    registro = rng.choice(datos.inventario)
+    return await client.put(f"/api/inventario/{registro['id']}/", json={
+        'empresa': registro['empresa_nit'], 'producto': registro['producto_codigo'],
+        'cantidad': rng.randint(0, 500),
+    })
+
+
+async def exportar(client, datos, rng):
+    return await client.get('/api/inventario/export_pdf/', params={'empresa': rng.choice(datos.nits)})
+
+
+async def chat(client, datos, rng):
+    return await client.post('/api/chatbot/message/', json={'message': rng.choice(PREGUNTAS)})
+
+
+ESCENARIOS = {
+    'dashboard': dashboard,
+    'list': listar,
+    'search': buscar,
+    'stock': stock,
+    'export': exportar,
+    'chat': chat,
+}
+
+
+async def usuario(client: httpx.AsyncClient, datos: Datos, mix: Dict[str, int], fin: float,
+                  resultados: Resultados, seed: int, pausa: float):
+    rng = random.Random(seed)
+    nombres, pesos = list(mix), list(mix.values())
+    while time.perf_counter() < fin:
+        escenario = rng.choices(nombres, pesos)[0]
+        inicio = time.perf_counter()
+        try:
+            response = await ESCENARIOS[escenario](client, datos, rng)
+            status = response.status_code if response is not None else None
+            if response is not None:
+                await response.aread()
+        except httpx.HTTPError:
+            status = None
+        resultados.registrar(escenario, time.perf_counter() - inicio, status)
+        if pausa:
+            await asyncio.sleep(rng.uniform(0, pausa * 2))
+
+
+async def run(url: str, users: int, duracion: float, mix: Dict[str, int], email: str, password: str,
+              timeout: float, pausa: float) -> dict:
+    limites = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limites) as client:
+        client.headers['Authorization'] = f"Bearer {await login(client, email, password)}"
+        datos = await cargar_datos(client)
+
+        resultados = Resultados()
+        inicio = time.perf_counter()
+        await asyncio.gather(*(
+            usuario(client, datos, mix, inicio + duracion, resultados, seed, pausa)
+            for seed in range(users)
+        ))
+        transcurrido = time.perf_counter() - inicio
+
+    escenarios = {}
+    for nombre in mix:
+        latencias = resultados.latencias.get(nombre, [])
+        escenarios[nombre] = {
+            'peticiones': len(latencias),
+            'errores': resultados.errores.get(nombre, 0),
+            'por_segundo': len(latencias) / transcurrido,
+            'p50_ms': percentil(latencias, 50) * 1000,
+            'p95_ms': percentil(latencias, 95) * 1000,
+            'p99_ms': percentil(latencias, 99) * 1000,
+            'max_ms': max(latencias, default=0) * 1000,
+            'media_ms': statistics.fmean(latencias) * 1000 if latencias else 0.0,
+            'estados': dict(resultados.estados.get(nombre, {})),
+        }
+    todas = [s for latencias in resultados.latencias.values() for s in latencias]
+    return {
+        'url': url,
+        'usuarios': users,
+        'segundos': transcurrido,
+        'mix': mix,
+        'total': {
+            'peticiones': len(todas),
+            'errores': sum(resultados.errores.values()),
+            'por_segundo': len(todas) / transcurrido,
+            'p50_ms': percentil(todas, 50) * 1000,
+            'p95_ms': percentil(todas, 95) * 1000,
+            'p99_ms': percentil(todas, 99) * 1000,
+        },
+        'escenarios': escenarios,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--url', default='http://localhost:8000', help='URL base del servidor')
+    parser.add_argument('--users', type=int, default=20, help='Usuarios virtuales concurrentes')
+    parser.add_argument('--duration', type=float, default=30, help='Segundos de carga')
+    parser.add_argument('--mix', default=MIX, help=f'Pesos por escenario (por defecto {MIX})')
+    parser.add_argument('--think', type=float, default=0, help='Pausa media (s) entre peticiones de un usuario')
+    parser.add_argument('--timeout', type=float, default=60, help='Timeout por petición (s)')
+    parser.add_argument('--email', default=SEED_EMAIL, help='Usuario (por defecto el administrador de seed_scale)')
+    parser.add_argument('--password', default=SEED_PASSWORD)
+    parser.add_argument('--json', help='Guardar el reporte en este archivo')
+    args = parser.parse_args()
+
+    reporte = asyncio.run(run(args.url, args.users, args.duration, parse_mix(args.mix), args.email,
+                              args.password, args.timeout, args.think))
+
+    print(f"{args.url}: {args.users} usuarios, {reporte['segundos']:.1f} s")
+    print(f"{'Escenario':<10} {'peticiones':>10} {'errores':>8} {'req/s':>8} {'ms p50':>8} "
+          f"{'ms p95':>8} {'ms p99':>8} {'ms máx':>8}")
+    for nombre, datos in reporte['escenarios'].items():
+        print(f"{nombre:<10} {datos['peticiones']:>10} {datos['errores']:>8} {datos['por_segundo']:>8.1f} "
+              f"{datos['p50_ms']:>8.0f} {datos['p95_ms']:>8.0f} {datos['p99_ms']:>8.0f} {datos['max_ms']:>8.0f}")
+    total = reporte['total']
+    print(f"{'total':<10} {total['peticiones']:>10} {total['errores']:>8} {total['por_segundo']:>8.1f} "
+          f"{total['p50_ms']:>8.0f} {total['p95_ms']:>8.0f} {total['p99_ms']:>8.0f}")
+
+    if args.json:
+        with open(args.json, 'w') as archivo:
+            json.dump(reporte, archivo, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Manejo de conexiones a PostgreSQL por modo (DB_CONNECTION_MODE)
+
+- per_request: una conexión por petición (comportamiento de Django por defecto)
+- persistent: cada worker de gunicorn reutiliza su conexión hasta
+  DB_CONN_MAX_AGE segundos, verificándola antes de reutilizarla
+- pgbouncer: conexiones persistentes hacia PgBouncer en modo transaction;
+  ese modo no admite cursores del lado del servidor, así que se desactivan
+  y los recorridos por lotes (apps.core.cursors) paginan por llave
+- pool: pool de conexiones de psycopg 3 dentro de cada worker (requiere
+  Django 5.1+ y psycopg[pool])
+
+Con workers ASGI (SERVER_MODE=asgi) el ORM corre en un hilo por petición y
+una conexión persistente no se reutilizaría: persistent no se admite y
+pgbouncer conecta por petición a PgBouncer, que es quien mantiene las
+conexiones a PostgreSQL.
+"""
+from typing import Optional
+import django
+from django.core.exceptions import ImproperlyConfigured
+
+
+CONNECTION_MODES = ('per_request', 'persistent', 'pgbouncer', 'pool')
+
+
+def connection_settings(mode: str, max_age: Optional[int] = 60, pool_min_size: int = 2,
+                        pool_max_size: int = 10, pool_timeout: int = 10, asgi: bool = False) -> dict:
+    """Claves de DATABASES['default'] para el modo de conexión"""
+    if mode not in CONNECTION_MODES:
+        raise ImproperlyConfigured(
+            f"DB_CONNECTION_MODE inválido: {mode} (opciones: {', '.join(CONNECTION_MODES)})"
+        )
+
+    if mode == 'per_request':
+        return {'CONN_MAX_AGE': 0}
+
+    if mode == 'pool':
+        if django.VERSION < (5, 1):
+            raise ImproperlyConfigured(
+                "DB_CONNECTION_MODE=pool requiere Django 5.1+ con psycopg 3; "
+                "use persistent o pgbouncer"
+            )
+        # El pool reemplaza a las conexiones persistentes (CONN_MAX_AGE debe ser 0)
+        return {
+            'CONN_MAX_AGE': 0,
+            'OPTIONS': {'pool': {
+                'min_size': pool_min_size,
+                'max_size': pool_max_size,
+                'timeout': pool_timeout,
+            }},
+        }
+
+    if asgi and mode == 'persistent':
+        raise ImproperlyConfigured(
+            "DB_CONNECTION_MODE=persistent no se admite con SERVER_MODE=asgi; "
+            "use pgbouncer o per_request"
+        )
+
+    settings = {'CONN_MAX_AGE': 0 if asgi else max_age, 'CONN_HEALTH_CHECKS': True}
+    if mode == 'pgbouncer':
+        settings['DISABLE_SERVER_SIDE_CURSORS'] = True
+    return settings
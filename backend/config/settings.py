@@ -1,6 +1,7 @@
 from pathlib import Path
 from decouple import config
 from datetime import timedelta
+from .database import connection_settings
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -8,6 +9,10 @@ SECRET_KEY = config('SECRET_KEY', default='django-insecure-change-this-in-produc
 DEBUG = config('DEBUG', default=True, cast=bool)
 ALLOWED_HOSTS = config('ALLOWED_HOSTS', default='localhost,127.0.0.1').split(',')
 
+# wsgi: workers sync de gunicorn (config.wsgi); asgi: workers uvicorn
+# (config.asgi), con vistas async para chatbot y envío de email (gunicorn.conf.py)
+SERVER_MODE = config('SERVER_MODE', default='wsgi')
+
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -15,6 +20,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third party
     'rest_framework',
@@ -24,6 +30,7 @@ INSTALLED_APPS = [
     'drf_spectacular',
     
     # Local apps
+    'apps.core',
     'apps.authentication',
     'apps.empresas',
     'apps.productos',
@@ -32,6 +39,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.core.middleware.RequestMetricsMiddleware',
+    'apps.core.middleware.DependencyScopeMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -71,6 +80,15 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD', default='postgres'),
         'HOST': config('DB_HOST', default='localhost'),
         'PORT': config('DB_PORT', default='5432'),
+        # Conexiones persistentes por worker, PgBouncer o pool (config/database.py)
+        **connection_settings(
+            config('DB_CONNECTION_MODE', default='persistent' if SERVER_MODE == 'wsgi' else 'per_request'),
+            max_age=config('DB_CONN_MAX_AGE', default=60, cast=int),
+            pool_min_size=config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            pool_max_size=config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            pool_timeout=config('DB_POOL_TIMEOUT', default=10, cast=int),
+            asgi=SERVER_MODE == 'asgi',
+        ),
     }
 }
 
@@ -103,13 +121,35 @@ AUTH_USER_MODEL = 'authentication.User'
 # Authentication Backends
 AUTHENTICATION_BACKENDS = [
     'apps.authentication.backends.EmailBackend',
-    'django.contrib.auth.backends.ModelBackend',
 ]
 
+# Hash de contraseñas: PASSWORD_HASHER (argon2, bcrypt o pbkdf2) se usa para
+# las contraseñas nuevas; las guardadas con otro algoritmo o con otro costo
+# se re-hashean al iniciar sesión
+PASSWORD_HASHER = config('PASSWORD_HASHER', default='argon2')
+_PASSWORD_HASHERS = {
+    'argon2': 'apps.authentication.hashers.Argon2PasswordHasher',
+    'bcrypt': 'apps.authentication.hashers.BCryptSHA256PasswordHasher',
+    'pbkdf2': 'apps.authentication.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    hasher for nombre, hasher in _PASSWORD_HASHERS.items() if nombre != PASSWORD_HASHER
+]
+ARGON2_TIME_COST = config('ARGON2_TIME_COST', default=2, cast=int)
+ARGON2_MEMORY_COST = config('ARGON2_MEMORY_COST', default=19456, cast=int)  # KiB
+ARGON2_PARALLELISM = config('ARGON2_PARALLELISM', default=1, cast=int)
+BCRYPT_ROUNDS = config('BCRYPT_ROUNDS', default=12, cast=int)
+PBKDF2_ITERATIONS = config('PBKDF2_ITERATIONS', default=720000, cast=int)
+
+# Límite de intentos de login por IP (token bucket en memoria de cada worker;
+# LOGIN_RATE_PER_MINUTE=0 lo desactiva)
+LOGIN_RATE_PER_MINUTE = config('LOGIN_RATE_PER_MINUTE', default=300, cast=int)
+LOGIN_RATE_BURST = config('LOGIN_RATE_BURST', default=100, cast=int)
+
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.authentication.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -120,6 +160,9 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # Proxies de confianza delante de la app; con 0 se ignora X-Forwarded-For
+    # al identificar la IP del cliente (límite de intentos de login)
+    'NUM_PROXIES': config('NUM_PROXIES', default=0, cast=int),
 }
 
 # JWT Settings
@@ -166,5 +209,54 @@ SPECTACULAR_SETTINGS = {
     },
 }
 
+# Autocompletado de productos (índice en memoria por proceso)
+AUTOCOMPLETE_MAX_PRODUCTOS = config('AUTOCOMPLETE_MAX_PRODUCTOS', default=200000, cast=int)
+AUTOCOMPLETE_REFRESH_SECONDS = config('AUTOCOMPLETE_REFRESH_SECONDS', default=30, cast=int)
+
+# Caché de usuarios autenticados por proceso (0 la desactiva)
+AUTH_USER_CACHE_SECONDS = config('AUTH_USER_CACHE_SECONDS', default=30, cast=int)
+AUTH_USER_CACHE_SIZE = config('AUTH_USER_CACHE_SIZE', default=10000, cast=int)
+
+# Caché por proceso de empresas y productos por llave en los repositorios de
+# las vistas (0 la desactiva); las ausencias (exists falso) duran menos
+REPOSITORY_CACHE_SECONDS = config('REPOSITORY_CACHE_SECONDS', default=30, cast=int)
+REPOSITORY_CACHE_MISS_SECONDS = config('REPOSITORY_CACHE_MISS_SECONDS', default=5, cast=int)
+REPOSITORY_CACHE_SIZE = config('REPOSITORY_CACHE_SIZE', default=10000, cast=int)
+
+# Instrumentación por petición: Server-Timing, /metrics y profiler (X-Profile).
+# Server-Timing expone tiempos internos: por defecto solo con DEBUG; /metrics
+# responde 403 mientras no se defina METRICS_TOKEN
+INSTRUMENTATION_ENABLED = config('INSTRUMENTATION_ENABLED', default=True, cast=bool)
+SERVER_TIMING_ENABLED = config('SERVER_TIMING_ENABLED', default=DEBUG, cast=bool)
+PROFILER_ENABLED = config('PROFILER_ENABLED', default=False, cast=bool)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Contenedor de dependencias (apps.core.container): implementación, alcance y
+# decoradores (del más interno al más externo) de cada repositorio
+_METRICAS = ['apps.core.instrumentation.MeteredRepository'] if INSTRUMENTATION_ENABLED else []
+_CACHE = REPOSITORY_CACHE_SECONDS > 0
+DEPENDENCIES = {
+    'nexus_domain.interfaces.IEmpresaRepository': {
+        'class': 'apps.empresas.repositories.DjangoEmpresaRepository',
+        'scope': 'request',
+        'decorators': ['apps.empresas.repositories.CachingEmpresaRepository'] * _CACHE + _METRICAS,
+    },
+    'nexus_domain.interfaces.IProductoRepository': {
+        'class': 'apps.productos.repositories.DjangoProductoRepository',
+        'scope': 'request',
+        'decorators': ['apps.productos.repositories.CachingProductoRepository'] * _CACHE + _METRICAS,
+    },
+    'nexus_domain.interfaces.IInventarioRepository': {
+        'class': 'apps.inventario.repositories.DjangoInventarioRepository',
+        'scope': 'request',
+        'decorators': _METRICAS,
+    },
+    # Una unidad de trabajo por caso de uso, sobre los repositorios de la petición
+    'nexus_domain.interfaces.IUnitOfWork': {
+        'class': 'apps.inventario.unit_of_work.DjangoUnitOfWork',
+        'scope': 'transient',
+    },
+}
+
 # Gemini API Configuration
 GEMINI_API_KEY = config('GEMINI_API_KEY', default='')
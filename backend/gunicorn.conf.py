@@ -0,0 +1,25 @@
+"""
+Configuración de gunicorn (se carga sola desde backend/)
+
+SERVER_MODE=wsgi (defecto): workers sync con config.wsgi; cada petición
+ocupa un worker hasta terminar, incluidas las esperas a Gemini o MailerSend.
+SERVER_MODE=asgi: workers uvicorn con config.asgi; las vistas async del
+chatbot y del envío de email liberan el worker mientras esperan.
+"""
+# "config" es un setting de gunicorn: no importarlo con ese nombre
+import decouple
+
+SERVER_MODE = decouple.config('SERVER_MODE', default='wsgi')
+
+bind = decouple.config('GUNICORN_BIND', default='0.0.0.0:8000')
+workers = decouple.config('GUNICORN_WORKERS', default=3, cast=int)
+timeout = decouple.config('GUNICORN_TIMEOUT', default=120, cast=int)
+
+if SERVER_MODE == 'asgi':
+    wsgi_app = 'config.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+elif SERVER_MODE == 'wsgi':
+    wsgi_app = 'config.wsgi:application'
+    worker_class = 'sync'
+else:
+    raise ValueError(f"SERVER_MODE inválido: {SERVER_MODE} (opciones: wsgi, asgi)")
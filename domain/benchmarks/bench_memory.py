@@ -0,0 +1,128 @@
+"""
+Benchmark de memoria por entidad del dominio
+
+Compara el costo en bytes por entidad de las clases actuales (con __slots__)
+contra variantes equivalentes con __dict__ por instancia, reconstruidas a
+partir de las mismas definiciones.
+
+Uso:
+    python benchmarks/bench_memory.py
+    python benchmarks/bench_memory.py --count 100000
+"""
+import argparse
+import dataclasses
+import gc
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, Tuple
+
+from nexus_domain.entities import Empresa, Producto, Inventario
+from nexus_domain.value_objects import NIT, Phone, ProductCode, Quantity
+
+
+def unslotted(cls: type) -> type:
+    """Reconstruir un dataclass con __slots__ como dataclass con __dict__"""
+    slot_names = set(getattr(cls, '__slots__', ()))
+    skip = slot_names | {
+        '__slots__', '__dict__', '__weakref__',
+        '__dataclass_fields__', '__dataclass_params__',
+        '__getstate__', '__setstate__', '__setattr__', '__delattr__',
+    }
+    namespace = {
+        name: value for name, value in cls.__dict__.items() if name not in skip
+    }
+    namespace['__annotations__'] = dict(cls.__annotations__)
+
+    # Restaurar defaults de los campos (en la clase slotted viven en los Field)
+    for f in dataclasses.fields(cls):
+        if f.default is not dataclasses.MISSING:
+            namespace[f.name] = f.default
+        elif f.default_factory is not dataclasses.MISSING:
+            namespace[f.name] = dataclasses.field(default_factory=f.default_factory)
+
+    params = cls.__dataclass_params__
+    return dataclasses.dataclass(frozen=params.frozen)(type(cls.__name__, (), namespace))
+
+
+def measure(factory: Callable[[int], object], count: int) -> float:
+    """Medir bytes asignados por instancia creada con factory"""
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    items = [factory(i) for i in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Descontar la lista contenedora
+    container = count * 8 + 56
+    del items
+    return (after - before - container) / count
+
+
+def build_factories(nit_cls, phone_cls, code_cls, qty_cls,
+                    empresa_cls, producto_cls, inventario_cls) -> Dict[str, Callable[[int], object]]:
+    """Construir factories de entidades con un conjunto de clases dado"""
+    now = datetime.now()
+
+    def empresa(i: int):
+        return empresa_cls(
+            nit=nit_cls(f"900{i:06d}"),
+            nombre=f"Empresa {i}",
+            direccion=f"Calle {i} # 1-2",
+            telefono=phone_cls("3001234567"),
+            created_at=now,
+            updated_at=now,
+        )
+
+    def producto(i: int):
+        return producto_cls(
+            codigo=code_cls(f"PROD-{i:06d}"),
+            nombre=f"Producto {i}",
+            empresa_nit=nit_cls(f"900{i % 100:06d}"),
+            caracteristicas=None,
+            created_at=now,
+            updated_at=now,
+        )
+
+    def inventario(i: int):
+        return inventario_cls(
+            id=i,
+            empresa_nit=nit_cls(f"900{i % 100:06d}"),
+            producto_codigo=code_cls(f"PROD-{i:06d}"),
+            cantidad=qty_cls(i % 500),
+            created_at=now,
+            updated_at=now,
+        )
+
+    return {'Empresa': empresa, 'Producto': producto, 'Inventario': inventario}
+
+
+def run(count: int) -> Dict[str, Tuple[float, float]]:
+    """Ejecutar el benchmark y retornar {entidad: (bytes_antes, bytes_despues)}"""
+    after = build_factories(NIT, Phone, ProductCode, Quantity,
+                            Empresa, Producto, Inventario)
+    before = build_factories(*(unslotted(cls) for cls in (
+        NIT, Phone, ProductCode, Quantity, Empresa, Producto, Inventario
+    )))
+
+    return {
+        name: (measure(before[name], count), measure(after[name], count))
+        for name in after
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=20000,
+                        help='Número de entidades a crear por medición')
+    args = parser.parse_args()
+
+    results = run(args.count)
+
+    print(f"{'Entidad':<12} {'__dict__ (B)':>14} {'__slots__ (B)':>14} {'Ahorro':>8}")
+    for name, (before, after) in results.items():
+        saving = (1 - after / before) * 100 if before else 0.0
+        print(f"{name:<12} {before:>14.0f} {after:>14.0f} {saving:>7.1f}%")
+
+
+if __name__ == '__main__':
+    main()
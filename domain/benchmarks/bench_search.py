@@ -0,0 +1,92 @@
+"""
+Benchmark de búsqueda de productos por nombre
+
+Compara, sobre un catálogo sintético, el recorrido lineal equivalente a
+nombre__icontains (subcadena sobre todos los nombres) contra TrigramIndex,
+que además tolera errores de escritura y ordena por relevancia.
+
+Uso:
+    python benchmarks/bench_search.py
+    python benchmarks/bench_search.py --count 100000 --repeat 20
+"""
+import argparse
+import random
+import time
+from typing import Callable, Dict, List, Tuple
+
+from nexus_domain.search import TrigramIndex, normalize
+
+
+TIPOS = ['Laptop', 'Mouse', 'Teclado', 'Monitor', 'Cable', 'Audífonos', 'Impresora',
+         'Cámara', 'Parlante', 'Router', 'Tableta', 'Cargador', 'Disco', 'Memoria']
+MARCAS = ['Lenovo', 'Logitech', 'Samsung', 'Dell', 'HP', 'Asus', 'Acer', 'Sony',
+          'Xiaomi', 'Kingston', 'Epson', 'Canon', 'Redragon', 'Genius']
+ATRIBUTOS = ['inalámbrico', 'gamer', 'ergonómico', 'compacto', 'profesional', 'USB-C',
+             'HDMI', 'bluetooth', 'portátil', 'mecánico', 'curvo', 'externo']
+
+CONSULTAS = ['laptop lenovo', 'mouse inalambrico', 'monitor curvo', 'samsung', 'router']
+CONSULTAS_CON_ERRORES = ['laptpo lenvo', 'mouse inalambirco', 'moniter curbo']
+
+
+def catalogo(count: int, seed: int = 42) -> List[Tuple[str, str]]:
+    """Productos sintéticos (código, nombre)"""
+    rng = random.Random(seed)
+    return [
+        (
+            f"PROD-{i:07d}",
+            f"{rng.choice(TIPOS)} {rng.choice(MARCAS)} {rng.choice(ATRIBUTOS)} {rng.randint(1, 999)}"
+        )
+        for i in range(count)
+    ]
+
+
+def timed(func: Callable[[], object], repeat: int) -> Tuple[float, object]:
+    """Milisegundos promedio por ejecución y el último resultado"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+
+def run(count: int, repeat: int) -> Dict[str, object]:
+    """Ejecutar el benchmark y retornar los tiempos"""
+    productos = catalogo(count)
+    nombres = [(codigo, normalize(nombre)) for codigo, nombre in productos]
+
+    start = time.perf_counter()
+    index = TrigramIndex()
+    for codigo, nombre in productos:
+        index.add(codigo, nombre, codigo)
+    build = time.perf_counter() - start
+
+    consultas = {}
+    for consulta in CONSULTAS + CONSULTAS_CON_ERRORES:
+        subcadena = normalize(consulta)
+        lineal, encontrados = timed(
+            lambda subcadena=subcadena: [codigo for codigo, nombre in nombres if subcadena in nombre],
+            repeat
+        )
+        indexada, resultados = timed(lambda consulta=consulta: index.search(consulta, limit=100), repeat)
+        consultas[consulta] = (lineal, len(encontrados), indexada, len(resultados))
+
+    return {'build': build, 'consultas': consultas}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=1_000_000,
+                        help='Número de productos del catálogo')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Repeticiones por consulta')
+    args = parser.parse_args()
+
+    results = run(args.count, args.repeat)
+
+    print(f"Índice de {args.count} productos construido en {results['build']:.1f} s")
+    print(f"{'Consulta':<20} {'icontains (ms)':>15} {'filas':>8} {'índice (ms)':>12} {'top':>5}")
+    for consulta, (lineal, filas, indexada, top) in results['consultas'].items():
+        print(f"{consulta:<20} {lineal:>15.1f} {filas:>8} {indexada:>12.1f} {top:>5}")
+
+
+if __name__ == '__main__':
+    main()
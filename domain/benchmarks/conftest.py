@@ -0,0 +1,91 @@
+"""
+Configuración de la suite de pytest-benchmark del dominio
+
+Los casos de uso corren contra los repositorios en memoria de
+nexus_domain.repositories con --bench-rows registros, así se mide solo el
+costo del dominio.
+
+Uso (desde domain/):
+    pytest benchmarks --benchmark-autosave
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=median:10%
+    pytest benchmarks --bench-rows 100000 -k use_cases
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Sequence, Set
+
+import pytest
+
+from nexus_domain.entities import Empresa, Inventario, Producto
+from nexus_domain.interfaces import ICatalogoImportRepository, IEmpresaRepository
+from nexus_domain.repositories import (
+    InMemoryEmpresaRepository,
+    InMemoryInventarioRepository,
+    InMemoryProductoRepository,
+)
+from nexus_domain.value_objects import NIT, Phone, ProductCode, Quantity
+
+# Productos por empresa de los datos sintéticos
+PRODUCTOS_POR_EMPRESA = 100
+
+
+def pytest_addoption(parser):
+    parser.addoption('--bench-rows', type=int, default=1000,
+                     help='Registros de inventario de los repositorios en memoria')
+
+
+def pytest_benchmark_update_json(config, benchmarks, output_json):
+    """Guardar el tamaño de los datos junto con los resultados"""
+    output_json['bench_rows'] = config.getoption('--bench-rows')
+
+
+def nit(i: int) -> str:
+    return f"{900000000 + i}"
+
+
+def codigo(i: int) -> str:
+    return f"PROD-{i:07d}"
+
+
+class FakeCatalogoImportRepository(ICatalogoImportRepository):
+    def __init__(self, empresas: IEmpresaRepository):
+        self.empresas = empresas
+
+    def existing_codigos(self, codigos: Sequence[str]) -> Set[str]:
+        return set()
+
+    def existing_empresas(self, nits: Sequence[str]) -> Set[str]:
+        return {n for n in nits if self.empresas.exists(n)}
+
+    def save_chunk(self, productos, precios, progress) -> None:
+        pass
+
+    def save_progress(self, progress) -> None:
+        pass
+
+
+@pytest.fixture(scope='session')
+def bench_rows(request) -> int:
+    return request.config.getoption('--bench-rows')
+
+
+@pytest.fixture
+def repositories(bench_rows):
+    """(empresas, productos, inventario) con bench_rows registros de inventario"""
+    empresas = InMemoryEmpresaRepository()
+    productos = InMemoryProductoRepository()
+    inventario = InMemoryInventarioRepository(empresas, productos)
+    hoy = date.today()
+
+    for i in range(bench_rows):
+        empresa_nit = nit(i // PRODUCTOS_POR_EMPRESA)
+        if not empresas.exists(empresa_nit):
+            empresas.save(Empresa(NIT(empresa_nit), f"Empresa {empresa_nit}",
+                                  f"Calle {i} #1-23", Phone('3001234567')))
+        productos.save(Producto(ProductCode(codigo(i)), f"Producto {i}", NIT(empresa_nit)))
+        inventario.save(Inventario(None, NIT(empresa_nit), ProductCode(codigo(i)),
+                                   Quantity(i % 50)))
+        inventario.set_precios(codigo(i), {'COP': Decimal(1000 + i % 997)})
+        for dia in range(0, 84, 3):
+            inventario.add_consumo(empresa_nit, codigo(i), hoy - timedelta(days=dia), float((i + dia) % 7))
+    return empresas, productos, inventario
@@ -0,0 +1,63 @@
+"""
+Benchmarks de value objects, entidades y serialización (to_dict)
+"""
+from datetime import datetime
+
+from nexus_domain.entities import Empresa, Inventario, Producto
+from nexus_domain.value_objects import NIT, Email, Phone, ProductCode, Quantity
+
+NOW = datetime(2024, 1, 1, 12, 0)
+
+
+def test_nit(benchmark):
+    benchmark(NIT, '900123456')
+
+
+def test_email(benchmark):
+    benchmark(Email, 'contacto@empresa.com')
+
+
+def test_phone(benchmark):
+    benchmark(Phone, '300 123-4567')
+
+
+def test_product_code(benchmark):
+    benchmark(ProductCode, 'PROD-0000001')
+
+
+def test_quantity(benchmark):
+    benchmark(Quantity, 42)
+
+
+def test_empresa(benchmark):
+    nit, telefono = NIT('900123456'), Phone('3001234567')
+    benchmark(lambda: Empresa(nit, 'TechCorp S.A.S.', 'Calle 123 #45-67', telefono,
+                              created_at=NOW, updated_at=NOW))
+
+
+def test_producto(benchmark):
+    codigo, nit = ProductCode('PROD-0000001'), NIT('900123456')
+    caracteristicas = {'color': 'negro', 'peso': 1.2, 'garantia': '12 meses'}
+    benchmark(lambda: Producto(codigo, 'Laptop Lenovo ThinkPad', nit, caracteristicas,
+                               created_at=NOW, updated_at=NOW))
+
+
+def test_inventario(benchmark):
+    nit, codigo, cantidad = NIT('900123456'), ProductCode('PROD-0000001'), Quantity(42)
+    benchmark(lambda: Inventario(1, nit, codigo, cantidad, created_at=NOW, updated_at=NOW))
+
+
+def test_empresa_to_dict(benchmark):
+    empresa = Empresa(NIT('900123456'), 'TechCorp S.A.S.', 'Calle 123 #45-67', Phone('3001234567'))
+    benchmark(empresa.to_dict)
+
+
+def test_producto_to_dict(benchmark):
+    producto = Producto(ProductCode('PROD-0000001'), 'Laptop Lenovo ThinkPad', NIT('900123456'),
+                        {'color': 'negro', 'peso': 1.2, 'garantia': '12 meses'})
+    benchmark(producto.to_dict)
+
+
+def test_inventario_to_dict(benchmark):
+    inventario = Inventario(1, NIT('900123456'), ProductCode('PROD-0000001'), Quantity(42))
+    benchmark(inventario.to_dict)
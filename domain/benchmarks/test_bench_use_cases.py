@@ -0,0 +1,206 @@
+"""
+Benchmarks de cada *UseCase.execute contra los repositorios en memoria
+"""
+from datetime import date
+from itertools import count
+
+import pytest
+
+from nexus_domain.entities import Empresa, Inventario, Producto
+from nexus_domain.use_cases import (
+    AddStockUseCase,
+    ClassifyABCUseCase,
+    CreateEmpresaUseCase,
+    CreateOrUpdateInventarioUseCase,
+    CreateProductoUseCase,
+    DeleteEmpresaUseCase,
+    DeleteInventarioUseCase,
+    DeleteProductoUseCase,
+    ForecastDemandUseCase,
+    GetEmpresaUseCase,
+    GetInventarioUseCase,
+    GetLowStockItemsUseCase,
+    GetProductoUseCase,
+    ImportCatalogUseCase,
+    ListEmpresasUseCase,
+    ListProductosUseCase,
+    RefreshABCClassificationUseCase,
+    RemoveStockUseCase,
+    UpdateEmpresaUseCase,
+    UpdateProductoUseCase,
+)
+from nexus_domain.value_objects import NIT, Phone, ProductCode, Quantity
+
+from conftest import FakeCatalogoImportRepository, codigo, nit
+
+HASTA = date.today()
+
+
+@pytest.fixture
+def nuevos():
+    """Índices que no existen en los repositorios (para crear)"""
+    return count(10_000_000)
+
+
+# --- Empresa ---
+
+def test_create_empresa(benchmark, repositories, nuevos):
+    empresas, _, _ = repositories
+    use_case = CreateEmpresaUseCase(empresas)
+    benchmark(lambda: use_case.execute(nit(next(nuevos)), 'Empresa nueva', 'Calle 1 #2-3',
+                                       '3001234567', 'user-1'))
+
+
+def test_get_empresa(benchmark, repositories):
+    empresas, _, _ = repositories
+    benchmark(GetEmpresaUseCase(empresas).execute, nit(0))
+
+
+def test_list_empresas(benchmark, repositories):
+    empresas, _, _ = repositories
+    benchmark(ListEmpresasUseCase(empresas).execute, limit=100)
+
+
+def test_search_empresas(benchmark, repositories):
+    empresas, _, _ = repositories
+    benchmark(ListEmpresasUseCase(empresas).execute, limit=100, search='empresa 9000000')
+
+
+def test_update_empresa(benchmark, repositories):
+    empresas, _, _ = repositories
+    benchmark(UpdateEmpresaUseCase(empresas).execute, nit(0), nombre='Empresa renombrada')
+
+
+def test_delete_empresa(benchmark, repositories, nuevos):
+    empresas, _, _ = repositories
+    use_case = DeleteEmpresaUseCase(empresas)
+
+    def setup():
+        empresa_nit = nit(next(nuevos))
+        empresas.save(Empresa(NIT(empresa_nit), 'Empresa temporal', 'Calle 1 #2-3', Phone('3001234567')))
+        return (empresa_nit,), {}
+
+    benchmark.pedantic(use_case.execute, setup=setup, rounds=1000)
+
+
+# --- Producto ---
+
+def test_create_producto(benchmark, repositories, nuevos):
+    empresas, productos, _ = repositories
+    use_case = CreateProductoUseCase(productos, empresas)
+    benchmark(lambda: use_case.execute(codigo(next(nuevos)), 'Producto nuevo', nit(0),
+                                       {'color': 'negro'}, 'user-1'))
+
+
+def test_get_producto(benchmark, repositories):
+    _, productos, _ = repositories
+    benchmark(GetProductoUseCase(productos).execute, codigo(0))
+
+
+def test_list_productos(benchmark, repositories):
+    _, productos, _ = repositories
+    benchmark(ListProductosUseCase(productos).execute, limit=100)
+
+
+def test_list_productos_by_empresa(benchmark, repositories):
+    _, productos, _ = repositories
+    benchmark(ListProductosUseCase(productos).execute, empresa_nit=nit(0))
+
+
+def test_update_producto(benchmark, repositories):
+    _, productos, _ = repositories
+    benchmark(UpdateProductoUseCase(productos).execute, codigo(0), nombre='Producto renombrado')
+
+
+def test_delete_producto(benchmark, repositories, nuevos):
+    _, productos, _ = repositories
+    use_case = DeleteProductoUseCase(productos)
+
+    def setup():
+        producto_codigo = codigo(next(nuevos))
+        productos.save(Producto(ProductCode(producto_codigo), 'Producto temporal', NIT(nit(0))))
+        return (producto_codigo,), {}
+
+    benchmark.pedantic(use_case.execute, setup=setup, rounds=1000)
+
+
+def test_import_catalog(benchmark, repositories, nuevos):
+    empresas, _, _ = repositories
+    use_case = ImportCatalogUseCase(FakeCatalogoImportRepository(empresas))
+
+    def filas():
+        return [
+            (fila, {'codigo': codigo(next(nuevos)), 'nombre': f'Producto {fila}', 'empresa': nit(0),
+                    'precio_COP': '125000.50', 'precio_USD': '31.99'})
+            for fila in range(1, 1001)
+        ]
+
+    benchmark.pedantic(use_case.execute, setup=lambda: ((filas(),), {}), rounds=20)
+
+
+# --- Inventario ---
+
+def test_create_or_update_inventario(benchmark, repositories):
+    empresas, productos, inventario = repositories
+    use_case = CreateOrUpdateInventarioUseCase(inventario, empresas, productos)
+    benchmark(use_case.execute, nit(0), codigo(0), 25)
+
+
+def test_get_inventario_by_empresa(benchmark, repositories):
+    _, _, inventario = repositories
+    benchmark(GetInventarioUseCase(inventario).execute, empresa_nit=nit(0))
+
+
+def test_add_stock(benchmark, repositories):
+    _, _, inventario = repositories
+    benchmark(AddStockUseCase(inventario).execute, 1, 1)
+
+
+def test_remove_stock(benchmark, repositories):
+    _, _, inventario = repositories
+    registro = inventario.find_by_id(1)
+    registro.update_stock(Quantity(10 ** 9))
+    inventario.save(registro)
+    benchmark(RemoveStockUseCase(inventario).execute, 1, 1)
+
+
+def test_delete_inventario(benchmark, repositories, nuevos):
+    _, _, inventario = repositories
+    use_case = DeleteInventarioUseCase(inventario)
+
+    def setup():
+        registro = inventario.save(Inventario(next(nuevos), NIT(nit(0)), ProductCode(codigo(0)), Quantity(1)))
+        return (registro.id,), {}
+
+    benchmark.pedantic(use_case.execute, setup=setup, rounds=1000)
+
+
+def test_low_stock_items(benchmark, repositories):
+    _, _, inventario = repositories
+    benchmark(GetLowStockItemsUseCase(inventario).execute)
+
+
+def test_forecast_demand(benchmark, repositories):
+    empresas, _, inventario = repositories
+    benchmark(ForecastDemandUseCase(inventario, empresas).execute, nit(0), hasta=HASTA)
+
+
+def test_classify_abc(benchmark, repositories):
+    empresas, _, inventario = repositories
+    benchmark(ClassifyABCUseCase(inventario, empresas).execute, nit(0))
+
+
+def test_refresh_abc(benchmark, repositories):
+    empresas, _, inventario = repositories
+    use_case = RefreshABCClassificationUseCase(inventario)
+    cantidades = count(1)
+
+    def setup():
+        # Un movimiento de stock por empresa deja su clasificación pendiente
+        for empresa in empresas.find_all(limit=len(empresas)):
+            registro = inventario.find_by_empresa(str(empresa.nit))[0]
+            registro.update_stock(Quantity(next(cantidades)))
+            inventario.save(registro)
+        return (), {}
+
+    benchmark.pedantic(use_case.execute, setup=setup, rounds=100)
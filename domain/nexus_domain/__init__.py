@@ -15,7 +15,7 @@ __version__ = "1.0.0"
 
 from .entities import Empresa, Producto, Inventario
 from .value_objects import NIT, Email, Phone, ProductCode, Quantity
-from .interfaces import IEmpresaRepository, IProductoRepository, IInventarioRepository
+from .interfaces import IEmpresaRepository, IProductoRepository, IInventarioRepository, IUnitOfWork
 from .exceptions import (
     DomainException,
     ValidationError,
@@ -41,6 +41,7 @@ __all__ = [
     'IEmpresaRepository',
     'IProductoRepository',
     'IInventarioRepository',
+    'IUnitOfWork',
     # Exceptions
     'DomainException',
     'ValidationError',
@@ -0,0 +1,34 @@
+"""
+Analítica vectorizada del inventario (NumPy)
+"""
+from .snapshot import (
+    InventorySnapshot,
+    MONEDAS,
+    STOCK_STATUS_LABELS
+)
+from .low_stock import LowStockEvaluator
+from .abc import ABCClassifier
+from .forecasting import (
+    DemandForecaster,
+    DemandSeries,
+    ForecastResult,
+    MAX_DIAS_PERIODO,
+    MAX_PERIODOS,
+    METODOS,
+    validate_periodos
+)
+
+__all__ = [
+    'InventorySnapshot',
+    'MONEDAS',
+    'STOCK_STATUS_LABELS',
+    'LowStockEvaluator',
+    'ABCClassifier',
+    'DemandForecaster',
+    'DemandSeries',
+    'ForecastResult',
+    'MAX_DIAS_PERIODO',
+    'MAX_PERIODOS',
+    'METODOS',
+    'validate_periodos',
+]
@@ -0,0 +1,75 @@
+"""
+Clasificación ABC (Pareto) del inventario por valor
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List
+import numpy as np
+
+from ..entities.inventario import CLASES_ABC
+from ..exceptions import ValidationError
+from .snapshot import InventorySnapshot
+
+
+@dataclass(frozen=True)
+class ABCClassifier:
+    """
+    Clasificador ABC por participación acumulada en el valor total
+
+    Las filas se ordenan de mayor a menor valor; una fila es A si el valor
+    acumulado *antes* de ella es menor que umbral_a (la fila que cruza el
+    umbral sigue siendo A), B si es menor que umbral_b y C en otro caso.
+    Las filas sin valor (sin precio o sin stock) siempre son C.
+    """
+    umbral_a: float = 0.8
+    umbral_b: float = 0.95
+    moneda: str = 'COP'
+
+    def __post_init__(self) -> None:
+        """Validar umbrales"""
+        if not 0 < self.umbral_a < self.umbral_b <= 1:
+            raise ValidationError("Los umbrales deben cumplir 0 < A < B <= 1")
+
+    def codes(self, values: np.ndarray) -> np.ndarray:
+        """Código de clase por fila (índice en CLASES_ABC)"""
+        values = np.asarray(values, dtype=np.float64)
+        total = values.sum()
+        codes = np.full(len(values), len(CLASES_ABC) - 1, dtype=np.int8)
+        if total <= 0:
+            return codes
+
+        order = np.argsort(-values, kind='stable')
+        sorted_values = values[order]
+        previo = (np.cumsum(sorted_values) - sorted_values) / total
+
+        ranked = np.searchsorted([self.umbral_a, self.umbral_b], previo, side='right')
+        ranked[sorted_values <= 0] = len(CLASES_ABC) - 1
+        codes[order] = ranked
+        return codes
+
+    def classify(self, snapshot: InventorySnapshot) -> np.ndarray:
+        """Códigos de clase por fila del snapshot según su valor en la moneda"""
+        return self.codes(snapshot.row_values(self.moneda))
+
+    def group_ids(self, snapshot: InventorySnapshot) -> Dict[str, List[int]]:
+        """IDs de inventario agrupados por clase: {'A': [...], 'B': [...], 'C': [...]}"""
+        codes = self.classify(snapshot)
+        return {
+            clase: snapshot.ids[codes == i].tolist()
+            for i, clase in enumerate(CLASES_ABC)
+        }
+
+    def summary(self, snapshot: InventorySnapshot) -> Dict[str, Dict[str, Any]]:
+        """Items, valor y porcentaje del valor total por clase"""
+        codes = self.classify(snapshot)
+        values = snapshot.row_values(self.moneda)
+        total = values.sum()
+        counts = np.bincount(codes, minlength=len(CLASES_ABC))
+        valores = np.bincount(codes, weights=values, minlength=len(CLASES_ABC))
+        return {
+            clase: {
+                'items': int(counts[i]),
+                'valor': float(valores[i]),
+                'porcentaje': round(float(valores[i] / total * 100), 2) if total > 0 else 0.0
+            }
+            for i, clase in enumerate(CLASES_ABC)
+        }
@@ -0,0 +1,207 @@
+"""
+Pronóstico de demanda y puntos de reorden vectorizado por SKU
+"""
+import math
+from dataclasses import dataclass, replace
+from datetime import date
+from statistics import NormalDist
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+
+from ..exceptions import ValidationError
+
+
+# Métodos soportados: promedio móvil simple / suavizado exponencial simple
+METODOS: Tuple[str, ...] = ('sma', 'ses')
+
+# Límites de la serie: acotan la matriz (productos × periodos) y el rango de fechas
+MAX_PERIODOS = 156
+MAX_DIAS_PERIODO = 365
+
+
+def validate_periodos(periodos: int, dias_periodo: int) -> None:
+    """Validar número y duración de los periodos de una serie"""
+    if not 0 < periodos <= MAX_PERIODOS:
+        raise ValidationError(f"Periodos debe estar entre 1 y {MAX_PERIODOS}")
+    if not 0 < dias_periodo <= MAX_DIAS_PERIODO:
+        raise ValidationError(f"Días por periodo debe estar entre 1 y {MAX_DIAS_PERIODO}")
+
+
+@dataclass(frozen=True, eq=False)
+class DemandSeries:
+    """
+    Serie de consumo por producto en periodos de igual duración
+
+    consumo es una matriz (productos, periodos) en float64; la columna 0 es el
+    periodo que empieza en `inicio` y la última el más reciente.
+    """
+    consumo: np.ndarray
+    productos: Tuple[str, ...]
+    inicio: date
+    dias_periodo: int = 7
+
+    def __post_init__(self) -> None:
+        """Validar forma de la matriz"""
+        if self.consumo.ndim != 2 or self.consumo.shape[0] != len(self.productos):
+            raise ValidationError("La matriz de consumo no coincide con los productos")
+
+    @property
+    def periodos(self) -> int:
+        return int(self.consumo.shape[1])
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[Any]], inicio: date, periodos: int,
+                  dias_periodo: int = 7, productos: Sequence[str] = ()) -> 'DemandSeries':
+        """
+        Construir la serie desde filas (producto_codigo, fecha, consumo)
+
+        Las fechas se agrupan en periodos de `dias_periodo` días desde `inicio`;
+        las filas fuera del rango se ignoran. `productos` fija el orden inicial
+        e incluye SKUs sin consumo (quedan con demanda cero).
+        """
+        validate_periodos(periodos, dias_periodo)
+
+        index: Dict[str, int] = {codigo: i for i, codigo in enumerate(dict.fromkeys(productos))}
+        rows = list(rows)
+        n_rows = len(rows)
+
+        codes = np.fromiter(
+            (index.setdefault(row[0], len(index)) for row in rows),
+            dtype=np.int64, count=n_rows
+        )
+        ordinals = np.fromiter((row[1].toordinal() for row in rows), dtype=np.int64, count=n_rows)
+        valores = np.fromiter((row[2] for row in rows), dtype=np.float64, count=n_rows)
+
+        periodo = (ordinals - inicio.toordinal()) // dias_periodo
+        valid = (periodo >= 0) & (periodo < periodos)
+
+        n = len(index)
+        consumo = np.bincount(
+            codes[valid] * periodos + periodo[valid],
+            weights=valores[valid],
+            minlength=n * periodos
+        ).reshape(n, periodos)
+
+        return cls(consumo=consumo, productos=tuple(index), inicio=inicio,
+                   dias_periodo=dias_periodo)
+
+
+@dataclass(frozen=True, eq=False)
+class ForecastResult:
+    """
+    Resultado del pronóstico, un valor por producto (alineado con productos)
+
+    - demanda: demanda esperada por periodo
+    - desviacion: desviación estándar del consumo por periodo
+    - stock_seguridad: z × desviación × √lead_time
+    - punto_reorden: demanda × lead_time + stock de seguridad (redondeado arriba)
+    - cantidad: stock actual (opcional)
+    """
+    productos: Tuple[str, ...]
+    demanda: np.ndarray
+    desviacion: np.ndarray
+    stock_seguridad: np.ndarray
+    punto_reorden: np.ndarray
+    cantidad: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.productos)
+
+    def with_stock(self, cantidades: Dict[str, int]) -> 'ForecastResult':
+        """Adjuntar el stock actual por producto (0 si no hay registro)"""
+        cantidad = np.fromiter(
+            (cantidades.get(codigo, 0) for codigo in self.productos),
+            dtype=np.int64, count=len(self.productos)
+        )
+        return replace(self, cantidad=cantidad)
+
+    def reorder_mask(self) -> np.ndarray:
+        """Productos cuyo stock actual está en o por debajo del punto de reorden"""
+        if self.cantidad is None:
+            raise ValidationError("El resultado no tiene stock actual")
+        return self.cantidad <= self.punto_reorden
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Convertir a lista de diccionarios (una entrada por producto)"""
+        columns = {
+            'producto_codigo': self.productos,
+            'demanda': np.round(self.demanda, 2).tolist(),
+            'desviacion': np.round(self.desviacion, 2).tolist(),
+            'stock_seguridad': np.round(self.stock_seguridad, 2).tolist(),
+            'punto_reorden': self.punto_reorden.tolist(),
+        }
+        if self.cantidad is not None:
+            columns['cantidad'] = self.cantidad.tolist()
+            columns['reordenar'] = self.reorder_mask().tolist()
+        return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+@dataclass(frozen=True)
+class DemandForecaster:
+    """
+    Pronosticador de demanda para todos los SKUs de una serie a la vez
+
+    - sma: promedio y desviación de los últimos `ventana` periodos
+    - ses: suavizado exponencial con factor `alpha` sobre toda la serie,
+      calculado como un producto matriz × pesos; desviación de toda la serie
+    lead_time se expresa en periodos de la serie.
+    """
+    metodo: str = 'ses'
+    ventana: int = 4
+    alpha: float = 0.3
+    lead_time: float = 1.0
+    nivel_servicio: float = 0.95
+
+    def __post_init__(self) -> None:
+        """Validar parámetros"""
+        if self.metodo not in METODOS:
+            raise ValidationError(f"Método no soportado: {self.metodo}")
+        if self.ventana <= 0:
+            raise ValidationError("La ventana debe ser positiva")
+        # nan e inf pasarían las comparaciones y llegarían a la serialización
+        if not all(math.isfinite(valor) for valor in (self.alpha, self.lead_time, self.nivel_servicio)):
+            raise ValidationError("Alpha, lead time y nivel de servicio deben ser finitos")
+        if not 0 < self.alpha <= 1:
+            raise ValidationError("Alpha debe estar en (0, 1]")
+        if self.lead_time < 0:
+            raise ValidationError("El lead time no puede ser negativo")
+        if not 0 < self.nivel_servicio < 1:
+            raise ValidationError("El nivel de servicio debe estar en (0, 1)")
+
+    def _ses_weights(self, periodos: int) -> np.ndarray:
+        """Pesos del suavizado exponencial (nivel inicial = primer periodo)"""
+        exponents = np.arange(periodos - 1, -1, -1)
+        weights = self.alpha * (1 - self.alpha) ** exponents
+        weights[0] = (1 - self.alpha) ** (periodos - 1)
+        return weights
+
+    def demand(self, consumo: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Demanda esperada y desviación por fila de la matriz de consumo"""
+        n, periodos = consumo.shape
+        if periodos == 0:
+            return np.zeros(n), np.zeros(n)
+
+        if self.metodo == 'sma':
+            window = consumo[:, -self.ventana:]
+            return window.mean(axis=1), window.std(axis=1)
+
+        return consumo @ self._ses_weights(periodos), consumo.std(axis=1)
+
+    def forecast(self, series: DemandSeries) -> ForecastResult:
+        """Calcular demanda, stock de seguridad y punto de reorden por SKU"""
+        demanda, desviacion = self.demand(series.consumo)
+
+        z = NormalDist().inv_cdf(self.nivel_servicio)
+        stock_seguridad = z * desviacion * np.sqrt(self.lead_time)
+        # Redondear antes de ceil para no subir una unidad por error de punto flotante
+        punto_reorden = np.ceil(
+            np.round(demanda * self.lead_time + stock_seguridad, 6)
+        ).astype(np.int64)
+
+        return ForecastResult(
+            productos=series.productos,
+            demanda=demanda,
+            desviacion=desviacion,
+            stock_seguridad=stock_seguridad,
+            punto_reorden=punto_reorden
+        )
@@ -0,0 +1,48 @@
+"""
+Evaluación vectorizada de stock bajo con puntos de reorden por producto y empresa
+"""
+from dataclasses import dataclass, field
+from typing import Mapping, Tuple
+import numpy as np
+
+from ..entities.inventario import DEFAULT_PUNTO_REORDEN
+from .snapshot import InventorySnapshot
+
+
+def _lookup(keys: Tuple[str, ...], values: Mapping[str, int]) -> np.ndarray:
+    """Array alineado a keys con el valor configurado o -1 si no hay"""
+    return np.fromiter(
+        (values.get(key, -1) for key in keys),
+        dtype=np.int64,
+        count=len(keys)
+    )
+
+
+@dataclass(frozen=True)
+class LowStockEvaluator:
+    """
+    Evaluador de stock bajo para procesos batch
+
+    Resuelve el punto de reorden efectivo de cada fila de un snapshot con la
+    misma prioridad que Inventario.resolve_punto_reorden:
+    producto, luego empresa, luego el valor por defecto.
+    """
+    producto_puntos: Mapping[str, int] = field(default_factory=dict)
+    empresa_puntos: Mapping[str, int] = field(default_factory=dict)
+    default: int = DEFAULT_PUNTO_REORDEN
+
+    def thresholds(self, snapshot: InventorySnapshot) -> np.ndarray:
+        """Punto de reorden efectivo por fila"""
+        por_producto = _lookup(snapshot.productos, self.producto_puntos)[snapshot.producto_idx]
+        por_empresa = _lookup(snapshot.empresas, self.empresa_puntos)[snapshot.empresa_idx]
+
+        resolved = np.where(por_empresa >= 0, por_empresa, self.default)
+        return np.where(por_producto >= 0, por_producto, resolved)
+
+    def mask(self, snapshot: InventorySnapshot) -> np.ndarray:
+        """Máscara de filas con cantidad por debajo de su punto de reorden"""
+        return snapshot.low_stock_mask(self.thresholds(snapshot))
+
+    def evaluate(self, snapshot: InventorySnapshot) -> InventorySnapshot:
+        """Snapshot con solo las filas en stock bajo"""
+        return snapshot.select(self.mask(snapshot))
@@ -0,0 +1,271 @@
+"""
+InventorySnapshot - Vista columnar del inventario para analítica vectorizada
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+import numpy as np
+
+from ..entities import Inventario
+from ..entities.inventario import DEFAULT_PUNTO_REORDEN, STOCK_MEDIO_FACTOR
+from ..exceptions import ValidationError
+
+
+# Monedas soportadas (mismo orden que las columnas de precios)
+MONEDAS: Tuple[str, ...] = ('COP', 'USD', 'EUR', 'MXN')
+
+# Estados de stock (mismas reglas que Inventario.get_stock_status)
+STOCK_STATUS_LABELS: Tuple[str, ...] = ('AGOTADO', 'BAJO', 'MEDIO', 'ALTO')
+
+
+def _factorize(values: Sequence[str]) -> Tuple[np.ndarray, Tuple[str, ...]]:
+    """Convertir una secuencia de claves en (índices, claves únicas)"""
+    index: Dict[str, int] = {}
+    codes = np.fromiter(
+        (index.setdefault(value, len(index)) for value in values),
+        dtype=np.int32,
+        count=len(values)
+    )
+    return codes, tuple(index)
+
+
+@dataclass(frozen=True, eq=False)
+class InventorySnapshot:
+    """
+    Snapshot columnar e inmutable del inventario
+
+    Cada fila es un registro de inventario (empresa + producto). Las columnas
+    son arrays de NumPy alineados por posición:
+    - ids: id del registro de inventario
+    - cantidad: stock disponible (int64)
+    - punto_reorden: punto de reorden efectivo del registro (int64)
+    - precios: matriz (filas, monedas) en float64; NaN si no hay precio
+    - empresa_idx / producto_idx: posiciones dentro de empresas / productos
+    """
+    ids: np.ndarray
+    cantidad: np.ndarray
+    punto_reorden: np.ndarray
+    precios: np.ndarray
+    empresa_idx: np.ndarray
+    producto_idx: np.ndarray
+    empresas: Tuple[str, ...]
+    productos: Tuple[str, ...]
+    monedas: Tuple[str, ...] = MONEDAS
+
+    def __post_init__(self) -> None:
+        """Validar que las columnas estén alineadas"""
+        n = len(self.cantidad)
+        for name in ('ids', 'punto_reorden', 'empresa_idx', 'producto_idx'):
+            if len(getattr(self, name)) != n:
+                raise ValidationError(f"Columna {name} no está alineada con cantidad")
+
+        if self.precios.shape != (n, len(self.monedas)):
+            raise ValidationError("La matriz de precios no coincide con filas y monedas")
+
+    # --- Construcción ---
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[Any]],
+                  monedas: Tuple[str, ...] = MONEDAS) -> 'InventorySnapshot':
+        """
+        Construir snapshot desde filas planas
+
+        Cada fila: (id, empresa_nit, producto_codigo, cantidad, punto_reorden, *precios)
+        con un precio (o None) por moneda, en el orden de `monedas`.
+        """
+        rows = list(rows)
+        n = len(rows)
+        width = 5 + len(monedas)
+
+        if n == 0:
+            return cls.empty(monedas)
+
+        columns = list(zip(*rows))
+        if len(columns) != width:
+            raise ValidationError(f"Cada fila debe tener {width} columnas")
+
+        empresa_idx, empresas = _factorize(columns[1])
+        producto_idx, productos = _factorize(columns[2])
+
+        precios = np.array(
+            [[np.nan if p is None else float(p) for p in col] for col in columns[5:]],
+            dtype=np.float64
+        ).T.reshape(n, len(monedas))
+
+        return cls(
+            ids=np.fromiter(columns[0], dtype=np.int64, count=n),
+            cantidad=np.fromiter(columns[3], dtype=np.int64, count=n),
+            punto_reorden=np.fromiter(
+                (DEFAULT_PUNTO_REORDEN if p is None else p for p in columns[4]),
+                dtype=np.int64,
+                count=n
+            ),
+            precios=precios,
+            empresa_idx=empresa_idx,
+            producto_idx=producto_idx,
+            empresas=empresas,
+            productos=productos,
+            monedas=monedas
+        )
+
+    @classmethod
+    def from_entities(cls, inventarios: Iterable[Inventario],
+                      precios: Optional[Mapping[str, Mapping[str, float]]] = None,
+                      monedas: Tuple[str, ...] = MONEDAS) -> 'InventorySnapshot':
+        """
+        Construir snapshot desde entidades de dominio
+
+        precios: {producto_codigo: {moneda: precio}} (opcional)
+        """
+        precios = precios or {}
+        rows = []
+        for inv in inventarios:
+            codigo = str(inv.producto_codigo)
+            producto_precios = precios.get(codigo, {})
+            rows.append((
+                int(str(inv.id)) if str(inv.id).isdigit() else -1,
+                str(inv.empresa_nit),
+                codigo,
+                int(inv.cantidad),
+                inv.punto_reorden,
+                *(producto_precios.get(moneda) for moneda in monedas)
+            ))
+        return cls.from_rows(rows, monedas)
+
+    @classmethod
+    def empty(cls, monedas: Tuple[str, ...] = MONEDAS) -> 'InventorySnapshot':
+        """Snapshot sin registros"""
+        return cls(
+            ids=np.empty(0, dtype=np.int64),
+            cantidad=np.empty(0, dtype=np.int64),
+            punto_reorden=np.empty(0, dtype=np.int64),
+            precios=np.empty((0, len(monedas)), dtype=np.float64),
+            empresa_idx=np.empty(0, dtype=np.int32),
+            producto_idx=np.empty(0, dtype=np.int32),
+            empresas=(),
+            productos=(),
+            monedas=monedas
+        )
+
+    def __len__(self) -> int:
+        return len(self.cantidad)
+
+    # --- Selección ---
+
+    def select(self, mask: np.ndarray) -> 'InventorySnapshot':
+        """Obtener un snapshot con las filas indicadas (máscara o índices)"""
+        return InventorySnapshot(
+            ids=self.ids[mask],
+            cantidad=self.cantidad[mask],
+            punto_reorden=self.punto_reorden[mask],
+            precios=self.precios[mask],
+            empresa_idx=self.empresa_idx[mask],
+            producto_idx=self.producto_idx[mask],
+            empresas=self.empresas,
+            productos=self.productos,
+            monedas=self.monedas
+        )
+
+    def for_empresa(self, empresa_nit: str) -> 'InventorySnapshot':
+        """Filtrar filas de una empresa"""
+        try:
+            position = self.empresas.index(str(empresa_nit))
+        except ValueError:
+            return self.select(np.zeros(len(self), dtype=bool))
+        return self.select(self.empresa_idx == position)
+
+    # --- Valoración ---
+
+    def price_column(self, moneda: str = 'COP') -> np.ndarray:
+        """Precios por fila en una moneda (NaN si no hay precio)"""
+        try:
+            column = self.monedas.index(moneda)
+        except ValueError:
+            raise ValidationError(f"Moneda no soportada: {moneda}")
+        return self.precios[:, column]
+
+    def row_values(self, moneda: str = 'COP') -> np.ndarray:
+        """Valor por fila (cantidad × precio); 0 si no hay precio"""
+        values: np.ndarray = np.nan_to_num(self.cantidad * self.price_column(moneda), nan=0.0)
+        return values
+
+    def total_cantidad(self) -> int:
+        """Suma de unidades en stock"""
+        return int(self.cantidad.sum())
+
+    def valuation(self, moneda: str = 'COP') -> float:
+        """Valor total del inventario en una moneda"""
+        return float(self.row_values(moneda).sum())
+
+    # --- Estados de stock ---
+
+    def stock_status_codes(self) -> np.ndarray:
+        """Código de estado por fila (índice en STOCK_STATUS_LABELS)"""
+        codes = (self.cantidad > 0).astype(np.int8)
+        codes += self.cantidad >= self.punto_reorden
+        codes += self.cantidad >= self.punto_reorden * STOCK_MEDIO_FACTOR
+        return codes
+
+    def stock_status_counts(self) -> Dict[str, int]:
+        """Distribución de registros por estado de stock"""
+        counts = np.bincount(self.stock_status_codes(), minlength=len(STOCK_STATUS_LABELS))
+        return {label: int(count) for label, count in zip(STOCK_STATUS_LABELS, counts)}
+
+    def low_stock_mask(self, threshold: Union[int, np.ndarray, None] = None) -> np.ndarray:
+        """
+        Máscara de filas con stock bajo (cantidad < threshold)
+
+        threshold puede ser un entero o un array por fila; sin threshold se
+        usa el punto de reorden de cada registro.
+        """
+        if threshold is None:
+            threshold = self.punto_reorden
+        mask: np.ndarray = self.cantidad < threshold
+        return mask
+
+    # --- Agrupaciones ---
+
+    def _group(self, codes: np.ndarray, keys: Tuple[str, ...],
+               weights: np.ndarray) -> Dict[str, float]:
+        """Sumar pesos por clave, omitiendo claves sin filas"""
+        totals = np.bincount(codes, weights=weights, minlength=len(keys))
+        present = np.bincount(codes, minlength=len(keys)) > 0
+        return {keys[i]: float(totals[i]) for i in np.flatnonzero(present)}
+
+    def cantidad_by_empresa(self) -> Dict[str, int]:
+        """Unidades en stock por NIT de empresa"""
+        grouped = self._group(self.empresa_idx, self.empresas, self.cantidad)
+        return {nit: int(total) for nit, total in grouped.items()}
+
+    def cantidad_by_producto(self) -> Dict[str, int]:
+        """Unidades en stock por código de producto"""
+        grouped = self._group(self.producto_idx, self.productos, self.cantidad)
+        return {codigo: int(total) for codigo, total in grouped.items()}
+
+    def valuation_by_empresa(self, moneda: str = 'COP') -> Dict[str, float]:
+        """Valor del inventario por NIT de empresa"""
+        return self._group(self.empresa_idx, self.empresas, self.row_values(moneda))
+
+    def count_empresas(self) -> int:
+        """Número de empresas con al menos un registro"""
+        return int(np.unique(self.empresa_idx).size)
+
+    def top_productos(self, n: int = 5, moneda: Optional[str] = None) -> List[Tuple[str, float]]:
+        """
+        Productos con mayor cantidad (o valor, si se indica moneda)
+
+        Retorna [(producto_codigo, total)] ordenado de mayor a menor.
+        """
+        if n <= 0:
+            return []
+
+        weights = self.cantidad if moneda is None else self.row_values(moneda)
+        totals = np.bincount(self.producto_idx, weights=weights, minlength=len(self.productos))
+        present = np.flatnonzero(np.bincount(self.producto_idx, minlength=len(self.productos)))
+
+        if n < present.size:
+            candidates = present[np.argpartition(-totals[present], n - 1)[:n]]
+        else:
+            candidates = present
+
+        ordered = candidates[np.argsort(-totals[candidates], kind='stable')]
+        return [(self.productos[i], float(totals[i])) for i in ordered]
@@ -8,7 +8,7 @@ from ..value_objects import NIT, Phone
 from ..exceptions import ValidationError
 
 
-@dataclass
+@dataclass(slots=True)
 class Empresa:
     """
     Entidad de negocio: Empresa
@@ -18,6 +18,7 @@ class Empresa:
     - Nombre requerido (mínimo 3 caracteres)
     - Dirección requerida
     - Teléfono válido
+    - Punto de reorden opcional (>= 0) para sus productos sin uno propio
     """
     nit: NIT
     nombre: str
@@ -26,6 +27,7 @@ class Empresa:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     created_by_id: Optional[str] = None
+    punto_reorden: Optional[int] = None
     
     def __post_init__(self):
         """Validar entidad al crear"""
@@ -39,17 +41,28 @@ class Empresa:
         if not self.direccion or len(self.direccion.strip()) < 5:
             raise ValidationError("Dirección debe tener al menos 5 caracteres")
         
+        # bool es subclase de int: True/False no son puntos de reorden
+        if self.punto_reorden is not None and (
+            isinstance(self.punto_reorden, bool) or not isinstance(self.punto_reorden, int)
+            or self.punto_reorden < 0
+        ):
+            raise ValidationError("Punto de reorden debe ser un entero no negativo")
+        
         # Normalizar nombre
         self.nombre = self.nombre.strip()
         self.direccion = self.direccion.strip()
     
     def update_info(self, nombre: Optional[str] = None, 
                     direccion: Optional[str] = None, 
-                    telefono: Optional[Phone] = None) -> None:
+                    telefono: Optional[Phone] = None,
+                    punto_reorden: Optional[int] = None,
+                    clear_punto_reorden: bool = False) -> None:
         """
         Actualizar información de la empresa
         
-        Regla de negocio: Al actualizar, validar y actualizar timestamp
+        Regla de negocio: Al actualizar, validar y actualizar timestamp.
+        Los argumentos en None no cambian; clear_punto_reorden quita el punto
+        de reorden propio.
         """
         if nombre is not None:
             self.nombre = nombre
@@ -60,6 +73,12 @@ class Empresa:
         if telefono is not None:
             self.telefono = telefono
         
+        if clear_punto_reorden:
+            # Sin valor propio: vuelve a usar el valor por defecto
+            self.punto_reorden = None
+        elif punto_reorden is not None:
+            self.punto_reorden = punto_reorden
+        
         self.updated_at = datetime.now()
         self.validate()
     
@@ -79,7 +98,8 @@ class Empresa:
             'telefono': str(self.telefono),
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
-            'created_by_id': self.created_by_id
+            'created_by_id': self.created_by_id,
+            'punto_reorden': self.punto_reorden
         }
     
     def __str__(self) -> str:
@@ -8,7 +8,17 @@ from ..value_objects import NIT, ProductCode, Quantity
 from ..exceptions import ValidationError, InsufficientStockError
 
 
-@dataclass
+# Punto de reorden por defecto cuando ni el producto ni la empresa definen uno
+DEFAULT_PUNTO_REORDEN = 10
+
+# El estado MEDIO llega hasta este múltiplo del punto de reorden
+STOCK_MEDIO_FACTOR = 5
+
+# Clases del análisis ABC (Pareto) por valor de inventario
+CLASES_ABC = ('A', 'B', 'C')
+
+
+@dataclass(slots=True)
 class Inventario:
     """
     Entidad de negocio: Inventario
@@ -18,6 +28,8 @@ class Inventario:
     - Cantidad siempre >= 0
     - Movimientos de stock deben validarse
     - No se puede retirar más de lo disponible
+    - Stock bajo por debajo del punto de reorden (producto > empresa > defecto)
+    - Clase ABC (opcional) según su participación en el valor de la empresa
     """
     id: Optional[int]
     empresa_nit: NIT
@@ -25,6 +37,8 @@ class Inventario:
     cantidad: Quantity
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
+    punto_reorden: int = DEFAULT_PUNTO_REORDEN
+    clase_abc: Optional[str] = None
     
     def __post_init__(self):
         """Validar entidad al crear"""
@@ -33,7 +47,25 @@ class Inventario:
     def validate(self) -> None:
         """Validar reglas de negocio"""
         # La validación de cantidad >= 0 ya está en Quantity
-        pass
+        if self.punto_reorden < 0:
+            raise ValidationError("Punto de reorden no puede ser negativo")
+        
+        if self.clase_abc is not None and self.clase_abc not in CLASES_ABC:
+            raise ValidationError(f"Clase ABC inválida: {self.clase_abc}")
+    
+    @staticmethod
+    def resolve_punto_reorden(producto_punto_reorden: Optional[int] = None,
+                              empresa_punto_reorden: Optional[int] = None) -> int:
+        """
+        Regla de negocio: Punto de reorden efectivo
+        
+        Prioridad: producto, luego empresa, luego DEFAULT_PUNTO_REORDEN
+        """
+        if producto_punto_reorden is not None:
+            return producto_punto_reorden
+        if empresa_punto_reorden is not None:
+            return empresa_punto_reorden
+        return DEFAULT_PUNTO_REORDEN
     
     def add_stock(self, quantity: Quantity) -> None:
         """
@@ -64,10 +96,14 @@ class Inventario:
         self.cantidad = new_quantity
         self.updated_at = datetime.now()
     
-    def is_low_stock(self, threshold: int = 10) -> bool:
+    def is_low_stock(self, threshold: Optional[int] = None) -> bool:
         """
         Regla de negocio: Verificar si el stock está bajo
+        
+        Sin threshold se usa el punto de reorden del registro
         """
+        if threshold is None:
+            threshold = self.punto_reorden
         return int(self.cantidad) < threshold
     
     def is_out_of_stock(self) -> bool:
@@ -89,9 +125,9 @@ class Inventario:
         qty = int(self.cantidad)
         if qty == 0:
             return "AGOTADO"
-        elif qty < 10:
+        elif qty < self.punto_reorden:
             return "BAJO"
-        elif qty < 50:
+        elif qty < self.punto_reorden * STOCK_MEDIO_FACTOR:
             return "MEDIO"
         else:
             return "ALTO"
@@ -103,7 +139,9 @@ class Inventario:
             'empresa_nit': str(self.empresa_nit),
             'producto_codigo': str(self.producto_codigo),
             'cantidad': int(self.cantidad),
+            'punto_reorden': self.punto_reorden,
             'stock_status': self.get_stock_status(),
+            'clase_abc': self.clase_abc,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
         }
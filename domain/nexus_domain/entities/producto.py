@@ -3,12 +3,16 @@ Entidad Producto - Lógica de negocio pura sin dependencias de Django
 """
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
-from ..value_objects import ProductCode, NIT
+from typing import Any, Dict, Optional, Union
+from ..value_objects import ProductCode, NIT, RawJSON
 from ..exceptions import ValidationError
 
 
-@dataclass
+# Objeto con atributos, texto libre o el JSON tal como se almacenó
+Caracteristicas = Union[Dict[str, Any], str, RawJSON]
+
+
+@dataclass(slots=True)
 class Producto:
     """
     Entidad de negocio: Producto
@@ -17,15 +21,17 @@ class Producto:
     - Código único e inmutable
     - Nombre requerido (mínimo 2 caracteres)
     - Debe estar asociado a una empresa
-    - Características opcionales
+    - Características opcionales: objeto JSON (atributos) o texto libre
+    - Punto de reorden opcional (>= 0); tiene prioridad sobre el de la empresa
     """
     codigo: ProductCode
     nombre: str
     empresa_nit: NIT
-    caracteristicas: Optional[str] = None
+    caracteristicas: Optional[Caracteristicas] = None
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     created_by_id: Optional[str] = None
+    punto_reorden: Optional[int] = None
     
     def __post_init__(self):
         """Validar entidad al crear"""
@@ -36,19 +42,36 @@ class Producto:
         if not self.nombre or len(self.nombre.strip()) < 2:
             raise ValidationError("Nombre de producto debe tener al menos 2 caracteres")
         
+        # bool es subclase de int: True/False no son puntos de reorden
+        if self.punto_reorden is not None and (
+            isinstance(self.punto_reorden, bool) or not isinstance(self.punto_reorden, int)
+            or self.punto_reorden < 0
+        ):
+            raise ValidationError("Punto de reorden debe ser un entero no negativo")
+        
         # Normalizar nombre
         self.nombre = self.nombre.strip()
         
-        if self.caracteristicas:
+        if isinstance(self.caracteristicas, str):
             self.caracteristicas = self.caracteristicas.strip()
+        elif isinstance(self.caracteristicas, dict):
+            if not all(isinstance(key, str) for key in self.caracteristicas):
+                raise ValidationError("Las claves de características deben ser texto")
+        elif self.caracteristicas is not None and not isinstance(self.caracteristicas, RawJSON):
+            # RawJSON viene del almacenamiento y no se decodifica para validar
+            raise ValidationError("Características deben ser un objeto o texto")
     
     def update_info(self, nombre: Optional[str] = None,
-                    caracteristicas: Optional[str] = None,
-                    empresa_nit: Optional[NIT] = None) -> None:
+                    caracteristicas: Optional[Caracteristicas] = None,
+                    empresa_nit: Optional[NIT] = None,
+                    punto_reorden: Optional[int] = None,
+                    clear_punto_reorden: bool = False) -> None:
         """
         Actualizar información del producto
         
-        Regla de negocio: Al actualizar, validar y actualizar timestamp
+        Regla de negocio: Al actualizar, validar y actualizar timestamp.
+        Los argumentos en None no cambian; clear_punto_reorden quita el punto
+        de reorden propio.
         """
         if nombre is not None:
             self.nombre = nombre
@@ -59,6 +82,12 @@ class Producto:
         if empresa_nit is not None:
             self.empresa_nit = empresa_nit
         
+        if clear_punto_reorden:
+            # Sin valor propio: vuelve a heredar el de la empresa o el valor por defecto
+            self.punto_reorden = None
+        elif punto_reorden is not None:
+            self.punto_reorden = punto_reorden
+        
         self.updated_at = datetime.now()
         self.validate()
     
@@ -71,18 +100,33 @@ class Producto:
     
     def has_caracteristicas(self) -> bool:
         """Verificar si tiene características definidas"""
+        if isinstance(self.caracteristicas, RawJSON):
+            return not self.caracteristicas.is_empty()
         return self.caracteristicas is not None and len(self.caracteristicas) > 0
     
-    def to_dict(self) -> dict:
-        """Convertir a diccionario para serialización"""
+    def get_caracteristicas(self) -> Optional[Union[Dict[str, Any], str]]:
+        """Características decodificadas (decodifica RawJSON si es necesario)"""
+        if isinstance(self.caracteristicas, RawJSON):
+            decodificadas: Optional[Union[Dict[str, Any], str]] = self.caracteristicas.value
+            return decodificadas
+        return self.caracteristicas
+    
+    def to_dict(self, raw_json: bool = False) -> dict:
+        """
+        Convertir a diccionario para serialización
+        
+        Con raw_json=True las características almacenadas se entregan como
+        RawJSON, para que el renderer las copie sin decodificarlas.
+        """
         return {
             'codigo': str(self.codigo),
             'nombre': self.nombre,
             'empresa_nit': str(self.empresa_nit),
-            'caracteristicas': self.caracteristicas,
+            'caracteristicas': self.caracteristicas if raw_json else self.get_caracteristicas(),
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
-            'created_by_id': self.created_by_id
+            'created_by_id': self.created_by_id,
+            'punto_reorden': self.punto_reorden
         }
     
     def __str__(self) -> str:
@@ -2,9 +2,16 @@
 Interfaces (contratos) para repositorios - Sin implementación
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import date
+from decimal import Decimal
+from types import TracebackType
+from typing import TYPE_CHECKING, List, Mapping, Optional, Sequence, Set, Tuple, Type
 from ..entities import Empresa, Producto, Inventario
 
+if TYPE_CHECKING:
+    from ..analytics import ABCClassifier, InventorySnapshot
+    from ..use_cases.catalogo_use_cases import ImportProgress
+
 
 class IEmpresaRepository(ABC):
     """
@@ -28,8 +35,8 @@ class IEmpresaRepository(ABC):
         pass
     
     @abstractmethod
-    def search_by_nombre(self, nombre: str) -> List[Empresa]:
-        """Buscar empresas por nombre (parcial)"""
+    def search_by_nombre(self, nombre: str, limit: int = 100, offset: int = 0) -> List[Empresa]:
+        """Buscar empresas por nombre, ordenadas por relevancia (tolera errores de escritura)"""
         pass
     
     @abstractmethod
@@ -70,8 +77,8 @@ class IProductoRepository(ABC):
         pass
     
     @abstractmethod
-    def search_by_nombre(self, nombre: str) -> List[Producto]:
-        """Buscar productos por nombre (parcial)"""
+    def search_by_nombre(self, nombre: str, limit: int = 100, offset: int = 0) -> List[Producto]:
+        """Buscar productos por nombre, ordenados por relevancia (tolera errores de escritura)"""
         pass
     
     @abstractmethod
@@ -118,8 +125,8 @@ class IInventarioRepository(ABC):
         pass
     
     @abstractmethod
-    def find_low_stock(self, threshold: int = 10) -> List[Inventario]:
-        """Buscar items con stock bajo"""
+    def find_low_stock(self, threshold: Optional[int] = None) -> List[Inventario]:
+        """Buscar items con stock bajo (sin threshold: punto de reorden de cada item)"""
         pass
     
     @abstractmethod
@@ -131,3 +138,146 @@ class IInventarioRepository(ABC):
     def exists(self, empresa_nit: str, producto_codigo: str) -> bool:
         """Verificar si existe un registro de inventario"""
         pass
+    
+    @abstractmethod
+    def load_snapshot(self, empresa_nit: Optional[str] = None) -> 'InventorySnapshot':
+        """Cargar el inventario (con precios) como snapshot columnar"""
+        pass
+    
+    @abstractmethod
+    def find_by_clase_abc(self, clase_abc: str, empresa_nit: Optional[str] = None) -> List[Inventario]:
+        """Buscar inventario por clase ABC (opcionalmente de una empresa)"""
+        pass
+    
+    @abstractmethod
+    def find_stale_abc_empresas(self, empresa_nit: Optional[str] = None) -> List[str]:
+        """NITs de empresas cuya clasificación ABC quedó desactualizada"""
+        pass
+    
+    @abstractmethod
+    def find_abc_classifier(self, empresa_nit: str) -> Optional['ABCClassifier']:
+        """Clasificador ABC guardado para la empresa (None: usar el de defecto)"""
+        pass
+    
+    @abstractmethod
+    def save_abc_classifier(self, empresa_nit: str, classifier: 'ABCClassifier') -> None:
+        """Guardar umbrales y moneda ABC de la empresa para las reclasificaciones"""
+        pass
+    
+    @abstractmethod
+    def mark_abc_current(self, empresa_nit: str) -> None:
+        """
+        Marcar la clasificación ABC de la empresa como vigente
+        
+        Se llama antes de leer el snapshot: un cambio posterior a la lectura
+        vuelve a dejar la empresa pendiente en lugar de perderse
+        """
+        pass
+    
+    @abstractmethod
+    def mark_abc_stale(self, empresa_nit: str) -> None:
+        """Marcar la clasificación ABC de la empresa como pendiente"""
+        pass
+    
+    @abstractmethod
+    def update_abc_classes(self, empresa_nit: str, clases: Mapping[str, Sequence[int]]) -> int:
+        """
+        Persistir clases ABC ({clase: [ids]})
+        
+        Retorna el número de registros cuya clase cambió
+        """
+        pass
+    
+    @abstractmethod
+    def load_consumo(self, empresa_nit: str, desde: date) -> List[Tuple[str, date, float]]:
+        """Consumo diario por producto desde una fecha: (producto_codigo, fecha, unidades)"""
+        pass
+
+
+class ICatalogoImportRepository(ABC):
+    """
+    Contrato para la importación masiva del catálogo
+    La implementación será en la capa de infraestructura
+    """
+    
+    @abstractmethod
+    def existing_codigos(self, codigos: Sequence[str]) -> Set[str]:
+        """Códigos de producto que ya existen (entre los indicados)"""
+        pass
+    
+    @abstractmethod
+    def existing_empresas(self, nits: Sequence[str]) -> Set[str]:
+        """NITs de empresa que existen (entre los indicados)"""
+        pass
+    
+    @abstractmethod
+    def save_chunk(self, productos: List[Producto], precios: List[Tuple[str, str, Decimal]],
+                   progress: 'ImportProgress') -> None:
+        """
+        Guardar un lote de productos y precios (producto_codigo, moneda, precio)
+        junto con el avance, en una sola transacción
+        """
+        pass
+    
+    @abstractmethod
+    def save_progress(self, progress: 'ImportProgress') -> None:
+        """Guardar el avance de la importación"""
+        pass
+
+
+class IUnitOfWork(ABC):
+    """
+    Contrato de unidad de trabajo para casos de uso de varios repositorios
+    
+    - Mapa de identidad: cada empresa, producto o registro de inventario se
+      lee una sola vez; las lecturas repetidas retornan la misma entidad
+    - Los registros de inventario modificados se registran con add y se
+      escriben juntos en commit, que les asigna id y fechas
+    
+    Como contexto confirma al salir sin error y descarta si hay excepción.
+    """
+    
+    @abstractmethod
+    def get_empresa(self, nit: str) -> Optional[Empresa]:
+        """Empresa por NIT (None si no existe)"""
+        pass
+    
+    @abstractmethod
+    def get_producto(self, codigo: str) -> Optional[Producto]:
+        """Producto por código (None si no existe)"""
+        pass
+    
+    @abstractmethod
+    def get_inventario(self, empresa_nit: str, producto_codigo: str) -> Optional[Inventario]:
+        """Registro de inventario por empresa y producto (None si no existe)"""
+        pass
+    
+    @abstractmethod
+    def add(self, inventario: Inventario) -> None:
+        """Registrar un inventario nuevo o modificado para escribirlo en commit"""
+        pass
+    
+    @abstractmethod
+    def commit(self) -> None:
+        """Escribir los registros pendientes y cerrar la unidad"""
+        pass
+    
+    @abstractmethod
+    def was_created(self, inventario: Inventario) -> bool:
+        """Verificar si el último commit creó el registro (False si ya existía al escribirlo)"""
+        pass
+    
+    @abstractmethod
+    def rollback(self) -> None:
+        """Descartar los registros pendientes y lo leído"""
+        pass
+    
+    def __enter__(self) -> 'IUnitOfWork':
+        return self
+    
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
@@ -0,0 +1,17 @@
+"""
+Implementaciones en memoria de los repositorios (sin base de datos) y
+unidad de trabajo genérica
+"""
+from .memory import (
+    InMemoryEmpresaRepository,
+    InMemoryInventarioRepository,
+    InMemoryProductoRepository
+)
+from .unit_of_work import UnitOfWork
+
+__all__ = [
+    'InMemoryEmpresaRepository',
+    'InMemoryInventarioRepository',
+    'InMemoryProductoRepository',
+    'UnitOfWork',
+]
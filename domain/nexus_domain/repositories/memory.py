@@ -0,0 +1,421 @@
+"""
+Repositorios en memoria indexados
+
+Implementan los contratos de nexus_domain.interfaces sin base de datos:
+sirven para correr los casos de uso en tests y benchmarks y como
+almacenamiento de respaldo de una caché.
+
+Como en los repositorios Django, se guardan y retornan copias de las
+entidades: modificar una entidad retornada no cambia el repositorio hasta
+llamar a save. Los listados salen del más reciente al más antiguo (el orden
+por -created_at de los modelos). A diferencia de la base de datos, eliminar
+una empresa o un producto no elimina en cascada sus registros de otros
+repositorios. Sí se propaga, como en los repositorios Django, el cambio del
+punto de reorden de una empresa o un producto al inventario que lo hereda
+(si el inventario se creó con esos repositorios).
+"""
+import copy
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime
+from itertools import islice
+from typing import Dict, Hashable, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, TypeVar, Union
+
+from ..analytics import ABCClassifier, InventorySnapshot
+from ..entities import Empresa, Inventario, Producto
+from ..exceptions import DuplicateEntityError
+from ..interfaces import IEmpresaRepository, IInventarioRepository, IProductoRepository
+from ..search import TrigramIndex
+
+K = TypeVar('K', bound=Hashable)
+T = TypeVar('T')
+
+
+def _pagina(valores: Iterable[T], limit: int, offset: int) -> List[T]:
+    """Copias de los valores en [offset, offset + limit)"""
+    return [copy.copy(valor) for valor in islice(valores, offset, offset + limit)]
+
+
+def _recientes(claves: Dict[K, None], entidades: Mapping[K, T]) -> Iterator[T]:
+    """Entidades de las claves, de la última insertada a la primera"""
+    return (entidades[clave] for clave in reversed(claves))
+
+
+class InMemoryEmpresaRepository(IEmpresaRepository):
+    """Empresas en un dict por NIT, con índice de texto para la búsqueda"""
+
+    def __init__(self) -> None:
+        self._por_nit: Dict[str, Empresa] = {}
+        self._texto = TrigramIndex()
+        # Inventarios que heredan el punto de reorden de estas empresas
+        self._inventarios: List['InMemoryInventarioRepository'] = []
+
+    def __len__(self) -> int:
+        return len(self._por_nit)
+
+    def save(self, empresa: Empresa) -> Empresa:
+        """Guardar o actualizar empresa (conserva created_at y la posición)"""
+        nit = str(empresa.nit)
+        guardada = copy.copy(empresa)
+        anterior = self._por_nit.get(nit)
+        if anterior is not None:
+            guardada.created_at = anterior.created_at
+        guardada.updated_at = datetime.now()
+        self._por_nit[nit] = guardada
+        self._texto.add(nit, guardada.nombre, nit)
+        if anterior is not None and anterior.punto_reorden != guardada.punto_reorden:
+            for inventarios in self._inventarios:
+                inventarios._sync_punto_reorden(empresa_nit=nit)
+        return copy.copy(guardada)
+
+    def find_by_nit(self, nit: str) -> Optional[Empresa]:
+        empresa = self._por_nit.get(str(nit))
+        return copy.copy(empresa) if empresa is not None else None
+
+    def find_all(self, limit: int = 100, offset: int = 0) -> List[Empresa]:
+        return _pagina(reversed(self._por_nit.values()), limit, offset)
+
+    def search_by_nombre(self, nombre: str, limit: int = 100, offset: int = 0) -> List[Empresa]:
+        """Buscar por nombre o NIT con el índice de trigramas, por relevancia"""
+        resultados = self._texto.search(nombre, limit=offset + limit)
+        return _pagina((self._por_nit[str(nit)] for nit, _ in resultados), limit, offset)
+
+    def delete(self, nit: str) -> bool:
+        if self._por_nit.pop(str(nit), None) is None:
+            return False
+        self._texto.remove(str(nit))
+        return True
+
+    def exists(self, nit: str) -> bool:
+        return str(nit) in self._por_nit
+
+
+class InMemoryProductoRepository(IProductoRepository):
+    """Productos en un dict por código, con índice secundario por empresa"""
+
+    def __init__(self) -> None:
+        self._por_codigo: Dict[str, Producto] = {}
+        # NIT -> códigos en orden de creación (dict como conjunto ordenado)
+        self._por_empresa: Dict[str, Dict[str, None]] = {}
+        self._texto = TrigramIndex()
+        # Inventarios que heredan el punto de reorden de estos productos
+        self._inventarios: List['InMemoryInventarioRepository'] = []
+
+    def __len__(self) -> int:
+        return len(self._por_codigo)
+
+    def save(self, producto: Producto) -> Producto:
+        """Guardar o actualizar producto (reindexa si cambió de empresa)"""
+        codigo = str(producto.codigo)
+        guardado = copy.copy(producto)
+        anterior = self._por_codigo.get(codigo)
+        if anterior is not None:
+            guardado.created_at = anterior.created_at
+            if anterior.empresa_nit != guardado.empresa_nit:
+                self._quitar_de_empresa(str(anterior.empresa_nit), codigo)
+        guardado.updated_at = datetime.now()
+        self._por_codigo[codigo] = guardado
+        self._por_empresa.setdefault(str(guardado.empresa_nit), {})[codigo] = None
+        self._texto.add(codigo, guardado.nombre, codigo)
+        if anterior is not None and anterior.punto_reorden != guardado.punto_reorden:
+            for inventarios in self._inventarios:
+                inventarios._sync_punto_reorden(producto_codigo=codigo)
+        return copy.copy(guardado)
+
+    def _quitar_de_empresa(self, nit: str, codigo: str) -> None:
+        codigos = self._por_empresa[nit]
+        del codigos[codigo]
+        if not codigos:
+            del self._por_empresa[nit]
+
+    def find_by_codigo(self, codigo: str) -> Optional[Producto]:
+        producto = self._por_codigo.get(str(codigo))
+        return copy.copy(producto) if producto is not None else None
+
+    def find_all(self, limit: int = 100, offset: int = 0) -> List[Producto]:
+        return _pagina(reversed(self._por_codigo.values()), limit, offset)
+
+    def find_by_empresa(self, empresa_nit: str) -> List[Producto]:
+        codigos = self._por_empresa.get(str(empresa_nit), {})
+        return [copy.copy(producto) for producto in _recientes(codigos, self._por_codigo)]
+
+    def search_by_nombre(self, nombre: str, limit: int = 100, offset: int = 0) -> List[Producto]:
+        """Buscar por nombre o código con el índice de trigramas, por relevancia"""
+        resultados = self._texto.search(nombre, limit=offset + limit)
+        return _pagina((self._por_codigo[str(codigo)] for codigo, _ in resultados), limit, offset)
+
+    def delete(self, codigo: str) -> bool:
+        producto = self._por_codigo.pop(str(codigo), None)
+        if producto is None:
+            return False
+        self._quitar_de_empresa(str(producto.empresa_nit), str(codigo))
+        self._texto.remove(str(codigo))
+        return True
+
+    def exists(self, codigo: str) -> bool:
+        return str(codigo) in self._por_codigo
+
+
+class InMemoryInventarioRepository(IInventarioRepository):
+    """
+    Inventario en un dict por ID con índices en memoria
+
+    - (empresa, producto) -> ID, para la restricción de unicidad
+    - empresa -> IDs, para los listados y el snapshot de una empresa
+    - listas ordenadas por cantidad y por cantidad - punto de reorden,
+      para find_low_stock con y sin threshold (búsqueda binaria)
+
+    Reproduce las reglas de persistencia de la base de datos: al crear un
+    registro se resuelve el punto de reorden con la empresa y el producto
+    (si se pasan sus repositorios); cada cambio de cantidad queda como
+    movimiento (las salidas alimentan load_consumo) y deja pendiente la
+    clasificación ABC de la empresa. Un cambio del punto de reorden en esos
+    repositorios se propaga a los registros que lo heredan. Los precios del snapshot se cargan con
+    set_precios, sin conversión entre monedas.
+    """
+
+    def __init__(self, empresa_repository: Optional[IEmpresaRepository] = None,
+                 producto_repository: Optional[IProductoRepository] = None) -> None:
+        self.empresa_repository = empresa_repository
+        self.producto_repository = producto_repository
+        for repositorio in (empresa_repository, producto_repository):
+            if isinstance(repositorio, (InMemoryEmpresaRepository, InMemoryProductoRepository)):
+                repositorio._inventarios.append(self)
+        self._por_id: Dict[int, Inventario] = {}
+        self._por_clave: Dict[Tuple[str, str], int] = {}
+        self._por_empresa: Dict[str, Dict[int, None]] = {}
+        self._por_cantidad: List[Tuple[int, int]] = []
+        self._por_margen: List[Tuple[int, int]] = []
+        self._siguiente_id = 1
+        self._precios: Dict[str, Dict[str, float]] = {}
+        # NIT -> {(producto_codigo, día): unidades que salieron}
+        self._consumo: Dict[str, Dict[Tuple[str, date], float]] = {}
+        self._abc_pendiente: Dict[str, None] = {}
+        self._abc_clasificadores: Dict[str, ABCClassifier] = {}
+
+    def __len__(self) -> int:
+        return len(self._por_id)
+
+    @staticmethod
+    def _clave(inventario: Inventario) -> Tuple[str, str]:
+        return str(inventario.empresa_nit), str(inventario.producto_codigo)
+
+    @staticmethod
+    def _id(inventario_id: Union[int, str, None]) -> Optional[int]:
+        """ID entero (los repositorios Django reciben el ID como texto)"""
+        if inventario_id is None:
+            return None
+        try:
+            return int(inventario_id)
+        except (TypeError, ValueError):
+            return None
+
+    def _buscar(self, inventario_id: Union[int, str, None]) -> Optional[Inventario]:
+        """Registro guardado del ID (sin copiar)"""
+        clave = self._id(inventario_id)
+        return self._por_id.get(clave) if clave is not None else None
+
+    def _indexar(self, inventario: Inventario, inventario_id: int) -> None:
+        nit, codigo = self._clave(inventario)
+        self._por_id[inventario_id] = inventario
+        self._por_clave[nit, codigo] = inventario_id
+        self._por_empresa.setdefault(nit, {})[inventario_id] = None
+        cantidad = int(inventario.cantidad)
+        insort(self._por_cantidad, (cantidad, inventario_id))
+        insort(self._por_margen, (cantidad - inventario.punto_reorden, inventario_id))
+
+    def _desindexar(self, inventario: Inventario, inventario_id: int) -> None:
+        nit, codigo = self._clave(inventario)
+        del self._por_id[inventario_id]
+        del self._por_clave[nit, codigo]
+        ids = self._por_empresa[nit]
+        del ids[inventario_id]
+        if not ids:
+            del self._por_empresa[nit]
+        cantidad = int(inventario.cantidad)
+        for ordenada, valor in ((self._por_cantidad, cantidad),
+                                (self._por_margen, cantidad - inventario.punto_reorden)):
+            del ordenada[bisect_left(ordenada, (valor, inventario_id))]
+
+    def _punto_reorden(self, nit: str, codigo: str, por_defecto: int) -> int:
+        """Punto de reorden efectivo de un registro nuevo"""
+        if self.empresa_repository is None or self.producto_repository is None:
+            return por_defecto
+        empresa = self.empresa_repository.find_by_nit(nit)
+        producto = self.producto_repository.find_by_codigo(codigo)
+        if empresa is None or producto is None:
+            raise ValueError(f"Empresa o producto no encontrado: {nit} / {codigo}")
+        return Inventario.resolve_punto_reorden(producto.punto_reorden, empresa.punto_reorden)
+
+    def _sync_punto_reorden(self, empresa_nit: Optional[str] = None,
+                            producto_codigo: Optional[str] = None) -> None:
+        """
+        Recalcular el punto de reorden de los registros de una empresa o un
+        producto (lo que hacen los repositorios Django con un UPDATE)
+        """
+        if empresa_nit is not None:
+            ids = list(self._por_empresa.get(str(empresa_nit), {}))
+        else:
+            ids = [inventario_id for (_, codigo), inventario_id in self._por_clave.items()
+                   if codigo == str(producto_codigo)]
+        for inventario_id in ids:
+            anterior = self._por_id[inventario_id]
+            try:
+                punto_reorden = self._punto_reorden(*self._clave(anterior), anterior.punto_reorden)
+            except ValueError:
+                # La empresa o el producto se eliminó (sin cascada): se conserva
+                continue
+            if punto_reorden != anterior.punto_reorden:
+                actualizado = copy.copy(anterior)
+                actualizado.punto_reorden = punto_reorden
+                self._desindexar(anterior, inventario_id)
+                self._indexar(actualizado, inventario_id)
+
+    def save(self, inventario: Inventario) -> Inventario:
+        """
+        Guardar o actualizar inventario
+
+        Actualiza el registro del ID o, si no existe, el de la misma empresa y
+        producto; en un registro existente solo cambian la cantidad y las
+        referencias (punto de reorden y clase ABC se conservan).
+        """
+        nit, codigo = self._clave(inventario)
+        punto_reorden = self._punto_reorden(nit, codigo, inventario.punto_reorden)
+
+        anterior = self._buscar(inventario.id)
+        if anterior is None:
+            anterior = self._buscar(self._por_clave.get((nit, codigo)))
+
+        guardado = copy.copy(inventario)
+        guardado.updated_at = datetime.now()
+        if anterior is None:
+            inventario_id = self._siguiente_id
+            self._siguiente_id += 1
+            guardado.punto_reorden = punto_reorden
+            guardado.clase_abc = None
+            cantidad_anterior = 0
+        else:
+            inventario_id = self._por_clave[self._clave(anterior)]
+            otro = self._por_clave.get((nit, codigo))
+            if otro is not None and otro != inventario_id:
+                raise DuplicateEntityError(f"Ya existe inventario para {nit} / {codigo}")
+            guardado.created_at = anterior.created_at
+            guardado.punto_reorden = anterior.punto_reorden
+            guardado.clase_abc = anterior.clase_abc
+            cantidad_anterior = int(anterior.cantidad)
+            self._desindexar(anterior, inventario_id)
+        guardado.id = inventario_id
+        self._indexar(guardado, inventario_id)
+
+        delta = int(guardado.cantidad) - cantidad_anterior
+        if delta:
+            if delta < 0:
+                self.add_consumo(nit, codigo, guardado.updated_at.date(), -delta)
+            self._abc_pendiente[nit] = None
+        return copy.copy(guardado)
+
+    def find_by_id(self, inventario_id: int) -> Optional[Inventario]:
+        inventario = self._buscar(inventario_id)
+        return copy.copy(inventario) if inventario is not None else None
+
+    def find_by_empresa_and_producto(self, empresa_nit: str,
+                                     producto_codigo: str) -> Optional[Inventario]:
+        inventario_id = self._por_clave.get((str(empresa_nit), str(producto_codigo)))
+        return self.find_by_id(inventario_id) if inventario_id is not None else None
+
+    def find_all(self, limit: int = 100, offset: int = 0) -> List[Inventario]:
+        return _pagina(reversed(self._por_id.values()), limit, offset)
+
+    def find_by_empresa(self, empresa_nit: str) -> List[Inventario]:
+        ids = self._por_empresa.get(str(empresa_nit), {})
+        return [copy.copy(inventario) for inventario in _recientes(ids, self._por_id)]
+
+    def find_low_stock(self, threshold: Optional[int] = None) -> List[Inventario]:
+        """
+        Registros con stock bajo, de menor a mayor cantidad (o margen)
+
+        Con threshold: cantidad <= threshold; sin él: cantidad < punto de reorden
+        """
+        if threshold is None:
+            fin = bisect_left(self._por_margen, (0, 0))
+            ordenada = self._por_margen
+        else:
+            fin = bisect_right(self._por_cantidad, (threshold, float('inf')))
+            ordenada = self._por_cantidad
+        return [copy.copy(self._por_id[inventario_id]) for _, inventario_id in ordenada[:fin]]
+
+    def delete(self, inventario_id: int) -> bool:
+        inventario = self._buscar(inventario_id)
+        if inventario is None:
+            return False
+        self._desindexar(inventario, int(inventario_id))
+        self._abc_pendiente[str(inventario.empresa_nit)] = None
+        return True
+
+    def exists(self, empresa_nit: str, producto_codigo: str) -> bool:
+        return (str(empresa_nit), str(producto_codigo)) in self._por_clave
+
+    def set_precios(self, producto_codigo: str, precios: Mapping[str, float]) -> None:
+        """Precios por moneda de un producto ({moneda: precio}) para load_snapshot"""
+        self._precios[str(producto_codigo)] = dict(precios)
+
+    def add_consumo(self, empresa_nit: str, producto_codigo: str, dia: date,
+                    unidades: float) -> None:
+        """Registrar salidas de stock de un día (se suman a las existentes)"""
+        consumo = self._consumo.setdefault(str(empresa_nit), {})
+        clave = (str(producto_codigo), dia)
+        consumo[clave] = consumo.get(clave, 0) + unidades
+
+    def load_snapshot(self, empresa_nit: Optional[str] = None) -> InventorySnapshot:
+        registros: Iterable[Inventario]
+        if empresa_nit:
+            ids = self._por_empresa.get(str(empresa_nit), {})
+            registros = (self._por_id[inventario_id] for inventario_id in ids)
+        else:
+            registros = self._por_id.values()
+        return InventorySnapshot.from_entities(registros, self._precios)
+
+    def find_by_clase_abc(self, clase_abc: str, empresa_nit: Optional[str] = None) -> List[Inventario]:
+        registros: Iterable[Inventario]
+        if empresa_nit:
+            registros = _recientes(self._por_empresa.get(str(empresa_nit), {}), self._por_id)
+        else:
+            registros = reversed(self._por_id.values())
+        return [copy.copy(inventario) for inventario in registros if inventario.clase_abc == clase_abc]
+
+    def find_stale_abc_empresas(self, empresa_nit: Optional[str] = None) -> List[str]:
+        if empresa_nit:
+            return [str(empresa_nit)] if str(empresa_nit) in self._abc_pendiente else []
+        return list(self._abc_pendiente)
+
+    def find_abc_classifier(self, empresa_nit: str) -> Optional[ABCClassifier]:
+        return self._abc_clasificadores.get(str(empresa_nit))
+
+    def save_abc_classifier(self, empresa_nit: str, classifier: ABCClassifier) -> None:
+        self._abc_clasificadores[str(empresa_nit)] = classifier
+
+    def mark_abc_current(self, empresa_nit: str) -> None:
+        self._abc_pendiente.pop(str(empresa_nit), None)
+
+    def mark_abc_stale(self, empresa_nit: str) -> None:
+        self._abc_pendiente[str(empresa_nit)] = None
+
+    def update_abc_classes(self, empresa_nit: str, clases: Mapping[str, Sequence[int]]) -> int:
+        """Cambiar la clase solo donde difiere"""
+        nit = str(empresa_nit)
+        ids_empresa = self._por_empresa.get(nit, {})
+        actualizados = 0
+        for clase, ids in clases.items():
+            for id_clasificado in ids:
+                inventario_id = self._id(id_clasificado)
+                if inventario_id in ids_empresa and self._por_id[inventario_id].clase_abc != clase:
+                    self._por_id[inventario_id].clase_abc = clase
+                    actualizados += 1
+        return actualizados
+
+    def load_consumo(self, empresa_nit: str, desde: date) -> List[Tuple[str, date, float]]:
+        """Consumo diario por producto (suma de salidas) desde una fecha"""
+        return [
+            (codigo, dia, unidades)
+            for (codigo, dia), unidades in self._consumo.get(str(empresa_nit), {}).items()
+            if dia >= desde
+        ]
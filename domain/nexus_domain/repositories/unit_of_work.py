@@ -0,0 +1,96 @@
+"""
+Unidad de trabajo sobre los repositorios de nexus_domain.interfaces
+
+Implementación genérica de IUnitOfWork: el mapa de identidad evita leer dos
+veces la misma entidad durante un caso de uso y commit guarda los registros
+pendientes con el repositorio de inventario, uno a uno. La infraestructura
+puede sobrescribir _flush para escribirlos por lotes en una transacción
+(DjangoUnitOfWork en el backend).
+"""
+import dataclasses
+from typing import Dict, List, Optional, Tuple
+
+from ..entities import Empresa, Inventario, Producto
+from ..interfaces import IEmpresaRepository, IInventarioRepository, IProductoRepository, IUnitOfWork
+
+
+class UnitOfWork(IUnitOfWork):
+    """Mapa de identidad por llave y registros de inventario pendientes"""
+
+    def __init__(self, inventario_repository: IInventarioRepository,
+                 empresa_repository: IEmpresaRepository,
+                 producto_repository: IProductoRepository):
+        self.inventario_repository = inventario_repository
+        self.empresa_repository = empresa_repository
+        self.producto_repository = producto_repository
+        # Registros creados por el último commit
+        self._creados: List[Inventario] = []
+        self._limpiar()
+
+    def _limpiar(self) -> None:
+        self._empresas: Dict[str, Optional[Empresa]] = {}
+        self._productos: Dict[str, Optional[Producto]] = {}
+        self._inventario: Dict[Tuple[str, str], Optional[Inventario]] = {}
+        # Cantidad de cada registro leído con get_inventario (None: no existía)
+        self._cantidades: Dict[Tuple[str, str], Optional[int]] = {}
+        self._pendientes: List[Inventario] = []
+
+    def get_empresa(self, nit: str) -> Optional[Empresa]:
+        nit = str(nit)
+        if nit not in self._empresas:
+            self._empresas[nit] = self.empresa_repository.find_by_nit(nit)
+        return self._empresas[nit]
+
+    def get_producto(self, codigo: str) -> Optional[Producto]:
+        codigo = str(codigo)
+        if codigo not in self._productos:
+            self._productos[codigo] = self.producto_repository.find_by_codigo(codigo)
+        return self._productos[codigo]
+
+    def get_inventario(self, empresa_nit: str, producto_codigo: str) -> Optional[Inventario]:
+        clave = (str(empresa_nit), str(producto_codigo))
+        if clave not in self._inventario:
+            inventario = self.inventario_repository.find_by_empresa_and_producto(*clave)
+            self._inventario[clave] = inventario
+            self._cantidades[clave] = int(inventario.cantidad) if inventario is not None else None
+        return self._inventario[clave]
+
+    def add(self, inventario: Inventario) -> None:
+        clave = (str(inventario.empresa_nit), str(inventario.producto_codigo))
+        self._inventario[clave] = inventario
+        if not any(pendiente is inventario for pendiente in self._pendientes):
+            self._pendientes.append(inventario)
+
+    def commit(self) -> None:
+        self._creados = []
+        try:
+            if self._pendientes:
+                self._flush(self._pendientes)
+        finally:
+            self._limpiar()
+
+    def rollback(self) -> None:
+        self._creados = []
+        self._limpiar()
+    
+    def was_created(self, inventario: Inventario) -> bool:
+        return any(creado is inventario for creado in self._creados)
+
+    def cantidad_leida(self, inventario: Inventario) -> Optional[int]:
+        """Cantidad del registro al leerlo en esta unidad (None si era nuevo o no se leyó aquí)"""
+        return self._cantidades.get((str(inventario.empresa_nit), str(inventario.producto_codigo)))
+
+    def _flush(self, pendientes: List[Inventario]) -> None:
+        """Escribir los registros pendientes"""
+        for inventario in pendientes:
+            self._save(inventario)
+
+    def _save(self, inventario: Inventario) -> None:
+        """Guardar con el repositorio y copiar lo asignado al guardar (id, fechas...)"""
+        nuevo = inventario.id is None
+        guardado = self.inventario_repository.save(inventario)
+        if guardado is not inventario:
+            for campo in dataclasses.fields(inventario):
+                setattr(inventario, campo.name, getattr(guardado, campo.name))
+        if nuevo:
+            self._creados.append(inventario)
@@ -0,0 +1,22 @@
+"""
+Búsqueda de texto en memoria (sin base de datos)
+"""
+from .prefix import PrefixIndex
+from .trigram import (
+    TrigramIndex,
+    UMBRAL_SIMILITUD,
+    normalize,
+    similarity,
+    trigrams,
+    words
+)
+
+__all__ = [
+    'PrefixIndex',
+    'TrigramIndex',
+    'UMBRAL_SIMILITUD',
+    'normalize',
+    'similarity',
+    'trigrams',
+    'words',
+]
@@ -0,0 +1,197 @@
+"""
+PrefixIndex - Índice compacto de prefijos para autocompletado
+"""
+import heapq
+import sys
+from array import array
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .trigram import words
+
+
+# Mayor carácter posible: cota superior del rango de un prefijo
+_FIN = '\U0010ffff'
+
+
+def _posiciones(arrays: List['array[int]'], total: int) -> np.ndarray:
+    """Unión ordenada de arrays de posiciones menores que total"""
+    if len(arrays) == 1:
+        # Sin copia: el array ya está ordenado y sin repetidos
+        return np.frombuffer(arrays[0], dtype=np.uint32)
+    # Marcar en una máscara evita ordenar la concatenación
+    mascara = np.zeros(total, dtype=bool)
+    for posiciones in arrays:
+        mascara[np.frombuffer(posiciones, dtype=np.uint32)] = True
+    return np.flatnonzero(mascara).astype(np.uint32)
+
+
+class PrefixIndex:
+    """
+    Índice de autocompletado por código y por prefijo de palabra del nombre
+
+    En lugar de un trie con un nodo por carácter se guardan listas ordenadas
+    con búsqueda binaria del rango de un prefijo:
+    - claves (códigos) ordenadas, con su posición en un array de 4 bytes
+    - vocabulario de palabras del nombre y, por palabra, un array con las
+      posiciones de los nombres que la contienen
+    La memoria es la de los textos más unos pocos bytes por clave y palabra.
+
+    Las posiciones siguen el orden alfabético del nombre al construir el
+    índice, así que recorrerlas en orden entrega los resultados ordenados;
+    las claves agregadas después quedan al final hasta reconstruirlo.
+    """
+
+    def __init__(self) -> None:
+        self._claves: List[Optional[str]] = []
+        self._nombres: List[str] = []
+        self._claves_ordenadas: List[str] = []
+        self._posicion_clave = array('I')
+        self._vocabulario: List[str] = []
+        self._postings: Dict[str, 'array[int]'] = {}
+
+    @classmethod
+    def build(cls, entradas: Iterable[Tuple[str, Optional[str]]]) -> 'PrefixIndex':
+        """Construir desde (clave, nombre), con las posiciones en orden de nombre"""
+        index = cls()
+        for clave, nombre in sorted(entradas, key=lambda e: (words(e[1] or ''), e[0])):
+            index._append(clave, nombre)
+
+        # Ordenar claves y vocabulario una sola vez (aún no hay eliminadas)
+        claves = [str(clave) for clave in index._claves]
+        orden = sorted(range(len(claves)), key=claves.__getitem__)
+        index._claves_ordenadas = [claves[posicion] for posicion in orden]
+        index._posicion_clave = array('I', orden)
+        index._vocabulario = sorted(index._postings)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._claves_ordenadas)
+
+    def __contains__(self, clave: str) -> bool:
+        return self._buscar_clave(clave) is not None
+
+    def _buscar_clave(self, clave: str) -> Optional[int]:
+        """Índice de la clave en claves_ordenadas (None si no está)"""
+        i = bisect_left(self._claves_ordenadas, clave)
+        if i < len(self._claves_ordenadas) and self._claves_ordenadas[i] == clave:
+            return i
+        return None
+
+    def _append(self, clave: str, nombre: Optional[str]) -> List[str]:
+        """Agregar la clave al final; retorna las palabras nuevas del vocabulario"""
+        posicion = len(self._claves)
+        self._claves.append(clave)
+        self._nombres.append(nombre or '')
+
+        nuevas = []
+        for palabra in dict.fromkeys(words(nombre or '')):
+            postings = self._postings.get(palabra)
+            if postings is None:
+                # Una sola copia de cada palabra
+                palabra = sys.intern(palabra)
+                postings = self._postings[palabra] = array('I')
+                nuevas.append(palabra)
+            postings.append(posicion)
+        return nuevas
+
+    def add(self, clave: str, nombre: Optional[str]) -> None:
+        """Indexar (o reindexar) una clave con su nombre"""
+        self.remove(clave)
+        posicion = len(self._claves)
+        for palabra in self._append(clave, nombre):
+            insort(self._vocabulario, palabra)
+
+        i = bisect_left(self._claves_ordenadas, clave)
+        self._claves_ordenadas.insert(i, clave)
+        self._posicion_clave.insert(i, posicion)
+
+    def remove(self, clave: str) -> None:
+        """Quitar una clave (su posición queda libre hasta reconstruir)"""
+        i = self._buscar_clave(clave)
+        if i is not None:
+            self._claves[self._posicion_clave[i]] = None
+            del self._claves_ordenadas[i]
+            del self._posicion_clave[i]
+
+    @staticmethod
+    def _rango(ordenada: List[str], prefijo: str) -> Tuple[int, int]:
+        """Rango [inicio, fin) de los elementos que empiezan con el prefijo"""
+        inicio = bisect_left(ordenada, prefijo)
+        return inicio, bisect_left(ordenada, prefijo + _FIN, inicio)
+
+    def _postings_de(self, prefijo: str) -> List['array[int]']:
+        """Arrays de posiciones de las palabras que empiezan con el prefijo"""
+        inicio, fin = self._rango(self._vocabulario, prefijo)
+        return [self._postings[palabra] for palabra in self._vocabulario[inicio:fin]]
+
+    def _por_nombre(self, prefijos: Tuple[str, ...]) -> Iterator[int]:
+        """Posiciones (en orden) de los nombres con una palabra por cada prefijo"""
+        postings = [self._postings_de(prefijo) for prefijo in prefijos]
+        if len(postings) == 1:
+            return self._merge(postings[0])
+
+        # Intersección vectorizada, empezando por el prefijo más selectivo
+        postings.sort(key=lambda arrays: sum(map(len, arrays)))
+        comunes = _posiciones(postings[0], len(self._claves))
+        for arrays in postings[1:]:
+            if not len(comunes):
+                break
+            comunes = np.intersect1d(
+                comunes, _posiciones(arrays, len(self._claves)), assume_unique=True
+            )
+        return iter(comunes.tolist())
+
+    @staticmethod
+    def _merge(arrays: List['array[int]']) -> Iterator[int]:
+        """Posiciones de varios arrays ordenados, en orden y sin repetir"""
+        anterior = -1
+        for posicion in heapq.merge(*arrays):
+            if posicion != anterior:
+                anterior = posicion
+                yield posicion
+
+    def _por_clave(self, prefijo: str) -> Iterator[int]:
+        """Posiciones de las claves que empiezan con el prefijo, en orden de clave"""
+        inicio, fin = self._rango(self._claves_ordenadas, prefijo)
+        return iter(self._posicion_clave[inicio:fin])
+
+    def search(self, consulta: str, limit: int = 10) -> List[Tuple[str, str]]:
+        """
+        Autocompletar una consulta
+
+        Retorna [(clave, nombre)]: primero la clave idéntica a la consulta (un
+        código exacto), luego los nombres con una palabra que empieza por
+        cada palabra de la consulta (en orden alfabético) y por último las
+        claves que empiezan con la consulta.
+        """
+        consulta = (consulta or '').strip()
+        if limit <= 0 or not consulta:
+            return []
+
+        vistas: Set[int] = set()
+        resultados: List[Tuple[str, str]] = []
+
+        def agregar(posiciones: Iterable[int]) -> None:
+            for posicion in posiciones:
+                if len(resultados) >= limit:
+                    return
+                clave = self._claves[posicion]
+                if clave is not None and posicion not in vistas:
+                    vistas.add(posicion)
+                    resultados.append((clave, self._nombres[posicion]))
+
+        exacta = self._buscar_clave(consulta)
+        if exacta is not None:
+            agregar([self._posicion_clave[exacta]])
+
+        prefijos = tuple(dict.fromkeys(words(consulta)))
+        if prefijos:
+            agregar(self._por_nombre(prefijos))
+        agregar(self._por_clave(consulta))
+        if consulta.upper() != consulta:
+            agregar(self._por_clave(consulta.upper()))
+
+        return resultados
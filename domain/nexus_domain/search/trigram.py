@@ -0,0 +1,161 @@
+"""
+TrigramIndex - Índice invertido de trigramas para búsqueda tolerante a errores
+"""
+import heapq
+import re
+import unicodedata
+from typing import Dict, FrozenSet, Hashable, List, Optional, Set, Tuple
+
+from ..exceptions import ValidationError
+
+
+# Similitud mínima por defecto (la misma de pg_trgm.similarity_threshold)
+UMBRAL_SIMILITUD = 0.3
+
+_NO_ALFANUMERICO = re.compile(r'[^0-9a-z]+')
+
+
+def normalize(texto: str) -> str:
+    """Minúsculas, sin tildes y con un espacio entre palabras"""
+    sin_tildes = ''.join(
+        c for c in unicodedata.normalize('NFKD', texto or '') if not unicodedata.combining(c)
+    )
+    return _NO_ALFANUMERICO.sub(' ', sin_tildes.lower()).strip()
+
+
+def words(texto: str) -> Tuple[str, ...]:
+    """Palabras normalizadas de un texto"""
+    return tuple(normalize(texto).split())
+
+
+def trigrams(palabra: str) -> FrozenSet[str]:
+    """Trigramas de una palabra normalizada con el relleno de pg_trgm ('  ab', 'ab ')"""
+    relleno = f'  {palabra} '
+    return frozenset(relleno[i:i + 3] for i in range(len(relleno) - 2))
+
+
+def similarity(a: str, b: str) -> float:
+    """Similitud entre dos palabras: trigramas compartidos / trigramas totales"""
+    ta, tb = trigrams(a), trigrams(b)
+    if not ta or not tb:
+        return 0.0
+    return len(ta & tb) / len(ta | tb)
+
+
+def word_score(consulta: str, palabra: str) -> float:
+    """Puntaje de una palabra para una palabra de la consulta (1.0 si es prefijo)"""
+    if palabra.startswith(consulta):
+        return 1.0
+    return similarity(consulta, palabra)
+
+
+def _orden(resultado: Tuple[Hashable, float]) -> Tuple[float, str]:
+    """Mayor puntaje primero; empates por clave"""
+    return -resultado[1], str(resultado[0])
+
+
+class TrigramIndex:
+    """
+    Índice de texto en memoria con búsqueda aproximada y ranking
+
+    Cada clave se indexa con las palabras de uno o más textos (por ejemplo,
+    nombre y código). Los trigramas apuntan a palabras del vocabulario y las
+    palabras a las claves que las contienen, así que la búsqueda aproximada
+    recorre el vocabulario y no todos los registros.
+
+    Una clave coincide si cada palabra de la consulta es prefijo de alguna de
+    sus palabras o se le parece con similitud >= umbral; el puntaje es el
+    promedio de la mejor coincidencia por palabra de la consulta.
+    """
+
+    def __init__(self) -> None:
+        self._palabras_por_clave: Dict[Hashable, Tuple[str, ...]] = {}
+        self._claves_por_palabra: Dict[str, Set[Hashable]] = {}
+        self._palabras_por_trigrama: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._palabras_por_clave)
+
+    def __contains__(self, clave: Hashable) -> bool:
+        return clave in self._palabras_por_clave
+
+    def add(self, clave: Hashable, *textos: Optional[str]) -> None:
+        """Indexar (o reindexar) una clave con sus textos"""
+        self.remove(clave)
+        palabras = tuple(dict.fromkeys(p for texto in textos for p in words(texto or '')))
+        self._palabras_por_clave[clave] = palabras
+        for palabra in palabras:
+            claves = self._claves_por_palabra.get(palabra)
+            if claves is None:
+                claves = self._claves_por_palabra[palabra] = set()
+                for trigrama in trigrams(palabra):
+                    self._palabras_por_trigrama.setdefault(trigrama, set()).add(palabra)
+            claves.add(clave)
+
+    def remove(self, clave: Hashable) -> None:
+        """Quitar una clave del índice (no falla si no existe)"""
+        for palabra in self._palabras_por_clave.pop(clave, ()):
+            claves = self._claves_por_palabra[palabra]
+            claves.discard(clave)
+            if not claves:
+                # Palabra sin claves: sale del vocabulario
+                del self._claves_por_palabra[palabra]
+                for trigrama in trigrams(palabra):
+                    palabras = self._palabras_por_trigrama[trigrama]
+                    palabras.discard(palabra)
+                    if not palabras:
+                        del self._palabras_por_trigrama[trigrama]
+
+    def _matching_words(self, consulta: str, umbral: float) -> Dict[str, float]:
+        """Palabras del vocabulario que coinciden con una palabra de la consulta"""
+        candidatas: Set[str] = set()
+        for trigrama in trigrams(consulta):
+            candidatas |= self._palabras_por_trigrama.get(trigrama, set())
+
+        puntajes = {}
+        for palabra in candidatas:
+            puntaje = word_score(consulta, palabra)
+            if puntaje >= umbral:
+                puntajes[palabra] = puntaje
+        return puntajes
+
+    def search(self, consulta: str, limit: Optional[int] = None,
+               umbral: float = UMBRAL_SIMILITUD) -> List[Tuple[Hashable, float]]:
+        """
+        Buscar claves por texto
+
+        Retorna [(clave, puntaje)] de mayor a menor puntaje (empates por
+        clave), con a lo sumo `limit` resultados.
+        """
+        if not 0 < umbral <= 1:
+            raise ValidationError("El umbral de similitud debe estar en (0, 1]")
+        if limit is not None and limit <= 0:
+            return []
+
+        palabras_consulta = tuple(dict.fromkeys(words(consulta)))
+        totales: Optional[Dict[Hashable, float]] = None
+        for palabra_consulta in palabras_consulta:
+            # Mejor puntaje por clave para esta palabra de la consulta
+            mejores: Dict[Hashable, float] = {}
+            coincidencias = self._matching_words(palabra_consulta, umbral)
+            for palabra, puntaje in sorted(coincidencias.items(), key=lambda item: -item[1]):
+                for clave in self._claves_por_palabra[palabra]:
+                    if totales is None or clave in totales:
+                        mejores.setdefault(clave, puntaje)
+
+            if totales is None:
+                totales = mejores
+            else:
+                # Todas las palabras de la consulta deben coincidir
+                totales = {clave: totales[clave] + puntaje for clave, puntaje in mejores.items()}
+            if not totales:
+                return []
+        if not totales:
+            # Consulta sin palabras
+            return []
+
+        n = len(palabras_consulta)
+        resultados = ((clave, total / n) for clave, total in totales.items())
+        if limit is None:
+            return sorted(resultados, key=_orden)
+        return heapq.nsmallest(limit, resultados, key=_orden)
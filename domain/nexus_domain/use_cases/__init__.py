@@ -17,13 +17,23 @@ from .producto_use_cases import (
     DeleteProductoUseCase
 )
 
+from .catalogo_use_cases import (
+    ImportCatalogUseCase,
+    ImportProgress,
+    CatalogRowError
+)
+
 from .inventario_use_cases import (
     CreateOrUpdateInventarioUseCase,
+    InventarioGuardado,
     GetInventarioUseCase,
     AddStockUseCase,
     RemoveStockUseCase,
     DeleteInventarioUseCase,
-    GetLowStockItemsUseCase
+    GetLowStockItemsUseCase,
+    ForecastDemandUseCase,
+    ClassifyABCUseCase,
+    RefreshABCClassificationUseCase
 )
 
 __all__ = [
@@ -39,11 +49,19 @@ __all__ = [
     'ListProductosUseCase',
     'UpdateProductoUseCase',
     'DeleteProductoUseCase',
+    # Catálogo
+    'ImportCatalogUseCase',
+    'ImportProgress',
+    'CatalogRowError',
     # Inventario
     'CreateOrUpdateInventarioUseCase',
+    'InventarioGuardado',
     'GetInventarioUseCase',
     'AddStockUseCase',
     'RemoveStockUseCase',
     'DeleteInventarioUseCase',
-    'GetLowStockItemsUseCase'
+    'GetLowStockItemsUseCase',
+    'ForecastDemandUseCase',
+    'ClassifyABCUseCase',
+    'RefreshABCClassificationUseCase'
 ]
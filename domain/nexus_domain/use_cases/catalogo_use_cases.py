@@ -0,0 +1,236 @@
+"""
+Casos de uso para importación masiva del catálogo de productos
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+from ..analytics.snapshot import MONEDAS
+from ..entities import Producto
+from ..value_objects import NIT, ProductCode
+from ..interfaces import ICatalogoImportRepository
+from ..exceptions import ValidationError
+
+
+# Precio máximo representable (12 dígitos, 2 decimales)
+PRECIO_MAXIMO = Decimal('9999999999.99')
+CENTAVO = Decimal('0.01')
+
+# Fila ya leída del archivo: (número de fila, valores por columna)
+FilaCatalogo = Tuple[int, Any]
+
+
+@dataclass(slots=True)
+class CatalogRowError:
+    """Error de validación de una fila del archivo"""
+    fila: int
+    error: str
+    codigo: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'fila': self.fila, 'codigo': self.codigo, 'error': self.error}
+
+
+@dataclass(slots=True)
+class ImportProgress:
+    """
+    Avance de una importación
+
+    filas_procesadas es el punto de control: al reanudar se omiten las filas
+    con número menor o igual. Solo se conservan los primeros MAX_ERRORES
+    errores; total_errores lleva la cuenta completa.
+    """
+    MAX_ERRORES = 1000
+
+    importacion_id: Optional[str] = None
+    filas_procesadas: int = 0
+    productos_creados: int = 0
+    precios_creados: int = 0
+    total_errores: int = 0
+    errores: List[CatalogRowError] = field(default_factory=list)
+    completada: bool = False
+
+    def add_error(self, error: CatalogRowError) -> None:
+        """Registrar un error de fila"""
+        self.total_errores += 1
+        if len(self.errores) < self.MAX_ERRORES:
+            self.errores.append(error)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convertir a diccionario para serialización"""
+        return {
+            'importacion_id': self.importacion_id,
+            'filas_procesadas': self.filas_procesadas,
+            'productos_creados': self.productos_creados,
+            'precios_creados': self.precios_creados,
+            'total_errores': self.total_errores,
+            'errores': [error.to_dict() for error in self.errores],
+            'completada': self.completada,
+        }
+
+
+def _valor(row: Mapping[str, Any], *keys: str) -> Any:
+    """Primer valor no vacío entre las columnas indicadas (texto sin espacios)"""
+    for key in keys:
+        value = row.get(key)
+        if isinstance(value, str):
+            value = value.strip()
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def _parse_precio(moneda: str, value: Any) -> Decimal:
+    """Validar un precio: decimal no negativo con máximo 2 decimales"""
+    try:
+        precio = Decimal(str(value))
+    except InvalidOperation:
+        raise ValidationError(f"Precio {moneda} inválido: {value}")
+    if not precio.is_finite() or precio < 0 or precio > PRECIO_MAXIMO:
+        raise ValidationError(f"Precio {moneda} fuera de rango: {value}")
+    if precio != precio.quantize(CENTAVO):
+        raise ValidationError(f"Precio {moneda} con más de 2 decimales: {value}")
+    return precio.quantize(CENTAVO)
+
+
+def _parse_punto_reorden(value: Any) -> Optional[int]:
+    """Convertir el punto de reorden leído del archivo a entero"""
+    if value is None or isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    raise ValidationError("Punto de reorden debe ser un entero no negativo")
+
+
+class ImportCatalogUseCase:
+    """
+    Caso de uso: Importar catálogo de productos con precios por moneda
+
+    Columnas por fila: codigo, nombre, empresa (NIT), caracteristicas,
+    punto_reorden y precios, como objeto `precios` ({moneda: valor}) o como
+    columnas `precio_<MONEDA>`.
+
+    Las filas se procesan por lotes: cada lote se valida con las entidades y
+    value objects del dominio, se verifica contra la base de datos con una
+    consulta por tipo (códigos y empresas) y se guarda junto con el punto de
+    control en una sola transacción. Las filas inválidas se reportan y no
+    detienen la importación.
+    """
+    CHUNK_SIZE = 5000
+
+    def __init__(self, repository: ICatalogoImportRepository, chunk_size: int = CHUNK_SIZE):
+        if chunk_size <= 0:
+            raise ValidationError("El tamaño de lote debe ser positivo")
+        self.repository = repository
+        self.chunk_size = chunk_size
+
+    def execute(self, rows: Iterable[FilaCatalogo], progress: Optional[ImportProgress] = None,
+                user_id: Optional[str] = None) -> ImportProgress:
+        """
+        Ejecutar caso de uso: Importar filas (número de fila, valores)
+
+        Con un progress existente se reanuda después de su punto de control.
+        """
+        progress = progress or ImportProgress()
+        pendientes = (row for row in rows if row[0] > progress.filas_procesadas)
+
+        for chunk in self._chunks(pendientes):
+            self._import_chunk(chunk, progress, user_id)
+
+        progress.completada = True
+        self.repository.save_progress(progress)
+        return progress
+
+    def _chunks(self, rows: Iterator[FilaCatalogo]) -> Iterator[List[FilaCatalogo]]:
+        """Agrupar filas en lotes de chunk_size"""
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def _import_chunk(self, chunk: List[FilaCatalogo], progress: ImportProgress,
+                      user_id: Optional[str]) -> None:
+        """Validar y guardar un lote junto con el punto de control"""
+        validos: Dict[str, Tuple[int, Producto, Dict[str, Decimal]]] = {}
+
+        for fila, row in chunk:
+            try:
+                producto, precios_producto = self._parse_row(row, user_id)
+            except ValidationError as e:
+                codigo = _valor(row, 'codigo') if isinstance(row, Mapping) else None
+                progress.add_error(CatalogRowError(fila, str(e), codigo and str(codigo)))
+                continue
+
+            codigo = str(producto.codigo)
+            if codigo in validos:
+                progress.add_error(CatalogRowError(fila, "Código duplicado en el archivo", codigo))
+                continue
+            validos[codigo] = (fila, producto, precios_producto)
+
+        existentes = self.repository.existing_codigos(list(validos))
+        empresas = self.repository.existing_empresas(
+            list({str(producto.empresa_nit) for _, producto, _ in validos.values()})
+        )
+
+        productos: List[Producto] = []
+        precios: List[Tuple[str, str, Decimal]] = []
+        for codigo, (fila, producto, precios_producto) in validos.items():
+            if codigo in existentes:
+                progress.add_error(CatalogRowError(fila, f"Producto con código {codigo} ya existe", codigo))
+            elif str(producto.empresa_nit) not in empresas:
+                progress.add_error(CatalogRowError(
+                    fila, f"Empresa con NIT {producto.empresa_nit} no encontrada", codigo
+                ))
+            else:
+                productos.append(producto)
+                precios.extend((codigo, moneda, precio) for moneda, precio in precios_producto.items())
+
+        progress.filas_procesadas = chunk[-1][0]
+        progress.productos_creados += len(productos)
+        progress.precios_creados += len(precios)
+        self.repository.save_chunk(productos, precios, progress)
+
+    def _parse_row(self, row: Any, user_id: Optional[str]) -> Tuple[Producto, Dict[str, Decimal]]:
+        """Construir la entidad y los precios de una fila (lanza ValidationError)"""
+        if not isinstance(row, Mapping):
+            raise ValidationError("Fila con formato inválido")
+
+        codigo = _valor(row, 'codigo')
+        empresa = _valor(row, 'empresa', 'empresa_nit')
+        if codigo is None or empresa is None:
+            raise ValidationError("Código y empresa son requeridos")
+
+        now = datetime.now()
+        producto = Producto(
+            codigo=ProductCode(str(codigo)),
+            nombre=str(_valor(row, 'nombre') or ''),
+            empresa_nit=NIT(str(empresa)),
+            caracteristicas=_valor(row, 'caracteristicas'),
+            created_at=now,
+            updated_at=now,
+            created_by_id=user_id,
+            punto_reorden=_parse_punto_reorden(_valor(row, 'punto_reorden'))
+        )
+
+        precios_row = row.get('precios')
+        if precios_row is not None and not isinstance(precios_row, Mapping):
+            raise ValidationError("precios debe ser un objeto {moneda: precio}")
+
+        precios: Dict[str, Decimal] = {}
+        for moneda in MONEDAS:
+            value = _valor(precios_row or {}, moneda)
+            if value is None:
+                value = _valor(row, f'precio_{moneda}', f'precio_{moneda.lower()}')
+            if value is not None:
+                precios[moneda] = _parse_precio(moneda, value)
+
+        if precios_row:
+            desconocidas = set(precios_row) - set(MONEDAS)
+            if desconocidas:
+                raise ValidationError(f"Moneda no soportada: {', '.join(sorted(desconocidas))}")
+
+        return producto, precios
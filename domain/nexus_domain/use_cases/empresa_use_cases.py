@@ -21,7 +21,8 @@ class CreateEmpresaUseCase:
         self.repository = repository
     
     def execute(self, nit: str, nombre: str, direccion: str, 
-                telefono: str, user_id: str) -> Empresa:
+                telefono: str, user_id: str,
+                punto_reorden: Optional[int] = None) -> Empresa:
         """
         Ejecutar caso de uso: Crear empresa
         
@@ -41,7 +42,8 @@ class CreateEmpresaUseCase:
             telefono=Phone(telefono),
             created_at=datetime.now(),
             updated_at=datetime.now(),
-            created_by_id=user_id
+            created_by_id=user_id,
+            punto_reorden=punto_reorden
         )
         
         # Persistir
@@ -74,7 +76,7 @@ class ListEmpresasUseCase:
                 search: Optional[str] = None) -> List[Empresa]:
         """Ejecutar caso de uso: Listar empresas"""
         if search:
-            return self.repository.search_by_nombre(search)
+            return self.repository.search_by_nombre(search, limit=limit, offset=offset)
         
         return self.repository.find_all(limit=limit, offset=offset)
 
@@ -87,7 +89,9 @@ class UpdateEmpresaUseCase:
     
     def execute(self, nit: str, nombre: Optional[str] = None,
                 direccion: Optional[str] = None,
-                telefono: Optional[str] = None) -> Empresa:
+                telefono: Optional[str] = None,
+                punto_reorden: Optional[int] = None,
+                clear_punto_reorden: bool = False) -> Empresa:
         """Ejecutar caso de uso: Actualizar empresa"""
         # Buscar empresa existente
         empresa = self.repository.find_by_nit(nit)
@@ -96,7 +100,9 @@ class UpdateEmpresaUseCase:
         
         # Actualizar información usando método de dominio
         telefono_vo = Phone(telefono) if telefono else None
-        empresa.update_info(nombre=nombre, direccion=direccion, telefono=telefono_vo)
+        empresa.update_info(nombre=nombre, direccion=direccion, telefono=telefono_vo,
+                            punto_reorden=punto_reorden,
+                            clear_punto_reorden=clear_punto_reorden)
         
         # Persistir cambios
         return self.repository.save(empresa)
@@ -1,11 +1,17 @@
 """
 Casos de uso para Inventario - Lógica de aplicación
 """
-from typing import List, Optional
-from datetime import datetime
-from ..entities import Inventario
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+from ..analytics import (
+    ABCClassifier, DemandForecaster, DemandSeries, ForecastResult, InventorySnapshot, validate_periodos
+)
+from ..entities import Empresa, Inventario, Producto
+from ..entities.inventario import CLASES_ABC
 from ..value_objects import NIT, ProductCode, Quantity
-from ..interfaces import IInventarioRepository, IEmpresaRepository, IProductoRepository
+from ..interfaces import IInventarioRepository, IEmpresaRepository, IProductoRepository, IUnitOfWork
+from ..repositories import UnitOfWork
 from ..exceptions import (
     ValidationError,
     EntityNotFoundError,
@@ -14,15 +20,28 @@ from ..exceptions import (
 )
 
 
+@dataclass(slots=True)
+class InventarioGuardado:
+    """Registro escrito por CreateOrUpdateInventarioUseCase y lo leído para escribirlo"""
+    inventario: Inventario
+    empresa: Empresa
+    producto: Producto
+    creado: bool
+
+
 class CreateOrUpdateInventarioUseCase:
     """Caso de uso: Crear o actualizar inventario"""
     
     def __init__(self, inventario_repository: IInventarioRepository,
                  empresa_repository: IEmpresaRepository,
-                 producto_repository: IProductoRepository):
+                 producto_repository: IProductoRepository,
+                 unit_of_work: Optional[IUnitOfWork] = None):
         self.inventario_repository = inventario_repository
         self.empresa_repository = empresa_repository
         self.producto_repository = producto_repository
+        self.unit_of_work = unit_of_work or UnitOfWork(
+            inventario_repository, empresa_repository, producto_repository
+        )
     
     def execute(self, empresa_nit: str, producto_codigo: str, 
                 cantidad: int) -> Inventario:
@@ -33,36 +52,54 @@ class CreateOrUpdateInventarioUseCase:
         - Empresa debe existir
         - Producto debe existir
         - Si ya existe inventario, actualizar cantidad
-        """
-        # Validar empresa existe
-        if not self.empresa_repository.exists(empresa_nit):
-            raise EntityNotFoundError(f"Empresa con NIT {empresa_nit} no encontrada")
-        
-        # Validar producto existe
-        if not self.producto_repository.exists(producto_codigo):
-            raise EntityNotFoundError(f"Producto con código {producto_codigo} no encontrado")
         
-        # Buscar inventario existente
-        inventario = self.inventario_repository.find_by_empresa_and_producto(
-            empresa_nit, producto_codigo
+        Empresa, producto e inventario se leen una vez (unidad de trabajo);
+        el registro se escribe al confirmarla.
+        """
+        return self.execute_detailed(empresa_nit, producto_codigo, cantidad).inventario
+    
+    def execute_detailed(self, empresa_nit: str, producto_codigo: str,
+                         cantidad: int) -> InventarioGuardado:
+        """
+        Como execute, retornando también la empresa y el producto leídos y si
+        el registro se creó (lo informa la unidad de trabajo al escribirlo)
+        """
+        with self.unit_of_work as uow:
+            # Validar empresa existe
+            empresa = uow.get_empresa(empresa_nit)
+            if empresa is None:
+                raise EntityNotFoundError(f"Empresa con NIT {empresa_nit} no encontrada")
+            
+            # Validar producto existe
+            producto = uow.get_producto(producto_codigo)
+            if producto is None:
+                raise EntityNotFoundError(f"Producto con código {producto_codigo} no encontrado")
+            
+            # Buscar inventario existente
+            inventario = uow.get_inventario(empresa_nit, producto_codigo)
+            
+            if inventario:
+                # Actualizar cantidad existente
+                inventario.update_stock(Quantity(cantidad))
+            else:
+                # Crear nuevo
+                inventario = Inventario(
+                    id=None,
+                    empresa_nit=NIT(empresa_nit),
+                    producto_codigo=ProductCode(producto_codigo),
+                    cantidad=Quantity(cantidad),
+                    created_at=datetime.now(),
+                    updated_at=datetime.now()
+                )
+            
+            # Persistir al confirmar
+            uow.add(inventario)
+        return InventarioGuardado(
+            inventario=inventario,
+            empresa=empresa,
+            producto=producto,
+            creado=self.unit_of_work.was_created(inventario)
         )
-        
-        if inventario:
-            # Actualizar cantidad existente
-            inventario.update_stock(Quantity(cantidad))
-        else:
-            # Crear nuevo
-            inventario = Inventario(
-                id=None,
-                empresa_nit=NIT(empresa_nit),
-                producto_codigo=ProductCode(producto_codigo),
-                cantidad=Quantity(cantidad),
-                created_at=datetime.now(),
-                updated_at=datetime.now()
-            )
-        
-        # Persistir
-        return self.inventario_repository.save(inventario)
 
 
 class GetInventarioUseCase:
@@ -71,12 +108,19 @@ class GetInventarioUseCase:
     def __init__(self, repository: IInventarioRepository):
         self.repository = repository
     
-    def execute(self, empresa_nit: Optional[str] = None) -> List[Inventario]:
+    def execute(self, empresa_nit: Optional[str] = None,
+                clase_abc: Optional[str] = None) -> List[Inventario]:
         """
         Ejecutar caso de uso: Obtener inventario
         
-        Si empresa_nit es None, retorna todo el inventario
+        Si empresa_nit es None, retorna todo el inventario.
+        clase_abc filtra por la clase ABC persistida.
         """
+        if clase_abc:
+            if clase_abc not in CLASES_ABC:
+                raise ValidationError(f"Clase ABC inválida: {clase_abc}")
+            return self.repository.find_by_clase_abc(clase_abc, empresa_nit)
+        
         if empresa_nit:
             return self.repository.find_by_empresa(empresa_nit)
         
@@ -150,10 +194,130 @@ class GetLowStockItemsUseCase:
     def __init__(self, repository: IInventarioRepository):
         self.repository = repository
     
-    def execute(self, threshold: int = 10) -> List[Inventario]:
+    def execute(self, threshold: Optional[int] = None) -> List[Inventario]:
         """
         Ejecutar caso de uso: Obtener items con stock bajo
         
-        Regla de negocio: threshold configurable
+        Regla de negocio: threshold global opcional; sin él se usa el punto
+        de reorden de cada item (producto > empresa > defecto)
         """
         return self.repository.find_low_stock(threshold=threshold)
+
+
+class ForecastDemandUseCase:
+    """Caso de uso: Pronosticar demanda y puntos de reorden de una empresa"""
+    
+    def __init__(self, inventario_repository: IInventarioRepository,
+                 empresa_repository: IEmpresaRepository):
+        self.inventario_repository = inventario_repository
+        self.empresa_repository = empresa_repository
+    
+    def execute(self, empresa_nit: str, periodos: int = 12, dias_periodo: int = 7,
+                forecaster: Optional[DemandForecaster] = None,
+                hasta: Optional[date] = None) -> ForecastResult:
+        """
+        Ejecutar caso de uso: Pronosticar demanda por SKU
+        
+        Reglas:
+        - Empresa debe existir
+        - El consumo se agrupa en `periodos` periodos de `dias_periodo` días
+          que terminan en `hasta` (hoy por defecto), dentro de MAX_PERIODOS y
+          MAX_DIAS_PERIODO
+        - Se incluyen todos los SKUs con inventario, aunque no tengan consumo
+        """
+        validate_periodos(periodos, dias_periodo)
+        if not self.empresa_repository.exists(empresa_nit):
+            raise EntityNotFoundError(f"Empresa con NIT {empresa_nit} no encontrada")
+        
+        forecaster = forecaster or DemandForecaster()
+        hasta = hasta or date.today()
+        inicio = hasta - timedelta(days=periodos * dias_periodo - 1)
+        
+        snapshot = self.inventario_repository.load_snapshot(empresa_nit)
+        series = DemandSeries.from_rows(
+            self.inventario_repository.load_consumo(empresa_nit, inicio),
+            inicio=inicio,
+            periodos=periodos,
+            dias_periodo=dias_periodo,
+            productos=snapshot.productos
+        )
+        
+        return forecaster.forecast(series).with_stock(snapshot.cantidad_by_producto())
+
+
+class ClassifyABCUseCase:
+    """Caso de uso: Clasificar el inventario de una empresa (análisis ABC)"""
+    
+    def __init__(self, inventario_repository: IInventarioRepository,
+                 empresa_repository: IEmpresaRepository):
+        self.inventario_repository = inventario_repository
+        self.empresa_repository = empresa_repository
+    
+    def execute(self, empresa_nit: str,
+                classifier: Optional[ABCClassifier] = None) -> Dict[str, Any]:
+        """
+        Ejecutar caso de uso: Recalcular y persistir la clase ABC
+        
+        Reglas:
+        - Empresa debe existir
+        - Valor por registro = cantidad × precio en la moneda del clasificador
+        - Solo se escriben los registros cuya clase cambió
+        - Un clasificador explícito queda guardado para la empresa; sin él se
+          usa el guardado o el de defecto
+        """
+        if not self.empresa_repository.exists(empresa_nit):
+            raise EntityNotFoundError(f"Empresa con NIT {empresa_nit} no encontrada")
+        
+        if classifier is not None:
+            self.inventario_repository.save_abc_classifier(empresa_nit, classifier)
+        else:
+            classifier = self.inventario_repository.find_abc_classifier(empresa_nit) or ABCClassifier()
+        snapshot, actualizados = _reclasificar_abc(self.inventario_repository, empresa_nit, classifier)
+        
+        return {
+            'empresa_nit': empresa_nit,
+            'moneda': classifier.moneda,
+            'actualizados': actualizados,
+            'clases': classifier.summary(snapshot)
+        }
+
+
+class RefreshABCClassificationUseCase:
+    """Caso de uso: Reclasificar solo las empresas con cambios pendientes"""
+    
+    def __init__(self, inventario_repository: IInventarioRepository):
+        self.inventario_repository = inventario_repository
+    
+    def execute(self, empresa_nit: Optional[str] = None) -> List[str]:
+        """
+        Ejecutar caso de uso: Reclasificación incremental
+        
+        Una empresa queda pendiente cuando cambian cantidades o precios de su
+        inventario; las demás conservan su clasificación. Cada empresa se
+        reclasifica con los umbrales y la moneda que se guardaron para ella.
+        Retorna los NITs reclasificados.
+        """
+        pendientes = self.inventario_repository.find_stale_abc_empresas(empresa_nit)
+        for nit in pendientes:
+            classifier = self.inventario_repository.find_abc_classifier(nit) or ABCClassifier()
+            _reclasificar_abc(self.inventario_repository, nit, classifier)
+        return pendientes
+
+
+def _reclasificar_abc(inventario_repository: IInventarioRepository, empresa_nit: str,
+                      classifier: ABCClassifier) -> Tuple[InventorySnapshot, int]:
+    """
+    Clasificar y persistir las clases ABC de una empresa
+    
+    La empresa se marca vigente antes de leer el snapshot, así un cambio
+    concurrente la deja pendiente de nuevo; si algo falla vuelve a quedar
+    pendiente.
+    """
+    inventario_repository.mark_abc_current(empresa_nit)
+    try:
+        snapshot = inventario_repository.load_snapshot(empresa_nit)
+        actualizados = inventario_repository.update_abc_classes(empresa_nit, classifier.group_ids(snapshot))
+    except Exception:
+        inventario_repository.mark_abc_stale(empresa_nit)
+        raise
+    return snapshot, actualizados
@@ -4,6 +4,7 @@ Casos de uso para Producto - Lógica de aplicación
 from typing import List, Optional
 from datetime import datetime
 from ..entities import Producto
+from ..entities.producto import Caracteristicas
 from ..value_objects import ProductCode, NIT
 from ..interfaces import IProductoRepository, IEmpresaRepository
 from ..exceptions import (
@@ -23,7 +24,8 @@ class CreateProductoUseCase:
         self.empresa_repository = empresa_repository
     
     def execute(self, codigo: str, nombre: str, empresa_nit: str,
-                caracteristicas: Optional[str], user_id: str) -> Producto:
+                caracteristicas: Optional[Caracteristicas], user_id: str,
+                punto_reorden: Optional[int] = None) -> Producto:
         """
         Ejecutar caso de uso: Crear producto
         
@@ -47,7 +49,8 @@ class CreateProductoUseCase:
             caracteristicas=caracteristicas,
             created_at=datetime.now(),
             updated_at=datetime.now(),
-            created_by_id=user_id
+            created_by_id=user_id,
+            punto_reorden=punto_reorden
         )
         
         # Persistir
@@ -84,7 +87,7 @@ class ListProductosUseCase:
             return self.repository.find_by_empresa(empresa_nit)
         
         if search:
-            return self.repository.search_by_nombre(search)
+            return self.repository.search_by_nombre(search, limit=limit, offset=offset)
         
         return self.repository.find_all(limit=limit, offset=offset)
 
@@ -96,7 +99,9 @@ class UpdateProductoUseCase:
         self.repository = repository
     
     def execute(self, codigo: str, nombre: Optional[str] = None,
-                caracteristicas: Optional[str] = None) -> Producto:
+                caracteristicas: Optional[Caracteristicas] = None,
+                punto_reorden: Optional[int] = None,
+                clear_punto_reorden: bool = False) -> Producto:
         """Ejecutar caso de uso: Actualizar producto"""
         # Buscar producto existente
         producto = self.repository.find_by_codigo(codigo)
@@ -104,7 +109,9 @@ class UpdateProductoUseCase:
             raise EntityNotFoundError(f"Producto con código {codigo} no encontrado")
         
         # Actualizar usando método de dominio
-        producto.update_info(nombre=nombre, caracteristicas=caracteristicas)
+        producto.update_info(nombre=nombre, caracteristicas=caracteristicas,
+                             punto_reorden=punto_reorden,
+                             clear_punto_reorden=clear_punto_reorden)
         
         # Persistir cambios
         return self.repository.save(producto)
@@ -1,12 +1,14 @@
 """
 Value Objects - Objetos de valor inmutables con validaciones
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any
+import json
 import re
 from ..exceptions import ValidationError
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NIT:
     """Value Object para NIT - Inmutable"""
     value: str
@@ -34,7 +36,7 @@ class NIT:
         return hash(self.value)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Email:
     """Value Object para Email - Inmutable"""
     value: str
@@ -56,7 +58,7 @@ class Email:
         return self.value.split('@')[1]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Phone:
     """Value Object para Teléfono - Inmutable"""
     value: str
@@ -78,7 +80,7 @@ class Phone:
         return self.value
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ProductCode:
     """Value Object para Código de Producto - Inmutable"""
     value: str
@@ -106,7 +108,7 @@ class ProductCode:
         return hash(self.value.upper())
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Quantity:
     """Value Object para Cantidad de Inventario - Inmutable"""
     value: int
@@ -135,3 +137,39 @@ class Quantity:
     def is_sufficient(self, required: 'Quantity') -> bool:
         """Verificar si la cantidad es suficiente"""
         return self.value >= required.value
+
+
+_NO_DECODIFICADO = object()
+
+# Representaciones JSON de un valor vacío
+_JSON_VACIOS = frozenset({'', 'null', '{}', '[]', '""'})
+
+
+@dataclass(frozen=True, slots=True)
+class RawJSON:
+    """
+    Value Object para un documento JSON ya serializado - Inmutable
+    
+    Conserva el texto tal como viene del almacenamiento y solo lo decodifica
+    (una vez) cuando se accede a `value`, de modo que se pueda reenviar a una
+    respuesta sin decodificar y volver a codificar.
+    """
+    raw: str
+    _value: Any = field(default=_NO_DECODIFICADO, init=False, repr=False, compare=False)
+    
+    @property
+    def value(self) -> Any:
+        """Valor decodificado (se decodifica en el primer acceso)"""
+        if self._value is _NO_DECODIFICADO:
+            try:
+                object.__setattr__(self, '_value', json.loads(self.raw))
+            except json.JSONDecodeError as e:
+                raise ValidationError(f"JSON inválido: {e}")
+        return self._value
+    
+    def is_empty(self) -> bool:
+        """Verificar si representa un valor vacío sin decodificarlo"""
+        return self.raw.strip() in _JSON_VACIOS
+    
+    def __str__(self) -> str:
+        return self.raw
@@ -0,0 +1,40 @@
+"""
+Tests para clasificación ABC - ABCClassifier
+"""
+import numpy as np
+import pytest
+from nexus_domain.analytics import ABCClassifier, InventorySnapshot
+from nexus_domain.exceptions import ValidationError
+
+
+class TestABCClassifier:
+    """Tests para ABCClassifier"""
+
+    def test_codes_by_cumulative_share(self):
+        values = np.array([5.0, 70.0, 0.0, 15.0, 10.0])
+
+        codes = ABCClassifier().codes(values)
+
+        # Orden: 70 (0%) A, 15 (70%) A, 10 (85%) B, 5 (95%) C, 0 C
+        assert codes.tolist() == [2, 0, 2, 0, 1]
+
+    def test_zero_total_is_all_c(self):
+        codes = ABCClassifier().codes(np.zeros(3))
+        assert codes.tolist() == [2, 2, 2]
+
+    def test_group_ids_and_summary(self):
+        snapshot = InventorySnapshot.from_rows([
+            (11, "900111111", "PROD-001", 10, 10, 800, None, None, None),
+            (12, "900111111", "PROD-002", 10, 10, 150, None, None, None),
+            (13, "900111111", "PROD-003", 10, 10, None, None, None, None),
+        ])
+        classifier = ABCClassifier()
+
+        assert classifier.group_ids(snapshot) == {'A': [11], 'B': [12], 'C': [13]}
+        summary = classifier.summary(snapshot)
+        assert summary['A'] == {'items': 1, 'valor': 8000.0, 'porcentaje': 84.21}
+        assert summary['C']['items'] == 1
+
+    def test_invalid_thresholds_raise_error(self):
+        with pytest.raises(ValidationError):
+            ABCClassifier(umbral_a=0.9, umbral_b=0.8)
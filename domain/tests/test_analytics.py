@@ -0,0 +1,139 @@
+"""
+Tests para analítica vectorizada - InventorySnapshot
+"""
+import numpy as np
+import pytest
+from nexus_domain.analytics import InventorySnapshot, LowStockEvaluator
+from nexus_domain.entities import Inventario
+from nexus_domain.value_objects import NIT, ProductCode, Quantity
+from nexus_domain.exceptions import ValidationError
+
+
+@pytest.fixture
+def snapshot():
+    """Snapshot con dos empresas y precios parciales"""
+    rows = [
+        # id, empresa, producto, cantidad, punto_reorden, COP, USD, EUR, MXN
+        (1, "900111111", "PROD-001", 0, 10, 1000, 0.25, None, None),
+        (2, "900111111", "PROD-002", 5, 10, 2000, None, None, None),
+        (3, "900222222", "PROD-001", 30, 10, 1000, 0.25, None, None),
+        (4, "900222222", "PROD-003", 100, None, None, 2.0, None, None),
+    ]
+    return InventorySnapshot.from_rows(rows)
+
+
+class TestInventorySnapshot:
+    """Tests para InventorySnapshot"""
+
+    def test_from_rows_builds_aligned_columns(self, snapshot):
+        assert len(snapshot) == 4
+        assert snapshot.empresas == ("900111111", "900222222")
+        assert snapshot.productos == ("PROD-001", "PROD-002", "PROD-003")
+        assert snapshot.cantidad.tolist() == [0, 5, 30, 100]
+        assert np.isnan(snapshot.price_column('COP')[3])
+
+    def test_empty_snapshot(self):
+        empty = InventorySnapshot.from_rows([])
+        assert len(empty) == 0
+        assert empty.valuation() == 0.0
+        assert empty.top_productos() == []
+
+    def test_misaligned_columns_raise_error(self, snapshot):
+        with pytest.raises(ValidationError):
+            InventorySnapshot(
+                ids=snapshot.ids[:2],
+                cantidad=snapshot.cantidad,
+                punto_reorden=snapshot.punto_reorden,
+                precios=snapshot.precios,
+                empresa_idx=snapshot.empresa_idx,
+                producto_idx=snapshot.producto_idx,
+                empresas=snapshot.empresas,
+                productos=snapshot.productos
+            )
+
+    def test_valuation_ignores_missing_prices(self, snapshot):
+        assert snapshot.valuation('COP') == 5 * 2000 + 30 * 1000
+        assert snapshot.valuation('USD') == pytest.approx(30 * 0.25 + 100 * 2.0)
+
+    def test_valuation_unknown_currency_raises_error(self, snapshot):
+        with pytest.raises(ValidationError, match="Moneda no soportada"):
+            snapshot.valuation('JPY')
+
+    def test_stock_status_matches_entity_rules(self, snapshot):
+        assert snapshot.stock_status_counts() == {
+            'AGOTADO': 1, 'BAJO': 1, 'MEDIO': 1, 'ALTO': 1
+        }
+
+        for cantidad, code in zip(snapshot.cantidad, snapshot.stock_status_codes()):
+            inventario = Inventario(
+                id=None,
+                empresa_nit=NIT("900111111"),
+                producto_codigo=ProductCode("PROD-001"),
+                cantidad=Quantity(int(cantidad))
+            )
+            assert inventario.get_stock_status() == ('AGOTADO', 'BAJO', 'MEDIO', 'ALTO')[code]
+
+    def test_low_stock_mask(self, snapshot):
+        assert snapshot.low_stock_mask(10).tolist() == [True, True, False, False]
+
+    def test_group_by_empresa(self, snapshot):
+        assert snapshot.cantidad_by_empresa() == {"900111111": 5, "900222222": 130}
+        assert snapshot.valuation_by_empresa('COP') == {
+            "900111111": 10000.0, "900222222": 30000.0
+        }
+        assert snapshot.count_empresas() == 2
+
+    def test_for_empresa(self, snapshot):
+        subset = snapshot.for_empresa("900222222")
+        assert subset.ids.tolist() == [3, 4]
+        assert len(snapshot.for_empresa("999999999")) == 0
+
+    def test_top_productos_by_cantidad_and_value(self, snapshot):
+        assert snapshot.top_productos(2) == [("PROD-003", 100.0), ("PROD-001", 30.0)]
+        assert snapshot.top_productos(1, moneda='COP') == [("PROD-001", 30000.0)]
+
+    def test_from_entities_with_prices(self):
+        inventarios = [
+            Inventario(
+                id="7",
+                empresa_nit=NIT("900123456"),
+                producto_codigo=ProductCode("PROD-001"),
+                cantidad=Quantity(4)
+            )
+        ]
+
+        snapshot = InventorySnapshot.from_entities(
+            inventarios, precios={"PROD-001": {"COP": 2500}}
+        )
+
+        assert snapshot.ids.tolist() == [7]
+        assert snapshot.valuation('COP') == 10000.0
+
+    def test_stock_status_uses_row_punto_reorden(self):
+        snapshot = InventorySnapshot.from_rows([
+            (1, "900111111", "PROD-001", 15, 20, None, None, None, None),
+            (2, "900111111", "PROD-002", 15, 3, None, None, None, None),
+        ])
+
+        assert snapshot.stock_status_codes().tolist() == [1, 3]
+        assert snapshot.low_stock_mask().tolist() == [True, False]
+
+
+class TestLowStockEvaluator:
+    """Tests para el evaluador vectorizado de stock bajo"""
+
+    def test_thresholds_priority_producto_empresa_default(self, snapshot):
+        evaluator = LowStockEvaluator(
+            producto_puntos={"PROD-003": 150},
+            empresa_puntos={"900222222": 40},
+            default=3
+        )
+
+        assert evaluator.thresholds(snapshot).tolist() == [3, 3, 40, 150]
+
+    def test_evaluate_returns_low_stock_rows(self, snapshot):
+        evaluator = LowStockEvaluator(producto_puntos={"PROD-003": 150}, default=3)
+
+        low = evaluator.evaluate(snapshot)
+
+        assert low.ids.tolist() == [1, 4]
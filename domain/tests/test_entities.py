@@ -4,7 +4,7 @@ Tests para Entities - Sin dependencias de Django
 import pytest
 from datetime import datetime
 from nexus_domain.entities import Empresa, Producto, Inventario
-from nexus_domain.value_objects import NIT, Email, Phone, ProductCode, Quantity
+from nexus_domain.value_objects import NIT, Email, Phone, ProductCode, Quantity, RawJSON
 from nexus_domain.exceptions import ValidationError, InsufficientStockError
 
 
@@ -87,6 +87,30 @@ class TestEmpresa:
             created_by_id="user-2"
         )
         assert empresa1 == empresa2  # Same NIT
+    
+    def test_empresa_clear_punto_reorden(self):
+        empresa = Empresa(
+            nit=NIT("900123456"),
+            nombre="Empresa Test",
+            direccion="Calle 123",
+            telefono=Phone("3001234567"),
+            punto_reorden=15
+        )
+        
+        empresa.update_info(nombre="Empresa Renombrada")
+        assert empresa.punto_reorden == 15
+        empresa.update_info(clear_punto_reorden=True)
+        assert empresa.punto_reorden is None
+    
+    def test_empresa_bool_punto_reorden_raises_error(self):
+        with pytest.raises(ValidationError):
+            Empresa(
+                nit=NIT("900123456"),
+                nombre="Empresa Test",
+                direccion="Calle 123",
+                telefono=Phone("3001234567"),
+                punto_reorden=True
+            )
 
 
 class TestProducto:
@@ -130,6 +154,20 @@ class TestProducto:
         assert producto.nombre == "Nombre Nuevo"
         assert producto.caracteristicas == "Nuevas características"
     
+    def test_producto_clear_punto_reorden(self):
+        producto = Producto(
+            codigo=ProductCode("PROD-001"),
+            nombre="Producto Test",
+            empresa_nit=NIT("900123456"),
+            punto_reorden=20
+        )
+        
+        producto.update_info(clear_punto_reorden=True)
+        
+        assert producto.punto_reorden is None
+        with pytest.raises(ValidationError):
+            producto.update_info(punto_reorden=False)
+    
     def test_producto_change_empresa(self):
         producto = Producto(
             codigo=ProductCode("PROD-001"),
@@ -162,6 +200,37 @@ class TestProducto:
             created_by_id="user-123"
         )
         assert producto_sin.has_caracteristicas() is False
+    
+    def test_producto_structured_caracteristicas(self):
+        producto = Producto(
+            codigo=ProductCode("PROD-001"),
+            nombre="Producto",
+            empresa_nit=NIT("900123456"),
+            caracteristicas={"color": "rojo", "peso_kg": 2}
+        )
+        assert producto.has_caracteristicas() is True
+        assert producto.to_dict()['caracteristicas'] == {"color": "rojo", "peso_kg": 2}
+    
+    def test_producto_raw_caracteristicas_pass_through(self):
+        raw = RawJSON('{"color": "rojo"}')
+        producto = Producto(
+            codigo=ProductCode("PROD-001"),
+            nombre="Producto",
+            empresa_nit=NIT("900123456"),
+            caracteristicas=raw
+        )
+        assert producto.to_dict(raw_json=True)['caracteristicas'] is raw
+        assert producto.to_dict()['caracteristicas'] == {"color": "rojo"}
+        assert producto.get_caracteristicas() == {"color": "rojo"}
+    
+    def test_producto_invalid_caracteristicas_raises_error(self):
+        with pytest.raises(ValidationError):
+            Producto(
+                codigo=ProductCode("PROD-001"),
+                nombre="Producto",
+                empresa_nit=NIT("900123456"),
+                caracteristicas=["no", "es", "objeto"]
+            )
 
 
 class TestInventario:
@@ -289,3 +358,85 @@ class TestInventario:
             cantidad=Quantity(100)
         )
         assert inv_alto.get_stock_status() == "ALTO"
+    
+    def test_inventario_stock_status_uses_punto_reorden(self):
+        inventario = Inventario(
+            id="inv-5",
+            empresa_nit=NIT("900123456"),
+            producto_codigo=ProductCode("PROD-005"),
+            cantidad=Quantity(30),
+            punto_reorden=50
+        )
+        
+        assert inventario.is_low_stock() is True
+        assert inventario.is_low_stock(threshold=10) is False
+        assert inventario.get_stock_status() == "BAJO"
+    
+    def test_inventario_negative_punto_reorden_raises_error(self):
+        with pytest.raises(ValidationError):
+            Inventario(
+                id="inv-6",
+                empresa_nit=NIT("900123456"),
+                producto_codigo=ProductCode("PROD-006"),
+                cantidad=Quantity(1),
+                punto_reorden=-1
+            )
+    
+    def test_resolve_punto_reorden_priority(self):
+        assert Inventario.resolve_punto_reorden(5, 20) == 5
+        assert Inventario.resolve_punto_reorden(None, 20) == 20
+        assert Inventario.resolve_punto_reorden(0, 20) == 0
+        assert Inventario.resolve_punto_reorden() == 10
+
+
+class TestEntitySlots:
+    """Tests para el layout de memoria (__slots__) de las entidades"""
+    
+    def test_entities_have_no_instance_dict(self):
+        empresa = Empresa(
+            nit=NIT("900123456"),
+            nombre="Empresa Test",
+            direccion="Calle 123",
+            telefono=Phone("3001234567")
+        )
+        producto = Producto(
+            codigo=ProductCode("PROD-001"),
+            nombre="Producto Test",
+            empresa_nit=NIT("900123456")
+        )
+        inventario = Inventario(
+            id="inv-1",
+            empresa_nit=NIT("900123456"),
+            producto_codigo=ProductCode("PROD-001"),
+            cantidad=Quantity(10)
+        )
+        
+        for entity in (empresa, producto, inventario):
+            assert not hasattr(entity, '__dict__')
+    
+    def test_slotted_inventario_keeps_equality_and_hash(self):
+        inv1 = Inventario(
+            id="inv-1",
+            empresa_nit=NIT("900123456"),
+            producto_codigo=ProductCode("prod-001"),
+            cantidad=Quantity(10)
+        )
+        inv2 = Inventario(
+            id="inv-2",
+            empresa_nit=NIT("900123456"),
+            producto_codigo=ProductCode("PROD-001"),
+            cantidad=Quantity(99)
+        )
+        
+        assert inv1 == inv2
+        assert len({inv1, inv2}) == 1
+    
+    def test_slotted_entity_rejects_unknown_attributes(self):
+        producto = Producto(
+            codigo=ProductCode("PROD-001"),
+            nombre="Producto Test",
+            empresa_nit=NIT("900123456")
+        )
+        
+        with pytest.raises(AttributeError):
+            producto.atributo_inexistente = "x"  # type: ignore
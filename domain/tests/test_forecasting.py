@@ -0,0 +1,96 @@
+"""
+Tests para pronóstico de demanda - DemandSeries / DemandForecaster
+"""
+from datetime import date
+import numpy as np
+import pytest
+from nexus_domain.analytics import DemandForecaster, DemandSeries
+from nexus_domain.exceptions import ValidationError
+
+
+@pytest.fixture
+def series():
+    """Dos SKUs en 4 periodos semanales desde el 1 de enero"""
+    rows = [
+        # producto, fecha, consumo
+        ("PROD-001", date(2024, 1, 1), 10),
+        ("PROD-001", date(2024, 1, 3), 10),
+        ("PROD-001", date(2024, 1, 8), 20),
+        ("PROD-001", date(2024, 1, 15), 20),
+        ("PROD-001", date(2024, 1, 22), 20),
+        ("PROD-002", date(2024, 1, 22), 8),
+        ("PROD-002", date(2024, 2, 1), 100),  # fuera de rango
+    ]
+    return DemandSeries.from_rows(rows, inicio=date(2024, 1, 1), periodos=4,
+                                  productos=("PROD-003",))
+
+
+class TestDemandSeries:
+    """Tests para DemandSeries"""
+
+    def test_from_rows_buckets_by_period(self, series):
+        assert series.productos == ("PROD-003", "PROD-001", "PROD-002")
+        assert series.consumo.tolist() == [
+            [0, 0, 0, 0],
+            [20, 20, 20, 20],
+            [0, 0, 0, 8],
+        ]
+
+    def test_empty_rows(self):
+        series = DemandSeries.from_rows([], inicio=date(2024, 1, 1), periodos=3)
+        assert series.consumo.shape == (0, 3)
+
+    def test_invalid_periods_raise_error(self):
+        with pytest.raises(ValidationError):
+            DemandSeries.from_rows([], inicio=date(2024, 1, 1), periodos=0)
+
+
+class TestDemandForecaster:
+    """Tests para DemandForecaster"""
+
+    def test_sma_uses_last_window(self, series):
+        result = DemandForecaster(metodo='sma', ventana=2).forecast(series)
+
+        assert result.demanda.tolist() == [0.0, 20.0, 4.0]
+        assert result.desviacion.tolist() == [0.0, 0.0, 4.0]
+
+    def test_ses_matches_recursive_definition(self, series):
+        alpha = 0.5
+        result = DemandForecaster(metodo='ses', alpha=alpha).forecast(series)
+
+        level = series.consumo[:, 0].copy()
+        for t in range(1, series.periodos):
+            level = alpha * series.consumo[:, t] + (1 - alpha) * level
+        np.testing.assert_allclose(result.demanda, level)
+
+    def test_reorder_point_includes_safety_stock(self, series):
+        result = DemandForecaster(
+            metodo='sma', ventana=2, lead_time=4, nivel_servicio=0.95
+        ).forecast(series)
+
+        # PROD-002: 4 × 4 + 1.645 × 4 × √4 = 29.16 → 30
+        assert result.punto_reorden.tolist() == [0, 80, 30]
+        assert result.stock_seguridad[2] == pytest.approx(13.16, abs=0.01)
+
+    def test_with_stock_and_to_dicts(self, series):
+        result = DemandForecaster(metodo='sma').forecast(series).with_stock(
+            {"PROD-001": 100, "PROD-002": 1}
+        )
+
+        rows = result.to_dicts()
+        assert [row['reordenar'] for row in rows] == [True, False, True]
+        assert rows[1]['producto_codigo'] == "PROD-001"
+        assert rows[1]['cantidad'] == 100
+
+    def test_invalid_parameters_raise_error(self):
+        with pytest.raises(ValidationError):
+            DemandForecaster(metodo='arima')
+        with pytest.raises(ValidationError):
+            DemandForecaster(alpha=0)
+        with pytest.raises(ValidationError):
+            DemandForecaster(nivel_servicio=1)
+
+    def test_non_finite_lead_time_raises_error(self):
+        for lead_time in (float('inf'), float('nan')):
+            with pytest.raises(ValidationError):
+                DemandForecaster(lead_time=lead_time)
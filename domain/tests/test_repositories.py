@@ -0,0 +1,298 @@
+"""
+Tests para los repositorios en memoria
+"""
+from datetime import date
+from unittest.mock import Mock
+
+import pytest
+from nexus_domain.analytics import ABCClassifier
+from nexus_domain.entities import Empresa, Inventario, Producto
+from nexus_domain.repositories import (
+    InMemoryEmpresaRepository,
+    InMemoryInventarioRepository,
+    InMemoryProductoRepository,
+    UnitOfWork
+)
+from nexus_domain.exceptions import DuplicateEntityError, EntityNotFoundError
+from nexus_domain.use_cases import (
+    AddStockUseCase,
+    ClassifyABCUseCase,
+    CreateOrUpdateInventarioUseCase,
+    RefreshABCClassificationUseCase
+)
+from nexus_domain.value_objects import NIT, Phone, ProductCode, Quantity
+
+
+@pytest.fixture
+def empresas():
+    repo = InMemoryEmpresaRepository()
+    repo.save(Empresa(NIT("900111111"), "Distribuciones Andina", "Calle 1", Phone("3001234567"),
+                      punto_reorden=5))
+    repo.save(Empresa(NIT("900222222"), "Tecnología del Caribe", "Calle 2", Phone("3007654321")))
+    return repo
+
+
+@pytest.fixture
+def productos(empresas):
+    repo = InMemoryProductoRepository()
+    repo.save(Producto(ProductCode("PROD-001"), "Laptop Lenovo", NIT("900111111"), punto_reorden=20))
+    repo.save(Producto(ProductCode("PROD-002"), "Mouse inalámbrico", NIT("900111111")))
+    repo.save(Producto(ProductCode("PROD-003"), "Monitor curvo", NIT("900222222")))
+    return repo
+
+
+@pytest.fixture
+def inventario(empresas, productos):
+    repo = InMemoryInventarioRepository(empresas, productos)
+    repo.save(Inventario(None, NIT("900111111"), ProductCode("PROD-001"), Quantity(15)))
+    repo.save(Inventario(None, NIT("900111111"), ProductCode("PROD-002"), Quantity(8)))
+    repo.save(Inventario(None, NIT("900222222"), ProductCode("PROD-003"), Quantity(50)))
+    return repo
+
+
+class TestInMemoryEmpresaRepository:
+    """Tests para InMemoryEmpresaRepository"""
+
+    def test_find_all_newest_first(self, empresas):
+        assert [str(e.nit) for e in empresas.find_all()] == ["900222222", "900111111"]
+        assert [str(e.nit) for e in empresas.find_all(limit=1, offset=1)] == ["900111111"]
+
+    def test_returns_copies(self, empresas):
+        # Act
+        empresa = empresas.find_by_nit("900111111")
+        empresa.nombre = "Otro nombre"
+
+        # Assert: solo save persiste los cambios
+        assert empresas.find_by_nit("900111111").nombre == "Distribuciones Andina"
+
+    def test_search_tolerates_typos_and_follows_updates(self, empresas):
+        assert [str(e.nit) for e in empresas.search_by_nombre("andna")] == ["900111111"]
+
+        empresa = empresas.find_by_nit("900111111")
+        empresa.update_info(nombre="Suministros del Norte")
+        empresas.save(empresa)
+
+        assert empresas.search_by_nombre("andina") == []
+        assert [str(e.nit) for e in empresas.search_by_nombre("suministros")] == ["900111111"]
+
+    def test_delete(self, empresas):
+        assert empresas.delete("900111111") is True
+        assert empresas.delete("900111111") is False
+        assert not empresas.exists("900111111")
+        assert empresas.search_by_nombre("andina") == []
+
+
+class TestInMemoryProductoRepository:
+    """Tests para InMemoryProductoRepository"""
+
+    def test_find_by_empresa_uses_secondary_index(self, productos):
+        assert [str(p.codigo) for p in productos.find_by_empresa("900111111")] == ["PROD-002", "PROD-001"]
+
+    def test_change_empresa_moves_index_entry(self, productos):
+        # Act
+        producto = productos.find_by_codigo("PROD-001")
+        producto.change_empresa(NIT("900222222"))
+        productos.save(producto)
+
+        # Assert
+        assert [str(p.codigo) for p in productos.find_by_empresa("900111111")] == ["PROD-002"]
+        assert {str(p.codigo) for p in productos.find_by_empresa("900222222")} == {"PROD-001", "PROD-003"}
+
+    def test_delete_removes_from_indexes(self, productos):
+        assert productos.delete("PROD-003") is True
+        assert productos.find_by_empresa("900222222") == []
+        assert productos.search_by_nombre("monitor") == []
+
+
+class TestInMemoryInventarioRepository:
+    """Tests para InMemoryInventarioRepository"""
+
+    def test_create_resolves_punto_reorden(self, inventario):
+        # Producto > empresa > defecto
+        assert inventario.find_by_empresa_and_producto("900111111", "PROD-001").punto_reorden == 20
+        assert inventario.find_by_empresa_and_producto("900111111", "PROD-002").punto_reorden == 5
+        assert inventario.find_by_empresa_and_producto("900222222", "PROD-003").punto_reorden == 10
+
+    def test_punto_reorden_changes_reach_inventory(self, inventario, empresas, productos):
+        # Arrange
+        empresa = empresas.find_by_nit("900111111")
+        empresa.punto_reorden = 7
+        producto = productos.find_by_codigo("PROD-001")
+        producto.punto_reorden = None
+
+        # Act: la empresa solo cambia los registros que heredan su valor
+        empresas.save(empresa)
+        heredado = inventario.find_by_empresa_and_producto("900111111", "PROD-002").punto_reorden
+        propio = inventario.find_by_empresa_and_producto("900111111", "PROD-001").punto_reorden
+        productos.save(producto)
+
+        # Assert
+        assert (heredado, propio) == (7, 20)
+        assert inventario.find_by_empresa_and_producto("900111111", "PROD-001").punto_reorden == 7
+        # El índice por margen sigue al nuevo punto de reorden (15 >= 7)
+        assert [str(i.producto_codigo) for i in inventario.find_low_stock()] == []
+
+    def test_save_without_id_updates_existing_pair(self, inventario):
+        # Act
+        registro = inventario.save(Inventario(None, NIT("900111111"), ProductCode("PROD-002"), Quantity(3)))
+
+        # Assert
+        assert len(inventario) == 3
+        assert inventario.find_by_id(str(registro.id)).cantidad == Quantity(3)
+
+    def test_save_rejects_duplicate_pair(self, inventario):
+        registro = inventario.find_by_empresa_and_producto("900111111", "PROD-001")
+        registro.producto_codigo = ProductCode("PROD-002")
+
+        with pytest.raises(DuplicateEntityError):
+            inventario.save(registro)
+
+    def test_save_rejects_unknown_producto(self, inventario):
+        with pytest.raises(ValueError):
+            inventario.save(Inventario(None, NIT("900111111"), ProductCode("PROD-999"), Quantity(1)))
+
+    def test_find_low_stock_follows_quantity_changes(self, inventario):
+        # PROD-001: 15 < 20; PROD-002: 8 >= 5
+        assert [str(i.producto_codigo) for i in inventario.find_low_stock()] == ["PROD-001"]
+        assert [str(i.producto_codigo) for i in inventario.find_low_stock(threshold=15)] == ["PROD-002", "PROD-001"]
+
+        AddStockUseCase(inventario).execute(
+            inventario.find_by_empresa_and_producto("900111111", "PROD-001").id, 10
+        )
+
+        assert inventario.find_low_stock() == []
+        assert [str(i.producto_codigo) for i in inventario.find_low_stock(threshold=15)] == ["PROD-002"]
+
+    def test_stock_exits_are_recorded_as_consumo(self, inventario):
+        # Arrange
+        registro = inventario.find_by_empresa_and_producto("900111111", "PROD-002")
+        registro.update_stock(Quantity(5))
+        inventario.save(registro)
+        registro.update_stock(Quantity(2))
+        inventario.save(registro)
+
+        # Assert: salidas del mismo día sumadas
+        assert inventario.load_consumo("900111111", date.today()) == [("PROD-002", date.today(), 6)]
+
+    def test_abc_classification_lifecycle(self, inventario, empresas):
+        # Arrange
+        inventario.set_precios("PROD-001", {"COP": 1000})
+        inventario.set_precios("PROD-002", {"COP": 10})
+        assert inventario.find_stale_abc_empresas() == ["900111111", "900222222"]
+
+        # Act
+        ClassifyABCUseCase(inventario, empresas).execute("900111111")
+
+        # Assert
+        assert inventario.find_stale_abc_empresas() == ["900222222"]
+        assert [str(i.producto_codigo) for i in inventario.find_by_clase_abc("A", "900111111")] == ["PROD-001"]
+
+        RefreshABCClassificationUseCase(inventario).execute()
+        assert inventario.find_stale_abc_empresas() == []
+
+        registro = inventario.find_by_empresa_and_producto("900111111", "PROD-002")
+        assert inventario.delete(registro.id) is True
+        assert inventario.find_stale_abc_empresas() == ["900111111"]
+        assert [str(i.producto_codigo) for i in inventario.find_by_empresa("900111111")] == ["PROD-001"]
+
+    def test_abc_refresh_uses_saved_classifier(self, inventario, empresas):
+        # Arrange
+        inventario.set_precios("PROD-001", {"USD": 10})
+        inventario.set_precios("PROD-002", {"COP": 1000})
+        classifier = ABCClassifier(moneda="USD")
+        ClassifyABCUseCase(inventario, empresas).execute("900111111", classifier)
+        inventario.mark_abc_stale("900111111")
+
+        # Act
+        RefreshABCClassificationUseCase(inventario).execute("900111111")
+
+        # Assert: valorado en USD, no con el clasificador de defecto (COP)
+        assert inventario.find_abc_classifier("900111111") == classifier
+        assert [str(i.producto_codigo) for i in inventario.find_by_clase_abc("A", "900111111")] == ["PROD-001"]
+
+    def test_abc_change_during_classification_stays_stale(self, inventario, empresas):
+        # Arrange: un cambio de cantidad llega después de leer el snapshot
+        load_snapshot = inventario.load_snapshot
+
+        def load_snapshot_y_cambio(empresa_nit=None):
+            snapshot = load_snapshot(empresa_nit)
+            registro = inventario.find_by_empresa_and_producto("900111111", "PROD-002")
+            registro.update_stock(Quantity(1))
+            inventario.save(registro)
+            return snapshot
+
+        inventario.load_snapshot = load_snapshot_y_cambio
+
+        # Act
+        ClassifyABCUseCase(inventario, empresas).execute("900111111")
+
+        # Assert
+        assert inventario.find_stale_abc_empresas("900111111") == ["900111111"]
+
+
+class TestUnitOfWork:
+    """Tests para UnitOfWork sobre los repositorios en memoria"""
+
+    @pytest.fixture
+    def repos(self, inventario, empresas, productos):
+        return Mock(wraps=inventario), Mock(wraps=empresas), Mock(wraps=productos)
+
+    def test_identity_map_reads_each_entity_once(self, repos):
+        # Arrange
+        inventario, empresas, productos = repos
+        uow = UnitOfWork(inventario, empresas, productos)
+
+        # Act
+        registro = uow.get_inventario("900111111", "PROD-001")
+
+        # Assert
+        assert uow.get_empresa("900111111") is uow.get_empresa(NIT("900111111"))
+        assert uow.get_producto("PROD-404") is None and uow.get_producto("PROD-404") is None
+        assert uow.get_inventario("900111111", "PROD-001") is registro
+        assert empresas.find_by_nit.call_count == 1
+        assert productos.find_by_codigo.call_count == 1
+        assert inventario.find_by_empresa_and_producto.call_count == 1
+
+    def test_use_case_writes_on_commit(self, repos):
+        # Arrange
+        inventario, empresas, productos = repos
+        use_case = CreateOrUpdateInventarioUseCase(inventario, empresas, productos)
+
+        # Act
+        registro = use_case.execute("900222222", "PROD-001", 7)
+
+        # Assert: id y punto de reorden asignados al guardar
+        assert registro.id is not None and registro.punto_reorden == 20
+        assert inventario.save.call_count == 1
+        assert inventario.exists("900222222", "PROD-001")
+
+    def test_use_case_reports_creation(self, repos):
+        # Arrange
+        inventario, empresas, productos = repos
+        use_case = CreateOrUpdateInventarioUseCase(inventario, empresas, productos)
+
+        # Act
+        creado = use_case.execute_detailed("900222222", "PROD-001", 7)
+        actualizado = use_case.execute_detailed("900222222", "PROD-001", 9)
+
+        # Assert: empresa y producto son los leídos por la unidad de trabajo
+        assert (creado.creado, actualizado.creado) == (True, False)
+        assert actualizado.empresa.nombre == "Tecnología del Caribe"
+        assert str(actualizado.producto.codigo) == "PROD-001"
+        assert actualizado.inventario.id == creado.inventario.id
+
+    def test_rollback_on_error(self, repos):
+        # Arrange
+        inventario, empresas, productos = repos
+
+        # Act
+        with pytest.raises(EntityNotFoundError):
+            with UnitOfWork(inventario, empresas, productos) as uow:
+                registro = uow.get_inventario("900111111", "PROD-001")
+                registro.update_stock(Quantity(1))
+                uow.add(registro)
+                raise EntityNotFoundError("Producto no encontrado")
+
+        # Assert
+        inventario.save.assert_not_called()
+        assert inventario.find_by_empresa_and_producto("900111111", "PROD-001").cantidad == Quantity(15)
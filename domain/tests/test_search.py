@@ -0,0 +1,136 @@
+"""
+Tests para búsqueda de texto en memoria - TrigramIndex
+"""
+import pytest
+from nexus_domain.exceptions import ValidationError
+from nexus_domain.search import PrefixIndex, TrigramIndex, normalize, similarity, trigrams
+
+
+@pytest.fixture
+def index():
+    """Catálogo pequeño indexado por nombre y código"""
+    index = TrigramIndex()
+    index.add("PROD-001", "Laptop Lenovo ThinkPad", "PROD-001")
+    index.add("PROD-002", "Mouse inalámbrico", "PROD-002")
+    index.add("PROD-003", "Laptop gamer", "PROD-003")
+    index.add("PROD-004", "Cable HDMI", "PROD-004")
+    return index
+
+
+class TestTrigramas:
+    """Tests para normalización y similitud"""
+
+    def test_normalize_removes_accents_and_symbols(self):
+        assert normalize("  Ratón  Inalámbrico-USB ") == "raton inalambrico usb"
+
+    def test_trigrams_use_pg_trgm_padding(self):
+        assert trigrams("cat") == {"  c", " ca", "cat", "at "}
+
+    def test_similarity(self):
+        assert similarity("laptop", "laptop") == 1.0
+        assert similarity("laptop", "mouse") == 0.0
+        assert 0.3 < similarity("laptpo", "laptop") < 1.0
+
+
+class TestTrigramIndex:
+    """Tests para TrigramIndex"""
+
+    def test_prefix_matches_rank_first(self, index):
+        # Act
+        resultados = index.search("lap")
+
+        # Assert
+        assert [clave for clave, _ in resultados] == ["PROD-001", "PROD-003"]
+        assert all(puntaje == 1.0 for _, puntaje in resultados)
+
+    def test_typo_tolerance(self, index):
+        assert [clave for clave, _ in index.search("laptpo lenvo")] == ["PROD-001"]
+
+    def test_all_query_words_must_match(self, index):
+        assert index.search("laptop mouse") == []
+
+    def test_accents_are_ignored(self, index):
+        assert [clave for clave, _ in index.search("INALAMBRICO")] == ["PROD-002"]
+
+    def test_search_by_codigo(self, index):
+        assert index.search("prod-004")[0][0] == "PROD-004"
+
+    def test_exact_match_ranks_above_similar(self, index):
+        index.add("PROD-005", "Mousse de chocolate")
+
+        resultados = index.search("mouse")
+
+        assert resultados[0] == ("PROD-002", 1.0)
+        assert resultados[1][0] == "PROD-005"
+        assert resultados[1][1] < 1.0
+
+    def test_limit(self, index):
+        assert len(index.search("prod", limit=3)) == 3
+        assert index.search("prod", limit=0) == []
+
+    def test_reindex_and_remove(self, index):
+        # Arrange
+        index.add("PROD-003", "Monitor curvo")
+
+        # Act
+        index.remove("PROD-002")
+
+        # Assert
+        assert [clave for clave, _ in index.search("laptop")] == ["PROD-001"]
+        assert index.search("mouse") == []
+        assert len(index) == 3
+        assert "PROD-002" not in index
+
+    def test_invalid_threshold(self, index):
+        with pytest.raises(ValidationError):
+            index.search("laptop", umbral=0)
+
+
+class TestPrefixIndex:
+    """Tests para PrefixIndex"""
+
+    @pytest.fixture
+    def prefix_index(self):
+        return PrefixIndex.build([
+            ("PROD-003", "Mouse inalámbrico"),
+            ("PROD-001", "Laptop Lenovo ThinkPad"),
+            ("PROD-002", "Cable HDMI para laptop"),
+            ("LAP-9", "Base para portátil"),
+        ])
+
+    def test_names_by_word_prefix_then_codes(self, prefix_index):
+        # Act
+        resultados = prefix_index.search("lap")
+
+        # Assert
+        assert resultados == [
+            ("PROD-002", "Cable HDMI para laptop"),
+            ("PROD-001", "Laptop Lenovo ThinkPad"),
+            ("LAP-9", "Base para portátil"),
+        ]
+
+    def test_exact_code_first(self, prefix_index):
+        assert prefix_index.search("LAP-9")[0] == ("LAP-9", "Base para portátil")
+
+    def test_every_word_must_match(self, prefix_index):
+        assert prefix_index.search("lap len") == [("PROD-001", "Laptop Lenovo ThinkPad")]
+        assert prefix_index.search("inalam") == [("PROD-003", "Mouse inalámbrico")]
+        assert prefix_index.search("lap mouse") == []
+
+    def test_limit(self, prefix_index):
+        assert len(prefix_index.search("prod", limit=2)) == 2
+        assert prefix_index.search("prod", limit=0) == []
+
+    def test_add_and_remove(self, prefix_index):
+        # Arrange
+        prefix_index.add("PROD-004", "Laptop gamer")
+        prefix_index.add("PROD-001", "Monitor curvo")
+
+        # Act
+        prefix_index.remove("PROD-002")
+
+        # Assert
+        assert prefix_index.search("laptop") == [("PROD-004", "Laptop gamer")]
+        assert prefix_index.search("monitor") == [("PROD-001", "Monitor curvo")]
+        assert len(prefix_index) == 4
+        assert "PROD-002" not in prefix_index
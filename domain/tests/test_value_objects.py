@@ -2,7 +2,7 @@
 Tests para Value Objects - Sin dependencias de Django
 """
 import pytest
-from nexus_domain.value_objects import NIT, Email, Phone, ProductCode, Quantity
+from nexus_domain.value_objects import NIT, Email, Phone, ProductCode, Quantity, RawJSON
 from nexus_domain.exceptions import ValidationError, InsufficientStockError
 
 
@@ -142,3 +142,27 @@ class TestQuantity:
         qty = Quantity(100)
         with pytest.raises(AttributeError):
             qty.value = 200  # type: ignore
+    
+    def test_quantity_has_no_instance_dict(self):
+        assert not hasattr(Quantity(1), '__dict__')
+        assert not hasattr(NIT("900123456"), '__dict__')
+        assert not hasattr(ProductCode("PROD-001"), '__dict__')
+
+
+class TestRawJSON:
+    """Tests para RawJSON Value Object"""
+    
+    def test_raw_json_decodes_lazily_once(self):
+        raw = RawJSON('{"color": "rojo"}')
+        assert raw.value == {"color": "rojo"}
+        assert raw.value is raw.value
+        assert str(raw) == '{"color": "rojo"}'
+    
+    def test_raw_json_is_empty_without_decoding(self):
+        assert RawJSON('{}').is_empty() is True
+        assert RawJSON('{"a": 1}').is_empty() is False
+    
+    def test_raw_json_invalid_raises_error_on_access(self):
+        raw = RawJSON('{no es json')
+        with pytest.raises(ValidationError):
+            raw.value